@@ -2,17 +2,40 @@
 This is the entry point for the VPN Switcher application.
 '''
 
-from threading import Thread
 import argparse
+from asyncio import gather, run
 from sys import exit as end
-from time import sleep
+from typing import Iterable
 
+from src.models.runner_config import RunnerConfig
 from src.models.user_switches import UserSwitches
 from src.models.vpn_model import abstract_vpn_model
+from src.services.vpn_connect_history_service import VpnConnectHistoryService
+from src.services.vpn_daemon_client_service import VpnDaemonClientService
+from src.services.vpn_daemon_service import VpnDaemonService
+from src.services.vpn_data_snapshot_service import VpnDataSnapshotService
+from src.services.vpn_data_watcher_service import VpnDataWatcherService
+from src.services.vpn_fleet_service import VpnFleetService
+from src.services.vpn_metrics_service import VpnMetricsService
 from src.services.vpn_parser_service import VpnDataParserService
+from src.services.vpn_supervisor_service import VpnSupervisorService
+from src.utils.tracing_utils import JsonLinesTraceSink, set_trace_sink
 
-PROMPT: str = 'Run in Connect (c), Disconnect (d), or be in Always-Connected mode (w)'
+PROMPT: str = (
+    'Run in Connect (c), Disconnect (d), or be in Always-Connected mode (w), or get the Status (s) '
+    'or Reload (r) the VPN data of a running daemon'
+)
+STATUS_LABELS: dict[bool | None, str] = {True: 'connected', False: 'disconnected', None: 'unknown'}
+LOCAL_ACTIONS: list[str] = ['w', 'c', 'd']
+ACTIONS: list[str] = LOCAL_ACTIONS + ['s', 'r']
+DAEMON_ACTIONS: dict[str, str] = {
+    'c': VpnDaemonService.connect_command,
+    'd': VpnDaemonService.disconnect_command,
+    's': VpnDaemonService.status_command,
+    'r': VpnDaemonService.reload_command,
+}
 DEFAULT_VPN_DATA_PATH: str = './vpn_data.json'
+DEFAULT_CONCURRENCY_LIMIT: int = 8
 
 
 def get_user_switches() -> UserSwitches:
@@ -39,46 +62,212 @@ def get_user_switches() -> UserSwitches:
         default=False,
         required=False
     )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        help=f'Maximum number of VPN actions running at once. DEFAULT {DEFAULT_CONCURRENCY_LIMIT}',
+        type=int,
+        default=DEFAULT_CONCURRENCY_LIMIT,
+        required=False
+    )
+    parser.add_argument(
+        '-s',
+        '--stream',
+        help='Parse the VPN data JSON file incrementally, starting on the first VPNs while the '
+        'rest of the file is parsed. Bypasses the snapshot',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--no-snapshot',
+        help='Always parse the VPN data JSON file instead of loading its cached snapshot',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--metrics-port',
+        help='Serve Prometheus metrics of watch mode on http://127.0.0.1:PORT/metrics',
+        type=int,
+        required=False
+    )
+    parser.add_argument(
+        '--trace-file',
+        help='Append timing spans of every connection, disconnection, backend command and VPN '
+        'data parse to this JSON Lines file',
+        type=str,
+        required=False
+    )
+    parser.add_argument(
+        '--daemon',
+        help='Keep the parsed VPNs in memory and serve the actions of later runs over a Unix '
+        'domain socket, which they use instead of parsing the VPN data JSON file',
+        action='store_true'
+    )
+    parser.add_argument(
+        '--socket',
+        help='Path of the Unix domain socket of the daemon. '
+        f'DEFAULT {VpnDaemonService.get_default_socket_path()}',
+        type=str,
+        required=False
+    )
+    parser.add_argument(
+        '--vpn',
+        help='ID or global ID of a VPN to act on, instead of every VPN. Can be repeated',
+        type=str,
+        action='append',
+        required=False
+    )
     args: argparse.Namespace = parser.parse_args()
-    if args.action is None and args.path is None and args.verbose is False:
+    if args.action is None and args.path is None and args.verbose is False and not args.daemon:
         parser.print_help()
         end(0)
+    action: str = args.action if args.action or args.daemon else input(f'{PROMPT}: ').lower()
     return UserSwitches(
-        args.action if args.action else input(f'{PROMPT}: ').lower(),
+        action,
         args.path if args.path else DEFAULT_VPN_DATA_PATH,
-        args.verbose if args.verbose else False
+        args.verbose if args.verbose else False,
+        args.jobs,
+        not args.no_snapshot,
+        args.stream,
+        args.metrics_port,
+        args.trace_file,
+        args.daemon,
+        args.socket,
+        args.vpn
+    )
+
+
+def send_to_daemon(switches: UserSwitches) -> int | None:
+    '''
+    Send the requested action to the running daemon, and print its results.
+
+    Args:
+      switches (UserSwitches): User switches selecting the action
+
+    Returns:
+      int | None: Exit code of the action, or None if no daemon is running and the action has to
+        be performed locally
+    '''
+    client: VpnDaemonClientService = VpnDaemonClientService(switches.get_socket_path())
+    if not client.is_daemon_running():
+        if switches.action in LOCAL_ACTIONS:
+            return None
+        print(f'No daemon is listening on {client.socket_path}')
+        return 1
+    try:
+        results: dict = client.send(
+            DAEMON_ACTIONS[switches.action], switches.get_vpn_ids(), switches.vpn_data_json_path
+        )
+    except (OSError, ValueError) as error:
+        print(f'The daemon failed to run the action: {error}')
+        return 1
+    if switches.action == 'r':
+        print(f'Reloaded {results["vpn_count"]} VPNs: {results["diff"]}')
+        return 0
+    if switches.action == 's':
+        for vpn_id, connected in results.items():
+            print(f'{vpn_id}: {STATUS_LABELS[connected]}')
+        return 0
+    for vpn_id, returncode in results.items():
+        print(f'{vpn_id}: {"done" if returncode == 0 else f"failed with code {returncode}"}')
+    return 0 if all(returncode == 0 for returncode in results.values()) else 1
+
+
+async def perform_action(
+    switches: UserSwitches,
+    vpns: Iterable[abstract_vpn_model.AbstractVpnModel],
+    runner_config: RunnerConfig
+) -> None:
+    '''
+    Perform the requested action on all VPNs under a single event loop.
+
+    Args:
+      switches (UserSwitches): User switches selecting the action
+      vpns (Iterable[AbstractVpnModel]): VPNs to perform the action on, possibly still being
+        parsed
+      runner_config (RunnerConfig): Limits on the connections of the VPN data JSON file
+    '''
+    if switches.action == 'c':
+        # Start the slowest VPNs of earlier runs first, unless they are connected as they are parsed
+        history_service: VpnConnectHistoryService = VpnConnectHistoryService()
+        await VpnFleetService(
+            switches.get_concurrency_limit(),
+            runner_config=runner_config,
+            history_service=history_service
+        ).connect_all(
+            vpns if switches.is_streaming() else history_service.order_for_connect(vpns),
+            switches.verbose
+        )
+        history_service.save()
+        return
+    if switches.action == 'd':
+        await VpnFleetService(
+            switches.get_concurrency_limit(), runner_config=runner_config
+        ).disconnect_all(vpns, switches.verbose)
+        return
+
+    # In watch mode, every VPN is supervised independently and only reconnected when it is down,
+    # while changes to the VPN data JSON file are applied without restarting
+    metrics_service: VpnMetricsService | None = None
+    if switches.get_metrics_port() is not None:
+        metrics_service = VpnMetricsService()
+        metrics_service.start_server(switches.get_metrics_port())
+    fleet_service: VpnFleetService = VpnFleetService(
+        switches.get_concurrency_limit(), metrics_service, runner_config
+    )
+    supervisor_service: VpnSupervisorService = VpnSupervisorService(fleet_service)
+    watcher_service: VpnDataWatcherService = VpnDataWatcherService(
+        switches.vpn_data_json_path, supervisor_service, VpnDataParserService()
+    )
+    await gather(
+        supervisor_service.supervise_all(vpns, switches.verbose),
+        watcher_service.watch(switches.verbose)
     )
 
 
 if __name__ == '__main__':
     # Get and Validate user switch to know whether to connect or disconnect VPNs
     user_switches: UserSwitches = get_user_switches()
-    if user_switches.action not in ['w', 'c', 'd']:
+    if not user_switches.is_daemon() and user_switches.action not in ACTIONS:
         raise ValueError(f'Invalid action switch. {PROMPT}!')
+    if user_switches.get_trace_path():
+        set_trace_sink(JsonLinesTraceSink(user_switches.get_trace_path()))
+
+    # A running daemon already holds the parsed VPNs, so the action costs one socket round trip
+    if not user_switches.is_daemon() and user_switches.action != 'w':
+        daemon_exit_code: int | None = send_to_daemon(user_switches)
+        if daemon_exit_code is not None:
+            end(daemon_exit_code)
+
+    # List all VPNs, from the snapshot of the VPN data JSON file if it did not change, or one at a
+    # time as they are parsed in streaming mode
+    vpn_parser_service: VpnDataParserService = VpnDataParserService(
+        VpnDataSnapshotService() if user_switches.is_using_snapshot() else None
+    )
+    vpn_runner_config: RunnerConfig = vpn_parser_service.parse_runner_config_file(
+        user_switches.vpn_data_json_path
+    )
+    if user_switches.is_daemon():
+        daemon_service: VpnDaemonService = VpnDaemonService(
+            user_switches.vpn_data_json_path,
+            vpn_parser_service,
+            VpnFleetService(
+                user_switches.get_concurrency_limit(), runner_config=vpn_runner_config
+            ),
+            user_switches.get_socket_path()
+        )
+        daemon_service.load(vpn_parser_service.parse_vpn_data_file(
+            user_switches.vpn_data_json_path, user_switches.is_verbose()
+        ))
+        run(daemon_service.serve(user_switches.is_verbose()))
+        end(0)
+    vpn_data_list: Iterable[abstract_vpn_model.AbstractVpnModel] = (
+        vpn_parser_service.stream_vpn_data_file(user_switches.vpn_data_json_path)
+        if user_switches.is_streaming()
+        else vpn_parser_service.parse_vpn_data_file(
+            user_switches.vpn_data_json_path, user_switches.is_verbose()
+        )
+    )
+    if user_switches.get_vpn_ids():
+        vpn_data_list = VpnFleetService.select(vpn_data_list, user_switches.get_vpn_ids())
 
-    # List all VPNs
-    vpn_data_list: list[abstract_vpn_model.AbstractVpnModel] = []
-    with open(user_switches.vpn_data_json_path, 'r', encoding='utf-8') as f:
-        vpn_parser_service: VpnDataParserService = VpnDataParserService()
-        vpn_data_list = vpn_parser_service.parse_vpn_data(f.read())
-
-    while True:
-        # Perform action on all VPNs
-        threads: set[Thread] = set()
-        for vpn in vpn_data_list:
-            t: Thread = Thread(
-                target=vpn.disconnect if user_switches.action == 'd' else vpn.connect,
-                kwargs={'verbose': user_switches.verbose}
-            )
-            t.start()
-            threads.add(t)
-
-        # Ensure all threads complete
-        for t in threads:
-            t.join()
-
-        # If not in watch mode, exit
-        if user_switches.action != 'w':
-            break
-
-        sleep(5)
+    # Perform action on all VPNs
+    run(perform_action(user_switches, vpn_data_list, vpn_runner_config))
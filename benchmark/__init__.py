@@ -0,0 +1,3 @@
+"""
+Benchmarks of auto_vpn_connect against fake VPN backends.
+"""
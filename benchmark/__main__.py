@@ -0,0 +1,154 @@
+"""
+Runs the benchmarks against fake backends and reports the results.
+
+Run from the root of the repository:
+
+    python -m benchmark --sizes 1 100 1000 --latency 0.05 --failure-rate 0.1
+"""
+
+import argparse
+from pathlib import Path
+from platform import python_version
+from tempfile import TemporaryDirectory
+
+from benchmark.benchmarks import (
+    add_jobs_argument,
+    measure_connect_makespan,
+    measure_parse,
+    measure_startup,
+    measure_watch_cpu,
+)
+from benchmark.fake_backends import FakeBackends
+from benchmark.vpn_data_generator import write_vpn_data
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+
+
+def get_arguments() -> argparse.Namespace:
+    """
+    Get the benchmark settings from the command line arguments.
+
+    Returns:
+        argparse.Namespace: Benchmark settings
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(prog="python -m benchmark")
+    parser.add_argument(
+        "--sizes",
+        help="Numbers of VPNs in the generated VPN data JSON files. DEFAULT 1 10 100 1000 5000",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100, 1000, 5000],
+    )
+    parser.add_argument(
+        "--latency",
+        help="Seconds every fake backend command takes. DEFAULT 0.01",
+        type=float,
+        default=0.01,
+    )
+    parser.add_argument(
+        "--failure-rate",
+        help="Share of fake connections that fail. DEFAULT 0",
+        type=float,
+        default=0.0,
+    )
+    add_jobs_argument(parser)
+    parser.add_argument(
+        "--max-connect-size",
+        help="Largest number of VPNs to measure the connection makespan and watch mode of. "
+        "DEFAULT 1000",
+        type=int,
+        default=1000,
+    )
+    parser.add_argument(
+        "--watch-seconds",
+        help="Seconds to run watch mode for. DEFAULT 10",
+        type=float,
+        default=10.0,
+    )
+    parser.add_argument(
+        "--watch-interval",
+        help="Seconds between two watch mode checks of a VPN. DEFAULT 1",
+        type=float,
+        default=1.0,
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="File to write the report to. DEFAULT bench_output.txt",
+        type=str,
+        default="bench_output.txt",
+    )
+    return parser.parse_args()
+
+
+def run_benchmarks(arguments: argparse.Namespace, directory: Path) -> list[str]:
+    """
+    Run every benchmark for every size of VPN data.
+
+    Args:
+        arguments (argparse.Namespace): Benchmark settings
+        directory (Path): Directory for the fake backends and generated files
+
+    Returns:
+        list[str]: Lines of the report
+    """
+    startup_backends: FakeBackends = FakeBackends(directory / "startup_backends")
+    backends: FakeBackends = FakeBackends(
+        directory / "backends", arguments.latency, arguments.failure_rate
+    )
+    report: list[str] = [
+        f"Python {python_version()}, latency {arguments.latency}s, "
+        f"failure rate {arguments.failure_rate}, {arguments.jobs} jobs, "
+        f"watch mode for {arguments.watch_seconds}s every {arguments.watch_interval}s",
+        "",
+        f"{'VPNs':>6} {'cold start':>11} {'warm start':>11} {'parse':>9} "
+        f"{'makespan':>9} {'failed':>7} {'watch CPU':>10}",
+    ]
+    for size in arguments.sizes:
+        startup_data_path: Path = write_vpn_data(
+            directory / f"startup_{size}.json", size, startup_backends.get_config_json()
+        )
+        cache_dir: Path = directory / f"cache_{size}"
+        cold_start: float = measure_startup(startup_data_path, cache_dir)
+        warm_start: float = measure_startup(startup_data_path, cache_dir)
+        vpn_data_path: Path = write_vpn_data(
+            directory / f"vpn_data_{size}.json", size, backends.get_config_json()
+        )
+        parse_seconds, vpns = measure_parse(vpn_data_path)
+        connect_columns: str = f"{'-':>9} {'-':>7} {'-':>10}"
+        if size <= arguments.max_connect_size:
+            connect_columns = _measure_connections(arguments, backends, vpns)
+        report.append(
+            f"{size:>6} {cold_start:>10.3f}s {warm_start:>10.3f}s {parse_seconds:>8.4f}s "
+            f"{connect_columns}"
+        )
+        print(report[-1])
+    return report
+
+
+def _measure_connections(
+    arguments: argparse.Namespace, backends: FakeBackends, vpns: list[AbstractVpnModel]
+) -> str:
+    """
+    Measure the connection makespan and the steady state watch mode of some VPNs.
+
+    Returns:
+        str: Columns of the report with the measurements
+    """
+    backends.disconnect_all()
+    makespan, failed = measure_connect_makespan(vpns, arguments.jobs)
+    # Watch mode is measured in a steady state, with every tunnel already up
+    backends.set_failure_rate(0.0)
+    measure_connect_makespan(vpns, arguments.jobs)
+    watch_cpu: float = measure_watch_cpu(
+        vpns, arguments.jobs, arguments.watch_seconds, arguments.watch_interval
+    )
+    backends.set_failure_rate(arguments.failure_rate)
+    return f"{makespan:>8.3f}s {failed:>7} {watch_cpu:>9.1%}"
+
+
+if __name__ == "__main__":
+    benchmark_arguments: argparse.Namespace = get_arguments()
+    with TemporaryDirectory(prefix="auto_vpn_connect_benchmark_") as benchmark_directory:
+        report_lines: list[str] = run_benchmarks(benchmark_arguments, Path(benchmark_directory))
+    Path(benchmark_arguments.output).write_text("\n".join(report_lines) + "\n", encoding="utf-8")
+    print(f"Report written to {benchmark_arguments.output}")
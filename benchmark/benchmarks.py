@@ -0,0 +1,144 @@
+"""
+Benchmarks of the hot paths: startup, parsing, one-shot connection of all VPNs and watch mode.
+"""
+
+import argparse
+from asyncio import TimeoutError as AsyncTimeoutError, run, wait_for
+from contextlib import redirect_stdout
+from io import StringIO
+from os import environ
+from pathlib import Path
+from resource import RUSAGE_CHILDREN, RUSAGE_SELF, getrusage
+from subprocess import DEVNULL, run as run_process
+from sys import executable
+from time import perf_counter
+
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.services.vpn_fleet_service import VpnFleetService
+from src.services.vpn_parser_service import VpnDataParserService
+from src.services.vpn_supervisor_service import VpnSupervisorService
+
+REPOSITORY_ROOT: Path = Path(__file__).resolve().parent.parent
+
+
+def add_jobs_argument(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the switch bounding the VPN actions running at once, shared by every benchmark.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser of the benchmark settings
+    """
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Maximum number of VPN actions running at once. DEFAULT 8",
+        type=int,
+        default=8,
+    )
+
+
+def measure_startup(vpn_data_path: Path, cache_dir: Path) -> float:
+    """
+    Measure the wall time of a one-shot connection run of the application, from the start of its
+    process to its exit. The snapshot cache is isolated in a directory of the benchmark, so the
+    first run parses the file and later runs load its snapshot.
+
+    Args:
+        vpn_data_path (Path): VPN data JSON file to connect the VPNs of
+        cache_dir (Path): Directory to keep the snapshot in
+
+    Returns:
+        float: Seconds the run took
+    """
+    started_at: float = perf_counter()
+    run_process(
+        [executable, str(REPOSITORY_ROOT), "-a", "c", "-p", str(vpn_data_path)],
+        check=True,
+        stdout=DEVNULL,
+        env={**environ, "XDG_CACHE_HOME": str(cache_dir)},
+    )
+    return perf_counter() - started_at
+
+
+def measure_parse(vpn_data_path: Path, repeats: int = 3) -> tuple[float, list[AbstractVpnModel]]:
+    """
+    Measure the time it takes to parse a VPN data JSON file, without the snapshot.
+
+    Args:
+        vpn_data_path (Path): VPN data JSON file to parse
+        repeats (int): Number of parses, of which the fastest is kept
+
+    Returns:
+        tuple[float, list[AbstractVpnModel]]: Seconds of the fastest parse, and the parsed VPNs
+    """
+    parser_service: VpnDataParserService = VpnDataParserService()
+    best: float = float("inf")
+    vpns: list[AbstractVpnModel] = []
+    for _ in range(repeats):
+        started_at: float = perf_counter()
+        vpns = parser_service.parse_vpn_data_file(str(vpn_data_path), False)
+        best = min(best, perf_counter() - started_at)
+    return best, vpns
+
+
+def measure_connect_makespan(vpns: list[AbstractVpnModel], jobs: int) -> tuple[float, int]:
+    """
+    Measure the time it takes to connect all the VPNs at once, from the first connection to the
+    last one.
+
+    Args:
+        vpns (list[AbstractVpnModel]): VPNs to connect
+        jobs (int): Maximum number of connections running at once
+
+    Returns:
+        tuple[float, int]: Seconds until every connection completed, and the number of
+            connections that failed
+    """
+    fleet_service: VpnFleetService = VpnFleetService(jobs)
+    started_at: float = perf_counter()
+    with redirect_stdout(StringIO()):
+        results = run(fleet_service.connect_all(vpns, False))
+    makespan: float = perf_counter() - started_at
+    return makespan, sum(1 for result in results if result is None or result.returncode != 0)
+
+
+def measure_watch_cpu(
+    vpns: list[AbstractVpnModel], jobs: int, seconds: float, check_interval: float
+) -> float:
+    """
+    Measure the CPU the watch mode uses to keep VPNs connected in a steady state, counting both
+    the application and the backend commands it spawns.
+
+    Args:
+        vpns (list[AbstractVpnModel]): VPNs to supervise, which should already be connected
+        jobs (int): Maximum number of checks running at once
+        seconds (float): Seconds to run the watch mode for
+        check_interval (float): Seconds between two checks of a VPN
+
+    Returns:
+        float: CPU seconds used per second of watch mode
+    """
+    supervisor_service: VpnSupervisorService = VpnSupervisorService(
+        VpnFleetService(jobs), check_interval
+    )
+    cpu_before: float = get_cpu_seconds()
+    started_at: float = perf_counter()
+    with redirect_stdout(StringIO()):
+        try:
+            run(wait_for(supervisor_service.supervise_all(vpns, False), seconds))
+        except AsyncTimeoutError:
+            pass
+    return (get_cpu_seconds() - cpu_before) / (perf_counter() - started_at)
+
+
+def get_cpu_seconds() -> float:
+    """
+    Get the user and system CPU seconds used by this process and its finished children.
+
+    Returns:
+        float: CPU seconds used so far
+    """
+    return sum(
+        usage.ru_utime + usage.ru_stime
+        for usage in (getrusage(RUSAGE_SELF), getrusage(RUSAGE_CHILDREN))
+    )
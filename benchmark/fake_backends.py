@@ -0,0 +1,215 @@
+"""
+Fake Pritunl and Global Protect backends for the benchmarks.
+
+The fakes are shell scripts keeping the state of the tunnels in files, so that they cost a process
+spawn like the real CLIs. Their behaviour is read from a control directory on every invocation,
+and can be changed while they are in use: latency, random failures, connections that hang, and
+connections rejected as an authentication failure.
+"""
+
+from pathlib import Path
+from typing import Iterable
+
+_PRITUNL_CLI_TEMPLATE: str = """#!/bin/sh
+state="{state_dir}"
+control="{control_dir}"
+latency=$(cat "$control/latency" 2>/dev/null || echo 0)
+failure_threshold=$(cat "$control/failure_threshold" 2>/dev/null || echo 0)
+sleep "$latency"
+case "$1" in
+  list)
+    echo "+----+------+------------+----------------+"
+    echo "| ID | NAME | ONLINE FOR | SERVER ADDRESS |"
+    echo "+----+------+------------+----------------+"
+    for profile in "$state"/*; do
+      [ -e "$profile" ] && echo "| ${{profile##*/}} | fake | 1 min | 10.0.0.1 |"
+    done
+    echo "+----+------+------------+----------------+"
+    ;;
+  start)
+    [ -e "$control/hang" ] && exec sleep "$(cat "$control/hang")"
+    if [ -e "$control/reject/$2" ] || [ -e "$control/reject/all" ]; then
+      echo "fake authentication failure" >&2
+      exit 1
+    fi
+    if [ "$(od -An -N2 -tu2 /dev/urandom)" -lt "$failure_threshold" ]; then
+      echo "fake connection failure" >&2
+      exit 1
+    fi
+    : > "$state/$2"
+    ;;
+  stop)
+    rm -f "$state/$2"
+    ;;
+esac
+"""
+
+_GLOBAL_PROTECT_TEMPLATE: str = """#!/bin/sh
+state="{state_dir}"
+control="{control_dir}"
+latency=$(cat "$control/latency" 2>/dev/null || echo 0)
+failure_threshold=$(cat "$control/failure_threshold" 2>/dev/null || echo 0)
+case "$1" in
+  status)
+    [ -e "$state/global_protect" ]
+    exit $?
+    ;;
+  load)
+    sleep "$latency"
+    [ -e "$control/hang" ] && exec sleep "$(cat "$control/hang")"
+    if [ -e "$control/reject/global_protect" ] || [ -e "$control/reject/all" ]; then
+      echo "fake authentication failure" >&2
+      exit 1
+    fi
+    if [ "$(od -An -N2 -tu2 /dev/urandom)" -lt "$failure_threshold" ]; then
+      echo "fake connection failure" >&2
+      exit 1
+    fi
+    : > "$state/global_protect"
+    ;;
+  unload|kill)
+    sleep "$latency"
+    rm -f "$state/global_protect"
+    ;;
+esac
+"""
+
+
+class FakeBackends:
+    """
+    Fake Pritunl CLI and Global Protect commands sharing one state and control directory.
+
+    Attributes:
+        directory (Path): Directory holding the scripts, their state and their control files
+        pritunl_cli_path (Path): Path to the fake Pritunl CLI
+        global_protect_path (Path): Path to the fake Global Protect command
+    """
+
+    _failure_threshold_scale: int = 65536
+
+    def __init__(self, directory: Path, latency: float = 0.0, failure_rate: float = 0.0) -> None:
+        self.directory: Path = directory
+        self.state_dir: Path = directory / "state"
+        self.control_dir: Path = directory / "control"
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.reject_dir: Path = self.control_dir / "reject"
+        self.reject_dir.mkdir(parents=True, exist_ok=True)
+        self.pritunl_cli_path: Path = self._write_script(
+            "pritunl-client", _PRITUNL_CLI_TEMPLATE
+        )
+        self.global_protect_path: Path = self._write_script(
+            "global-protect", _GLOBAL_PROTECT_TEMPLATE
+        )
+        self.set_latency(latency)
+        self.set_failure_rate(failure_rate)
+
+    def set_latency(self, latency: float) -> None:
+        """
+        Set the seconds every connection, disconnection and Pritunl listing takes.
+
+        Args:
+            latency (float): Latency in seconds
+        """
+        (self.control_dir / "latency").write_text(f"{latency:f}", encoding="utf-8")
+
+    def set_failure_rate(self, failure_rate: float) -> None:
+        """
+        Set the share of connections that fail.
+
+        Args:
+            failure_rate (float): Probability of a connection failing, between 0 and 1
+        """
+        threshold: int = round(failure_rate * FakeBackends._failure_threshold_scale)
+        (self.control_dir / "failure_threshold").write_text(str(threshold), encoding="utf-8")
+
+    def set_hang(self, seconds: float | None) -> None:
+        """
+        Make every connection hang, as a backend stuck on an unreachable server does.
+
+        Args:
+            seconds (float | None): Seconds a connection hangs for before exiting without
+                connecting, or None to stop hanging
+        """
+        hang_path: Path = self.control_dir / "hang"
+        if seconds is None:
+            hang_path.unlink(missing_ok=True)
+        else:
+            hang_path.write_text(f"{seconds:f}", encoding="utf-8")
+
+    def set_rejected(self, tunnel_ids: Iterable[str]) -> None:
+        """
+        Set the tunnels whose connections fail as an authentication failure.
+
+        Args:
+            tunnel_ids (Iterable[str]): IDs of the Pritunl profiles, "global_protect" for the
+                Global Protect agent, or "all" for every tunnel. Empty to accept every connection
+        """
+        for path in self.reject_dir.iterdir():
+            path.unlink()
+        for tunnel_id in tunnel_ids:
+            (self.reject_dir / tunnel_id).touch()
+
+    def drop(self, tunnel_ids: Iterable[str]) -> None:
+        """
+        Drop some tunnels, as a network outage does.
+
+        Args:
+            tunnel_ids (Iterable[str]): IDs of the Pritunl profiles, or "global_protect" for the
+                Global Protect agent
+        """
+        for tunnel_id in tunnel_ids:
+            (self.state_dir / tunnel_id).unlink(missing_ok=True)
+
+    def disconnect_all(self) -> None:
+        """
+        Drop every tunnel, as if the machine had just started.
+        """
+        for path in self.state_dir.iterdir():
+            path.unlink()
+
+    def get_connected(self) -> set[str]:
+        """
+        Get the tunnels that are up.
+
+        Returns:
+            set[str]: IDs of the connected Pritunl profiles, and "global_protect" if the Global
+                Protect agent is running
+        """
+        return {path.name for path in self.state_dir.iterdir()}
+
+    def get_config_json(self, timeouts: dict[str, float] | None = None) -> dict:
+        """
+        Get the "config" section of a VPN data JSON file pointing at the fakes.
+
+        Args:
+            timeouts (dict[str, float] | None): Deadlines of the backend operations, by operation
+                name, or None for the defaults
+
+        Returns:
+            dict: Configs of the Pritunl and Global Protect VPN types
+        """
+        global_protect: str = str(self.global_protect_path)
+        config_json: dict = {
+            "PRITUNL": {"vpn_type": "PRITUNL", "cli_path": str(self.pritunl_cli_path)},
+            "GLOBAL_PROTECT": {
+                "vpn_type": "GLOBAL_PROTECT",
+                "service_load_command": f"{global_protect} load",
+                "service_unload_command": f"{global_protect} unload",
+                "process_kill_command": f"{global_protect} kill",
+                "status_command": f"{global_protect} status",
+            },
+        }
+        if timeouts:
+            for vpn_type_json in config_json.values():
+                vpn_type_json["timeouts"] = timeouts
+        return config_json
+
+    def _write_script(self, name: str, template: str) -> Path:
+        """Write an executable fake backend command."""
+        path: Path = self.directory / name
+        path.write_text(
+            template.format(state_dir=self.state_dir, control_dir=self.control_dir),
+            encoding="utf-8",
+        )
+        path.chmod(0o755)
+        return path
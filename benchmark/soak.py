@@ -0,0 +1,470 @@
+"""
+Chaos soak test of the watch mode.
+
+Keeps VPNs connected with the watch mode against the fake backends for a long time, while tunnels
+are dropped on a schedule and their reconnections are impaired by hanging, rejected or slow
+backend commands. Reports the mean time each tunnel took to come back up, and the resources the
+watch mode used over time.
+
+Run from the root of the repository:
+
+    python -m benchmark.soak --profiles 20 --seconds 600 --period 60
+"""
+
+import argparse
+from asyncio import Task, create_task, gather, run, sleep
+from contextlib import redirect_stdout
+from enum import Enum
+from os import devnull, listdir
+from pathlib import Path
+from random import Random
+from resource import RUSAGE_SELF, getrusage
+from statistics import mean
+from sys import platform
+from tempfile import TemporaryDirectory
+from threading import active_count
+from time import monotonic
+
+from benchmark.benchmarks import add_jobs_argument, get_cpu_seconds
+from benchmark.fake_backends import FakeBackends
+from benchmark.vpn_data_generator import write_vpn_data
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.services.vpn_fleet_service import VpnFleetService
+from src.services.vpn_parser_service import VpnDataParserService
+from src.services.vpn_supervisor_service import VpnSupervisorService
+
+
+class Fault(Enum):
+    """
+    Fault injected into the fake backends. Every fault drops some tunnels, and all but DROP also
+    impair the backends while the watch mode reconnects them.
+    """
+
+    DROP = "drop"
+    SLOW = "slow"
+    HANG = "hang"
+    AUTH_FAILURE = "auth_failure"
+
+
+# pylint: disable-next=too-few-public-methods
+class FaultEvent:
+    """
+    Fault injected at a point of the soak test.
+
+    Attributes:
+        at (float): Seconds since the start of the soak test
+        fault (Fault): Fault to inject
+        duration (float): Seconds the backends stay impaired
+        share (float): Share of the tunnels to drop, between 0 and 1
+    """
+
+    __slots__ = ("at", "fault", "duration", "share")
+
+    def __init__(self, at: float, fault: Fault, duration: float, share: float) -> None:
+        self.at: float = at
+        self.fault: Fault = fault
+        self.duration: float = duration
+        self.share: float = share
+
+
+def get_default_schedule(seconds: float, period: float, share: float) -> list[FaultEvent]:
+    """
+    Get a schedule injecting every fault once per period, a quarter of a period apart, each
+    impairing the backends for a sixth of a period.
+
+    Args:
+        seconds (float): Seconds the soak test runs for
+        period (float): Seconds between two injections of the same fault
+        share (float): Share of the tunnels every fault drops
+
+    Returns:
+        list[FaultEvent]: Fault events, in chronological order
+    """
+    schedule: list[FaultEvent] = []
+    cycle_start: float = 0.0
+    while cycle_start < seconds:
+        for index, fault in enumerate(Fault):
+            at: float = cycle_start + period * index / len(Fault)
+            if at < seconds:
+                schedule.append(FaultEvent(at, fault, period / 6, share))
+        cycle_start += period
+    return schedule
+
+
+class RecoveryTracker:
+    """
+    Tracks when every tunnel goes down and comes back up.
+
+    Attributes:
+        recoveries (dict[str, list[float]]): Seconds every outage of each tunnel lasted
+    """
+
+    def __init__(self, tunnel_ids: set[str]) -> None:
+        self.recoveries: dict[str, list[float]] = {tunnel_id: [] for tunnel_id in tunnel_ids}
+        self._down_since: dict[str, float] = {}
+
+    def record_drops(self, tunnel_ids: list[str], now: float) -> None:
+        """
+        Record tunnels dropped on purpose, so their outage starts when they were dropped rather
+        than when the next observation notices it.
+
+        Args:
+            tunnel_ids (list[str]): Dropped tunnels
+            now (float): Monotonic time of the drop
+        """
+        for tunnel_id in tunnel_ids:
+            self._down_since.setdefault(tunnel_id, now)
+
+    def observe(self, connected: set[str], now: float) -> None:
+        """
+        Record the tunnels that are up at a point in time.
+
+        Args:
+            connected (set[str]): Tunnels that are up
+            now (float): Monotonic time of the observation
+        """
+        for tunnel_id, recoveries in self.recoveries.items():
+            down_since: float | None = self._down_since.get(tunnel_id)
+            if tunnel_id not in connected:
+                self._down_since.setdefault(tunnel_id, now)
+            elif down_since is not None:
+                recoveries.append(now - down_since)
+                del self._down_since[tunnel_id]
+
+    def get_unrecovered(self, now: float) -> dict[str, float]:
+        """
+        Get the tunnels that are still down.
+
+        Args:
+            now (float): Monotonic time to measure the ongoing outages at
+
+        Returns:
+            dict[str, float]: Seconds each tunnel that is still down has been down for
+        """
+        return {tunnel_id: now - down_since for tunnel_id, down_since in self._down_since.items()}
+
+
+# pylint: disable-next=too-few-public-methods
+class ResourceSample:
+    """
+    Resources used by the soak test process over an interval.
+
+    Attributes:
+        elapsed (float): Seconds since the start of the soak test
+        cpu (float): CPU seconds used per second by the process and its backend commands
+        max_rss (float): Peak resident memory of the process so far, in MiB
+        open_files (int): File descriptors the process has open
+        threads (int): Threads the process runs
+    """
+
+    __slots__ = ("elapsed", "cpu", "max_rss", "open_files", "threads")
+
+    # pylint: disable-next=R0913,R0917
+    def __init__(
+        self, elapsed: float, cpu: float, max_rss: float, open_files: int, threads: int
+    ) -> None:
+        self.elapsed: float = elapsed
+        self.cpu: float = cpu
+        self.max_rss: float = max_rss
+        self.open_files: int = open_files
+        self.threads: int = threads
+
+
+# pylint: disable-next=R0902,R0903
+class ChaosSoak:
+    """
+    Runs the watch mode against fake backends while injecting faults.
+
+    Attributes:
+        backends (FakeBackends): Fake backends the VPNs use
+        schedule (list[FaultEvent]): Faults to inject, in chronological order
+        jobs (int): Maximum number of VPN actions running at once
+        check_interval (float): Seconds between two watch mode checks of a VPN
+        slow_latency (float): Seconds every backend command takes during a SLOW fault
+        hang_seconds (float): Seconds a connection hangs for during a HANG fault
+        sample_interval (float): Seconds between two observations of the tunnels
+        resource_interval (float): Seconds between two samples of the resources
+    """
+
+    # pylint: disable-next=R0913
+    def __init__(
+        self,
+        backends: FakeBackends,
+        schedule: list[FaultEvent],
+        *,
+        jobs: int = 8,
+        check_interval: float = 1.0,
+        slow_latency: float = 2.0,
+        hang_seconds: float = 3600.0,
+        sample_interval: float = 0.1,
+        resource_interval: float = 5.0,
+        seed: int = 0
+    ) -> None:
+        self.backends: FakeBackends = backends
+        self.schedule: list[FaultEvent] = schedule
+        self.jobs: int = jobs
+        self.check_interval: float = check_interval
+        self.slow_latency: float = slow_latency
+        self.hang_seconds: float = hang_seconds
+        self.sample_interval: float = sample_interval
+        self.resource_interval: float = resource_interval
+        self._rng: Random = Random(seed)
+
+    async def run(
+        self, vpns: list[AbstractVpnModel], seconds: float, base_latency: float
+    ) -> tuple[RecoveryTracker, list[ResourceSample]]:
+        """
+        Connect the VPNs, then keep them connected with the watch mode while injecting the faults.
+
+        Args:
+            vpns (list[AbstractVpnModel]): VPNs to keep connected
+            seconds (float): Seconds to run the watch mode for
+            base_latency (float): Seconds every backend command takes outside of SLOW faults
+
+        Returns:
+            tuple[RecoveryTracker, list[ResourceSample]]: Outages of every tunnel, and the
+                resources used over time
+        """
+        fleet_service: VpnFleetService = VpnFleetService(self.jobs)
+        await fleet_service.connect_all(vpns, False)
+        tracker: RecoveryTracker = RecoveryTracker(self.backends.get_connected())
+        resources: list[ResourceSample] = []
+        supervisor: Task = create_task(
+            VpnSupervisorService(fleet_service, self.check_interval).supervise_all(vpns, False)
+        )
+        started_at: float = monotonic()
+        helpers: list[Task] = [
+            create_task(self._inject_faults(tracker, started_at, base_latency)),
+            create_task(self._observe_tunnels(tracker)),
+            create_task(self._sample_resources(resources, started_at)),
+        ]
+        try:
+            await sleep(seconds)
+        finally:
+            for task in (supervisor, *helpers):
+                task.cancel()
+            await gather(supervisor, *helpers, return_exceptions=True)
+            self._restore(base_latency)
+        tracker.observe(self.backends.get_connected(), monotonic())
+        return tracker, resources
+
+    async def _inject_faults(
+        self, tracker: RecoveryTracker, started_at: float, base_latency: float
+    ) -> None:
+        """Inject the faults of the schedule when they are due, and lift them after a while."""
+        tunnel_ids: list[str] = sorted(tracker.recoveries)
+        lifts: list[Task] = []
+        for event in self.schedule:
+            await sleep(max(0.0, started_at + event.at - monotonic()))
+            dropped: list[str] = self._rng.sample(
+                tunnel_ids, max(1, round(event.share * len(tunnel_ids)))
+            )
+            if event.fault == Fault.SLOW:
+                self.backends.set_latency(self.slow_latency)
+            elif event.fault == Fault.HANG:
+                self.backends.set_hang(self.hang_seconds)
+            elif event.fault == Fault.AUTH_FAILURE:
+                self.backends.set_rejected(dropped)
+            tracker.record_drops(dropped, monotonic())
+            self.backends.drop(dropped)
+            lifts.append(create_task(self._lift_fault(event.duration, base_latency)))
+        await gather(*lifts)
+
+    async def _lift_fault(self, delay: float, base_latency: float) -> None:
+        """Lift the impairment of the backends after a delay."""
+        await sleep(delay)
+        self._restore(base_latency)
+
+    def _restore(self, base_latency: float) -> None:
+        """Make the backends behave normally again."""
+        self.backends.set_latency(base_latency)
+        self.backends.set_hang(None)
+        self.backends.set_rejected([])
+
+    async def _observe_tunnels(self, tracker: RecoveryTracker) -> None:
+        """Observe the tunnels that are up, until cancelled."""
+        while True:
+            tracker.observe(self.backends.get_connected(), monotonic())
+            await sleep(self.sample_interval)
+
+    async def _sample_resources(self, resources: list[ResourceSample], started_at: float) -> None:
+        """Sample the resources used over every interval, until cancelled."""
+        cpu_before: float = get_cpu_seconds()
+        sampled_at: float = started_at
+        while True:
+            await sleep(self.resource_interval)
+            cpu_now: float = get_cpu_seconds()
+            now: float = monotonic()
+            # ru_maxrss is in KiB on Linux but in bytes on macOS
+            max_rss: float = getrusage(RUSAGE_SELF).ru_maxrss / (
+                1024 * 1024 if platform == "darwin" else 1024
+            )
+            resources.append(ResourceSample(
+                now - started_at,
+                (cpu_now - cpu_before) / (now - sampled_at),
+                max_rss,
+                len(listdir("/dev/fd")),
+                active_count(),
+            ))
+            cpu_before, sampled_at = cpu_now, now
+
+
+def format_report(tracker: RecoveryTracker, resources: list[ResourceSample]) -> list[str]:
+    """
+    Format the results of a soak test.
+
+    Args:
+        tracker (RecoveryTracker): Outages of every tunnel
+        resources (list[ResourceSample]): Resources used over time
+
+    Returns:
+        list[str]: Lines of the report
+    """
+    unrecovered: dict[str, float] = tracker.get_unrecovered(monotonic())
+    all_recoveries: list[float] = sorted(
+        seconds for recoveries in tracker.recoveries.values() for seconds in recoveries
+    )
+    report: list[str] = [
+        f"{'tunnel':<16} {'outages':>8} {'mean TTR':>9} {'max TTR':>9} {'still down':>11}"
+    ]
+    for tunnel_id, recoveries in sorted(tracker.recoveries.items()):
+        still_down: str = f"{unrecovered[tunnel_id]:.1f}s" if tunnel_id in unrecovered else "-"
+        report.append(
+            f"{tunnel_id:<16} {len(recoveries):>8} "
+            f"{_format_seconds(mean(recoveries) if recoveries else None):>9} "
+            f"{_format_seconds(max(recoveries) if recoveries else None):>9} {still_down:>11}"
+        )
+    report.append("")
+    if all_recoveries:
+        report.append(
+            f"{len(all_recoveries)} outages recovered, mean time to reconnect "
+            f"{mean(all_recoveries):.2f}s, p95 "
+            f"{all_recoveries[int(0.95 * (len(all_recoveries) - 1))]:.2f}s, "
+            f"{len(unrecovered)} tunnels still down"
+        )
+    report += [
+        "",
+        f"{'elapsed':>8} {'CPU':>7} {'max RSS':>10} {'open files':>11} {'threads':>8}",
+        *(
+            f"{sample.elapsed:>7.0f}s {sample.cpu:>7.1%} {sample.max_rss:>6.1f} MiB "
+            f"{sample.open_files:>11} {sample.threads:>8}"
+            for sample in resources
+        ),
+    ]
+    return report
+
+
+def _format_seconds(seconds: float | None) -> str:
+    """Format a duration of the report, or a dash when there is none."""
+    return "-" if seconds is None else f"{seconds:.2f}s"
+
+
+def get_arguments() -> argparse.Namespace:
+    """
+    Get the soak test settings from the command line arguments.
+
+    Returns:
+        argparse.Namespace: Soak test settings
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(prog="python -m benchmark.soak")
+    parser.add_argument("--profiles", help="Number of VPNs. DEFAULT 20", type=int, default=20)
+    parser.add_argument(
+        "--seconds", help="Seconds to run the soak test for. DEFAULT 600", type=float, default=600.0
+    )
+    parser.add_argument(
+        "--period",
+        help="Seconds between two injections of the same fault. DEFAULT 60",
+        type=float,
+        default=60.0,
+    )
+    parser.add_argument(
+        "--share",
+        help="Share of the tunnels every fault drops. DEFAULT 0.25",
+        type=float,
+        default=0.25,
+    )
+    parser.add_argument(
+        "--latency",
+        help="Seconds every backend command takes. DEFAULT 0.05",
+        type=float,
+        default=0.05,
+    )
+    parser.add_argument(
+        "--slow-latency",
+        help="Seconds every backend command takes during a slow response fault. DEFAULT 2",
+        type=float,
+        default=2.0,
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        help="Seconds after which a hanging connection is killed. DEFAULT 5",
+        type=float,
+        default=5.0,
+    )
+    add_jobs_argument(parser)
+    parser.add_argument(
+        "--check-interval",
+        help="Seconds between two watch mode checks of a VPN. DEFAULT 1",
+        type=float,
+        default=1.0,
+    )
+    parser.add_argument(
+        "--seed", help="Seed choosing the tunnels to drop. DEFAULT 0", type=int, default=0
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="File to write the report to. DEFAULT soak_output.txt",
+        type=str,
+        default="soak_output.txt",
+    )
+    return parser.parse_args()
+
+
+def run_soak(arguments: argparse.Namespace, directory: Path) -> list[str]:
+    """
+    Run a soak test with the default schedule.
+
+    Args:
+        arguments (argparse.Namespace): Soak test settings
+        directory (Path): Directory for the fake backends and the generated VPN data
+
+    Returns:
+        list[str]: Lines of the report
+    """
+    backends: FakeBackends = FakeBackends(directory / "backends", arguments.latency)
+    vpn_data_path: Path = write_vpn_data(
+        directory / "vpn_data.json",
+        arguments.profiles,
+        backends.get_config_json({"connect": arguments.connect_timeout}),
+    )
+    vpns: list[AbstractVpnModel] = VpnDataParserService().parse_vpn_data_file(
+        str(vpn_data_path), False
+    )
+    soak: ChaosSoak = ChaosSoak(
+        backends,
+        get_default_schedule(arguments.seconds, arguments.period, arguments.share),
+        jobs=arguments.jobs,
+        check_interval=arguments.check_interval,
+        slow_latency=arguments.slow_latency,
+        seed=arguments.seed,
+    )
+    with open(devnull, "w", encoding="utf-8") as output, redirect_stdout(output):
+        tracker, resources = run(soak.run(vpns, arguments.seconds, arguments.latency))
+    return [
+        f"{arguments.profiles} VPNs for {arguments.seconds}s, every fault every "
+        f"{arguments.period}s dropping {arguments.share:.0%} of the tunnels, latency "
+        f"{arguments.latency}s (slow {arguments.slow_latency}s), connect timeout "
+        f"{arguments.connect_timeout}s, check interval {arguments.check_interval}s",
+        "",
+        *format_report(tracker, resources),
+    ]
+
+
+if __name__ == "__main__":
+    soak_arguments: argparse.Namespace = get_arguments()
+    with TemporaryDirectory(prefix="auto_vpn_connect_soak_") as soak_directory:
+        report_lines: list[str] = run_soak(soak_arguments, Path(soak_directory))
+    print("\n".join(report_lines))
+    Path(soak_arguments.output).write_text("\n".join(report_lines) + "\n", encoding="utf-8")
+    print(f"Report written to {soak_arguments.output}")
@@ -0,0 +1,71 @@
+"""
+Generator of VPN data JSON files of any size for the benchmarks.
+"""
+
+from json import dump
+from pathlib import Path
+
+_TOTP_URL: str = "otpauth://totp/benchmark@auto_vpn_connect?secret=JBSWY3DPEHPK3PXP&issuer=bench"
+
+
+def generate_vpn_data(
+    profile_count: int, config_json: dict, totp_every: int = 10, global_protect: bool = True
+) -> dict:
+    """
+    Generate VPN data with Pritunl profiles, a share of which use a TOTP, and a Global Protect
+    VPN.
+
+    Args:
+        profile_count (int): Number of VPNs, including the Global Protect VPN
+        config_json (dict): "config" section of the VPN data
+        totp_every (int): Every how many Pritunl profiles one uses a TOTP, or 0 for none
+        global_protect (bool): Whether the last VPN is a Global Protect VPN
+
+    Returns:
+        dict: VPN data, as it would be read from a VPN data JSON file
+    """
+    has_global_protect: bool = global_protect and profile_count > 1
+    pritunl_count: int = profile_count - 1 if has_global_protect else profile_count
+    vpn_list: list[dict] = []
+    for index in range(pritunl_count):
+        vpn_json: dict = {
+            "vpn_id": get_profile_id(index),
+            "vpn_type": "PRITUNL",
+            "pin": f"{index:04d}",
+        }
+        if totp_every and index % totp_every == 0:
+            vpn_json["totp_url"] = _TOTP_URL
+        vpn_list.append(vpn_json)
+    if pritunl_count < profile_count:
+        vpn_list.append({"vpn_id": "GP", "vpn_type": "GLOBAL_PROTECT"})
+    return {"config": config_json, "vpn_list": vpn_list}
+
+
+def write_vpn_data(path: Path, profile_count: int, config_json: dict) -> Path:
+    """
+    Write a VPN data JSON file with a number of profiles.
+
+    Args:
+        path (Path): Path to write the file to
+        profile_count (int): Number of VPNs
+        config_json (dict): "config" section of the VPN data
+
+    Returns:
+        Path: Path to the file
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        dump(generate_vpn_data(profile_count, config_json), file, indent=4)
+    return path
+
+
+def get_profile_id(index: int) -> str:
+    """
+    Get the ID of a generated Pritunl profile.
+
+    Args:
+        index (int): Index of the profile
+
+    Returns:
+        str: ID of the profile
+    """
+    return f"profile_{index:05d}"
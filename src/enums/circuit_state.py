@@ -0,0 +1,18 @@
+'''
+Module for circuit breaker state enumeration.
+'''
+
+from enum import Enum
+
+
+class CircuitState(Enum):
+    '''
+    Circuit breaker state enumeration.
+
+    CLOSED lets every attempt through, OPEN blocks attempts until its backoff delay is over, and
+    HALF_OPEN lets a single trial attempt through to decide whether to close or open again.
+    '''
+
+    CLOSED: str = 'CLOSED'
+    OPEN: str = 'OPEN'
+    HALF_OPEN: str = 'HALF_OPEN'
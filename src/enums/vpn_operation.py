@@ -0,0 +1,15 @@
+'''
+Module for VPN operation enumeration.
+'''
+
+from enum import Enum
+
+
+class VpnOperation(Enum):
+    '''
+    VPN operation enumeration. These are the operations that invoke a VPN backend.
+    '''
+
+    CONNECT: str = 'connect'
+    DISCONNECT: str = 'disconnect'
+    STATUS: str = 'status'
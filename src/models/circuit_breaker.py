@@ -0,0 +1,103 @@
+'''
+This module contains the CircuitBreaker model.
+'''
+
+from random import Random
+from time import monotonic
+from typing import Callable
+
+from src.enums.circuit_state import CircuitState
+
+
+# pylint: disable-next=R0902
+class CircuitBreaker:
+    '''
+    Tracks the consecutive connection failures of a VPN, and stops retrying it for an exponentially
+    growing, jittered delay once it keeps failing.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures after which the circuit opens
+        base_delay (float): Seconds the circuit stays open the first time it opens
+        max_delay (float): Upper bound of the seconds the circuit stays open
+        jitter (float): Fraction by which the open delay is randomly shortened or lengthened
+    '''
+
+    # pylint: disable=R0913
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        base_delay: float = 5.0,
+        max_delay: float = 300.0,
+        jitter: float = 0.2,
+        *,
+        clock: Callable[[], float] = monotonic,
+        rng: Random | None = None
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError(f'Invalid failure threshold {failure_threshold}')
+        self.failure_threshold: int = failure_threshold
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.jitter: float = jitter
+        self._clock: Callable[[], float] = clock
+        self._rng: Random = rng if rng else Random()
+        self._consecutive_failures: int = 0
+        self._open_until: float | None = None
+
+    def get_state(self) -> CircuitState:
+        '''
+        Get the state of the circuit.
+
+        Returns:
+            CircuitState: OPEN while the backoff delay is running, HALF_OPEN once it is over and
+                until the trial attempt is recorded, CLOSED otherwise
+        '''
+        if self._open_until is None:
+            return CircuitState.CLOSED
+        if self._clock() < self._open_until:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    def get_consecutive_failures(self) -> int:
+        '''
+        Get the number of connection failures since the last success.
+
+        Returns:
+            int: Number of consecutive connection failures
+        '''
+        return self._consecutive_failures
+
+    def get_remaining_delay(self) -> float:
+        '''
+        Get the seconds until the next attempt is allowed.
+
+        Returns:
+            float: Seconds until the circuit turns half-open, or 0 if an attempt is allowed now
+        '''
+        if self._open_until is None:
+            return 0.0
+        return max(0.0, self._open_until - self._clock())
+
+    def record_success(self) -> None:
+        '''
+        Record a successful attempt, closing the circuit.
+        '''
+        self._consecutive_failures = 0
+        self._open_until = None
+
+    def record_failure(self) -> float:
+        '''
+        Record a failed attempt, opening the circuit once the failure threshold is reached or if
+        the trial attempt of a half-open circuit failed.
+
+        Returns:
+            float: Seconds the circuit stays open, or 0 if it is still closed
+        '''
+        self._consecutive_failures += 1
+        opens: int = self._consecutive_failures - self.failure_threshold
+        if opens < 0:
+            return 0.0
+        delay: float = self.base_delay * 2 ** min(opens, 32)
+        delay = min(self.max_delay, delay * (1 + self.jitter * self._rng.uniform(-1, 1)))
+        self._open_until = self._clock() + delay
+        return delay
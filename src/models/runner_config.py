@@ -0,0 +1,160 @@
+'''
+This module contains the RunnerConfig model.
+'''
+
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from src.enums.vpn_type import VpnType
+
+
+class RunnerConfig:
+    '''
+    This model contains the options of the runner of VPN actions, read from the "runner" object
+    of the "config" of the VPN data JSON file. They bound the connections that run at once and
+    how fast they start, so that a storm of reconnections after a wake-up or a network flap is
+    spread out instead of hitting the VPN servers all at once.
+
+    Configs are immutable.
+
+    Attributes:
+        max_concurrent_connects (int | None): Maximum number of connections running at once, or
+            None for no limit besides the jobs switch
+        max_concurrent_connects_per_type (Mapping[VpnType, int]): Maximum number of connections
+            of each VPN type running at once. Types missing from it have no limit of their own
+        connects_per_second (float | None): Steady rate at which connections start, or None to
+            start them as soon as they are allowed to run
+        connect_burst (int): Number of connections that can start at once before the rate
+            applies
+    '''
+
+    __slots__ = (
+        'max_concurrent_connects',
+        'max_concurrent_connects_per_type',
+        'connects_per_second',
+        'connect_burst',
+    )
+
+    _max_concurrent_connects_key: str = 'max_concurrent_connects'
+    _max_concurrent_connects_per_type_key: str = 'max_concurrent_connects_per_type'
+    _connects_per_second_key: str = 'connects_per_second'
+    _connect_burst_key: str = 'connect_burst'
+
+    def __init__(
+        self,
+        max_concurrent_connects: int | None = None,
+        max_concurrent_connects_per_type: dict[VpnType, int] | None = None,
+        connects_per_second: float | None = None,
+        connect_burst: int = 1
+    ) -> None:
+        self.max_concurrent_connects: int | None = max_concurrent_connects
+        self.max_concurrent_connects_per_type: Mapping[VpnType, int] = MappingProxyType(
+            dict(max_concurrent_connects_per_type or {})
+        )
+        self.connects_per_second: float | None = connects_per_second
+        self.connect_burst: int = connect_burst
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if hasattr(self, name):
+            raise AttributeError(f'{type(self).__name__} is immutable, cannot set {name}')
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable, cannot delete {name}')
+
+    def get_connect_limit(self, vpn_type: VpnType) -> int | None:
+        '''
+        Get the maximum number of connections of a VPN type running at once.
+
+        Args:
+            vpn_type (VpnType): Type of the VPNs
+
+        Returns:
+            int | None: Limit of the VPN type, or None if it has no limit of its own
+        '''
+        return self.max_concurrent_connects_per_type.get(vpn_type)
+
+    def to_json(self) -> dict:
+        '''
+        Convert the runner config to a JSON representation.
+
+        Returns:
+            dict: JSON representation of the runner config
+        '''
+        json: dict = {RunnerConfig._connect_burst_key: self.connect_burst}
+        if self.max_concurrent_connects is not None:
+            json[RunnerConfig._max_concurrent_connects_key] = self.max_concurrent_connects
+        if self.max_concurrent_connects_per_type:
+            json[RunnerConfig._max_concurrent_connects_per_type_key] = {
+                vpn_type.value: limit
+                for vpn_type, limit in self.max_concurrent_connects_per_type.items()
+            }
+        if self.connects_per_second is not None:
+            json[RunnerConfig._connects_per_second_key] = self.connects_per_second
+        return json
+
+    @staticmethod
+    def from_json(json: dict | None) -> 'RunnerConfig':
+        '''
+        Create a runner config from a JSON representation.
+
+        Args:
+            json (dict | None): JSON representation of the runner config, or None for the defaults
+
+        Raises:
+            ValueError: If an option is invalid
+
+        Returns:
+            RunnerConfig: Runner config
+        '''
+        json = json or {}
+        if not isinstance(json, dict):
+            raise ValueError(f'Invalid runner config {json}')
+        per_type_json: object = json.get(RunnerConfig._max_concurrent_connects_per_type_key, {})
+        if not isinstance(per_type_json, dict):
+            raise ValueError(f'Invalid {RunnerConfig._max_concurrent_connects_per_type_key}')
+        connects_per_second: object = json.get(RunnerConfig._connects_per_second_key)
+        if connects_per_second is not None and (
+            not isinstance(connects_per_second, (int, float))
+            or isinstance(connects_per_second, bool)
+            or connects_per_second <= 0
+        ):
+            raise ValueError(f'Invalid connects per second {connects_per_second}')
+        max_concurrent_connects: object = json.get(RunnerConfig._max_concurrent_connects_key)
+        return RunnerConfig(
+            max_concurrent_connects=(
+                None if max_concurrent_connects is None
+                else RunnerConfig._limit_from_json(
+                    RunnerConfig._max_concurrent_connects_key, max_concurrent_connects
+                )
+            ),
+            max_concurrent_connects_per_type={
+                VpnType(vpn_type): RunnerConfig._limit_from_json(vpn_type, limit)
+                for vpn_type, limit in per_type_json.items()
+            },
+            connects_per_second=(
+                None if connects_per_second is None else float(connects_per_second)
+            ),
+            connect_burst=RunnerConfig._limit_from_json(
+                RunnerConfig._connect_burst_key, json.get(RunnerConfig._connect_burst_key, 1)
+            )
+        )
+
+    @staticmethod
+    def _limit_from_json(name: str, limit: object) -> int:
+        '''
+        Parse a positive count from the JSON representation of the runner config.
+
+        Args:
+            name (str): Name of the count, for the error message
+            limit (object): Count to parse
+
+        Raises:
+            ValueError: If the count is not a positive integer
+
+        Returns:
+            int: Count
+        '''
+        if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+            raise ValueError(f'Invalid {name} limit {limit}')
+        return limit
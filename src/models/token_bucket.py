@@ -0,0 +1,51 @@
+'''
+This module contains the TokenBucket model.
+'''
+
+from time import monotonic
+from typing import Callable
+
+
+# pylint: disable-next=too-few-public-methods
+class TokenBucket:
+    '''
+    Hands out tokens at a steady rate, allowing bursts of up to its capacity.
+
+    Tokens are reserved in the order they are asked for, and a caller asking for a token that is
+    not there yet is told how long to wait for it, so waiting callers are spread out evenly
+    instead of racing for every new token.
+
+    Attributes:
+        rate (float): Tokens added per second
+        capacity (int): Largest number of tokens the bucket holds, and so the largest burst
+    '''
+
+    def __init__(
+        self, rate: float, capacity: int = 1, *, clock: Callable[[], float] = monotonic
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f'Invalid token rate {rate}')
+        if capacity < 1:
+            raise ValueError(f'Invalid token capacity {capacity}')
+        self.rate: float = rate
+        self.capacity: int = capacity
+        self._clock: Callable[[], float] = clock
+        self._tokens: float = float(capacity)
+        self._updated_at: float = clock()
+
+    def reserve(self) -> float:
+        '''
+        Reserve the next token.
+
+        Returns:
+            float: Seconds until the reserved token is available, or 0 if it is available now
+        '''
+        now: float = self._clock()
+        self._tokens = min(
+            float(self.capacity), self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
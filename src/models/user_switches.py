@@ -3,27 +3,66 @@ This module contains the UserSwitches data model.
 '''
 
 
+# pylint: disable-next=R0902
 class UserSwitches:
     '''
     This data model contains the user switches for the application.
 
     Attributes:
-        action (str): Action to take. "w" for always-connected, "c" for connect, "d" for disconnect
+        action (str): Action to take. "w" for always-connected, "c" for connect, "d" for
+            disconnect, "s" for the status and "r" to reload the VPN data of a running daemon
         vpn_data_json_path (str): The path to the VPN data JSON file
         verbose (bool): Whether to run in verbose mode. DEFAULT false
+        concurrency_limit (int): Maximum number of VPN actions running at once. DEFAULT 8
+        use_snapshot (bool): Whether to load the VPN data from its snapshot when the file did not
+            change since it was last parsed. DEFAULT true
+        stream (bool): Whether to parse the VPN data JSON file incrementally. DEFAULT false
+        metrics_port (int | None): Local port to serve the watch mode metrics on, or None to not
+            serve them. DEFAULT None
+        trace_path (str | None): Path to the JSON Lines file to append timing spans to, or None to
+            not trace. DEFAULT None
+        daemon (bool): Whether to run as a daemon serving the actions of local clients. DEFAULT
+            false
+        socket_path (str | None): Path of the Unix domain socket of the daemon, or None for the
+            default path. DEFAULT None
+        vpn_ids (list[str] | None): IDs or global IDs of the VPNs to act on, or None for every
+            VPN. DEFAULT None
     '''
 
-    def __init__(self, action: chr, vpn_data_json_path: str, verbose: bool = False):
+    # pylint: disable=R0913,R0917
+    def __init__(
+        self,
+        action: chr,
+        vpn_data_json_path: str,
+        verbose: bool = False,
+        concurrency_limit: int = 8,
+        use_snapshot: bool = True,
+        stream: bool = False,
+        metrics_port: int | None = None,
+        trace_path: str | None = None,
+        daemon: bool = False,
+        socket_path: str | None = None,
+        vpn_ids: list[str] | None = None
+    ):
         self.action: chr = action
         self.vpn_data_json_path: str = vpn_data_json_path
         self.verbose: bool = verbose
+        self.concurrency_limit: int = concurrency_limit
+        self.use_snapshot: bool = use_snapshot
+        self.stream: bool = stream
+        self.metrics_port: int | None = metrics_port
+        self.trace_path: str | None = trace_path
+        self.daemon: bool = daemon
+        self.socket_path: str | None = socket_path
+        self.vpn_ids: list[str] | None = vpn_ids
 
     def get_action(self) -> chr:
         '''
         Get the action to take.
 
         Returns:
-            chr: Action to take. "w" for always-connected, "c" for connect, "d" for disconnect
+            chr: Action to take. "w" for always-connected, "c" for connect, "d" for disconnect,
+                "s" for the status and "r" to reload the VPN data of a running daemon
         '''
         return self.action
 
@@ -44,3 +83,75 @@ class UserSwitches:
             bool: Whether to run in verbose mode. DEFAULT false
         '''
         return self.verbose
+
+    def get_concurrency_limit(self) -> int:
+        '''
+        Get the maximum number of VPN actions running at once.
+
+        Returns:
+            int: Maximum number of VPN actions running at once. DEFAULT 8
+        '''
+        return self.concurrency_limit
+
+    def is_using_snapshot(self) -> bool:
+        '''
+        Get whether to load the VPN data from its snapshot when the file did not change.
+
+        Returns:
+            bool: Whether to use the VPN data snapshot. DEFAULT true
+        '''
+        return self.use_snapshot
+
+    def is_streaming(self) -> bool:
+        '''
+        Get whether to parse the VPN data JSON file incrementally.
+
+        Returns:
+            bool: Whether to parse the VPN data JSON file incrementally. DEFAULT false
+        '''
+        return self.stream
+
+    def get_metrics_port(self) -> int | None:
+        '''
+        Get the local port to serve the watch mode metrics on.
+
+        Returns:
+            int | None: Port of the metrics endpoint, or None to not serve it. DEFAULT None
+        '''
+        return self.metrics_port
+
+    def get_trace_path(self) -> str | None:
+        '''
+        Get the path to the JSON Lines file to append timing spans to.
+
+        Returns:
+            str | None: Path to the trace file, or None to not trace. DEFAULT None
+        '''
+        return self.trace_path
+
+    def is_daemon(self) -> bool:
+        '''
+        Get whether to run as a daemon serving the actions of local clients.
+
+        Returns:
+            bool: Whether to run as a daemon. DEFAULT false
+        '''
+        return self.daemon
+
+    def get_socket_path(self) -> str | None:
+        '''
+        Get the path of the Unix domain socket of the daemon.
+
+        Returns:
+            str | None: Path of the daemon socket, or None for the default path. DEFAULT None
+        '''
+        return self.socket_path
+
+    def get_vpn_ids(self) -> list[str] | None:
+        '''
+        Get the IDs of the VPNs to act on.
+
+        Returns:
+            list[str] | None: IDs or global IDs of the VPNs, or None for every VPN. DEFAULT None
+        '''
+        return self.vpn_ids
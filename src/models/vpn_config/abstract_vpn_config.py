@@ -3,17 +3,60 @@ Abstract class for VPN data.
 """
 
 from abc import ABC
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
 
+from src.enums.vpn_operation import VpnOperation
 from src.enums.vpn_type import VpnType, VpnTypeVisitor, T
 
 
 class AbstractVpnConfig(ABC):
     """
     Abstract class for VPN data.
+
+    Configs are immutable, so a single config object can be shared by every VPN of its type.
+
+    Attributes:
+        timeouts (Mapping[VpnOperation, float]): Deadline of each backend operation, in seconds
+        kill_grace_period (float): Seconds a timed out backend process gets to exit after SIGTERM,
+            before it is killed with SIGKILL
     """
 
+    __slots__ = ("timeouts", "kill_grace_period")
+
     _vpn_type_key: str = "vpn_type"
+    _timeouts_key: str = "timeouts"
+    _kill_grace_period_key: str = "kill_grace_period"
+    _runtime_option_keys: tuple[str, ...] = (_timeouts_key, _kill_grace_period_key)
     _vpn_type: VpnType = VpnType.NONE
+    _default_timeouts: dict[VpnOperation, float] = {
+        VpnOperation.CONNECT: 60.0,
+        VpnOperation.DISCONNECT: 30.0,
+        VpnOperation.STATUS: 10.0,
+    }
+    _default_kill_grace_period: float = 2.0
+
+    def __init__(
+        self,
+        timeouts: dict[VpnOperation, float] | None = None,
+        kill_grace_period: float = _default_kill_grace_period,
+    ) -> None:
+        self.timeouts: Mapping[VpnOperation, float] = MappingProxyType({
+            **AbstractVpnConfig._default_timeouts,
+            **(timeouts or {}),
+        })
+        self.kill_grace_period: float = kill_grace_period
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if hasattr(self, name):
+            raise AttributeError(f"{type(self).__name__} is immutable, cannot set {name}")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable, cannot delete {name}")
+
+    def __reduce__(self) -> tuple[Callable[[dict], "AbstractVpnConfig"], tuple[dict]]:
+        return (type(self).from_json, (self.to_json(),))
 
     def get_vpn_type(self) -> VpnType:
         """
@@ -24,6 +67,18 @@ class AbstractVpnConfig(ABC):
         """
         return AbstractVpnConfig._vpn_type
 
+    def get_timeout(self, operation: VpnOperation) -> float:
+        """
+        Get the deadline of a backend operation.
+
+        Args:
+            operation (VpnOperation): Operation to get the deadline of
+
+        Returns:
+            float: Deadline of the operation, in seconds
+        """
+        return self.timeouts[operation]
+
     def visit(self, visitor: "VpnTypeVisitor[T]") -> T:
         """
         Visit the VPN with a VpnTypeVisitor.
@@ -42,6 +97,97 @@ class AbstractVpnConfig(ABC):
         """
         return {AbstractVpnConfig._vpn_type_key: self.get_vpn_type().value}
 
+    def get_connection_json(self) -> dict:
+        """
+        Get the JSON representation of the options that decide how the VPN connects, leaving out
+        the runtime options that can change without reconnecting, like the operation deadlines.
+
+        Returns:
+            dict: JSON representation of the connection options
+        """
+        return {
+            key: value
+            for key, value in self.to_json().items()
+            if key not in self._runtime_option_keys
+        }
+
+    def _timeouts_to_json(self) -> dict:
+        """
+        Convert the operation deadlines to their JSON representation.
+
+        Returns:
+            dict: JSON representation of the operation deadlines and the kill grace period
+        """
+        return {
+            AbstractVpnConfig._timeouts_key: {
+                operation.value: timeout for operation, timeout in self.timeouts.items()
+            },
+            AbstractVpnConfig._kill_grace_period_key: self.kill_grace_period,
+        }
+
+    @staticmethod
+    def _timeouts_from_json(json: dict) -> dict[VpnOperation, float]:
+        """
+        Parse the operation deadlines from the JSON representation of a VPN config.
+
+        Args:
+            json (dict): JSON representation of the VPN config
+
+        Returns:
+            dict[VpnOperation, float]: Deadline of each configured operation, in seconds
+        """
+        timeouts: dict[VpnOperation, float] = {}
+        for operation, timeout in json.get(AbstractVpnConfig._timeouts_key, {}).items():
+            if not isinstance(timeout, (int, float)) or isinstance(timeout, bool) or timeout <= 0:
+                raise ValueError(f"Invalid {operation} timeout {timeout}")
+            timeouts[VpnOperation(operation)] = float(timeout)
+        return timeouts
+
+    @staticmethod
+    def _kill_grace_period_from_json(json: dict) -> float:
+        """
+        Parse the kill grace period from the JSON representation of a VPN config.
+
+        Args:
+            json (dict): JSON representation of the VPN config
+
+        Returns:
+            float: Seconds a timed out backend process gets to exit after SIGTERM
+        """
+        kill_grace_period: float = json.get(
+            AbstractVpnConfig._kill_grace_period_key,
+            AbstractVpnConfig._default_kill_grace_period,
+        )
+        if (
+            not isinstance(kill_grace_period, (int, float))
+            or isinstance(kill_grace_period, bool)
+            or kill_grace_period < 0
+        ):
+            raise ValueError(f"Invalid kill grace period {kill_grace_period}")
+        return float(kill_grace_period)
+
+    @staticmethod
+    def _seconds_from_json(
+        json: dict, key: str, default: float, allow_zero: bool = False
+    ) -> float:
+        """
+        Parse a duration in seconds from the JSON representation of the VPN config.
+
+        Args:
+            json (dict): JSON representation of the VPN config
+            key (str): Key of the duration
+            default (float): Duration to use if the key is missing
+            allow_zero (bool): Whether a duration of 0 is valid
+
+        Returns:
+            float: Duration in seconds
+        """
+        seconds: float = json.get(key, default)
+        is_number: bool = isinstance(seconds, (int, float)) and not isinstance(seconds, bool)
+        if not is_number or seconds < 0 or (seconds == 0 and not allow_zero):
+            raise ValueError(f"Invalid {key} {seconds}")
+        return float(seconds)
+
     @staticmethod
     def from_json(json: dict) -> "AbstractVpnConfig":
         """
@@ -2,6 +2,7 @@
 Abstract class for VPN data.
 '''
 
+from src.enums.vpn_operation import VpnOperation
 from src.enums.vpn_type import VpnType, VpnTypeVisitor, T
 from src.models.vpn_config.abstract_vpn_config import AbstractVpnConfig
 
@@ -13,10 +14,27 @@ class GlobalProtectVpnConfig(AbstractVpnConfig):
         vpn_id (str): ID of the VPN
     '''
 
+    __slots__ = (
+        "service_load_command",
+        "service_unload_command",
+        "process_kill_command",
+        "status_command",
+        "unload_wait_timeout",
+        "unload_poll_interval",
+    )
+
     _vpn_type: VpnType = VpnType.GLOBAL_PROTECT
     _service_load_command_key: str = "service_load_command"
     _service_unload_command_key: str = "service_unload_command"
     _process_kill_command_key: str = "process_kill_command"
+    _status_command_key: str = "status_command"
+    _unload_wait_timeout_key: str = "unload_wait_timeout"
+    _unload_poll_interval_key: str = "unload_poll_interval"
+    _runtime_option_keys: tuple[str, ...] = (
+        *AbstractVpnConfig._runtime_option_keys,
+        _unload_wait_timeout_key,
+        _unload_poll_interval_key,
+    )
     _default_service_load_command: str = (
         "launchctl load /Library/LaunchAgents/com.paloaltonetworks.gp.pangpa.plist"
     )
@@ -24,16 +42,30 @@ class GlobalProtectVpnConfig(AbstractVpnConfig):
         "launchctl unload /Library/LaunchAgents/com.paloaltonetworks.gp.pangpa.plist"
     )
     _default_process_kill_command: str = "pkill -9 -f GlobalProtect"
+    _default_status_command: str = "pgrep -f GlobalProtect"
+    _default_unload_wait_timeout: float = 2.0
+    _default_unload_poll_interval: float = 0.1
 
+    # pylint: disable=R0913
     def __init__(
         self,
         service_load_command: str = _default_service_load_command,
         service_unload_command: str = _default_service_unload_command,
-        process_kill_command: str = _default_process_kill_command
+        process_kill_command: str = _default_process_kill_command,
+        status_command: str = _default_status_command,
+        *,
+        timeouts: dict[VpnOperation, float] | None = None,
+        kill_grace_period: float = AbstractVpnConfig._default_kill_grace_period,
+        unload_wait_timeout: float = _default_unload_wait_timeout,
+        unload_poll_interval: float = _default_unload_poll_interval
     ):
+        super().__init__(timeouts=timeouts, kill_grace_period=kill_grace_period)
         self.service_load_command: str = service_load_command
         self.service_unload_command: str = service_unload_command
         self.process_kill_command: str = process_kill_command
+        self.status_command: str = status_command
+        self.unload_wait_timeout: float = unload_wait_timeout
+        self.unload_poll_interval: float = unload_poll_interval
 
     def get_vpn_type(self) -> VpnType:
         '''
@@ -64,7 +96,11 @@ class GlobalProtectVpnConfig(AbstractVpnConfig):
             GlobalProtectVpnConfig._vpn_type_key: self.get_vpn_type().value,
             GlobalProtectVpnConfig._service_load_command_key: self.service_load_command,
             GlobalProtectVpnConfig._service_unload_command_key: self.service_unload_command,
-            GlobalProtectVpnConfig._process_kill_command_key: self.process_kill_command
+            GlobalProtectVpnConfig._process_kill_command_key: self.process_kill_command,
+            GlobalProtectVpnConfig._status_command_key: self.status_command,
+            GlobalProtectVpnConfig._unload_wait_timeout_key: self.unload_wait_timeout,
+            GlobalProtectVpnConfig._unload_poll_interval_key: self.unload_poll_interval,
+            **self._timeouts_to_json()
         }
 
     @staticmethod
@@ -83,5 +119,22 @@ class GlobalProtectVpnConfig(AbstractVpnConfig):
         return GlobalProtectVpnConfig(
             service_load_command=json.get(GlobalProtectVpnConfig._service_load_command_key),
             service_unload_command=json.get(GlobalProtectVpnConfig._service_unload_command_key),
-            process_kill_command=json.get(GlobalProtectVpnConfig._process_kill_command_key)
+            process_kill_command=json.get(GlobalProtectVpnConfig._process_kill_command_key),
+            status_command=json.get(
+                GlobalProtectVpnConfig._status_command_key,
+                GlobalProtectVpnConfig._default_status_command
+            ),
+            timeouts=AbstractVpnConfig._timeouts_from_json(json),
+            kill_grace_period=AbstractVpnConfig._kill_grace_period_from_json(json),
+            unload_wait_timeout=GlobalProtectVpnConfig._seconds_from_json(
+                json,
+                GlobalProtectVpnConfig._unload_wait_timeout_key,
+                GlobalProtectVpnConfig._default_unload_wait_timeout,
+                allow_zero=True
+            ),
+            unload_poll_interval=GlobalProtectVpnConfig._seconds_from_json(
+                json,
+                GlobalProtectVpnConfig._unload_poll_interval_key,
+                GlobalProtectVpnConfig._default_unload_poll_interval
+            )
         )
@@ -0,0 +1,62 @@
+'''
+Config of the OpenVPN backend.
+'''
+
+from src.enums.vpn_type import VpnType, VpnTypeVisitor, T
+from src.models.vpn_config.abstract_vpn_config import AbstractVpnConfig
+
+class OpenVpnConfig(AbstractVpnConfig):
+    '''
+    Config shared by all OpenVPN VPNs. The timeouts are the deadlines of the management interface
+    commands of each operation.
+    '''
+
+    __slots__ = ()
+
+    _vpn_type: VpnType = VpnType.OPEN_VPN
+
+    def get_vpn_type(self) -> VpnType:
+        '''
+        Get the type of the VPN.
+
+        Returns:
+            VpnType: Type of the VPN
+        '''
+        return OpenVpnConfig._vpn_type
+
+    def visit(self, visitor: 'VpnTypeVisitor[T]') -> T:
+        '''
+        Visit the VPN with a VpnTypeVisitor.
+
+        Args:
+            visitor (VpnTypeVisitor): Visitor to visit the OpenVPN VPN with
+        '''
+        return visitor.visit_open_vpn()
+
+    def to_json(self) -> dict:
+        '''
+        Convert the VPN data to a JSON string.
+
+        Returns:
+            str: JSON string of the VPN data
+        '''
+        return {
+            OpenVpnConfig._vpn_type_key: self.get_vpn_type().value,
+            **self._timeouts_to_json()
+        }
+
+    @staticmethod
+    def from_json(json: dict) -> 'OpenVpnConfig':
+        '''
+        Create a VPN data object from a JSON string.
+
+        Args:
+            json (dict): JSON string of the VPN data
+        '''
+        vpn_type: VpnType = VpnType(json.get(OpenVpnConfig._vpn_type_key, VpnType.OPEN_VPN))
+        if vpn_type != OpenVpnConfig._vpn_type:
+            raise ValueError(f'Invalid VPN type {vpn_type}')
+        return OpenVpnConfig(
+            timeouts=AbstractVpnConfig._timeouts_from_json(json),
+            kill_grace_period=AbstractVpnConfig._kill_grace_period_from_json(json)
+        )
@@ -2,6 +2,10 @@
 Abstract class for VPN data.
 '''
 
+from types import MappingProxyType
+from typing import Mapping
+
+from src.enums.vpn_operation import VpnOperation
 from src.enums.vpn_type import VpnType, VpnTypeVisitor, T
 from src.models.vpn_config.abstract_vpn_config import AbstractVpnConfig
 
@@ -11,14 +15,84 @@ class PritunlVpnConfig(AbstractVpnConfig):
 
     Attributes:
         vpn_id (str): ID of the VPN
+        service_address (str): Path to the Unix socket, or TCP host:port, of the local Pritunl
+            client service to send requests to instead of spawning the CLI. Empty to always use
+            the CLI
+        service_auth_key_path (str): Path to the file holding the key that authenticates requests
+            to the service. Empty to send no key
+        service_endpoints (Mapping[str, str]): "METHOD /path" of the list, start and stop
+            requests to the service. Paths can contain a {vpn_id} placeholder
+        totp_min_validity (float): Seconds a TOTP must stay valid for to be sent. A connection
+            started closer to the end of the TOTP window waits for the next window instead
     '''
 
+    __slots__ = (
+        "cli_path",
+        "service_address",
+        "service_auth_key_path",
+        "service_endpoints",
+        "totp_min_validity",
+    )
+
     _vpn_type: VpnType = VpnType.PRITUNL
     _cli_path_key: str = "cli_path"
+    _service_address_key: str = "service_address"
+    _service_auth_key_path_key: str = "service_auth_key_path"
+    _service_endpoints_key: str = "service_endpoints"
+    _totp_min_validity_key: str = "totp_min_validity"
+    _runtime_option_keys: tuple[str, ...] = (
+        *AbstractVpnConfig._runtime_option_keys,
+        _service_address_key,
+        _service_auth_key_path_key,
+        _service_endpoints_key,
+        _totp_min_validity_key,
+    )
     _default_cli_path: str = "/Applications/Pritunl.app/Contents/Resources/pritunl-client"
+    _default_totp_min_validity: float = 3.0
+    list_endpoint: str = "list"
+    start_endpoint: str = "start"
+    stop_endpoint: str = "stop"
+    _default_service_endpoints: dict[str, str] = {
+        list_endpoint: "GET /profile",
+        start_endpoint: "POST /profile",
+        stop_endpoint: "DELETE /profile",
+    }
+
+    # pylint: disable=R0913
+    def __init__(
+        self,
+        cli_path: str=_default_cli_path,
+        *,
+        timeouts: dict[VpnOperation, float] | None = None,
+        kill_grace_period: float = AbstractVpnConfig._default_kill_grace_period,
+        service_address: str = "",
+        service_auth_key_path: str = "",
+        service_endpoints: dict[str, str] | None = None,
+        totp_min_validity: float = _default_totp_min_validity
+    ) -> None:
+        super().__init__(timeouts=timeouts, kill_grace_period=kill_grace_period)
+        self.cli_path: str = cli_path
+        self.service_address: str = service_address
+        self.service_auth_key_path: str = service_auth_key_path
+        self.service_endpoints: Mapping[str, str] = MappingProxyType({
+            **PritunlVpnConfig._default_service_endpoints,
+            **(service_endpoints or {}),
+        })
+        self.totp_min_validity: float = totp_min_validity
+
+    def get_service_endpoint(self, endpoint: str, vpn_id: str = "") -> tuple[str, str]:
+        '''
+        Get the method and path of a request to the Pritunl client service.
 
-    def __init__(self, cli_path: str=_default_cli_path) -> None:
-        self.cli_path = cli_path
+        Args:
+            endpoint (str): "list", "start" or "stop"
+            vpn_id (str): ID of the VPN the request is about, filled into the path
+
+        Returns:
+            tuple[str, str]: HTTP method and path of the request
+        '''
+        method, request_path = self.service_endpoints[endpoint].split(" ", 1)
+        return method, request_path.strip().replace("{vpn_id}", vpn_id)
 
     def get_vpn_type(self) -> VpnType:
         '''
@@ -47,7 +121,12 @@ class PritunlVpnConfig(AbstractVpnConfig):
         '''
         return {
             PritunlVpnConfig._vpn_type_key: self.get_vpn_type().value,
-            PritunlVpnConfig._cli_path_key: self.cli_path
+            PritunlVpnConfig._cli_path_key: self.cli_path,
+            PritunlVpnConfig._service_address_key: self.service_address,
+            PritunlVpnConfig._service_auth_key_path_key: self.service_auth_key_path,
+            PritunlVpnConfig._service_endpoints_key: dict(self.service_endpoints),
+            PritunlVpnConfig._totp_min_validity_key: self.totp_min_validity,
+            **self._timeouts_to_json()
         }
 
     @staticmethod
@@ -61,4 +140,38 @@ class PritunlVpnConfig(AbstractVpnConfig):
         vpn_type: VpnType = VpnType(json.get(PritunlVpnConfig._vpn_type_key, VpnType.PRITUNL))
         if vpn_type != PritunlVpnConfig._vpn_type:
             raise ValueError(f'Invalid VPN type {vpn_type}')
-        return PritunlVpnConfig(cli_path=json.get(PritunlVpnConfig._cli_path_key))
+        return PritunlVpnConfig(
+            cli_path=json.get(PritunlVpnConfig._cli_path_key),
+            timeouts=AbstractVpnConfig._timeouts_from_json(json),
+            kill_grace_period=AbstractVpnConfig._kill_grace_period_from_json(json),
+            service_address=json.get(PritunlVpnConfig._service_address_key, ""),
+            service_auth_key_path=json.get(PritunlVpnConfig._service_auth_key_path_key, ""),
+            service_endpoints=PritunlVpnConfig._service_endpoints_from_json(json),
+            totp_min_validity=AbstractVpnConfig._seconds_from_json(
+                json,
+                PritunlVpnConfig._totp_min_validity_key,
+                PritunlVpnConfig._default_totp_min_validity,
+                allow_zero=True
+            )
+        )
+
+    @staticmethod
+    def _service_endpoints_from_json(json: dict) -> dict[str, str]:
+        '''
+        Parse the requests to the Pritunl client service from the JSON representation of the
+        VPN config.
+
+        Args:
+            json (dict): JSON representation of the VPN config
+
+        Returns:
+            dict[str, str]: "METHOD /path" of every overridden request, keyed by the endpoint
+        '''
+        endpoints: dict = json.get(PritunlVpnConfig._service_endpoints_key) or {}
+        if not isinstance(endpoints, dict):
+            raise ValueError(f'Invalid service endpoints {endpoints}')
+        for endpoint, request in endpoints.items():
+            is_request: bool = isinstance(request, str) and len(request.split()) == 2
+            if endpoint not in PritunlVpnConfig._default_service_endpoints or not is_request:
+                raise ValueError(f'Invalid service endpoint {endpoint}: {request}')
+        return endpoints
@@ -0,0 +1,105 @@
+'''
+Config of the WireGuard VPN backend.
+'''
+
+from src.enums.vpn_operation import VpnOperation
+from src.enums.vpn_type import VpnType, VpnTypeVisitor, T
+from src.models.vpn_config.abstract_vpn_config import AbstractVpnConfig
+
+class WireguardVpnConfig(AbstractVpnConfig):
+    '''
+    Config shared by all WireGuard VPNs.
+
+    Attributes:
+        wg_quick_path (str): Path to the wg-quick CLI, which brings interfaces up and down
+        wg_path (str): Path to the wg CLI, which reports the status of all interfaces
+        handshake_timeout (float): Seconds since the latest handshake of an interface after which
+            its tunnel is considered dead
+    '''
+
+    __slots__ = ("wg_quick_path", "wg_path", "handshake_timeout")
+
+    _vpn_type: VpnType = VpnType.WIREGUARD
+    _wg_quick_path_key: str = "wg_quick_path"
+    _wg_path_key: str = "wg_path"
+    _handshake_timeout_key: str = "handshake_timeout"
+    _runtime_option_keys: tuple[str, ...] = (
+        *AbstractVpnConfig._runtime_option_keys,
+        _handshake_timeout_key,
+    )
+    _default_wg_quick_path: str = "wg-quick"
+    _default_wg_path: str = "wg"
+    # WireGuard rekeys every 2 minutes while there is traffic, and gives up after 3
+    _default_handshake_timeout: float = 180.0
+
+    def __init__(
+        self,
+        wg_quick_path: str = _default_wg_quick_path,
+        wg_path: str = _default_wg_path,
+        *,
+        timeouts: dict[VpnOperation, float] | None = None,
+        kill_grace_period: float = AbstractVpnConfig._default_kill_grace_period,
+        handshake_timeout: float = _default_handshake_timeout
+    ) -> None:
+        super().__init__(timeouts=timeouts, kill_grace_period=kill_grace_period)
+        self.wg_quick_path: str = wg_quick_path
+        self.wg_path: str = wg_path
+        self.handshake_timeout: float = handshake_timeout
+
+    def get_vpn_type(self) -> VpnType:
+        '''
+        Get the type of the VPN.
+
+        Returns:
+            VpnType: Type of the VPN
+        '''
+        return WireguardVpnConfig._vpn_type
+
+    def visit(self, visitor: 'VpnTypeVisitor[T]') -> T:
+        '''
+        Visit the VPN with a VpnTypeVisitor.
+
+        Args:
+            visitor (VpnTypeVisitor): Visitor to visit the WireGuard VPN with
+        '''
+        return visitor.visit_wireguard()
+
+    def to_json(self) -> dict:
+        '''
+        Convert the VPN data to a JSON string.
+
+        Returns:
+            str: JSON string of the VPN data
+        '''
+        return {
+            WireguardVpnConfig._vpn_type_key: self.get_vpn_type().value,
+            WireguardVpnConfig._wg_quick_path_key: self.wg_quick_path,
+            WireguardVpnConfig._wg_path_key: self.wg_path,
+            WireguardVpnConfig._handshake_timeout_key: self.handshake_timeout,
+            **self._timeouts_to_json()
+        }
+
+    @staticmethod
+    def from_json(json: dict) -> 'WireguardVpnConfig':
+        '''
+        Create a VPN data object from a JSON string.
+
+        Args:
+            json (dict): JSON string of the VPN data
+        '''
+        vpn_type: VpnType = VpnType(json.get(WireguardVpnConfig._vpn_type_key, VpnType.WIREGUARD))
+        if vpn_type != WireguardVpnConfig._vpn_type:
+            raise ValueError(f'Invalid VPN type {vpn_type}')
+        return WireguardVpnConfig(
+            wg_quick_path=json.get(
+                WireguardVpnConfig._wg_quick_path_key, WireguardVpnConfig._default_wg_quick_path
+            ),
+            wg_path=json.get(WireguardVpnConfig._wg_path_key, WireguardVpnConfig._default_wg_path),
+            timeouts=AbstractVpnConfig._timeouts_from_json(json),
+            kill_grace_period=AbstractVpnConfig._kill_grace_period_from_json(json),
+            handshake_timeout=WireguardVpnConfig._seconds_from_json(
+                json,
+                WireguardVpnConfig._handshake_timeout_key,
+                WireguardVpnConfig._default_handshake_timeout
+            )
+        )
@@ -0,0 +1,108 @@
+'''
+This module contains the VpnDataDiff data model.
+'''
+
+from typing import Iterable
+
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+
+
+class VpnDataDiff:
+    '''
+    This data model contains the difference between two lists of VPNs, keyed by their global IDs.
+
+    Attributes:
+        added (list[AbstractVpnModel]): VPNs that only exist in the new list
+        removed (list[AbstractVpnModel]): VPNs that only exist in the old list
+        changed (list[tuple[AbstractVpnModel, AbstractVpnModel]]): Old and new version of every VPN
+            whose connection data or config changed, and that has to be reconnected
+        updated (list[tuple[AbstractVpnModel, AbstractVpnModel]]): Old and new version of every VPN
+            whose only changes are runtime options, like its check interval or its timeouts
+    '''
+
+    def __init__(
+        self,
+        added: list[AbstractVpnModel],
+        removed: list[AbstractVpnModel],
+        changed: list[tuple[AbstractVpnModel, AbstractVpnModel]],
+        updated: list[tuple[AbstractVpnModel, AbstractVpnModel]]
+    ) -> None:
+        self.added: list[AbstractVpnModel] = added
+        self.removed: list[AbstractVpnModel] = removed
+        self.changed: list[tuple[AbstractVpnModel, AbstractVpnModel]] = changed
+        self.updated: list[tuple[AbstractVpnModel, AbstractVpnModel]] = updated
+
+    def is_empty(self) -> bool:
+        '''
+        Get whether the two lists of VPNs are equivalent.
+
+        Returns:
+            bool: Whether no VPN was added, removed, changed or updated
+        '''
+        return not (self.added or self.removed or self.changed or self.updated)
+
+    def __str__(self) -> str:
+        return (
+            f'{len(self.added)} added, {len(self.removed)} removed, '
+            f'{len(self.changed)} changed, {len(self.updated)} updated'
+        )
+
+    @staticmethod
+    def from_vpn_lists(
+        old_vpns: Iterable[AbstractVpnModel],
+        new_vpns: Iterable[AbstractVpnModel]
+    ) -> 'VpnDataDiff':
+        '''
+        Compute the difference between two lists of VPNs.
+
+        A VPN is changed if the JSON representation of either its connection data or its connection
+        config changed, and updated if only its other options changed.
+
+        Args:
+            old_vpns (Iterable[AbstractVpnModel]): VPNs before the change
+            new_vpns (Iterable[AbstractVpnModel]): VPNs after the change
+
+        Returns:
+            VpnDataDiff: Difference between the two lists of VPNs
+        '''
+        old_by_id: dict[str, AbstractVpnModel] = {
+            vpn.get_global_vpn_id(): vpn for vpn in old_vpns
+        }
+        new_by_id: dict[str, AbstractVpnModel] = {
+            vpn.get_global_vpn_id(): vpn for vpn in new_vpns
+        }
+        diff: VpnDataDiff = VpnDataDiff(
+            added=[vpn for vpn_id, vpn in new_by_id.items() if vpn_id not in old_by_id],
+            removed=[vpn for vpn_id, vpn in old_by_id.items() if vpn_id not in new_by_id],
+            changed=[],
+            updated=[]
+        )
+        for vpn_id, new_vpn in new_by_id.items():
+            old_vpn: AbstractVpnModel | None = old_by_id.get(vpn_id)
+            if old_vpn is None or VpnDataDiff._is_same(old_vpn, new_vpn):
+                continue
+            if VpnDataDiff._connects_the_same(old_vpn, new_vpn):
+                diff.updated.append((old_vpn, new_vpn))
+            else:
+                diff.changed.append((old_vpn, new_vpn))
+        return diff
+
+    @staticmethod
+    def _is_same(old_vpn: AbstractVpnModel, new_vpn: AbstractVpnModel) -> bool:
+        '''
+        Get whether two versions of a VPN have the same data and config.
+        '''
+        return (
+            old_vpn.to_json() == new_vpn.to_json()
+            and old_vpn.config.to_json() == new_vpn.config.to_json()
+        )
+
+    @staticmethod
+    def _connects_the_same(old_vpn: AbstractVpnModel, new_vpn: AbstractVpnModel) -> bool:
+        '''
+        Get whether two versions of a VPN have the same connection data and connection config.
+        '''
+        return (
+            old_vpn.get_connection_json() == new_vpn.get_connection_json()
+            and old_vpn.config.get_connection_json() == new_vpn.config.get_connection_json()
+        )
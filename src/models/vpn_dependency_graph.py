@@ -0,0 +1,146 @@
+'''
+This module contains the VpnDependencyGraph data model.
+'''
+
+from typing import Iterable
+
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+
+
+class VpnDependencyGraph:
+    '''
+    This data model contains the dependencies between VPNs, declared by the "depends_on" IDs of
+    each VPN, keyed by their global IDs. An ID names every VPN with that ID or global ID.
+
+    Dependencies on IDs that name none of the VPNs are left out of the graph, so that a subset of
+    the VPNs can be acted on, and are reported by the validation.
+
+    Attributes:
+        vpns (list[AbstractVpnModel]): VPNs of the graph, in their original order
+    '''
+
+    def __init__(self, vpns: Iterable[AbstractVpnModel]) -> None:
+        self.vpns: list[AbstractVpnModel] = list(vpns)
+        vpns_by_id: dict[str, list[AbstractVpnModel]] = {}
+        for vpn in self.vpns:
+            vpns_by_id.setdefault(vpn.get_vpn_id(), []).append(vpn)
+            if vpn.get_global_vpn_id() != vpn.get_vpn_id():
+                vpns_by_id.setdefault(vpn.get_global_vpn_id(), []).append(vpn)
+        self._dependencies: dict[str, list[AbstractVpnModel]] = {}
+        self._unknown_dependencies: set[str] = set()
+        for vpn in self.vpns:
+            dependencies: dict[str, AbstractVpnModel] = {}
+            for vpn_id in vpn.get_dependencies():
+                if vpn_id not in vpns_by_id:
+                    self._unknown_dependencies.add(vpn_id)
+                for dependency in vpns_by_id.get(vpn_id, []):
+                    dependencies[dependency.get_global_vpn_id()] = dependency
+            self._dependencies[vpn.get_global_vpn_id()] = list(dependencies.values())
+
+    def get_dependencies(self, vpn: AbstractVpnModel) -> list[AbstractVpnModel]:
+        '''
+        Get the VPNs that a VPN directly depends on.
+
+        Args:
+            vpn (AbstractVpnModel): VPN to get the dependencies of
+
+        Returns:
+            list[AbstractVpnModel]: VPNs of the graph named by the dependencies of the VPN
+        '''
+        return self._dependencies.get(vpn.get_global_vpn_id(), [])
+
+    def get_all_dependencies(self, vpn: AbstractVpnModel) -> list[AbstractVpnModel]:
+        '''
+        Get the VPNs that a VPN directly or indirectly depends on, in the order to connect them.
+
+        Args:
+            vpn (AbstractVpnModel): VPN to get the dependencies of
+
+        Returns:
+            list[AbstractVpnModel]: Dependencies of the VPN, every VPN after its own dependencies.
+                A cycle is cut where it closes
+        '''
+        ordered: dict[str, AbstractVpnModel] = {}
+        visited: set[str] = {vpn.get_global_vpn_id()}
+        # Depth first, adding a VPN once all of its dependencies were added
+        stack: list[tuple[AbstractVpnModel, bool]] = [
+            (dependency, False) for dependency in reversed(self.get_dependencies(vpn))
+        ]
+        while stack:
+            dependency, expanded = stack.pop()
+            global_vpn_id: str = dependency.get_global_vpn_id()
+            if expanded:
+                ordered[global_vpn_id] = dependency
+                continue
+            if global_vpn_id in visited:
+                continue
+            visited.add(global_vpn_id)
+            stack.append((dependency, True))
+            stack.extend(
+                (indirect, False) for indirect in reversed(self.get_dependencies(dependency))
+            )
+        return list(ordered.values())
+
+    def get_unknown_dependencies(self) -> set[str]:
+        '''
+        Get the dependencies that name none of the VPNs of the graph.
+
+        Returns:
+            set[str]: Unknown IDs
+        '''
+        return set(self._unknown_dependencies)
+
+    def get_waves(self) -> list[list[AbstractVpnModel]]:
+        '''
+        Split the VPNs into waves, every VPN being in the wave after the last of its dependencies.
+        The VPNs of a wave do not depend on each other, so they can be connected all at once once
+        the previous waves are connected.
+
+        Raises:
+            ValueError: If the dependencies form a cycle
+
+        Returns:
+            list[list[AbstractVpnModel]]: Waves of VPNs, each in the original order of the VPNs
+        '''
+        remaining: dict[str, int] = {
+            global_vpn_id: len(dependencies)
+            for global_vpn_id, dependencies in self._dependencies.items()
+        }
+        dependents: dict[str, list[str]] = {}
+        for global_vpn_id, dependencies in self._dependencies.items():
+            for dependency in dependencies:
+                dependents.setdefault(dependency.get_global_vpn_id(), []).append(global_vpn_id)
+        wave_ids: set[str] = {
+            global_vpn_id for global_vpn_id, count in remaining.items() if count == 0
+        }
+        waves: list[list[AbstractVpnModel]] = []
+        placed: int = 0
+        while wave_ids:
+            waves.append([vpn for vpn in self.vpns if vpn.get_global_vpn_id() in wave_ids])
+            placed += len(wave_ids)
+            next_wave_ids: set[str] = set()
+            for global_vpn_id in wave_ids:
+                for dependent in dependents.get(global_vpn_id, []):
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        next_wave_ids.add(dependent)
+            wave_ids = next_wave_ids
+        if placed < len(remaining):
+            cycle: list[str] = sorted(
+                global_vpn_id for global_vpn_id, count in remaining.items() if count > 0
+            )
+            raise ValueError(f'Dependency cycle among {", ".join(cycle)}')
+        return waves
+
+    def validate(self) -> None:
+        '''
+        Check that every dependency names a VPN of the graph, and that there is no cycle.
+
+        Raises:
+            ValueError: If a dependency is unknown or the dependencies form a cycle
+        '''
+        if self._unknown_dependencies:
+            raise ValueError(
+                f'Unknown dependencies {", ".join(sorted(self._unknown_dependencies))}'
+            )
+        self.get_waves()
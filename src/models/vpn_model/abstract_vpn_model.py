@@ -4,26 +4,60 @@ Abstract class for VPN data.
 
 from subprocess import CompletedProcess
 from abc import ABC, abstractmethod
+from contextvars import ContextVar, Token
+from functools import wraps
+from typing import Any, Awaitable, Callable, ContextManager
 
 from src.enums.vpn_type import VpnType, VpnTypeVisitor, T
 from src.models.vpn_config.abstract_vpn_config import AbstractVpnConfig
+from src.utils.tracing_utils import set_exit_code, trace_span
 
 
 class AbstractVpnModel(ABC):
     """
     Abstract class for VPN data.
 
+    The connect and disconnect methods of every subclass, and their async variants, are traced as
+    spans holding the global ID, the type and the exit code of the VPN action.
+
     Attributes:
         vpn_id (str): ID of the VPN
+        check_interval (float | None): Seconds between two watch mode checks of the VPN, or None
+            to use the default interval
+        priority (int): Priority of the VPN when connecting to all VPNs, the VPNs with the
+            highest priority starting first
+        depends_on (tuple[str, ...]): IDs or global IDs of the VPNs that have to be connected
+            before this one, like a VPN whose server is only reachable through another VPN
     """
 
+    __slots__ = ("vpn_id", "config", "check_interval", "priority", "depends_on")
+
     _vpn_id_key: str = "vpn_id"
     vpn_type_key: str = "vpn_type"
+    _check_interval_key: str = "check_interval"
+    _priority_key: str = "priority"
+    _default_priority: int = 0
+    _depends_on_key: str = "depends_on"
     _vpn_type: VpnType = VpnType.NONE
 
+    _traced_methods: tuple[str, ...] = ("connect", "disconnect")
+    _traced_async_methods: tuple[str, ...] = ("connect_async", "disconnect_async")
+
     def __init__(self, vpn_id: str, config: AbstractVpnConfig) -> None:
         self.vpn_id: str = vpn_id
         self.config: AbstractVpnConfig = config
+        self.check_interval: float | None = None
+        self.priority: int = AbstractVpnModel._default_priority
+        self.depends_on: tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        for name in AbstractVpnModel._traced_methods:
+            if name in cls.__dict__:
+                setattr(cls, name, _trace_action(name, cls.__dict__[name]))
+        for name in AbstractVpnModel._traced_async_methods:
+            if name in cls.__dict__:
+                setattr(cls, name, _trace_async_action(name, cls.__dict__[name]))
 
     def get_vpn_id(self) -> str:
         """
@@ -43,6 +77,33 @@ class AbstractVpnModel(ABC):
         """
         return AbstractVpnModel._vpn_type
 
+    def get_check_interval(self) -> float | None:
+        """
+        Get the seconds between two watch mode checks of the VPN.
+
+        Returns:
+            float | None: Seconds between two checks, or None to use the default interval
+        """
+        return self.check_interval
+
+    def get_priority(self) -> int:
+        """
+        Get the priority of the VPN when connecting to all VPNs.
+
+        Returns:
+            int: Priority of the VPN, higher priorities starting first
+        """
+        return self.priority
+
+    def get_dependencies(self) -> tuple[str, ...]:
+        """
+        Get the IDs of the VPNs that have to be connected before this one.
+
+        Returns:
+            tuple[str, ...]: IDs or global IDs of the VPNs this one depends on
+        """
+        return self.depends_on
+
     @abstractmethod
     def connect(self, verbose: bool) -> CompletedProcess:
         """
@@ -63,6 +124,124 @@ class AbstractVpnModel(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def is_connected(self, verbose: bool) -> bool | None:
+        """
+        Probe whether the VPN is currently connected.
+
+        Args:
+            verbose (bool): Whether to print the output of the status probe
+
+        Returns:
+            bool | None: True if the VPN is connected, False if it is down, or None if the status
+                probe failed and the status is unknown
+        """
+        raise NotImplementedError
+
+    def ensure_connected(self, verbose: bool) -> CompletedProcess | None:
+        """
+        Connect to the VPN only if the status probe reports it as down.
+
+        Args:
+            verbose (bool): Whether to print the output of the probe and connection processes
+
+        Returns:
+            CompletedProcess | None: Result of the connection process, or None if the VPN was
+                already connected or its status is unknown, and nothing was spawned
+        """
+        if self._should_skip_connect(self.is_connected(verbose), verbose):
+            return None
+        return self.connect(verbose)
+
+    @abstractmethod
+    async def connect_async(self, verbose: bool) -> CompletedProcess:
+        """
+        Connect to the VPN without blocking the event loop.
+
+        Args:
+            verbose (bool): Whether to print the output of the connection process
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def disconnect_async(self, verbose: bool) -> CompletedProcess:
+        """
+        Disconnect from the VPN without blocking the event loop.
+
+        Args:
+            verbose (bool): Whether to print the output of the disconnection process
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def is_connected_async(self, verbose: bool) -> bool | None:
+        """
+        Probe whether the VPN is currently connected without blocking the event loop.
+
+        Args:
+            verbose (bool): Whether to print the output of the status probe
+
+        Returns:
+            bool | None: True if the VPN is connected, False if it is down, or None if the status
+                probe failed and the status is unknown
+        """
+        raise NotImplementedError
+
+    async def ensure_connected_async(self, verbose: bool) -> CompletedProcess | None:
+        """
+        Connect to the VPN only if the status probe reports it as down, without blocking the
+        event loop.
+
+        Args:
+            verbose (bool): Whether to print the output of the probe and connection processes
+
+        Returns:
+            CompletedProcess | None: Result of the connection process, or None if the VPN was
+                already connected or its status is unknown, and nothing was spawned
+        """
+        if not await self.needs_connect_async(verbose):
+            return None
+        return await self.connect_async(verbose)
+
+    async def needs_connect_async(self, verbose: bool) -> bool | None:
+        """
+        Probe whether the VPN is down and has to be connected, without blocking the event loop.
+
+        Args:
+            verbose (bool): Whether to print the output of the probe
+
+        Returns:
+            bool | None: Whether the status probe reports the VPN as down, or None if its status
+                is unknown, in which case it is not connected either
+        """
+        connected: bool | None = await self.is_connected_async(verbose)
+        if self._should_skip_connect(connected, verbose):
+            return None if connected is None else False
+        return True
+
+    def _should_skip_connect(self, connected: bool | None, verbose: bool) -> bool:
+        """
+        Decide from a status probe whether connecting to the VPN should be skipped. A VPN whose
+        status is unknown is left alone until a later probe succeeds, instead of being reconnected
+        on the assumption that it is down.
+
+        Args:
+            connected (bool | None): Result of the status probe
+            verbose (bool): Whether to print why the connection is skipped
+
+        Returns:
+            bool: Whether connecting should be skipped
+        """
+        if connected is None:
+            if verbose:
+                print(f"{self.get_vpn_id()} status is unknown, skipping.")
+            return True
+        if connected:
+            if verbose:
+                print(f"{self.get_vpn_id()} is already connected, skipping.")
+            return True
+        return False
+
     def visit(self, visitor: "VpnTypeVisitor[T]") -> T:
         """
         Visit the VPN with a VpnTypeVisitor.
@@ -91,8 +270,69 @@ class AbstractVpnModel(ABC):
         return {
             AbstractVpnModel._vpn_id_key: self.get_vpn_id(),
             AbstractVpnModel.vpn_type_key: self.get_vpn_type().value,
+            **self._scheduling_to_json(),
         }
 
+    def get_connection_json(self) -> dict:
+        """
+        Get the JSON representation of the data that decides how the VPN connects, leaving out
+        the scheduling options that can change without reconnecting.
+
+        Returns:
+            dict: JSON representation of the connection data
+        """
+        json: dict = self.to_json()
+        json.pop(AbstractVpnModel._check_interval_key, None)
+        json.pop(AbstractVpnModel._priority_key, None)
+        json.pop(AbstractVpnModel._depends_on_key, None)
+        return json
+
+    def _scheduling_to_json(self) -> dict:
+        """
+        Convert the scheduling options of the VPN to their JSON representation.
+
+        Returns:
+            dict: JSON representation of the scheduling options that are set
+        """
+        json: dict = {}
+        if self.check_interval is not None:
+            json[AbstractVpnModel._check_interval_key] = self.check_interval
+        if self.priority != AbstractVpnModel._default_priority:
+            json[AbstractVpnModel._priority_key] = self.priority
+        if self.depends_on:
+            json[AbstractVpnModel._depends_on_key] = list(self.depends_on)
+        return json
+
+    def load_scheduling_json(self, json: dict) -> "AbstractVpnModel":
+        """
+        Load the scheduling options of the VPN from its JSON representation.
+
+        Args:
+            json (dict): JSON representation of the VPN data
+
+        Returns:
+            AbstractVpnModel: This VPN data object
+        """
+        check_interval: float | None = json.get(AbstractVpnModel._check_interval_key)
+        if check_interval is not None and (
+            not isinstance(check_interval, (int, float))
+            or isinstance(check_interval, bool)
+            or check_interval <= 0
+        ):
+            raise ValueError(f"Invalid check interval {check_interval}")
+        priority: int = json.get(AbstractVpnModel._priority_key, AbstractVpnModel._default_priority)
+        if not isinstance(priority, int) or isinstance(priority, bool):
+            raise ValueError(f"Invalid priority {priority}")
+        depends_on: list[str] = json.get(AbstractVpnModel._depends_on_key, [])
+        if not isinstance(depends_on, list) or not all(
+            isinstance(vpn_id, str) for vpn_id in depends_on
+        ):
+            raise ValueError(f"Invalid dependencies {depends_on}")
+        self.check_interval = check_interval
+        self.priority = priority
+        self.depends_on = tuple(depends_on)
+        return self
+
     @staticmethod
     def from_json_with_config(
         json: dict, config: AbstractVpnConfig
@@ -112,3 +352,80 @@ class AbstractVpnModel(ABC):
         return AbstractVpnModel(
             vpn_id=json.get(AbstractVpnModel._vpn_id_key), config=config
         )
+
+
+# Actions of VPNs being traced in the current context, so that an async action implemented by
+# running its sync variant in a thread is traced once
+_traced_actions: ContextVar[frozenset[tuple[int, str]]] = ContextVar(
+    "traced_actions", default=frozenset()
+)
+
+
+def _trace_action(
+    name: str, action: Callable[[AbstractVpnModel, bool], CompletedProcess]
+) -> Callable[[AbstractVpnModel, bool], CompletedProcess]:
+    """
+    Wrap a connect or disconnect method so that every call is traced as a span.
+
+    Args:
+        name (str): Name of the method, used as the name of the span
+        action (Callable[[AbstractVpnModel, bool], CompletedProcess]): Method to wrap
+
+    Returns:
+        Callable[[AbstractVpnModel, bool], CompletedProcess]: Traced method
+    """
+
+    @wraps(action)
+    def traced_action(vpn: AbstractVpnModel, verbose: bool) -> CompletedProcess:
+        key: tuple[int, str] = (id(vpn), name)
+        traced_actions: frozenset[tuple[int, str]] = _traced_actions.get()
+        if key in traced_actions:
+            return action(vpn, verbose)
+        token: Token = _traced_actions.set(traced_actions | {key})
+        try:
+            with _trace_vpn_span(name, vpn) as span:
+                process: CompletedProcess = action(vpn, verbose)
+                set_exit_code(span, process)
+                return process
+        finally:
+            _traced_actions.reset(token)
+
+    return traced_action
+
+
+def _trace_async_action(
+    name: str, action: Callable[[AbstractVpnModel, bool], Awaitable[CompletedProcess]]
+) -> Callable[[AbstractVpnModel, bool], Awaitable[CompletedProcess]]:
+    """
+    Wrap an async connect or disconnect method so that every call is traced as a span.
+
+    Args:
+        name (str): Name of the method, used as the name of the span without its "_async" suffix
+        action (Callable[[AbstractVpnModel, bool], Awaitable[CompletedProcess]]): Method to wrap
+
+    Returns:
+        Callable[[AbstractVpnModel, bool], Awaitable[CompletedProcess]]: Traced method
+    """
+    span_name: str = name.removesuffix("_async")
+
+    @wraps(action)
+    async def traced_action(vpn: AbstractVpnModel, verbose: bool) -> CompletedProcess:
+        key: tuple[int, str] = (id(vpn), span_name)
+        traced_actions: frozenset[tuple[int, str]] = _traced_actions.get()
+        if key in traced_actions:
+            return await action(vpn, verbose)
+        token: Token = _traced_actions.set(traced_actions | {key})
+        try:
+            with _trace_vpn_span(span_name, vpn) as span:
+                process: CompletedProcess = await action(vpn, verbose)
+                set_exit_code(span, process)
+                return process
+        finally:
+            _traced_actions.reset(token)
+
+    return traced_action
+
+
+def _trace_vpn_span(name: str, vpn: AbstractVpnModel) -> ContextManager[dict[str, Any]]:
+    """Start the span of an action of a VPN."""
+    return trace_span(name, vpn=vpn.get_global_vpn_id(), vpn_type=vpn.get_vpn_type().name)
@@ -0,0 +1,170 @@
+"""
+This file contains the CommandStatusCache class, which shares the parsed output of one backend
+status command between all the VPNs of a backend.
+"""
+
+from asyncio import Task, ensure_future, shield
+from subprocess import CompletedProcess
+from threading import Lock
+from time import monotonic
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from src.enums.vpn_operation import VpnOperation
+from src.models.vpn_config.abstract_vpn_config import AbstractVpnConfig
+from src.utils.command_utils import TimedOutProcess, run_command, run_command_async
+
+S = TypeVar("S")
+
+
+class CommandStatusCache(Generic[S]):  # pylint: disable=R0902
+    """
+    Shares one parsed snapshot of a status command between all the VPNs running it, so a status
+    check of the whole fleet costs a single process spawn per command per tick.
+
+    A command that fails or times out is stored as unknown rather than as every VPN being down, so
+    that a misbehaving CLI does not make the whole fleet reconnect.
+
+    Attributes:
+        name (str): Name of the status command, used in messages
+        parse (Callable[[str], S]): Parses the standard output of a successful status command
+        max_age_seconds (float): Seconds a snapshot is reused for
+        run (Callable[[list[str], AbstractVpnConfig], CompletedProcess]): Runs a status command,
+            spawning it as a process by default
+        run_async (Callable[[list[str], AbstractVpnConfig], Awaitable[CompletedProcess]]): Runs a
+            status command without blocking the event loop
+    """
+
+    def __init__(
+        self,
+        name: str,
+        parse: Callable[[str], S],
+        max_age_seconds: float = 2.0,
+        *,
+        run: Callable[[list[str], AbstractVpnConfig], CompletedProcess] | None = None,
+        run_async: (
+            Callable[[list[str], AbstractVpnConfig], Awaitable[CompletedProcess]] | None
+        ) = None
+    ) -> None:
+        self.name: str = name
+        self.parse: Callable[[str], S] = parse
+        self.max_age_seconds: float = max_age_seconds
+        self.run: Callable[[list[str], AbstractVpnConfig], CompletedProcess] = (
+            run if run else _run_status_command
+        )
+        self.run_async: Callable[[list[str], AbstractVpnConfig], Awaitable[CompletedProcess]] = (
+            run_async if run_async else _run_status_command_async
+        )
+        self._lock: Lock = Lock()
+        self._snapshots: dict[tuple[str, ...], tuple[float, S | None]] = {}
+        self._pending_refreshes: dict[tuple[str, ...], Task] = {}
+
+    def get(self, command: list[str], config: AbstractVpnConfig, verbose: bool) -> S | None:
+        """
+        Get the parsed output of a status command, only running it if there is no snapshot
+        younger than the maximum age.
+
+        Args:
+            command (list[str]): Status command and its arguments
+            config (AbstractVpnConfig): Config holding the deadline of the command
+            verbose (bool): Whether to print the outcome of the command
+
+        Returns:
+            S | None: Parsed output, or None if it is unknown because the command failed or timed
+                out
+        """
+        key: tuple[str, ...] = tuple(command)
+        with self._lock:
+            snapshot: tuple[float, S | None] | None = self._get_fresh_snapshot(key)
+            if snapshot is not None:
+                return snapshot[1]
+            process: CompletedProcess = self.run(command, config)
+            return self._store_snapshot(key, process, verbose)
+
+    async def get_async(
+        self, command: list[str], config: AbstractVpnConfig, verbose: bool
+    ) -> S | None:
+        """
+        Get the parsed output of a status command without blocking the event loop.
+
+        Concurrent callers share a single in-flight command instead of spawning one each.
+
+        Args:
+            command (list[str]): Status command and its arguments
+            config (AbstractVpnConfig): Config holding the deadline of the command
+            verbose (bool): Whether to print the outcome of the command
+
+        Returns:
+            S | None: Parsed output, or None if it is unknown because the command failed or timed
+                out
+        """
+        key: tuple[str, ...] = tuple(command)
+        with self._lock:
+            snapshot: tuple[float, S | None] | None = self._get_fresh_snapshot(key)
+        if snapshot is not None:
+            return snapshot[1]
+        refresh: Task | None = self._pending_refreshes.get(key)
+        if refresh is None:
+            refresh = ensure_future(self._refresh_async(command, config, verbose))
+            self._pending_refreshes[key] = refresh
+            refresh.add_done_callback(lambda _: self._pending_refreshes.pop(key, None))
+        return await shield(refresh)
+
+    def invalidate(self, command: list[str]) -> None:
+        """
+        Drop the snapshot of a status command, e.g. after one of its VPNs was started or stopped.
+
+        Args:
+            command (list[str]): Status command and its arguments
+        """
+        with self._lock:
+            self._snapshots.pop(tuple(command), None)
+
+    async def _refresh_async(
+        self, command: list[str], config: AbstractVpnConfig, verbose: bool
+    ) -> S | None:
+        """Run the status command and store its parsed snapshot."""
+        process: CompletedProcess = await self.run_async(command, config)
+        with self._lock:
+            return self._store_snapshot(tuple(command), process, verbose)
+
+    def _get_fresh_snapshot(self, key: tuple[str, ...]) -> tuple[float, S | None] | None:
+        """Get the snapshot of a status command if it is young enough. Call with the lock held."""
+        snapshot: tuple[float, S | None] | None = self._snapshots.get(key)
+        if snapshot and monotonic() - snapshot[0] < self.max_age_seconds:
+            return snapshot
+        return None
+
+    def _store_snapshot(
+        self, key: tuple[str, ...], process: CompletedProcess, verbose: bool
+    ) -> S | None:
+        """Parse and store the result of a status command. Call with the lock held."""
+        if isinstance(process, TimedOutProcess):
+            print(f"{self.name} timed out after {process.timeout} seconds")
+        elif process.returncode != 0:
+            print(f"{self.name} failed with return code {process.returncode}")
+        elif verbose:
+            print(f"{self.name} completed")
+        statuses: S | None = self.parse(process.stdout) if process.returncode == 0 else None
+        self._snapshots[key] = (monotonic(), statuses)
+        return statuses
+
+
+def _run_status_command(command: list[str], config: AbstractVpnConfig) -> CompletedProcess:
+    """Spawn a status command, with the status deadline of the config."""
+    return run_command(
+        command,
+        timeout=config.get_timeout(VpnOperation.STATUS),
+        kill_grace_period=config.kill_grace_period,
+        capture_output=True,
+    )
+
+
+async def _run_status_command_async(
+    command: list[str], config: AbstractVpnConfig
+) -> CompletedProcess:
+    """Spawn a status command without blocking the event loop."""
+    return await run_command_async(
+        command,
+        timeout=config.get_timeout(VpnOperation.STATUS),
+        kill_grace_period=config.kill_grace_period,
+    )
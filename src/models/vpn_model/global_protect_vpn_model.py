@@ -3,12 +3,14 @@ This file contains the PritunlVpnData class, which is a concrete implementation
 AbstractVpnData class.
 '''
 
-from subprocess import run, CompletedProcess
-from time import sleep
+from subprocess import CompletedProcess
 
 from src.models.vpn_config.global_protect_vpn_config import GlobalProtectVpnConfig
 from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.enums.vpn_operation import VpnOperation
 from src.enums.vpn_type import VpnType, VpnTypeVisitor, T
+from src.utils.command_utils import TimedOutProcess, run_command, run_command_async
+from src.utils.wait_utils import wait_until, wait_until_async
 
 
 class GlobalProtectVpnModel(AbstractVpnModel):
@@ -23,13 +25,42 @@ class GlobalProtectVpnModel(AbstractVpnModel):
         totp_obj (pyotp.TOTP): TOTP object of the Pritunl VPN
     '''
 
+    __slots__ = ()
+
     _vpn_type: VpnType = VpnType.GLOBAL_PROTECT
 
     def __init__(self, vpn_id: str, config: GlobalProtectVpnConfig) -> None:
         super().__init__(vpn_id=vpn_id, config=config)
-        self.service_load_command: str = config.service_load_command
-        self.service_unload_command: str = config.service_unload_command
-        self.process_kill_command: str = config.process_kill_command
+
+    @property
+    def service_load_command(self) -> str:
+        '''Command that loads the Global Protect agent, from the shared config.'''
+        return self.config.service_load_command
+
+    @property
+    def service_unload_command(self) -> str:
+        '''Command that unloads the Global Protect agent, from the shared config.'''
+        return self.config.service_unload_command
+
+    @property
+    def process_kill_command(self) -> str:
+        '''Command that kills the Global Protect agent, from the shared config.'''
+        return self.config.process_kill_command
+
+    @property
+    def status_command(self) -> str:
+        '''Command that probes whether the Global Protect agent runs, from the shared config.'''
+        return self.config.status_command
+
+    @property
+    def unload_wait_timeout(self) -> float:
+        '''Seconds to wait for the agent to stop after unloading it, from the shared config.'''
+        return self.config.unload_wait_timeout
+
+    @property
+    def unload_poll_interval(self) -> float:
+        '''Seconds between two checks of whether the agent stopped, from the shared config.'''
+        return self.config.unload_poll_interval
 
     def get_vpn_type(self) -> VpnType:
         '''
@@ -49,7 +80,7 @@ class GlobalProtectVpnModel(AbstractVpnModel):
         '''
         if verbose:
             print(f'Connecting to {self.get_vpn_id()}...')
-        process: CompletedProcess = run(self.service_load_command.split(), check=False)
+        process: CompletedProcess = self._run(self.service_load_command, VpnOperation.CONNECT)
         if verbose:
             print('Connect process completed!')
             print(f'Result: {process.stdout}; Error: {process.stderr}')
@@ -59,14 +90,25 @@ class GlobalProtectVpnModel(AbstractVpnModel):
         '''
         Disconnect from the Pritunl VPN.
 
+        The agent is only killed if it is still running once the unload wait deadline passes.
+
         Args:
             verbose (bool): Whether to print the output of the disconnection process
         '''
         if verbose:
             print(f'Disconnecting from {self.get_vpn_id()}')
-        unloading_process: CompletedProcess = run(self.service_unload_command.split(), check=False)
-        sleep(1)
-        kill_process: CompletedProcess = run(self.process_kill_command.split(), check=False)
+        unloading_process: CompletedProcess = self._run(
+            self.service_unload_command, VpnOperation.DISCONNECT
+        )
+        if wait_until(
+            lambda: self.is_connected(False) is False,
+            self.unload_wait_timeout,
+            self.unload_poll_interval
+        ):
+            return self._report_unloaded(unloading_process, verbose)
+        kill_process: CompletedProcess = self._run(
+            self.process_kill_command, VpnOperation.DISCONNECT
+        )
         if verbose:
             print('Disconnect process completed!')
             print(
@@ -77,6 +119,146 @@ class GlobalProtectVpnModel(AbstractVpnModel):
             )
         return kill_process
 
+    def is_connected(self, verbose: bool) -> bool | None:
+        '''
+        Probe whether the Global Protect agent is running, using the configured status command.
+        The status is unknown if the status command timed out.
+
+        Args:
+            verbose (bool): Whether to print the output of the status probe
+        '''
+        status_process: CompletedProcess = self._run(
+            self.status_command, VpnOperation.STATUS, capture_output=True
+        )
+        if verbose:
+            print(f'Status probe of {self.get_vpn_id()} returned {status_process.returncode}')
+        if isinstance(status_process, TimedOutProcess):
+            return None
+        return status_process.returncode == 0
+
+    async def connect_async(self, verbose: bool) -> CompletedProcess:
+        '''
+        Connect to the Global Protect VPN without blocking the event loop.
+
+        Args:
+            verbose (bool): Whether to print the output of the connection process
+        '''
+        if verbose:
+            print(f'Connecting to {self.get_vpn_id()}...')
+        process: CompletedProcess = await self._run_async(
+            self.service_load_command, VpnOperation.CONNECT
+        )
+        if verbose:
+            print(f'Connect process of {self.get_vpn_id()} completed!')
+            print(f'Result: {process.stdout}; Error: {process.stderr}')
+        return process
+
+    async def disconnect_async(self, verbose: bool) -> CompletedProcess:
+        '''
+        Disconnect from the Global Protect VPN without blocking the event loop.
+
+        The agent is only killed if it is still running once the unload wait deadline passes.
+
+        Args:
+            verbose (bool): Whether to print the output of the disconnection process
+        '''
+        if verbose:
+            print(f'Disconnecting from {self.get_vpn_id()}')
+        unloading_process: CompletedProcess = await self._run_async(
+            self.service_unload_command, VpnOperation.DISCONNECT
+        )
+        if await wait_until_async(
+            self._is_unloaded_async,
+            self.unload_wait_timeout,
+            self.unload_poll_interval
+        ):
+            return self._report_unloaded(unloading_process, verbose)
+        kill_process: CompletedProcess = await self._run_async(
+            self.process_kill_command, VpnOperation.DISCONNECT
+        )
+        if verbose:
+            print(f'Disconnect process of {self.get_vpn_id()} completed!')
+            print(
+                f'Unloading Result: {unloading_process.stdout}; Error: {unloading_process.stderr}'
+            )
+            print(
+                f'Kill Result: {kill_process.stdout}; Error: {kill_process.stderr}'
+            )
+        return kill_process
+
+    async def is_connected_async(self, verbose: bool) -> bool | None:
+        '''
+        Probe whether the Global Protect agent is running without blocking the event loop. The
+        status is unknown if the status command timed out.
+
+        Args:
+            verbose (bool): Whether to print the output of the status probe
+        '''
+        status_process: CompletedProcess = await self._run_async(
+            self.status_command, VpnOperation.STATUS
+        )
+        if verbose:
+            print(f'Status probe of {self.get_vpn_id()} returned {status_process.returncode}')
+        if isinstance(status_process, TimedOutProcess):
+            return None
+        return status_process.returncode == 0
+
+    async def _is_unloaded_async(self) -> bool:
+        '''
+        Check whether the Global Protect agent has stopped running.
+        '''
+        return await self.is_connected_async(False) is False
+
+    def _report_unloaded(
+        self, unloading_process: CompletedProcess, verbose: bool
+    ) -> CompletedProcess:
+        '''
+        Report a disconnection that completed without having to kill the agent.
+
+        Args:
+            unloading_process (CompletedProcess): Result of the service unload command
+            verbose (bool): Whether to print the output of the disconnection process
+        '''
+        if verbose:
+            print(f'Disconnect process of {self.get_vpn_id()} completed, agent unloaded cleanly!')
+            print(
+                f'Unloading Result: {unloading_process.stdout}; Error: {unloading_process.stderr}'
+            )
+        return unloading_process
+
+    def _run(
+        self, command: str, operation: VpnOperation, capture_output: bool = False
+    ) -> CompletedProcess:
+        '''
+        Run a Global Protect command within the deadline of the operation it belongs to.
+
+        Args:
+            command (str): Command to run
+            operation (VpnOperation): Operation the command belongs to
+            capture_output (bool): Whether to capture the output instead of inheriting it
+        '''
+        return run_command(
+            command.split(),
+            timeout=self.config.get_timeout(operation),
+            kill_grace_period=self.config.kill_grace_period,
+            capture_output=capture_output
+        )
+
+    async def _run_async(self, command: str, operation: VpnOperation) -> CompletedProcess:
+        '''
+        Run a Global Protect command within the deadline of the operation it belongs to, without
+        blocking the event loop.
+
+        Args:
+            command (str): Command to run
+            operation (VpnOperation): Operation the command belongs to
+        '''
+        return await run_command_async(
+            command.split(),
+            timeout=self.config.get_timeout(operation),
+            kill_grace_period=self.config.kill_grace_period
+        )
+
     def visit(self, visitor: 'VpnTypeVisitor[T]') -> T:
         '''
         Visit the Pritunl VPN with a VpnTypeVisitor.
@@ -90,6 +272,7 @@ class GlobalProtectVpnModel(AbstractVpnModel):
         return {
             GlobalProtectVpnModel._vpn_id_key: self.get_vpn_id(),
             GlobalProtectVpnModel.vpn_type_key: self.get_vpn_type().value,
+            **self._scheduling_to_json(),
         }
 
     @staticmethod
@@ -100,4 +283,4 @@ class GlobalProtectVpnModel(AbstractVpnModel):
         return GlobalProtectVpnModel(
             vpn_id=json.get(GlobalProtectVpnModel._vpn_id_key),
             config=config
-        )
+        ).load_scheduling_json(json)
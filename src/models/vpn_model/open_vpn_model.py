@@ -0,0 +1,260 @@
+"""
+This file contains the OpenVpnModel class, which is a concrete implementation of the
+AbstractVpnModel class.
+"""
+
+from asyncio import to_thread
+from subprocess import CompletedProcess
+from typing import Callable
+
+from src.models.vpn_config.open_vpn_config import OpenVpnConfig
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.enums.vpn_operation import VpnOperation
+from src.enums.vpn_type import VpnType, VpnTypeVisitor, T
+from src.utils.command_utils import COMMAND_NOT_RUNNABLE_RETURN_CODE, TimedOutProcess
+from src.utils.open_vpn_management_utils import OpenVpnManagementClient, OpenVpnManagementError
+
+
+class OpenVpnModel(AbstractVpnModel):
+    """
+    Concrete implementation of the AbstractVpnModel class for VPNs of an OpenVPN daemon started
+    with a management interface, like `openvpn --management /run/openvpn.sock unix`.
+
+    The daemon is driven over a pooled, long-lived connection to its management interface instead
+    of spawning a process per operation: connecting releases a daemon on hold, or restarts a
+    tunnel that is down, and leaves a connected tunnel alone; disconnecting puts the daemon on hold
+    and restarts it, so that it stays down until the next connection.
+
+    Attributes:
+        id (str): ID of the OpenVPN VPN
+        management_address (str): Path to the Unix socket of the management interface, or its
+            TCP host:port
+        management_password (str): Password of the management interface, empty if there is none
+    """
+
+    __slots__ = ("management_address", "management_password")
+
+    _vpn_type: VpnType = VpnType.OPEN_VPN
+    _management_address_key: str = "management_address"
+    _management_password_key: str = "management_password"
+    _release_commands: tuple[str, ...] = ("hold off", "hold release")
+    _restart_commands: tuple[str, ...] = ("signal SIGUSR1",)
+    _disconnect_commands: tuple[str, ...] = ("hold on", "signal SIGUSR1")
+    _connected_state: str = "CONNECTED"
+    _held_response: str = "hold=1"
+
+    def __init__(
+        self,
+        vpn_id: str,
+        config: OpenVpnConfig,
+        *,
+        management_address: str,
+        management_password: str = "",
+    ) -> None:
+        super().__init__(vpn_id=vpn_id, config=config)
+        self.management_address: str = management_address
+        self.management_password: str = management_password
+
+    def get_vpn_type(self) -> VpnType:
+        """
+        Get the type of the OpenVPN VPN.
+
+        Returns:
+            VpnType: Type of the VPN
+        """
+        return OpenVpnModel._vpn_type
+
+    def connect(self, verbose: bool) -> CompletedProcess:
+        """
+        Connect to the OpenVPN VPN, releasing the daemon from its hold, or restarting the tunnel
+        if the daemon is not on hold. A tunnel that is already connected is left alone, as a
+        restart would drop it.
+
+        Args:
+            verbose (bool): Whether to print the responses of the management interface
+        """
+        return self._run_commands(self._get_connect_commands, VpnOperation.CONNECT, verbose)
+
+    def disconnect(self, verbose: bool) -> CompletedProcess:
+        """
+        Disconnect from the OpenVPN VPN, restarting the daemon into a hold until the next
+        connection.
+
+        Args:
+            verbose (bool): Whether to print the responses of the management interface
+        """
+        return self._run_commands(
+            lambda _: OpenVpnModel._disconnect_commands, VpnOperation.DISCONNECT, verbose
+        )
+
+    def is_connected(self, verbose: bool) -> bool | None:
+        """
+        Probe whether the OpenVPN VPN is connected with a state query over the management
+        interface.
+
+        Args:
+            verbose (bool): Whether to print the state of the daemon
+        """
+        try:
+            state: str = self._get_state(self.config.get_timeout(VpnOperation.STATUS))
+        except (OSError, OpenVpnManagementError) as error:
+            print(f"State query of {self.get_vpn_id()} failed: {error}")
+            return None
+        if verbose:
+            print(f"{self.get_vpn_id()} is in state {state or 'unknown'}")
+        return state == OpenVpnModel._connected_state
+
+    async def connect_async(self, verbose: bool) -> CompletedProcess:
+        """
+        Connect to the OpenVPN VPN without blocking the event loop.
+
+        Args:
+            verbose (bool): Whether to print the responses of the management interface
+        """
+        return await to_thread(self.connect, verbose)
+
+    async def disconnect_async(self, verbose: bool) -> CompletedProcess:
+        """
+        Disconnect from the OpenVPN VPN without blocking the event loop.
+
+        Args:
+            verbose (bool): Whether to print the responses of the management interface
+        """
+        return await to_thread(self.disconnect, verbose)
+
+    async def is_connected_async(self, verbose: bool) -> bool | None:
+        """
+        Probe whether the OpenVPN VPN is connected without blocking the event loop.
+
+        Args:
+            verbose (bool): Whether to print the state of the daemon
+        """
+        return await to_thread(self.is_connected, verbose)
+
+    def _get_client(self) -> OpenVpnManagementClient:
+        """
+        Get the pooled connection to the management interface of the daemon.
+
+        Returns:
+            OpenVpnManagementClient: Connection shared by all operations on the daemon
+        """
+        return OpenVpnManagementClient.get_pooled(
+            self.management_address, self.management_password
+        )
+
+    def _get_state(self, timeout: float) -> str:
+        """
+        Query the current state of the daemon, like "CONNECTED" or "RECONNECTING".
+
+        Args:
+            timeout (float): Deadline of the query, in seconds
+
+        Returns:
+            str: State of the daemon, empty if it reported none
+
+        Raises:
+            OpenVpnManagementError: If the interface answers with an ERROR
+            OSError: If the interface cannot be reached or does not answer in time
+        """
+        state_lines: list[str] = self._get_client().run("state", timeout, multiline=True)
+        # The current state is the second field: time,state,description,local IP,remote IP,...
+        state_fields: list[str] = state_lines[-1].split(",") if state_lines else []
+        return state_fields[1] if len(state_fields) > 1 else ""
+
+    def _get_connect_commands(self, timeout: float) -> tuple[str, ...]:
+        """
+        Choose the management commands that connect the VPN, from the state of the daemon.
+
+        Args:
+            timeout (float): Deadline of every query, in seconds
+
+        Returns:
+            tuple[str, ...]: No command if the tunnel is connected, the commands releasing the hold
+                if the daemon is on hold, or the command restarting the tunnel otherwise
+
+        Raises:
+            OpenVpnManagementError: If the interface answers with an ERROR
+            OSError: If the interface cannot be reached or does not answer in time
+        """
+        if self._get_state(timeout) == OpenVpnModel._connected_state:
+            return ()
+        hold_lines: list[str] = self._get_client().run("hold", timeout)
+        if any(line.endswith(OpenVpnModel._held_response) for line in hold_lines):
+            return OpenVpnModel._release_commands
+        return OpenVpnModel._restart_commands
+
+    def _run_commands(
+        self,
+        get_commands: Callable[[float], tuple[str, ...]],
+        operation: VpnOperation,
+        verbose: bool
+    ) -> CompletedProcess:
+        """
+        Send management commands one after the other, stopping at the first failure. The outcome
+        is reported like the result of a backend CLI process.
+
+        Args:
+            get_commands (Callable[[float], tuple[str, ...]]): Chooses the management commands to
+                send, given the deadline of every command
+            operation (VpnOperation): Operation whose deadline applies to every command
+            verbose (bool): Whether to print the responses of the management interface
+
+        Returns:
+            CompletedProcess: Responses as the standard output, a TimedOutProcess if the interface
+                did not answer in time, or return code 127 if it could not be reached
+        """
+        args: list[str] = [self.management_address]
+        timeout: float = self.config.get_timeout(operation)
+        responses: list[str] = []
+        try:
+            commands: tuple[str, ...] = get_commands(timeout)
+            args.extend(commands)
+            for command in commands:
+                responses.extend(self._get_client().run(command, timeout))
+        except TimeoutError:
+            return TimedOutProcess(args, 1, timeout)
+        except OpenVpnManagementError as error:
+            return CompletedProcess(args, 1, "\n".join(responses), str(error))
+        except OSError as error:
+            return CompletedProcess(
+                args, COMMAND_NOT_RUNNABLE_RETURN_CODE, "\n".join(responses), str(error)
+            )
+        if verbose and not commands:
+            print(f"{self.get_vpn_id()} is already connected, skipping.")
+        elif verbose:
+            print(f"{operation.value.capitalize()} of {self.get_vpn_id()} completed!")
+            print(f"Result: {responses}")
+        return CompletedProcess(args, 0, "\n".join(responses), "")
+
+    def visit(self, visitor: "VpnTypeVisitor[T]") -> T:
+        """
+        Visit the OpenVPN VPN with a VpnTypeVisitor.
+
+        Args:
+            visitor (VpnTypeVisitor): Visitor to visit the OpenVPN VPN with
+        """
+        return visitor.visit_open_vpn()
+
+    def to_json(self) -> dict:
+        return {
+            OpenVpnModel._vpn_id_key: self.get_vpn_id(),
+            OpenVpnModel.vpn_type_key: self.get_vpn_type().value,
+            OpenVpnModel._management_address_key: self.management_address,
+            OpenVpnModel._management_password_key: self.management_password,
+            **self._scheduling_to_json(),
+        }
+
+    @staticmethod
+    def from_json_with_config(json: dict, config: OpenVpnConfig) -> "OpenVpnModel":
+        vpn_type: VpnType = VpnType(json.get(OpenVpnModel.vpn_type_key))
+        if vpn_type != OpenVpnModel._vpn_type:
+            raise ValueError(f"Invalid VPN type {vpn_type}")
+        management_address: str | None = json.get(OpenVpnModel._management_address_key)
+        if not isinstance(management_address, str) or not management_address:
+            raise ValueError(f"Invalid management address {management_address}")
+        return OpenVpnModel(
+            vpn_id=json.get(OpenVpnModel._vpn_id_key),
+            config=config,
+            management_address=management_address,
+            management_password=json.get(OpenVpnModel._management_password_key, ""),
+        ).load_scheduling_json(json)
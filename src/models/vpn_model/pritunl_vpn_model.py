@@ -3,13 +3,307 @@ This file contains the PritunlVpnData class, which is a concrete implementation
 AbstractVpnData class.
 """
 
-from subprocess import run, CompletedProcess
-from pyotp import totp, parse_uri
+from asyncio import sleep as async_sleep, to_thread
+from http.client import HTTPException
+from json import dumps, loads
+from re import IGNORECASE, Pattern, compile as compile_pattern
+from subprocess import CompletedProcess
+from time import sleep, time
+from typing import TYPE_CHECKING, Any
 
 from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.models.vpn_model.command_status_cache import CommandStatusCache
+from src.utils.command_utils import TimedOutProcess, run_command, run_command_async
+from src.utils.http_utils import HttpServiceError, PersistentHttpClient
+from src.enums.vpn_operation import VpnOperation
 from src.enums.vpn_type import VpnType, VpnTypeVisitor, T
 from src.models.vpn_config.pritunl_vpn_config import PritunlVpnConfig
 
+if TYPE_CHECKING:
+    from pyotp import TOTP
+
+
+class PritunlStatusCache:
+    """
+    Shares one parsed `pritunl-client list` snapshot between all Pritunl VPNs using the same CLI,
+    so a status check of the whole fleet costs a single process spawn per tick.
+    """
+
+    disconnected_states: frozenset[str] = frozenset(
+        {"", "-", "DISCONNECTED", "INACTIVE", "FALSE"}
+    )
+    _status_columns: tuple[str, ...] = ("ONLINE FOR", "ONLINE", "STATUS", "STATE")
+
+    @staticmethod
+    def get_statuses(config: PritunlVpnConfig, verbose: bool) -> dict[str, bool] | None:
+        """
+        Get the connection status of every profile known to the Pritunl CLI.
+
+        The CLI is only invoked if there is no snapshot younger than the cache's maximum age.
+
+        Args:
+            config (PritunlVpnConfig): Config of the Pritunl CLI
+            verbose (bool): Whether to print the output of the listing process
+
+        Returns:
+            dict[str, bool] | None: Whether each profile is connected, keyed by the profile ID, or
+                None if the statuses are unknown because the listing failed or timed out
+        """
+        if PritunlServiceTransport.is_enabled(config):
+            statuses: dict[str, bool] | None = _SERVICE_STATUS_CACHE.get(
+                PritunlServiceTransport.get_list_key(config), config, verbose
+            )
+            if statuses is not None:
+                return statuses
+        return _STATUS_CACHE.get([config.cli_path, "list"], config, verbose)
+
+    @staticmethod
+    async def get_statuses_async(
+        config: PritunlVpnConfig, verbose: bool
+    ) -> dict[str, bool] | None:
+        """
+        Get the connection status of every profile known to the Pritunl CLI without blocking the
+        event loop.
+
+        Concurrent callers share a single in-flight listing instead of spawning one each.
+
+        Args:
+            config (PritunlVpnConfig): Config of the Pritunl CLI
+            verbose (bool): Whether to print the output of the listing process
+
+        Returns:
+            dict[str, bool] | None: Whether each profile is connected, keyed by the profile ID, or
+                None if the statuses are unknown because the listing failed or timed out
+        """
+        if PritunlServiceTransport.is_enabled(config):
+            statuses: dict[str, bool] | None = await _SERVICE_STATUS_CACHE.get_async(
+                PritunlServiceTransport.get_list_key(config), config, verbose
+            )
+            if statuses is not None:
+                return statuses
+        return await _STATUS_CACHE.get_async([config.cli_path, "list"], config, verbose)
+
+    @staticmethod
+    def invalidate(config: PritunlVpnConfig) -> None:
+        """
+        Drop the snapshots of a Pritunl CLI and service, e.g. after one of their profiles was
+        started or stopped.
+
+        Args:
+            config (PritunlVpnConfig): Config of the Pritunl CLI and service
+        """
+        _STATUS_CACHE.invalidate([config.cli_path, "list"])
+        _SERVICE_STATUS_CACHE.invalidate(PritunlServiceTransport.get_list_key(config))
+
+    @staticmethod
+    def parse_list_output(output: str) -> dict[str, bool]:
+        """
+        Parse the table printed by `pritunl-client list`.
+
+        A profile that is connecting is reported as connected, so that it is not started twice.
+
+        Args:
+            output (str): Standard output of the listing process
+
+        Returns:
+            dict[str, bool]: Whether each profile is connected, keyed by the profile ID
+        """
+        rows: list[list[str]] = [
+            [cell.strip() for cell in line.strip().strip("|").split("|")]
+            for line in (output or "").splitlines()
+            if line.strip().startswith("|")
+        ]
+        if not rows:
+            return {}
+        header: list[str] = [cell.upper() for cell in rows[0]]
+        status_index: int = next(
+            (
+                header.index(column)
+                for column in PritunlStatusCache._status_columns
+                if column in header
+            ),
+            len(header) - 1,
+        )
+        return {
+            row[0]: row[status_index].upper() not in PritunlStatusCache.disconnected_states
+            for row in rows[1:]
+            if len(row) > status_index and row[0]
+        }
+
+
+class PritunlServiceTransport:
+    """
+    Sends the operations of Pritunl VPNs as requests to the local Pritunl client service, which
+    the CLI only forwards them to, over one keep-alive connection per service. This turns every
+    operation from a process spawn into a request on an open connection.
+
+    The transport is only used if the config has a service address, and every request that fails
+    is retried with the CLI.
+    """
+
+    _auth_key_header: str = "Auth-Key"
+    _status_fields: tuple[str, ...] = ("status", "state", "connected")
+
+    @staticmethod
+    def is_enabled(config: PritunlVpnConfig) -> bool:
+        """
+        Get whether requests should be sent to the Pritunl client service.
+
+        Args:
+            config (PritunlVpnConfig): Config of the Pritunl service
+
+        Returns:
+            bool: Whether the config has a service address
+        """
+        return bool(config.service_address)
+
+    @staticmethod
+    def get_list_key(config: PritunlVpnConfig) -> list[str]:
+        """
+        Get the key the status listing of a Pritunl client service is cached under.
+
+        Args:
+            config (PritunlVpnConfig): Config of the Pritunl service
+
+        Returns:
+            list[str]: Address of the service and the list request
+        """
+        return [
+            config.service_address,
+            *config.get_service_endpoint(PritunlVpnConfig.list_endpoint),
+        ]
+
+    @staticmethod
+    def request(
+        config: PritunlVpnConfig,
+        endpoint: str,
+        operation: VpnOperation,
+        vpn_id: str = "",
+        body: dict | None = None,
+    ) -> CompletedProcess:
+        """
+        Send a request to the Pritunl client service. The outcome is reported like the result of
+        a CLI process, with the body of the response as the standard output.
+
+        Args:
+            config (PritunlVpnConfig): Config of the Pritunl service
+            endpoint (str): "list", "start" or "stop"
+            operation (VpnOperation): Operation whose deadline applies to the request
+            vpn_id (str): ID of the VPN the request is about
+            body (dict | None): Body of the request, or None for no body
+
+        Returns:
+            CompletedProcess: Result of the request, with return code 0 on success, a
+                TimedOutProcess if the service did not answer in time, or return code 1 otherwise
+        """
+        method, request_path = config.get_service_endpoint(endpoint, vpn_id)
+        args: list[str] = [config.service_address, method, request_path]
+        timeout: float = config.get_timeout(operation)
+        try:
+            response: Any = PersistentHttpClient.get_pooled(config.service_address).request_json(
+                method,
+                request_path,
+                body,
+                PritunlServiceTransport._get_headers(config),
+                timeout,
+            )
+        except TimeoutError:
+            return TimedOutProcess(args, 1, timeout)
+        except (OSError, HTTPException, HttpServiceError, ValueError) as error:
+            return CompletedProcess(args, 1, "", str(error))
+        return CompletedProcess(args, 0, dumps(response), "")
+
+    @staticmethod
+    async def request_async(
+        config: PritunlVpnConfig,
+        endpoint: str,
+        operation: VpnOperation,
+        vpn_id: str = "",
+        body: dict | None = None,
+    ) -> CompletedProcess:
+        """
+        Send a request to the Pritunl client service without blocking the event loop.
+
+        Args:
+            config (PritunlVpnConfig): Config of the Pritunl service
+            endpoint (str): "list", "start" or "stop"
+            operation (VpnOperation): Operation whose deadline applies to the request
+            vpn_id (str): ID of the VPN the request is about
+            body (dict | None): Body of the request, or None for no body
+
+        Returns:
+            CompletedProcess: Result of the request
+        """
+        return await to_thread(
+            PritunlServiceTransport.request, config, endpoint, operation, vpn_id, body
+        )
+
+    @staticmethod
+    def parse_profiles(output: str) -> dict[str, bool]:
+        """
+        Parse the profiles listed by the Pritunl client service, either an object of profiles
+        keyed by their ID or a list of profiles with an "id".
+
+        Args:
+            output (str): JSON body of the list response
+
+        Returns:
+            dict[str, bool]: Whether each profile is connected, keyed by the profile ID
+        """
+        profiles: Any = loads(output) if output else {}
+        if isinstance(profiles, list):
+            profiles = {
+                profile.get("id"): profile for profile in profiles if isinstance(profile, dict)
+            }
+        if not isinstance(profiles, dict):
+            return {}
+        return {
+            str(profile_id): PritunlServiceTransport._is_connected(profile)
+            for profile_id, profile in profiles.items()
+            if profile_id and isinstance(profile, dict)
+        }
+
+    @staticmethod
+    def _is_connected(profile: dict) -> bool:
+        """Get whether a profile listed by the service is connected, or connecting."""
+        status: Any = next(
+            (
+                profile[field]
+                for field in PritunlServiceTransport._status_fields
+                if field in profile
+            ),
+            "",
+        )
+        if isinstance(status, bool):
+            return status
+        return str(status).upper() not in PritunlStatusCache.disconnected_states
+
+    @staticmethod
+    def _get_headers(config: PritunlVpnConfig) -> dict[str, str]:
+        """
+        Get the headers authenticating a request to the service. The key is read on every request,
+        as the service generates a new one whenever it restarts.
+        """
+        if not config.service_auth_key_path:
+            return {}
+        with open(config.service_auth_key_path, "r", encoding="utf-8") as file:
+            return {PritunlServiceTransport._auth_key_header: file.read().strip()}
+
+
+_STATUS_CACHE: CommandStatusCache[dict[str, bool]] = CommandStatusCache(
+    "Status listing", PritunlStatusCache.parse_list_output
+)
+_SERVICE_STATUS_CACHE: CommandStatusCache[dict[str, bool]] = CommandStatusCache(
+    "Pritunl service status listing",
+    PritunlServiceTransport.parse_profiles,
+    run=lambda _, config: PritunlServiceTransport.request(
+        config, PritunlVpnConfig.list_endpoint, VpnOperation.STATUS
+    ),
+    run_async=lambda _, config: PritunlServiceTransport.request_async(
+        config, PritunlVpnConfig.list_endpoint, VpnOperation.STATUS
+    ),
+)
+
 
 class PritunlVpnModel(AbstractVpnModel):
     """
@@ -22,10 +316,15 @@ class PritunlVpnModel(AbstractVpnModel):
         totp_url (str): TOTP URL of the Pritunl VPN
         totp_obj (pyotp.TOTP): TOTP object of the Pritunl VPN
     """
+    __slots__ = ("pin", "totp_url", "totp_obj", "token")
+
     _vpn_type: VpnType = VpnType.PRITUNL
     _pin_key: str = "pin"
     _token_key: str = "token"
     _totp_url_key: str = "totp_url"
+    _auth_failure_pattern: Pattern = compile_pattern(
+        r"\b(?:auth\w*|unauthori[sz]ed|t?otp|passcode|password|credentials?|401)\b", IGNORECASE
+    )
 
     # pylint: disable=R0913
     def __init__(
@@ -38,12 +337,20 @@ class PritunlVpnModel(AbstractVpnModel):
         token: str = "",
     ) -> None:
         super().__init__(vpn_id=vpn_id, config=config)
-        self.cli_path: str = config.cli_path
         self.pin: str = pin
         self.totp_url: str = totp_url
-        self.totp_obj: totp.TOTP = parse_uri(totp_url) if len(totp_url) > 0 else None
+        self.totp_obj: "TOTP | None" = None
+        if len(totp_url) > 0:
+            # Imported here, as pyotp is only needed by VPNs that use a TOTP
+            from pyotp import parse_uri  # pylint: disable=import-outside-toplevel
+            self.totp_obj = parse_uri(totp_url)
         self.token: str = token
 
+    @property
+    def cli_path(self) -> str:
+        """Path to the Pritunl CLI, from the config shared by all Pritunl VPNs."""
+        return self.config.cli_path
+
     def get_vpn_type(self) -> VpnType:
         """
         Get the type of the Pritunl VPN.
@@ -71,38 +378,39 @@ class PritunlVpnModel(AbstractVpnModel):
         """
         return self.token
 
-    def get_totp(self) -> str:
+    def get_totp(self, for_time: float | None = None, counter_offset: int = 0) -> str:
         """
         Get the TOTP of the Pritunl VPN.
 
+        Args:
+            for_time (float | None): Time to generate the TOTP for, or None for now
+            counter_offset (int): Number of TOTP windows to move forward from that time
+
         Returns:
             str: TOTP of the Pritunl VPN
         """
-        return self.totp_obj.now() if self.totp_obj else ""
+        if not self.totp_obj:
+            return ""
+        return self.totp_obj.at(time() if for_time is None else for_time, counter_offset)
 
     def connect(self, verbose: bool) -> CompletedProcess:
         """
-        Connect to the Pritunl VPN.
+        Connect to the Pritunl VPN, through the Pritunl client service if it is configured and
+        through the CLI otherwise.
+
+        A TOTP about to expire is not sent: the connection waits for the next TOTP window instead,
+        and a connection rejected for its credentials is retried once right away with the TOTP of
+        the next window.
 
         Args:
             verbose (bool): Whether to print the output of the connection process
         """
-        pin: str = self.get_pin()
-        vpn_totp: str = self.get_totp()
-        token: str = self.get_token()
-        if verbose:
-            print(f"Connecting to {self.get_vpn_id()}...")
-            print(f"Pin: {pin}; TOTP: {vpn_totp}; Token: {token}")
-        process: CompletedProcess = run(
-            [
-                self.cli_path,
-                "start",
-                self.get_vpn_id(),
-                "-p",
-                f"{pin}{vpn_totp}{token}",
-            ],
-            check=False,
-        )
+        totp_time: float = self._get_totp_time()
+        sleep(max(0.0, totp_time - time()))
+        process: CompletedProcess = self._start(self._get_password(verbose, totp_time))
+        if self._should_retry_with_next_totp(process, verbose):
+            process = self._start(self._get_password(verbose, totp_time, 1))
+        PritunlStatusCache.invalidate(self.config)
         if verbose:
             print("Connect process completed!")
             print(f"Result: {process.stdout}; Error: {process.stderr}")
@@ -110,22 +418,288 @@ class PritunlVpnModel(AbstractVpnModel):
 
     def disconnect(self, verbose: bool) -> CompletedProcess:
         """
-        Disconnect from the Pritunl VPN.
+        Disconnect from the Pritunl VPN, through the Pritunl client service if it is configured
+        and through the CLI otherwise.
 
         Args:
             verbose (bool): Whether to print the output of the disconnection process
         """
         if verbose:
             print(f"Disconnecting from {self.get_vpn_id()}")
-        process: CompletedProcess = run(
-            [self.cli_path, "stop", self.get_vpn_id()],
-            check=False,
+        process: CompletedProcess | None = self._request_service(
+            PritunlVpnConfig.stop_endpoint, VpnOperation.DISCONNECT
         )
+        if process is None:
+            process = run_command(
+                self._get_disconnect_command(),
+                timeout=self.config.get_timeout(VpnOperation.DISCONNECT),
+                kill_grace_period=self.config.kill_grace_period,
+            )
+        PritunlStatusCache.invalidate(self.config)
         if verbose:
             print("Disconnect process completed!")
             print(f"Result: {process.stdout}; Error: {process.stderr}")
         return process
 
+    def is_connected(self, verbose: bool) -> bool | None:
+        """
+        Probe whether the Pritunl VPN is connected, using the snapshot shared by all Pritunl VPNs.
+
+        Args:
+            verbose (bool): Whether to print the output of the status probe
+        """
+        statuses: dict[str, bool] | None = PritunlStatusCache.get_statuses(self.config, verbose)
+        return statuses.get(self.get_vpn_id(), False) if statuses is not None else None
+
+    async def connect_async(self, verbose: bool) -> CompletedProcess:
+        """
+        Connect to the Pritunl VPN without blocking the event loop, waiting for the next TOTP
+        window like connect.
+
+        Args:
+            verbose (bool): Whether to print the output of the connection process
+        """
+        totp_time: float = self._get_totp_time()
+        await async_sleep(max(0.0, totp_time - time()))
+        process: CompletedProcess = await self._start_async(
+            self._get_password(verbose, totp_time)
+        )
+        if self._should_retry_with_next_totp(process, verbose):
+            process = await self._start_async(self._get_password(verbose, totp_time, 1))
+        PritunlStatusCache.invalidate(self.config)
+        if verbose:
+            print(f"Connect process of {self.get_vpn_id()} completed!")
+            print(f"Result: {process.stdout}; Error: {process.stderr}")
+        return process
+
+    async def disconnect_async(self, verbose: bool) -> CompletedProcess:
+        """
+        Disconnect from the Pritunl VPN without blocking the event loop.
+
+        Args:
+            verbose (bool): Whether to print the output of the disconnection process
+        """
+        if verbose:
+            print(f"Disconnecting from {self.get_vpn_id()}")
+        process: CompletedProcess | None = await self._request_service_async(
+            PritunlVpnConfig.stop_endpoint, VpnOperation.DISCONNECT
+        )
+        if process is None:
+            process = await run_command_async(
+                self._get_disconnect_command(),
+                timeout=self.config.get_timeout(VpnOperation.DISCONNECT),
+                kill_grace_period=self.config.kill_grace_period,
+            )
+        PritunlStatusCache.invalidate(self.config)
+        if verbose:
+            print(f"Disconnect process of {self.get_vpn_id()} completed!")
+            print(f"Result: {process.stdout}; Error: {process.stderr}")
+        return process
+
+    async def is_connected_async(self, verbose: bool) -> bool | None:
+        """
+        Probe whether the Pritunl VPN is connected without blocking the event loop, using the
+        snapshot shared by all Pritunl VPNs.
+
+        Args:
+            verbose (bool): Whether to print the output of the status probe
+        """
+        statuses: dict[str, bool] | None = await PritunlStatusCache.get_statuses_async(
+            self.config, verbose
+        )
+        return statuses.get(self.get_vpn_id(), False) if statuses is not None else None
+
+    def _get_totp_time(self) -> float:
+        """
+        Get the time to generate the TOTP of a connection for: now, unless the current TOTP
+        expires in less than the minimum validity of the config, in which case the connection
+        should wait for the start of the next TOTP window.
+
+        Returns:
+            float: Time to generate the TOTP for, and to start the connection at
+        """
+        now: float = time()
+        if not self.totp_obj:
+            return now
+        remaining_validity: float = self.totp_obj.interval - now % self.totp_obj.interval
+        if remaining_validity < self.config.totp_min_validity:
+            return now + remaining_validity
+        return now
+
+    def _should_retry_with_next_totp(self, process: CompletedProcess, verbose: bool) -> bool:
+        """
+        Get whether a failed connection was rejected because of its credentials, which a TOTP
+        from the wrong window is, and should be retried with the TOTP of the next window.
+        Connections that timed out or failed for any other reason are not retried, as another
+        TOTP would not help them.
+
+        Args:
+            process (CompletedProcess): Result of the connection
+            verbose (bool): Whether to print that the connection is retried
+
+        Returns:
+            bool: Whether to retry the connection
+        """
+        should_retry: bool = (
+            self.totp_obj is not None
+            and process.returncode != 0
+            and not isinstance(process, TimedOutProcess)
+            and PritunlVpnModel._auth_failure_pattern.search(
+                f"{process.stdout}\n{process.stderr}"
+            ) is not None
+        )
+        if should_retry and verbose:
+            print(f"Connecting to {self.get_vpn_id()} was rejected, retrying with the next TOTP")
+        return should_retry
+
+    def _get_password(self, verbose: bool, totp_time: float, counter_offset: int = 0) -> str:
+        """
+        Build the password that starts the VPN.
+
+        Args:
+            verbose (bool): Whether to print the credentials being used
+            totp_time (float): Time to generate the TOTP for
+            counter_offset (int): Number of TOTP windows to move forward from that time
+        """
+        pin: str = self.get_pin()
+        vpn_totp: str = self.get_totp(totp_time, counter_offset)
+        token: str = self.get_token()
+        if verbose:
+            print(f"Connecting to {self.get_vpn_id()}...")
+            print(f"Pin: {pin}; TOTP: {vpn_totp}; Token: {token}")
+        return f"{pin}{vpn_totp}{token}"
+
+    def _start(self, password: str) -> CompletedProcess:
+        """
+        Start the VPN through the Pritunl client service if it is configured, and through the CLI
+        otherwise.
+
+        Args:
+            password (str): Password that starts the VPN
+        """
+        process: CompletedProcess | None = self._request_service(
+            PritunlVpnConfig.start_endpoint, VpnOperation.CONNECT, password
+        )
+        if process is None:
+            process = run_command(
+                self._get_connect_command(password),
+                timeout=self.config.get_timeout(VpnOperation.CONNECT),
+                kill_grace_period=self.config.kill_grace_period,
+            )
+        return process
+
+    async def _start_async(self, password: str) -> CompletedProcess:
+        """
+        Start the VPN without blocking the event loop.
+
+        Args:
+            password (str): Password that starts the VPN
+        """
+        process: CompletedProcess | None = await self._request_service_async(
+            PritunlVpnConfig.start_endpoint, VpnOperation.CONNECT, password
+        )
+        if process is None:
+            process = await run_command_async(
+                self._get_connect_command(password),
+                timeout=self.config.get_timeout(VpnOperation.CONNECT),
+                kill_grace_period=self.config.kill_grace_period,
+            )
+        return process
+
+    def _get_connect_command(self, password: str) -> list[str]:
+        """
+        Build the Pritunl CLI command that starts the VPN.
+
+        Args:
+            password (str): Password that starts the VPN
+        """
+        return [self.cli_path, "start", self.get_vpn_id(), "-p", password]
+
+    def _get_disconnect_command(self) -> list[str]:
+        """
+        Build the Pritunl CLI command that stops the VPN.
+        """
+        return [self.cli_path, "stop", self.get_vpn_id()]
+
+    def _get_service_body(self, password: str | None) -> dict:
+        """
+        Build the body of a start or stop request to the Pritunl client service.
+
+        Args:
+            password (str | None): Password that starts the VPN, or None for a stop request
+        """
+        body: dict = {"id": self.get_vpn_id()}
+        if password is not None:
+            body["password"] = password
+        return body
+
+    def _request_service(
+        self, endpoint: str, operation: VpnOperation, password: str | None = None
+    ) -> CompletedProcess | None:
+        """
+        Start or stop the VPN through the Pritunl client service, if it is configured.
+
+        Args:
+            endpoint (str): "start" or "stop"
+            operation (VpnOperation): Operation whose deadline applies to the request
+            password (str | None): Password that starts the VPN, or None for a stop request
+
+        Returns:
+            CompletedProcess | None: Result of the request, or None if the CLI should be used
+                instead because the service is not configured or the request failed
+        """
+        if not PritunlServiceTransport.is_enabled(self.config):
+            return None
+        return self._complete_service_request(
+            PritunlServiceTransport.request(
+                self.config,
+                endpoint,
+                operation,
+                self.get_vpn_id(),
+                self._get_service_body(password),
+            )
+        )
+
+    async def _request_service_async(
+        self, endpoint: str, operation: VpnOperation, password: str | None = None
+    ) -> CompletedProcess | None:
+        """
+        Start or stop the VPN through the Pritunl client service without blocking the event loop.
+
+        Args:
+            endpoint (str): "start" or "stop"
+            operation (VpnOperation): Operation whose deadline applies to the request
+            password (str | None): Password that starts the VPN, or None for a stop request
+
+        Returns:
+            CompletedProcess | None: Result of the request, or None if the CLI should be used
+                instead
+        """
+        if not PritunlServiceTransport.is_enabled(self.config):
+            return None
+        return self._complete_service_request(
+            await PritunlServiceTransport.request_async(
+                self.config,
+                endpoint,
+                operation,
+                self.get_vpn_id(),
+                self._get_service_body(password),
+            )
+        )
+
+    def _complete_service_request(self, process: CompletedProcess) -> CompletedProcess | None:
+        """
+        Keep the result of a successful service request, and announce the fallback to the CLI
+        otherwise.
+        """
+        if process.returncode == 0:
+            return process
+        print(
+            f"Pritunl service request for {self.get_vpn_id()} failed, falling back to the CLI: "
+            f"{process.stderr or 'timed out'}"
+        )
+        return None
+
     def visit(self, visitor: "VpnTypeVisitor[T]") -> T:
         """
         Visit the Pritunl VPN with a VpnTypeVisitor.
@@ -142,6 +716,7 @@ class PritunlVpnModel(AbstractVpnModel):
             PritunlVpnModel._pin_key: self.get_pin(),
             PritunlVpnModel._totp_url_key: self.totp_url,
             PritunlVpnModel._token_key: self.get_token(),
+            **self._scheduling_to_json(),
         }
 
     @staticmethod
@@ -155,4 +730,4 @@ class PritunlVpnModel(AbstractVpnModel):
             pin=json.get(PritunlVpnModel._pin_key, ""),
             totp_url=json.get(PritunlVpnModel._totp_url_key, ""),
             token=json.get(PritunlVpnModel._token_key, ""),
-        )
+        ).load_scheduling_json(json)
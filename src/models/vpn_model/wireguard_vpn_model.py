@@ -0,0 +1,368 @@
+"""
+This file contains the WireguardVpnModel class, which is a concrete implementation of the
+AbstractVpnModel class.
+"""
+
+from os import path
+from subprocess import CompletedProcess
+from time import time
+
+from src.models.vpn_config.wireguard_vpn_config import WireguardVpnConfig
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.models.vpn_model.command_status_cache import CommandStatusCache
+from src.enums.vpn_operation import VpnOperation
+from src.enums.vpn_type import VpnType, VpnTypeVisitor, T
+from src.utils.command_utils import run_command, run_command_async
+
+
+class WireguardStatusCache:
+    """
+    Shares one parsed `wg show all dump` snapshot between all WireGuard VPNs using the same CLI,
+    so a status check of every interface costs a single process spawn per tick.
+    """
+
+    _interface_field_count: int = 5
+    _peer_field_count: int = 9
+    _peer_latest_handshake_index: int = 5
+
+    @staticmethod
+    def get_handshakes(config: WireguardVpnConfig, verbose: bool) -> dict[str, int] | None:
+        """
+        Get the latest handshake of every WireGuard interface that is up.
+
+        Args:
+            config (WireguardVpnConfig): Config of the wg CLI
+            verbose (bool): Whether to print the outcome of the dump process
+
+        Returns:
+            dict[str, int] | None: Latest handshake of each interface that is up, keyed by the
+                interface name, or None if they are unknown because the dump failed or timed out
+        """
+        return _STATUS_CACHE.get([config.wg_path, "show", "all", "dump"], config, verbose)
+
+    @staticmethod
+    async def get_handshakes_async(
+        config: WireguardVpnConfig, verbose: bool
+    ) -> dict[str, int] | None:
+        """
+        Get the latest handshake of every WireGuard interface that is up without blocking the
+        event loop. Concurrent callers share a single in-flight dump.
+
+        Args:
+            config (WireguardVpnConfig): Config of the wg CLI
+            verbose (bool): Whether to print the outcome of the dump process
+
+        Returns:
+            dict[str, int] | None: Latest handshake of each interface that is up, keyed by the
+                interface name, or None if they are unknown because the dump failed or timed out
+        """
+        return await _STATUS_CACHE.get_async(
+            [config.wg_path, "show", "all", "dump"], config, verbose
+        )
+
+    @staticmethod
+    def invalidate(wg_path: str) -> None:
+        """
+        Drop the snapshot of a wg CLI, e.g. after one of its interfaces was brought up or down.
+
+        Args:
+            wg_path (str): Path to the wg CLI
+        """
+        _STATUS_CACHE.invalidate([wg_path, "show", "all", "dump"])
+
+    @staticmethod
+    def parse_dump_output(output: str) -> dict[str, int]:
+        """
+        Parse the tab separated lines printed by `wg show all dump`: one line per interface,
+        followed by one line per peer of the interface.
+
+        Args:
+            output (str): Standard output of the dump process
+
+        Returns:
+            dict[str, int]: Latest handshake of each interface across all its peers, in seconds
+                since the epoch, keyed by the interface name. 0 if no peer completed a handshake
+        """
+        handshakes: dict[str, int] = {}
+        for line in (output or "").splitlines():
+            fields: list[str] = line.split("\t")
+            if len(fields) == WireguardStatusCache._interface_field_count:
+                handshakes.setdefault(fields[0], 0)
+            elif len(fields) == WireguardStatusCache._peer_field_count:
+                latest_handshake: str = fields[WireguardStatusCache._peer_latest_handshake_index]
+                handshakes[fields[0]] = max(
+                    handshakes.get(fields[0], 0),
+                    int(latest_handshake) if latest_handshake.isdigit() else 0,
+                )
+        return handshakes
+
+    @staticmethod
+    def is_alive(latest_handshake: int, handshake_timeout: float) -> bool:
+        """
+        Get whether the tunnel of an interface that is up is alive.
+
+        An interface whose peers never completed a handshake is not considered dead, as WireGuard
+        only performs a handshake once there is traffic to send.
+
+        Args:
+            latest_handshake (int): Latest handshake of the interface, 0 if there was none
+            handshake_timeout (float): Seconds after which a handshake is considered stale
+
+        Returns:
+            bool: Whether the interface completed a handshake recently enough, or never did
+        """
+        return latest_handshake == 0 or time() - latest_handshake <= handshake_timeout
+
+
+_STATUS_CACHE: CommandStatusCache[dict[str, int]] = CommandStatusCache(
+    "WireGuard status dump", WireguardStatusCache.parse_dump_output
+)
+
+
+class WireguardVpnModel(AbstractVpnModel):
+    """
+    Concrete implementation of the AbstractVpnModel class for WireGuard VPNs, brought up and down
+    with wg-quick.
+
+    Attributes:
+        id (str): Name of the WireGuard interface, or path to its wg-quick config file
+    """
+
+    __slots__ = ()
+
+    _vpn_type: VpnType = VpnType.WIREGUARD
+
+    def __init__(self, vpn_id: str, config: WireguardVpnConfig) -> None:
+        super().__init__(vpn_id=vpn_id, config=config)
+
+    @property
+    def wg_quick_path(self) -> str:
+        """Path to the wg-quick CLI, from the config shared by all WireGuard VPNs."""
+        return self.config.wg_quick_path
+
+    @property
+    def wg_path(self) -> str:
+        """Path to the wg CLI, from the config shared by all WireGuard VPNs."""
+        return self.config.wg_path
+
+    def get_vpn_type(self) -> VpnType:
+        """
+        Get the type of the WireGuard VPN.
+
+        Returns:
+            VpnType: Type of the VPN
+        """
+        return WireguardVpnModel._vpn_type
+
+    def get_interface(self) -> str:
+        """
+        Get the name of the WireGuard interface, which wg-quick derives from the config file name.
+
+        Returns:
+            str: Name of the interface
+        """
+        interface: str = path.basename(self.get_vpn_id())
+        return interface[:-len(".conf")] if interface.endswith(".conf") else interface
+
+    def connect(self, verbose: bool) -> CompletedProcess:
+        """
+        Bring the WireGuard interface up. An interface that is up with a live tunnel is left
+        alone, and one with a dead tunnel is brought down first, as wg-quick refuses to bring up
+        an interface that already exists.
+
+        Args:
+            verbose (bool): Whether to print the output of the connection process
+        """
+        is_alive: bool | None = self._is_up_and_alive(
+            WireguardStatusCache.get_handshakes(self.config, verbose)
+        )
+        if is_alive:
+            return self._skip_connect(verbose)
+        if is_alive is False:
+            self.disconnect(verbose)
+        return self._run_wg_quick("up", VpnOperation.CONNECT, verbose)
+
+    def disconnect(self, verbose: bool) -> CompletedProcess:
+        """
+        Bring the WireGuard interface down.
+
+        Args:
+            verbose (bool): Whether to print the output of the disconnection process
+        """
+        return self._run_wg_quick("down", VpnOperation.DISCONNECT, verbose)
+
+    def is_connected(self, verbose: bool) -> bool | None:
+        """
+        Probe whether the WireGuard interface is up with a live tunnel, using the snapshot shared
+        by all WireGuard VPNs.
+
+        Args:
+            verbose (bool): Whether to print the output of the status probe
+        """
+        return self._is_alive(WireguardStatusCache.get_handshakes(self.config, verbose))
+
+    async def connect_async(self, verbose: bool) -> CompletedProcess:
+        """
+        Bring the WireGuard interface up without blocking the event loop. An interface that is up
+        with a live tunnel is left alone, and one with a dead tunnel is brought down first.
+
+        Args:
+            verbose (bool): Whether to print the output of the connection process
+        """
+        is_alive: bool | None = self._is_up_and_alive(
+            await WireguardStatusCache.get_handshakes_async(self.config, verbose)
+        )
+        if is_alive:
+            return self._skip_connect(verbose)
+        if is_alive is False:
+            await self.disconnect_async(verbose)
+        return await self._run_wg_quick_async("up", VpnOperation.CONNECT, verbose)
+
+    async def disconnect_async(self, verbose: bool) -> CompletedProcess:
+        """
+        Bring the WireGuard interface down without blocking the event loop.
+
+        Args:
+            verbose (bool): Whether to print the output of the disconnection process
+        """
+        return await self._run_wg_quick_async("down", VpnOperation.DISCONNECT, verbose)
+
+    async def is_connected_async(self, verbose: bool) -> bool | None:
+        """
+        Probe whether the WireGuard interface is up with a live tunnel without blocking the event
+        loop, using the snapshot shared by all WireGuard VPNs.
+
+        Args:
+            verbose (bool): Whether to print the output of the status probe
+        """
+        return self._is_alive(
+            await WireguardStatusCache.get_handshakes_async(self.config, verbose)
+        )
+
+    def _is_alive(self, handshakes: dict[str, int] | None) -> bool | None:
+        """
+        Get whether the interface is up with a live tunnel from a status snapshot.
+
+        Args:
+            handshakes (dict[str, int] | None): Latest handshake of each interface that is up, or
+                None if unknown
+
+        Returns:
+            bool | None: Whether the tunnel is alive, or None if the status is unknown
+        """
+        if handshakes is None:
+            return None
+        return bool(self._is_up_and_alive(handshakes))
+
+    def _is_up_and_alive(self, handshakes: dict[str, int] | None) -> bool | None:
+        """
+        Get whether the interface, if it is up, has a live tunnel.
+
+        Args:
+            handshakes (dict[str, int] | None): Latest handshake of each interface that is up, or
+                None if unknown
+
+        Returns:
+            bool | None: Whether the tunnel of the interface is alive, or None if the interface is
+                down or its status is unknown
+        """
+        latest_handshake: int | None = (handshakes or {}).get(self.get_interface())
+        if latest_handshake is None:
+            return None
+        return WireguardStatusCache.is_alive(latest_handshake, self.config.handshake_timeout)
+
+    def _skip_connect(self, verbose: bool) -> CompletedProcess:
+        """
+        Report that the interface is already up with a live tunnel, without running wg-quick.
+
+        Args:
+            verbose (bool): Whether to print that the connection is skipped
+
+        Returns:
+            CompletedProcess: Successful process standing for the connection
+        """
+        if verbose:
+            print(f"{self.get_vpn_id()} is already connected, skipping.")
+        return CompletedProcess([self.wg_quick_path, "up", self.get_vpn_id()], 0, "", "")
+
+    def _run_wg_quick(
+        self, action: str, operation: VpnOperation, verbose: bool
+    ) -> CompletedProcess:
+        """
+        Bring the interface up or down with wg-quick.
+
+        Args:
+            action (str): "up" or "down"
+            operation (VpnOperation): Operation whose deadline applies
+            verbose (bool): Whether to print the output of the process
+        """
+        if verbose:
+            print(f"Bringing {self.get_vpn_id()} {action}...")
+        process: CompletedProcess = run_command(
+            [self.wg_quick_path, action, self.get_vpn_id()],
+            timeout=self.config.get_timeout(operation),
+            kill_grace_period=self.config.kill_grace_period,
+        )
+        return self._complete_wg_quick(action, process, verbose)
+
+    async def _run_wg_quick_async(
+        self, action: str, operation: VpnOperation, verbose: bool
+    ) -> CompletedProcess:
+        """
+        Bring the interface up or down with wg-quick without blocking the event loop.
+
+        Args:
+            action (str): "up" or "down"
+            operation (VpnOperation): Operation whose deadline applies
+            verbose (bool): Whether to print the output of the process
+        """
+        if verbose:
+            print(f"Bringing {self.get_vpn_id()} {action}...")
+        process: CompletedProcess = await run_command_async(
+            [self.wg_quick_path, action, self.get_vpn_id()],
+            timeout=self.config.get_timeout(operation),
+            kill_grace_period=self.config.kill_grace_period,
+        )
+        return self._complete_wg_quick(action, process, verbose)
+
+    def _complete_wg_quick(
+        self, action: str, process: CompletedProcess, verbose: bool
+    ) -> CompletedProcess:
+        """
+        Drop the outdated status snapshot after wg-quick ran, and report its outcome.
+
+        Args:
+            action (str): "up" or "down"
+            process (CompletedProcess): Result of the wg-quick process
+            verbose (bool): Whether to print the output of the process
+        """
+        WireguardStatusCache.invalidate(self.wg_path)
+        if verbose:
+            print(f"wg-quick {action} of {self.get_vpn_id()} completed!")
+            print(f"Result: {process.stdout}; Error: {process.stderr}")
+        return process
+
+    def visit(self, visitor: "VpnTypeVisitor[T]") -> T:
+        """
+        Visit the WireGuard VPN with a VpnTypeVisitor.
+
+        Args:
+            visitor (VpnTypeVisitor): Visitor to visit the WireGuard VPN with
+        """
+        return visitor.visit_wireguard()
+
+    def to_json(self) -> dict:
+        return {
+            WireguardVpnModel._vpn_id_key: self.get_vpn_id(),
+            WireguardVpnModel.vpn_type_key: self.get_vpn_type().value,
+            **self._scheduling_to_json(),
+        }
+
+    @staticmethod
+    def from_json_with_config(json: dict, config: WireguardVpnConfig) -> "WireguardVpnModel":
+        vpn_type: VpnType = VpnType(json.get(WireguardVpnModel.vpn_type_key))
+        if vpn_type != WireguardVpnModel._vpn_type:
+            raise ValueError(f"Invalid VPN type {vpn_type}")
+        return WireguardVpnModel(
+            vpn_id=json.get(WireguardVpnModel._vpn_id_key), config=config
+        ).load_scheduling_json(json)
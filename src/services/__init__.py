@@ -2,4 +2,13 @@
 This module contains all the services used by the application.
 '''
 
+from src.services.vpn_backend_registry import VpnBackend, VpnBackendRegistry
+from src.services.vpn_data_snapshot_service import VpnDataSnapshotService
 from src.services.vpn_parser_service import VpnDataParserService
+from src.services.vpn_fleet_service import VpnFleetService
+from src.services.vpn_supervisor_service import VpnSupervisorService
+from src.services.vpn_data_watcher_service import VpnDataWatcherService
+from src.services.vpn_metrics_service import VpnMetricsService
+from src.services.vpn_daemon_service import VpnDaemonService
+from src.services.vpn_daemon_client_service import VpnDaemonClientService
+from src.services.vpn_connect_history_service import VpnConnectHistoryService
@@ -0,0 +1,164 @@
+"""
+Module for looking up the model and config classes of every VPN type, importing them on first use
+"""
+
+from typing import Callable
+
+from src.enums.vpn_type import VpnType
+from src.models.vpn_config.abstract_vpn_config import AbstractVpnConfig
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+
+# The backends are imported inside their loaders on purpose, so that only the backends actually
+# used by the VPN data are ever imported. PyInstaller still finds these imports.
+# pylint: disable=import-outside-toplevel
+
+
+class VpnBackend:
+    """
+    Model and config classes implementing one VPN type
+
+    Attributes:
+        model_class (type[AbstractVpnModel]): Class of the VPNs of the type
+        config_class (type[AbstractVpnConfig]): Class of the config of the type
+    """
+
+    __slots__ = ("model_class", "config_class")
+
+    def __init__(
+        self, model_class: type[AbstractVpnModel], config_class: type[AbstractVpnConfig]
+    ) -> None:
+        self.model_class: type[AbstractVpnModel] = model_class
+        self.config_class: type[AbstractVpnConfig] = config_class
+
+    def parse_config(self, config_json: dict | None) -> AbstractVpnConfig:
+        """
+        Parse the config of the VPN type from JSON.
+
+        Args:
+            config_json (dict | None): JSON of the config, or None for the default config
+
+        Returns:
+            AbstractVpnConfig: Parsed config
+        """
+        return self.config_class.from_json(config_json if config_json else {})
+
+    def parse_vpn(self, vpn_json: dict, config: AbstractVpnConfig) -> AbstractVpnModel:
+        """
+        Parse a VPN of the type from JSON.
+
+        Args:
+            vpn_json (dict): JSON of the VPN
+            config (AbstractVpnConfig): Already parsed config of the VPN type
+
+        Returns:
+            AbstractVpnModel: Parsed VPN
+        """
+        return self.model_class.from_json_with_config(vpn_json, config)
+
+
+def _load_pritunl_backend() -> VpnBackend:
+    """Import the Pritunl backend."""
+    from src.models.vpn_config.pritunl_vpn_config import PritunlVpnConfig
+    from src.models.vpn_model.pritunl_vpn_model import PritunlVpnModel
+
+    return VpnBackend(PritunlVpnModel, PritunlVpnConfig)
+
+
+def _load_wireguard_backend() -> VpnBackend:
+    """Import the WireGuard backend."""
+    from src.models.vpn_config.wireguard_vpn_config import WireguardVpnConfig
+    from src.models.vpn_model.wireguard_vpn_model import WireguardVpnModel
+
+    return VpnBackend(WireguardVpnModel, WireguardVpnConfig)
+
+
+def _load_open_vpn_backend() -> VpnBackend:
+    """Import the OpenVPN backend."""
+    from src.models.vpn_config.open_vpn_config import OpenVpnConfig
+    from src.models.vpn_model.open_vpn_model import OpenVpnModel
+
+    return VpnBackend(OpenVpnModel, OpenVpnConfig)
+
+
+def _load_global_protect_backend() -> VpnBackend:
+    """Import the Global Protect backend."""
+    from src.models.vpn_config.global_protect_vpn_config import GlobalProtectVpnConfig
+    from src.models.vpn_model.global_protect_vpn_model import GlobalProtectVpnModel
+
+    return VpnBackend(GlobalProtectVpnModel, GlobalProtectVpnConfig)
+
+
+class VpnBackendRegistry:
+    """
+    Registry mapping every VPN type to a loader of its backend. A backend is only imported the
+    first time a VPN of its type is looked up, so the startup cost of a run only grows with the
+    VPN types it actually uses.
+    """
+
+    def __init__(self) -> None:
+        self._loaders: dict[VpnType, Callable[[], VpnBackend]] = {}
+        self._backends: dict[VpnType, VpnBackend] = {}
+
+    @staticmethod
+    def create_default() -> "VpnBackendRegistry":
+        """
+        Create a registry of all the VPN types supported by the application.
+
+        Returns:
+            VpnBackendRegistry: Registry of the supported VPN types
+        """
+        registry: VpnBackendRegistry = VpnBackendRegistry()
+        registry.register(VpnType.PRITUNL, _load_pritunl_backend)
+        registry.register(VpnType.WIREGUARD, _load_wireguard_backend)
+        registry.register(VpnType.OPEN_VPN, _load_open_vpn_backend)
+        registry.register(VpnType.GLOBAL_PROTECT, _load_global_protect_backend)
+        return registry
+
+    def register(self, vpn_type: VpnType, loader: Callable[[], VpnBackend]) -> None:
+        """
+        Register the backend of a VPN type, replacing any backend already registered for it.
+
+        Args:
+            vpn_type (VpnType): VPN type implemented by the backend
+            loader (Callable[[], VpnBackend]): Imports and returns the backend on first use
+        """
+        self._loaders[vpn_type] = loader
+        self._backends.pop(vpn_type, None)
+
+    def is_loaded(self, vpn_type: VpnType) -> bool:
+        """
+        Get whether the backend of a VPN type was already imported.
+
+        Args:
+            vpn_type (VpnType): VPN type to check
+
+        Returns:
+            bool: Whether the backend was looked up at least once
+        """
+        return vpn_type in self._backends
+
+    def get_backend(self, vpn_type: VpnType) -> VpnBackend:
+        """
+        Get the backend of a VPN type, importing it if this is the first time it is needed.
+
+        Args:
+            vpn_type (VpnType): VPN type to get the backend of
+
+        Returns:
+            VpnBackend: Backend of the VPN type
+
+        Raises:
+            ValueError: If the VPN type is not specified
+            NotImplementedError: If no backend is registered for the VPN type
+        """
+        backend: VpnBackend | None = self._backends.get(vpn_type)
+        if backend is not None:
+            return backend
+        if vpn_type == VpnType.NONE:
+            raise ValueError("Invalid VPN type")
+        loader: Callable[[], VpnBackend] | None = self._loaders.get(vpn_type)
+        if loader is None:
+            raise NotImplementedError(f"{vpn_type.value} VPNs are not supported")
+        backend = loader()
+        self._backends[vpn_type] = backend
+        return backend
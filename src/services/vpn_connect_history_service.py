@@ -0,0 +1,187 @@
+"""
+Module for remembering how long VPN connections took, to start the slowest ones first
+"""
+
+from json import JSONDecodeError, dump, load
+from os import O_CREAT, O_EXCL, O_WRONLY, fdopen, getpid, makedirs
+from os import open as open_fd, path, replace, unlink
+from subprocess import CompletedProcess
+from typing import Iterable
+
+from src.enums.vpn_type import VpnType
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.services.vpn_data_snapshot_service import VpnDataSnapshotService
+
+
+class VpnConnectHistoryService:
+    """
+    Service remembering the connection latency of every VPN across runs, and ordering the
+    connections of a run so that the VPNs expected to take longest start first.
+
+    Under a concurrency limit, a slow VPN that starts last keeps the run going long after the
+    others are done. Starting the longest connections first (the LPT rule) keeps the time until
+    every VPN is connected close to the shortest possible.
+
+    The latency of every VPN is an exponentially weighted moving average of its successful
+    connections, keyed by its global ID and stored as JSON in the cache directory. A history that
+    cannot be read is ignored, and one that cannot be written is skipped, as it is only an
+    optimisation.
+
+    Attributes:
+        history_path (str): Path of the JSON file holding the latencies
+        smoothing (float): Weight of the latest connection in the moving average, between 0
+            and 1
+    """
+
+    _format_version: int = 1
+    _file_name: str = "connect_latencies.json"
+    _default_smoothing: float = 0.3
+    _version_key: str = "version"
+    _latencies_key: str = "latencies"
+
+    def __init__(
+        self, history_path: str | None = None, smoothing: float = _default_smoothing
+    ) -> None:
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"Invalid smoothing {smoothing}")
+        self.history_path: str = history_path if history_path else self.get_default_history_path()
+        self.smoothing: float = smoothing
+        self._latencies: dict[str, float] | None = None
+
+    @staticmethod
+    def get_default_history_path() -> str:
+        """
+        Get the default path of the history, next to the snapshots of the VPN data.
+
+        Returns:
+            str: Path of the history in the default cache directory
+        """
+        return path.join(
+            VpnDataSnapshotService.get_default_cache_dir(), VpnConnectHistoryService._file_name
+        )
+
+    def get_latency(self, vpn: AbstractVpnModel) -> float | None:
+        """
+        Get the expected connection latency of a VPN.
+
+        Args:
+            vpn (AbstractVpnModel): VPN to get the latency of
+
+        Returns:
+            float | None: Expected latency in seconds, or None if the VPN never connected
+        """
+        return self._get_latencies().get(vpn.get_global_vpn_id())
+
+    def observe_connect(
+        self, vpn: AbstractVpnModel, duration: float, result: CompletedProcess
+    ) -> None:
+        """
+        Record how long a connection took. Failed connections are not recorded, as they can fail
+        much faster or slower than a connection that goes through.
+
+        Args:
+            vpn (AbstractVpnModel): VPN that was connected
+            duration (float): Seconds the connection took
+            result (CompletedProcess): Result of the connection
+        """
+        if result.returncode != 0:
+            return
+        latencies: dict[str, float] = self._get_latencies()
+        global_vpn_id: str = vpn.get_global_vpn_id()
+        previous: float | None = latencies.get(global_vpn_id)
+        latencies[global_vpn_id] = (
+            duration if previous is None
+            else self.smoothing * duration + (1 - self.smoothing) * previous
+        )
+
+    def order_for_connect(self, vpns: Iterable[AbstractVpnModel]) -> list[AbstractVpnModel]:
+        """
+        Order VPNs to be connected by descending priority, then by descending expected latency.
+        A VPN that never connected is expected to take as long as the average VPN of its type, or
+        of any type if none of its type connected before. VPNs that tie keep their order.
+
+        Args:
+            vpns (Iterable[AbstractVpnModel]): VPNs to connect
+
+        Returns:
+            list[AbstractVpnModel]: VPNs in the order to start their connections in
+        """
+        vpn_list: list[AbstractVpnModel] = list(vpns)
+        known: dict[str, float] = {
+            vpn.get_global_vpn_id(): latency
+            for vpn in vpn_list
+            if (latency := self.get_latency(vpn)) is not None
+        }
+        type_latencies: dict[VpnType, list[float]] = {}
+        for vpn in vpn_list:
+            if vpn.get_global_vpn_id() in known:
+                type_latencies.setdefault(vpn.get_vpn_type(), []).append(
+                    known[vpn.get_global_vpn_id()]
+                )
+        default_latency: float = sum(known.values()) / len(known) if known else 0.0
+
+        def get_expected_latency(vpn: AbstractVpnModel) -> float:
+            if vpn.get_global_vpn_id() in known:
+                return known[vpn.get_global_vpn_id()]
+            latencies: list[float] | None = type_latencies.get(vpn.get_vpn_type())
+            return sum(latencies) / len(latencies) if latencies else default_latency
+
+        return sorted(
+            vpn_list, key=lambda vpn: (-vpn.get_priority(), -get_expected_latency(vpn))
+        )
+
+    def save(self) -> None:
+        """
+        Atomically write the history, readable and writable only by the current user.
+        """
+        if self._latencies is None:
+            return
+        temporary_path: str = f"{self.history_path}.{getpid()}.tmp"
+        try:
+            makedirs(path.dirname(self.history_path) or ".", mode=0o700, exist_ok=True)
+            with fdopen(open_fd(temporary_path, O_WRONLY | O_CREAT | O_EXCL, 0o600), "w") as file:
+                dump({
+                    VpnConnectHistoryService._version_key: self._format_version,
+                    VpnConnectHistoryService._latencies_key: self._latencies,
+                }, file)
+            replace(temporary_path, self.history_path)
+        except OSError:
+            try:
+                unlink(temporary_path)
+            except OSError:
+                pass
+
+    def _get_latencies(self) -> dict[str, float]:
+        """
+        Get the latencies of the history, reading them on first use.
+
+        Returns:
+            dict[str, float]: Expected latency of every VPN that connected, by global ID
+        """
+        if self._latencies is None:
+            self._latencies = self._read()
+        return self._latencies
+
+    def _read(self) -> dict[str, float]:
+        """
+        Read the latencies of the history file.
+
+        Returns:
+            dict[str, float]: Latencies of the file, or none if it is missing, corrupt or outdated
+        """
+        try:
+            with open(self.history_path, "r", encoding="utf-8") as file:
+                history: object = load(file)
+        except (OSError, JSONDecodeError, UnicodeDecodeError):
+            return {}
+        if (
+            not isinstance(history, dict)
+            or history.get(VpnConnectHistoryService._version_key) != self._format_version
+            or not isinstance(history.get(VpnConnectHistoryService._latencies_key), dict)
+        ):
+            return {}
+        return {
+            global_vpn_id: float(latency)
+            for global_vpn_id, latency in history[VpnConnectHistoryService._latencies_key].items()
+            if isinstance(latency, (int, float)) and not isinstance(latency, bool) and latency >= 0
+        }
@@ -0,0 +1,86 @@
+"""
+Module for sending VPN commands to a running daemon
+"""
+
+from json import dumps, loads
+from os import path
+from socket import AF_UNIX, SOCK_STREAM, socket
+
+from src.services.vpn_daemon_service import VpnDaemonService
+
+
+class VpnDaemonClientService:
+    """
+    Service for sending commands to the daemon listening on a Unix domain socket, so that the
+    command line only pays for a socket round trip when a daemon is running.
+
+    Attributes:
+        socket_path (str): Path of the Unix domain socket of the daemon
+        timeout (float | None): Seconds to wait for the daemon to answer, or None to wait until
+            its command completes
+    """
+
+    _read_size: int = 65536
+
+    def __init__(self, socket_path: str | None = None, timeout: float | None = None) -> None:
+        self.socket_path: str = (
+            socket_path if socket_path else VpnDaemonService.get_default_socket_path()
+        )
+        self.timeout: float | None = timeout
+
+    def is_daemon_running(self) -> bool:
+        """
+        Get whether a daemon is listening on the socket.
+
+        Returns:
+            bool: Whether the socket accepts connections
+        """
+        if not path.exists(self.socket_path):
+            return False
+        with socket(AF_UNIX, SOCK_STREAM) as client:
+            try:
+                client.connect(self.socket_path)
+            except OSError:
+                return False
+        return True
+
+    def send(
+        self, command: str, vpn_ids: list[str] | None = None, vpn_data_path: str | None = None
+    ) -> dict:
+        """
+        Send a command to the daemon and wait for its results.
+
+        Args:
+            command (str): Command to run, one of the commands of VpnDaemonService
+            vpn_ids (list[str] | None): IDs or global IDs of the VPNs to run the command on, or
+                None for every VPN
+            vpn_data_path (str | None): Path to the VPN data JSON file the command is meant for,
+                which the daemon must be serving, or None to use whichever file it serves
+
+        Raises:
+            OSError: If the daemon cannot be reached or closes the connection before answering
+            ValueError: If the daemon rejects the command, or serves another VPN data JSON file
+
+        Returns:
+            dict: Results of the command by global VPN ID, or the difference and the number of
+                VPNs after a "reload"
+        """
+        request: dict = {VpnDaemonService.command_key: command}
+        if vpn_ids:
+            request[VpnDaemonService.vpn_ids_key] = vpn_ids
+        if vpn_data_path:
+            request[VpnDaemonService.vpn_data_path_key] = path.realpath(vpn_data_path)
+        with socket(AF_UNIX, SOCK_STREAM) as client:
+            client.settimeout(self.timeout)
+            client.connect(self.socket_path)
+            client.sendall(dumps(request).encode("utf-8") + b"\n")
+            response: bytes = b""
+            while not response.endswith(b"\n"):
+                chunk: bytes = client.recv(VpnDaemonClientService._read_size)
+                if not chunk:
+                    raise ConnectionError(f"The daemon on {self.socket_path} closed the connection")
+                response += chunk
+        json: dict = loads(response)
+        if not json.get(VpnDaemonService.ok_key):
+            raise ValueError(json.get(VpnDaemonService.error_key, "Command rejected"))
+        return json[VpnDaemonService.results_key]
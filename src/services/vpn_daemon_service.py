@@ -0,0 +1,291 @@
+"""
+Module for serving VPN actions to local clients from a long-running daemon
+"""
+
+from asyncio import AbstractEventLoop, AbstractServer, Event, StreamReader, StreamWriter
+from asyncio import get_running_loop, start_unix_server
+from json import JSONDecodeError, dumps, loads
+from os import chmod, environ, makedirs, path, unlink
+from signal import SIGTERM
+from socket import AF_UNIX, SOCK_STREAM, socket
+from subprocess import CompletedProcess
+from typing import Callable
+
+from src.models.runner_config import RunnerConfig
+from src.models.vpn_data_diff import VpnDataDiff
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.services.vpn_data_snapshot_service import VpnDataSnapshotService
+from src.services.vpn_fleet_service import VpnFleetService
+from src.services.vpn_parser_service import VpnDataParserService
+
+
+class VpnDaemonService:
+    """
+    Service keeping the parsed VPNs in memory and running the commands of local clients on them,
+    received over a Unix domain socket, so that toggling a VPN costs a socket round trip rather
+    than starting the interpreter and parsing the VPN data JSON file.
+
+    Every request and response is a JSON object on its own line. A request has a "command", one
+    of "connect", "disconnect", "status" or "reload", and optionally the "vpn_ids" to run it on,
+    by ID or global ID, defaulting to every VPN. A response has "ok", and either the "results" of
+    the command or an "error". The results of a VPN command are the return code of each action, or
+    whether each VPN is connected, by global VPN ID.
+
+    A request can name the "vpn_data_path" its client was asked to act on, and is rejected unless
+    it is the VPN data JSON file of the daemon, so that a client never acts on the VPNs of another
+    file.
+
+    The socket is only accessible to the current user.
+
+    Attributes:
+        vpn_data_json_path (str): Path to the VPN data JSON file, read again on "reload"
+        parser_service (VpnDataParserService): Parser for the VPN data JSON file
+        fleet_service (VpnFleetService): Fleet service running the actions on the VPNs
+        socket_path (str): Path of the Unix domain socket to listen on
+    """
+
+    connect_command: str = "connect"
+    disconnect_command: str = "disconnect"
+    status_command: str = "status"
+    reload_command: str = "reload"
+    command_key: str = "command"
+    vpn_ids_key: str = "vpn_ids"
+    vpn_data_path_key: str = "vpn_data_path"
+    ok_key: str = "ok"
+    results_key: str = "results"
+    error_key: str = "error"
+    _socket_name: str = "auto_vpn_connect.sock"
+    _reload_errors: tuple[type[Exception], ...] = (
+        OSError, JSONDecodeError, KeyError, ValueError, TypeError, AttributeError,
+        NotImplementedError
+    )
+
+    def __init__(
+        self,
+        vpn_data_json_path: str,
+        parser_service: VpnDataParserService,
+        fleet_service: VpnFleetService,
+        socket_path: str | None = None
+    ) -> None:
+        self.vpn_data_json_path: str = vpn_data_json_path
+        self.parser_service: VpnDataParserService = parser_service
+        self.fleet_service: VpnFleetService = fleet_service
+        self.socket_path: str = socket_path if socket_path else self.get_default_socket_path()
+        self._vpns: list[AbstractVpnModel] = []
+
+    @staticmethod
+    def get_default_socket_path() -> str:
+        """
+        Get the default path of the daemon socket.
+
+        Returns:
+            str: $XDG_RUNTIME_DIR/auto_vpn_connect.sock, or a socket in the snapshot cache
+                directory if it is not set
+        """
+        runtime_dir: str | None = environ.get("XDG_RUNTIME_DIR")
+        if runtime_dir:
+            return path.join(runtime_dir, VpnDaemonService._socket_name)
+        return path.join(
+            VpnDataSnapshotService.get_default_cache_dir(), VpnDaemonService._socket_name
+        )
+
+    def get_vpns(self) -> list[AbstractVpnModel]:
+        """
+        Get the VPNs the daemon runs commands on.
+
+        Returns:
+            list[AbstractVpnModel]: VPNs of the daemon
+        """
+        return list(self._vpns)
+
+    def load(self, vpns: list[AbstractVpnModel]) -> None:
+        """
+        Replace the VPNs the daemon runs commands on.
+
+        Args:
+            vpns (list[AbstractVpnModel]): VPNs parsed from the VPN data JSON file
+        """
+        self._vpns = list(vpns)
+
+    async def serve(self, verbose: bool) -> None:
+        """
+        Serve the commands of local clients, until cancelled or terminated by SIGTERM.
+
+        Args:
+            verbose (bool): Whether to print the output of the commands
+
+        Raises:
+            OSError: If another daemon is already listening on the socket, or it cannot be created
+        """
+        self._remove_stale_socket()
+        makedirs(path.dirname(self.socket_path) or ".", mode=0o700, exist_ok=True)
+        server: AbstractServer = await start_unix_server(
+            lambda reader, writer: self._handle_client(reader, writer, verbose),
+            path=self.socket_path
+        )
+        chmod(self.socket_path, 0o600)
+        print(f"Listening on {self.socket_path} with {len(self._vpns)} VPNs")
+        terminated: Event = Event()
+        loop: AbstractEventLoop = get_running_loop()
+        loop.add_signal_handler(SIGTERM, terminated.set)
+        try:
+            async with server:
+                await terminated.wait()
+        finally:
+            loop.remove_signal_handler(SIGTERM)
+            try:
+                unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+    async def handle_request(self, request: dict, verbose: bool) -> dict:
+        """
+        Run the command of a client request.
+
+        Args:
+            request (dict): Request of the client
+            verbose (bool): Whether to print the output of the command
+
+        Returns:
+            dict: Response to the client
+        """
+        vpn_data_path: object = request.get(VpnDaemonService.vpn_data_path_key)
+        if vpn_data_path is not None and (
+            not isinstance(vpn_data_path, str)
+            or path.realpath(vpn_data_path) != path.realpath(self.vpn_data_json_path)
+        ):
+            return VpnDaemonService._get_error_response(
+                f"The daemon serves {path.realpath(self.vpn_data_json_path)}, "
+                f"not {vpn_data_path!r}"
+            )
+        command: object = request.get(VpnDaemonService.command_key)
+        if command == VpnDaemonService.reload_command:
+            return self._reload(verbose)
+        handlers: dict[str, Callable] = {
+            VpnDaemonService.connect_command: self.fleet_service.connect_all,
+            VpnDaemonService.disconnect_command: self.fleet_service.disconnect_all,
+            VpnDaemonService.status_command: self.fleet_service.get_statuses,
+        }
+        if command not in handlers:
+            return VpnDaemonService._get_error_response(f"Unknown command {command!r}")
+        vpn_ids: object = request.get(VpnDaemonService.vpn_ids_key)
+        if vpn_ids is not None and (
+            not isinstance(vpn_ids, list) or not all(isinstance(vpn_id, str) for vpn_id in vpn_ids)
+        ):
+            return VpnDaemonService._get_error_response(f"Invalid VPN IDs {vpn_ids!r}")
+        try:
+            vpns: list[AbstractVpnModel] = (
+                VpnFleetService.select(self._vpns, vpn_ids) if vpn_ids else list(self._vpns)
+            )
+        except ValueError as error:
+            return VpnDaemonService._get_error_response(str(error))
+        results: list[CompletedProcess | bool | None] = await handlers[command](vpns, verbose)
+        return {
+            VpnDaemonService.ok_key: True,
+            VpnDaemonService.results_key: {
+                vpn.get_global_vpn_id(): (
+                    result.returncode if isinstance(result, CompletedProcess) else result
+                )
+                for vpn, result in zip(vpns, results)
+            },
+        }
+
+    def _reload(self, verbose: bool) -> dict:
+        """
+        Read the VPN data JSON file again, replace the VPNs of the daemon and apply the limits of
+        its runner config to the later connections. The connections are left as they are.
+
+        A file that cannot be read or parsed is reported and leaves the VPNs of the daemon as they
+        were.
+
+        Returns:
+            dict: Response with the difference between the old and the new VPNs
+        """
+        try:
+            new_vpns: list[AbstractVpnModel] = self.parser_service.parse_vpn_data_file(
+                self.vpn_data_json_path, verbose
+            )
+            runner_config: RunnerConfig = self.parser_service.parse_runner_config_file(
+                self.vpn_data_json_path
+            )
+        except VpnDaemonService._reload_errors as error:
+            return VpnDaemonService._get_error_response(
+                f"Cannot reload {self.vpn_data_json_path}: {error!r}"
+            )
+        diff: VpnDataDiff = VpnDataDiff.from_vpn_lists(self._vpns, new_vpns)
+        self.load(new_vpns)
+        self.fleet_service.set_runner_config(runner_config)
+        return {
+            VpnDaemonService.ok_key: True,
+            VpnDaemonService.results_key: {"diff": str(diff), "vpn_count": len(new_vpns)},
+        }
+
+    async def _handle_client(
+        self, reader: StreamReader, writer: StreamWriter, verbose: bool
+    ) -> None:
+        """
+        Answer every request of a client, until it closes its connection.
+
+        Args:
+            reader (StreamReader): Requests of the client
+            writer (StreamWriter): Responses to the client
+            verbose (bool): Whether to print the output of the commands
+        """
+        try:
+            while line := await reader.readline():
+                response: dict = await self._respond(line, verbose)
+                writer.write(dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError) as error:
+            print(f"Dropping daemon client: {error!r}")
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes, verbose: bool) -> dict:
+        """
+        Answer a request line of a client.
+
+        Args:
+            line (bytes): JSON request of the client
+            verbose (bool): Whether to print the output of the command
+
+        Returns:
+            dict: Response to the client
+        """
+        try:
+            request: object = loads(line)
+        except ValueError as error:
+            return VpnDaemonService._get_error_response(f"Invalid request: {error}")
+        if not isinstance(request, dict):
+            return VpnDaemonService._get_error_response(f"Invalid request {request!r}")
+        return await self.handle_request(request, verbose)
+
+    def _remove_stale_socket(self) -> None:
+        """
+        Remove the socket left behind by a daemon that did not exit cleanly.
+
+        Raises:
+            OSError: If a daemon is still listening on the socket
+        """
+        if not path.exists(self.socket_path):
+            return
+        with socket(AF_UNIX, SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.socket_path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                unlink(self.socket_path)
+                return
+        raise OSError(f"A daemon is already listening on {self.socket_path}")
+
+    @staticmethod
+    def _get_error_response(error: str) -> dict:
+        """
+        Get the response to a request that failed.
+
+        Args:
+            error (str): Reason the request failed
+
+        Returns:
+            dict: Response to the client
+        """
+        return {VpnDaemonService.ok_key: False, VpnDaemonService.error_key: error}
@@ -0,0 +1,186 @@
+"""
+Module for caching parsed VPN data between runs
+"""
+
+from hashlib import sha256
+from os import O_CREAT, O_EXCL, O_WRONLY, environ, fdopen, fstat, getpid, getuid, makedirs
+from os import open as open_fd, path, replace, stat_result, unlink
+from pickle import HIGHEST_PROTOCOL, dump, load
+from typing import Callable
+
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+
+
+class VpnDataSnapshotService:
+    """
+    Service for caching the VPN models parsed from a VPN data JSON file, so that later runs on the
+    same, unchanged file skip parsing it.
+
+    A snapshot is written after every successful full parse, and is only trusted while the
+    modification time and size of the file match it, or while the SHA-256 of the file's content
+    does. A stale, corrupt or foreign snapshot is ignored and the file is parsed again.
+
+    Snapshots are pickled, so they are only read if they belong to the current user and are not
+    writable by anyone else.
+
+    Attributes:
+        cache_dir (str): Directory the snapshots are stored in
+    """
+
+    _format_version: int = 4
+    _application_name: str = "auto_vpn_connect"
+
+    def __init__(self, cache_dir: str | None = None) -> None:
+        self.cache_dir: str = cache_dir if cache_dir else self.get_default_cache_dir()
+
+    @staticmethod
+    def get_default_cache_dir() -> str:
+        """
+        Get the default directory for snapshots, following the XDG base directory specification.
+
+        Returns:
+            str: $XDG_CACHE_HOME/auto_vpn_connect, or ~/.cache/auto_vpn_connect if it is not set
+        """
+        cache_home: str = environ.get("XDG_CACHE_HOME") or path.join(
+            path.expanduser("~"), ".cache"
+        )
+        return path.join(cache_home, VpnDataSnapshotService._application_name)
+
+    def get_snapshot_path(self, vpn_data_json_path: str) -> str:
+        """
+        Get the path of the snapshot of a VPN data JSON file.
+
+        Args:
+            vpn_data_json_path (str): Path to the VPN data JSON file
+
+        Returns:
+            str: Path of the snapshot, unique for the resolved path of the file
+        """
+        key: str = sha256(path.realpath(vpn_data_json_path).encode("utf-8")).hexdigest()
+        return path.join(self.cache_dir, f"{key[:32]}.snapshot")
+
+    def load_or_parse(
+        self,
+        vpn_data_json_path: str,
+        parse: Callable[[str], list[AbstractVpnModel]],
+        verbose: bool = False
+    ) -> list[AbstractVpnModel]:
+        """
+        Load the VPN models of a VPN data JSON file from its snapshot, or parse the file and
+        snapshot the result if there is no valid snapshot.
+
+        Args:
+            vpn_data_json_path (str): Path to the VPN data JSON file
+            parse (Callable[[str], list[AbstractVpnModel]]): Parses the content of the file
+            verbose (bool): Whether to print whether the snapshot was used
+
+        Returns:
+            list[AbstractVpnModel]: VPN models of the file
+        """
+        snapshot_path: str = self.get_snapshot_path(vpn_data_json_path)
+        with open(vpn_data_json_path, "rb") as file:
+            file_stat: stat_result = fstat(file.fileno())
+            file_signature: tuple[int, int] = (file_stat.st_mtime_ns, file_stat.st_size)
+            header: dict | None = self._read_header(snapshot_path)
+            if header and header["signature"] == file_signature:
+                vpns: list[AbstractVpnModel] | None = self._read_vpns(snapshot_path)
+                if vpns is not None:
+                    if verbose:
+                        print(f"Loaded {len(vpns)} VPNs from snapshot {snapshot_path}")
+                    return vpns
+            content: bytes = file.read()
+        digest: str = sha256(content).hexdigest()
+        vpns = (
+            self._read_vpns(snapshot_path) if header and header["digest"] == digest else None
+        )
+        if vpns is None:
+            vpns = parse(content.decode("utf-8"))
+        elif verbose:
+            print(f"Loaded {len(vpns)} VPNs from snapshot {snapshot_path}")
+        self._write(snapshot_path, {"signature": file_signature, "digest": digest}, vpns)
+        return vpns
+
+    def _read_header(self, snapshot_path: str) -> dict | None:
+        """
+        Read the header of a snapshot.
+
+        Args:
+            snapshot_path (str): Path of the snapshot
+
+        Returns:
+            dict | None: Header of the snapshot, or None if there is no usable snapshot
+        """
+        try:
+            with open(snapshot_path, "rb") as file:
+                if not VpnDataSnapshotService._is_trusted(fstat(file.fileno())):
+                    return None
+                header: dict = load(file)
+        except Exception:  # pylint: disable=broad-exception-caught
+            # A missing snapshot raises OSError, unpickling a corrupt one can raise almost anything
+            return None
+        if not isinstance(header, dict) or header.get("version") != self._format_version:
+            return None
+        return header
+
+    def _read_vpns(self, snapshot_path: str) -> list[AbstractVpnModel] | None:
+        """
+        Read the VPN models of a snapshot, after its header.
+
+        Args:
+            snapshot_path (str): Path of the snapshot
+
+        Returns:
+            list[AbstractVpnModel] | None: VPN models, or None if the snapshot is unusable
+        """
+        try:
+            with open(snapshot_path, "rb") as file:
+                if not VpnDataSnapshotService._is_trusted(fstat(file.fileno())):
+                    return None
+                load(file)
+                vpns: list[AbstractVpnModel] = load(file)
+        except Exception:  # pylint: disable=broad-exception-caught
+            # Unpickling a corrupt or outdated snapshot can raise almost anything
+            return None
+        if not isinstance(vpns, list) or not all(
+            isinstance(vpn, AbstractVpnModel) for vpn in vpns
+        ):
+            return None
+        return vpns
+
+    def _write(self, snapshot_path: str, header: dict, vpns: list[AbstractVpnModel]) -> None:
+        """
+        Atomically write a snapshot, readable and writable only by the current user. A snapshot
+        that cannot be written is skipped, as it is only an optimisation.
+
+        Args:
+            snapshot_path (str): Path of the snapshot
+            header (dict): Header identifying the file the snapshot was taken from
+            vpns (list[AbstractVpnModel]): VPN models to snapshot
+        """
+        temporary_path: str = f"{snapshot_path}.{getpid()}.tmp"
+        try:
+            makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            with fdopen(open_fd(temporary_path, O_WRONLY | O_CREAT | O_EXCL, 0o600), "wb") as file:
+                dump({"version": self._format_version, **header}, file, HIGHEST_PROTOCOL)
+                dump(vpns, file, HIGHEST_PROTOCOL)
+            replace(temporary_path, snapshot_path)
+        except Exception:  # pylint: disable=broad-exception-caught
+            # Pickling can fail for models holding unpicklable state, and the cache directory
+            # may not be writable
+            try:
+                unlink(temporary_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _is_trusted(snapshot_stat: stat_result) -> bool:
+        """
+        Get whether a snapshot is owned by the current user and not writable by anyone else.
+
+        Args:
+            snapshot_stat (stat_result): Status of the snapshot file
+
+        Returns:
+            bool: Whether the snapshot can be safely unpickled
+        """
+        return snapshot_stat.st_uid == getuid() and not snapshot_stat.st_mode & 0o022
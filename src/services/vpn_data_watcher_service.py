@@ -0,0 +1,121 @@
+"""
+Module for hot-reloading the VPN data JSON file in watch mode
+"""
+
+from asyncio import sleep
+from json import JSONDecodeError
+from os import stat_result, stat
+
+from src.models.vpn_data_diff import VpnDataDiff
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.services.vpn_fleet_service import VpnFleetService
+from src.services.vpn_parser_service import VpnDataParserService
+from src.services.vpn_supervisor_service import VpnSupervisorService
+
+
+class VpnDataWatcherService:
+    """
+    Service for hot-reloading the VPN data JSON file. The file is polled for changes, and only the
+    VPNs that were added, removed or changed are connected, disconnected or reconnected.
+
+    Attributes:
+        vpn_data_json_path (str): Path to the VPN data JSON file
+        supervisor_service (VpnSupervisorService): Supervisor keeping the VPNs connected
+        parser_service (VpnDataParserService): Parser for the VPN data JSON file
+        poll_interval (float): Seconds between two checks of the file for changes
+    """
+
+    _default_poll_interval: float = 2.0
+
+    def __init__(
+        self,
+        vpn_data_json_path: str,
+        supervisor_service: VpnSupervisorService,
+        parser_service: VpnDataParserService,
+        poll_interval: float = _default_poll_interval
+    ) -> None:
+        self.vpn_data_json_path: str = vpn_data_json_path
+        self.supervisor_service: VpnSupervisorService = supervisor_service
+        self.parser_service: VpnDataParserService = parser_service
+        self.poll_interval: float = poll_interval
+        self._file_signature: tuple[int, int, int] | None = self._get_file_signature()
+
+    async def watch(self, verbose: bool) -> None:
+        """
+        Reload the VPN data JSON file whenever it changes, until cancelled.
+
+        Args:
+            verbose (bool): Whether to print the output of the reloads
+        """
+        while True:
+            await sleep(self.poll_interval)
+            await self.reload_if_changed(verbose)
+
+    async def reload_if_changed(self, verbose: bool) -> VpnDataDiff | None:
+        """
+        Reload the VPN data JSON file if it changed since it was last read, and apply the
+        difference to the supervised VPNs.
+
+        A file that cannot be read or parsed is reported and leaves the supervised VPNs untouched.
+
+        Args:
+            verbose (bool): Whether to print the output of the reload
+
+        Returns:
+            VpnDataDiff | None: Difference that was applied, or None if the file was not reloaded
+        """
+        file_signature: tuple[int, int, int] | None = self._get_file_signature()
+        if file_signature is None or file_signature == self._file_signature:
+            return None
+        self._file_signature = file_signature
+        try:
+            with open(self.vpn_data_json_path, 'r', encoding='utf-8') as file:
+                new_vpns: list[AbstractVpnModel] = self.parser_service.parse_vpn_data(file.read())
+        except (
+            OSError, JSONDecodeError, KeyError, ValueError, TypeError, AttributeError,
+            NotImplementedError
+        ) as error:
+            print(f"Ignoring change to {self.vpn_data_json_path}: {error!r}")
+            return None
+        diff: VpnDataDiff = VpnDataDiff.from_vpn_lists(
+            self.supervisor_service.get_vpns(), new_vpns
+        )
+        await self.apply(diff, verbose)
+        return diff
+
+    async def apply(self, diff: VpnDataDiff, verbose: bool) -> None:
+        """
+        Apply a difference to the supervised VPNs. Removed VPNs are disconnected, changed VPNs are
+        disconnected and reconnected with their new data, and added VPNs are connected. Updated VPNs
+        are swapped in place, without touching their connections.
+
+        Args:
+            diff (VpnDataDiff): Difference to apply
+            verbose (bool): Whether to print the output of the connection processes
+        """
+        if diff.is_empty():
+            return
+        print(f"Reloading {self.vpn_data_json_path}: {diff}")
+        for _, new_vpn in diff.updated:
+            self.supervisor_service.replace_vpn(new_vpn)
+        outdated_vpns: list[AbstractVpnModel] = diff.removed + [old for old, _ in diff.changed]
+        for vpn in outdated_vpns:
+            self.supervisor_service.remove_vpn(vpn.get_global_vpn_id())
+        fleet_service: VpnFleetService = self.supervisor_service.fleet_service
+        await fleet_service.disconnect_all(outdated_vpns, verbose)
+        for vpn in diff.added + [new for _, new in diff.changed]:
+            self.supervisor_service.add_vpn(vpn)
+
+    def _get_file_signature(self) -> tuple[int, int, int] | None:
+        """
+        Get the modification time, size and inode of the VPN data JSON file.
+
+        Returns:
+            tuple[int, int, int] | None: Signature that changes whenever the file is modified or
+                replaced, or None if the file cannot be accessed right now
+        """
+        try:
+            file_stat: stat_result = stat(self.vpn_data_json_path)
+        except OSError:
+            return None
+        return (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino)
@@ -0,0 +1,463 @@
+"""
+Module for running actions on a fleet of VPNs under a single event loop
+"""
+
+from asyncio import AbstractEventLoop, Semaphore, Task, create_task, gather, get_running_loop
+from asyncio import sleep
+from contextlib import AsyncExitStack
+from subprocess import CompletedProcess
+from time import monotonic
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable
+
+from src.enums.vpn_operation import VpnOperation
+from src.enums.vpn_type import VpnType
+from src.models.runner_config import RunnerConfig
+from src.models.token_bucket import TokenBucket
+from src.models.vpn_dependency_graph import VpnDependencyGraph
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.utils.command_utils import TimedOutProcess
+from src.utils.single_flight_utils import SingleFlight
+
+if TYPE_CHECKING:
+    from src.services.vpn_connect_history_service import VpnConnectHistoryService
+    from src.services.vpn_metrics_service import VpnMetricsService
+
+# pylint: disable-next=R0902
+class VpnFleetService:
+    """
+    Service for running actions on a fleet of VPNs under a single event loop, with a bound on
+    how many backend CLI invocations run at once.
+
+    Attributes:
+        concurrency_limit (int): Maximum number of VPN actions running at once
+        metrics_service (VpnMetricsService | None): Service recording the latency and return code
+            of every connection and disconnection, or None to record nothing
+        runner_config (RunnerConfig): Limits on the connections running at once and on how fast
+            they start, on top of the concurrency limit
+        history_service (VpnConnectHistoryService | None): Service remembering the latency of
+            every connection for later runs, or None to remember nothing
+    """
+
+    _default_concurrency_limit: int = 8
+    _actions_semaphore_key: str = "actions"
+    _connects_semaphore_key: str = "connects"
+
+    def __init__(
+        self,
+        concurrency_limit: int = _default_concurrency_limit,
+        metrics_service: "VpnMetricsService | None" = None,
+        runner_config: RunnerConfig | None = None,
+        history_service: "VpnConnectHistoryService | None" = None
+    ) -> None:
+        if concurrency_limit < 1:
+            raise ValueError(f"Invalid concurrency limit {concurrency_limit}")
+        self.concurrency_limit: int = concurrency_limit
+        self.metrics_service: "VpnMetricsService | None" = metrics_service
+        self.runner_config: RunnerConfig = runner_config if runner_config else RunnerConfig()
+        self.history_service: "VpnConnectHistoryService | None" = history_service
+        self._connect_bucket: TokenBucket | None = VpnFleetService._create_connect_bucket(
+            self.runner_config
+        )
+        self._semaphores: dict[str, Semaphore] = {}
+        self._semaphore_loop: AbstractEventLoop | None = None
+        self._running_actions: SingleFlight[CompletedProcess | None] = SingleFlight()
+
+    def set_runner_config(self, runner_config: RunnerConfig) -> None:
+        """
+        Replace the limits on the connections, like after a reload of the VPN data JSON file.
+        Connections already running keep the slots they hold, later connections wait under the
+        new limits and rate.
+
+        Args:
+            runner_config (RunnerConfig): New limits on the connections
+        """
+        self.runner_config = runner_config
+        self._connect_bucket = VpnFleetService._create_connect_bucket(runner_config)
+        self._semaphores = {
+            key: semaphore
+            for key, semaphore in self._semaphores.items()
+            if not key.startswith(VpnFleetService._connects_semaphore_key)
+        }
+
+    async def connect_all(
+        self, vpns: Iterable[AbstractVpnModel], verbose: bool
+    ) -> list[CompletedProcess | None]:
+        """
+        Connect to all the VPNs, every VPN once the VPNs it depends on are connected.
+
+        Args:
+            vpns (Iterable[AbstractVpnModel]): VPNs to connect to
+            verbose (bool): Whether to print the output of the connection processes
+
+        Returns:
+            list[CompletedProcess | None]: Result of each connection, in the order of the VPNs
+        """
+        return await self._run_all(
+            vpns,
+            lambda vpn: self.run_bounded(vpn, vpn.connect_async, verbose, VpnOperation.CONNECT)
+        )
+
+    async def disconnect_all(
+        self, vpns: Iterable[AbstractVpnModel], verbose: bool
+    ) -> list[CompletedProcess | None]:
+        """
+        Disconnect from all the VPNs, every VPN once the VPNs depending on it are disconnected.
+
+        Args:
+            vpns (Iterable[AbstractVpnModel]): VPNs to disconnect from
+            verbose (bool): Whether to print the output of the disconnection processes
+
+        Returns:
+            list[CompletedProcess | None]: Result of each disconnection, in the order of the VPNs
+        """
+        return await self._run_all(
+            vpns,
+            lambda vpn: self.run_bounded(
+                vpn, vpn.disconnect_async, verbose, VpnOperation.DISCONNECT
+            ),
+            dependencies_first=False
+        )
+
+    async def ensure_all_connected(
+        self, vpns: Iterable[AbstractVpnModel], verbose: bool
+    ) -> list[CompletedProcess | None]:
+        """
+        Connect to the VPNs whose status probe reports them as down.
+
+        Args:
+            vpns (Iterable[AbstractVpnModel]): VPNs to keep connected
+            verbose (bool): Whether to print the output of the probes and connection processes
+
+        Returns:
+            list[CompletedProcess | None]: Result of each connection, in the order of the VPNs.
+                None if the VPN was already connected or its status is unknown.
+        """
+        return await self._run_all(vpns, lambda vpn: self.ensure_connected(vpn, verbose))
+
+    async def ensure_connected(
+        self,
+        vpn: AbstractVpnModel,
+        verbose: bool,
+        dependencies: Iterable[AbstractVpnModel] = ()
+    ) -> CompletedProcess | None:
+        """
+        Connect to a VPN if its status probe reports it as down. The probe runs like any other
+        action, and the connection is subject to the connection limits of the runner config.
+
+        Before connecting, the VPNs it depends on are connected one after the other if they are
+        down too. If one of them fails to connect, the VPN is not connected.
+
+        Args:
+            vpn (AbstractVpnModel): VPN to keep connected
+            verbose (bool): Whether to print the output of the probe and connection process
+            dependencies (Iterable[AbstractVpnModel]): VPNs to connect first, every VPN after its
+                own dependencies
+
+        Returns:
+            CompletedProcess | None: Result of the connection, or of the probe if it failed with
+                an error. None if the VPN was already connected or its status is unknown.
+        """
+        _, result = await self.check_connected(vpn, verbose, dependencies)
+        return result
+
+    async def check_connected(
+        self,
+        vpn: AbstractVpnModel,
+        verbose: bool,
+        dependencies: Iterable[AbstractVpnModel] = ()
+    ) -> tuple[bool | None, CompletedProcess | None]:
+        """
+        Connect to a VPN if its status probe reports it as down, like ensure_connected, telling
+        apart a VPN that is connected from one whose status is unknown.
+
+        Args:
+            vpn (AbstractVpnModel): VPN to keep connected
+            verbose (bool): Whether to print the output of the probe and connection process
+            dependencies (Iterable[AbstractVpnModel]): VPNs to connect first, every VPN after its
+                own dependencies
+
+        Returns:
+            tuple[bool | None, CompletedProcess | None]: Whether the probe found the VPN
+                connected, or None if its status is unknown or the probe failed with an error,
+                and the result of the connection or of the failed probe, or None if neither ran
+        """
+        needs_connect: bool | CompletedProcess | None = await self.run_bounded(
+            vpn, vpn.needs_connect_async, verbose
+        )
+        if isinstance(needs_connect, CompletedProcess):
+            return None, needs_connect
+        if needs_connect is None:
+            return None, None
+        if not needs_connect:
+            return True, None
+        for dependency in dependencies:
+            if VpnFleetService._is_failure(await self.ensure_connected(dependency, verbose)):
+                return False, VpnFleetService._skip(vpn, dependency)
+        return False, await self.run_bounded(
+            vpn, vpn.connect_async, verbose, VpnOperation.CONNECT
+        )
+
+    async def get_statuses(
+        self, vpns: Iterable[AbstractVpnModel], verbose: bool
+    ) -> list[bool | None]:
+        """
+        Probe whether each of the VPNs is connected.
+
+        Args:
+            vpns (Iterable[AbstractVpnModel]): VPNs to probe
+            verbose (bool): Whether to print the output of the probes
+
+        Returns:
+            list[bool | None]: Whether each VPN is connected, or None if its status is unknown,
+                in the order of the VPNs
+        """
+        async def probe(vpn: AbstractVpnModel) -> bool | None:
+            async with self._get_semaphore(
+                VpnFleetService._actions_semaphore_key, self.concurrency_limit
+            ):
+                return await vpn.is_connected_async(verbose)
+
+        return await gather(*(probe(vpn) for vpn in vpns))
+
+    @staticmethod
+    def select(vpns: Iterable[AbstractVpnModel], vpn_ids: Iterable[str]) -> list[AbstractVpnModel]:
+        """
+        Select some VPNs by their ID or global ID.
+
+        Args:
+            vpns (Iterable[AbstractVpnModel]): VPNs to select from
+            vpn_ids (Iterable[str]): IDs or global IDs of the VPNs to select
+
+        Raises:
+            ValueError: If an ID matches none of the VPNs
+
+        Returns:
+            list[AbstractVpnModel]: Selected VPNs, in the order of the VPNs they were selected from
+        """
+        wanted: set[str] = set(vpn_ids)
+        selected: list[AbstractVpnModel] = []
+        found: set[str] = set()
+        for vpn in vpns:
+            matches: set[str] = wanted & {vpn.get_vpn_id(), vpn.get_global_vpn_id()}
+            if matches:
+                selected.append(vpn)
+                found |= matches
+        if wanted - found:
+            raise ValueError(f"Unknown VPNs {', '.join(sorted(wanted - found))}")
+        return selected
+
+    async def run_bounded(
+        self,
+        vpn: AbstractVpnModel,
+        action: Callable[[bool], Awaitable[CompletedProcess | None]],
+        verbose: bool,
+        operation: VpnOperation | None = None
+    ) -> CompletedProcess | None:
+        """
+        Run an action of a VPN once a concurrency slot is free.
+
+        An error raised by the action, or a backend command that timed out, is reported and does
+        not affect the other VPNs. An error is returned as a failed process with return code 1.
+
+        If the same action of the same VPN is already running, for example a connection started
+        by an earlier check or another client, its result is awaited instead of running it again.
+
+        Args:
+            vpn (AbstractVpnModel): VPN the action belongs to
+            action (Callable[[bool], Awaitable[CompletedProcess | None]]): Action to run
+            verbose (bool): Whether to print the output of the action
+            operation (VpnOperation | None): Operation the action performs, recorded in the
+                metrics service, or None to leave the recording to the caller
+
+        Returns:
+            CompletedProcess | None: Result of the action
+        """
+        return await self._running_actions.run(
+            (vpn.get_global_vpn_id(), action),
+            lambda: self._run_bounded(vpn, action, verbose, operation)
+        )
+
+    async def _run_bounded(
+        self,
+        vpn: AbstractVpnModel,
+        action: Callable[[bool], Awaitable[CompletedProcess | None]],
+        verbose: bool,
+        operation: VpnOperation | None
+    ) -> CompletedProcess | None:
+        """
+        Run an action of a VPN once a concurrency slot is free, and record it. A connection also
+        waits for a slot under the connection limits and for its turn under the connection rate.
+        """
+        async with AsyncExitStack() as slots:
+            if operation == VpnOperation.CONNECT:
+                await self._wait_for_connect_turn(vpn, slots)
+            await slots.enter_async_context(self._get_semaphore(
+                VpnFleetService._actions_semaphore_key, self.concurrency_limit
+            ))
+            started_at: float = monotonic()
+            try:
+                result: CompletedProcess | None = await action(verbose)
+            # pylint: disable-next=broad-exception-caught
+            except Exception as error:
+                print(f"{vpn.get_global_vpn_id()} failed: {error!r}")
+                result = CompletedProcess([], 1, "", repr(error))
+            duration: float = monotonic() - started_at
+        if self.metrics_service and operation and result is not None:
+            self.metrics_service.observe_action(vpn, operation, duration, result)
+        if self.history_service and operation == VpnOperation.CONNECT and result is not None:
+            self.history_service.observe_connect(vpn, duration, result)
+        if isinstance(result, TimedOutProcess):
+            print(f"{vpn.get_global_vpn_id()} timed out after {result.timeout} seconds")
+        return result
+
+    async def _run_all(
+        self,
+        vpns: Iterable[AbstractVpnModel],
+        run_action: Callable[[AbstractVpnModel], Awaitable[CompletedProcess | None]],
+        dependencies_first: bool = True
+    ) -> list[CompletedProcess | None]:
+        """
+        Run an action of every VPN in waves following the dependencies between the VPNs. All the
+        actions of a wave start at once, after the actions of the previous wave are done.
+
+        With dependencies first, the action of a VPN without dependencies starts as soon as its
+        VPN is produced, so that the first actions of a streamed VPN list start before the rest of
+        it is parsed, and a VPN whose dependency failed is skipped. Otherwise, the waves run in
+        reverse once every VPN is produced, and every action runs.
+
+        Args:
+            vpns (Iterable[AbstractVpnModel]): VPNs to run the action of
+            run_action (Callable[[AbstractVpnModel], Awaitable[CompletedProcess | None]]): Runs
+                the action of a VPN
+            dependencies_first (bool): Whether a VPN waits for the VPNs it depends on, rather than
+                for the VPNs depending on it
+
+        Raises:
+            ValueError: If the dependencies form a cycle, once the actions already started are done
+
+        Returns:
+            list[CompletedProcess | None]: Result of each action, in the order of the VPNs
+        """
+        vpn_list: list[AbstractVpnModel] = []
+        tasks: dict[int, Task] = {}
+        for vpn in vpns:
+            vpn_list.append(vpn)
+            if dependencies_first and not vpn.get_dependencies():
+                tasks[id(vpn)] = create_task(run_action(vpn))
+                # Let the new task, then the task running its action, start before producing the
+                # next VPN
+                await sleep(0)
+                await sleep(0)
+        if len(tasks) == len(vpn_list):
+            return await gather(*tasks.values())
+        graph: VpnDependencyGraph = VpnDependencyGraph(vpn_list)
+        try:
+            waves: list[list[AbstractVpnModel]] = graph.get_waves()
+        except ValueError:
+            await gather(*tasks.values())
+            raise
+        results: dict[int, CompletedProcess | None] = {}
+        for wave in waves if dependencies_first else reversed(waves):
+            for vpn in wave:
+                failed: list[AbstractVpnModel] = [
+                    dependency
+                    for dependency in graph.get_dependencies(vpn)
+                    if dependencies_first and VpnFleetService._is_failure(results[id(dependency)])
+                ]
+                if failed:
+                    results[id(vpn)] = VpnFleetService._skip(vpn, failed[0])
+                elif id(vpn) not in tasks:
+                    tasks[id(vpn)] = create_task(run_action(vpn))
+            await gather(*(tasks[id(vpn)] for vpn in wave if id(vpn) not in results))
+            for vpn in wave:
+                if id(vpn) not in results:
+                    results[id(vpn)] = tasks[id(vpn)].result()
+        return [results[id(vpn)] for vpn in vpn_list]
+
+    async def _wait_for_connect_turn(self, vpn: AbstractVpnModel, slots: AsyncExitStack) -> None:
+        """
+        Wait for a slot under the global and per VPN type connection limits, then for the turn of
+        the connection under the connection rate.
+
+        Args:
+            vpn (AbstractVpnModel): VPN to connect
+            slots (AsyncExitStack): Stack releasing the slots once the connection is over
+        """
+        vpn_type: VpnType = vpn.get_vpn_type()
+        limits: list[tuple[str, int | None]] = [
+            (VpnFleetService._connects_semaphore_key, self.runner_config.max_concurrent_connects),
+            (
+                f"{VpnFleetService._connects_semaphore_key}_{vpn_type.name}",
+                self.runner_config.get_connect_limit(vpn_type)
+            ),
+        ]
+        for key, limit in limits:
+            if limit is not None:
+                await slots.enter_async_context(self._get_semaphore(key, limit))
+        if self._connect_bucket:
+            await sleep(self._connect_bucket.reserve())
+
+    @staticmethod
+    def _create_connect_bucket(runner_config: RunnerConfig) -> TokenBucket | None:
+        """
+        Create the token bucket spacing out the connections under the connection rate.
+
+        Args:
+            runner_config (RunnerConfig): Limits on the connections
+
+        Returns:
+            TokenBucket | None: Token bucket of the connection rate, or None if there is no rate
+        """
+        if not runner_config.connects_per_second:
+            return None
+        return TokenBucket(runner_config.connects_per_second, runner_config.connect_burst)
+
+    @staticmethod
+    def _is_failure(result: CompletedProcess | None) -> bool:
+        """
+        Get whether the result of an action is a failure.
+
+        Args:
+            result (CompletedProcess | None): Result of the action
+
+        Returns:
+            bool: Whether the action ran and failed
+        """
+        return result is not None and result.returncode != 0
+
+    @staticmethod
+    def _skip(vpn: AbstractVpnModel, dependency: AbstractVpnModel) -> CompletedProcess:
+        """
+        Report that the action of a VPN is skipped because a VPN it depends on failed.
+
+        Args:
+            vpn (AbstractVpnModel): VPN whose action is skipped
+            dependency (AbstractVpnModel): VPN that failed
+
+        Returns:
+            CompletedProcess: Failed process standing for the skipped action
+        """
+        message: str = (
+            f"{vpn.get_global_vpn_id()} skipped, as {dependency.get_global_vpn_id()} failed"
+        )
+        print(message)
+        return CompletedProcess([], 1, "", message)
+
+    def _get_semaphore(self, key: str, limit: int) -> Semaphore:
+        """
+        Get a semaphore bounding concurrent actions, bound to the running event loop.
+
+        Args:
+            key (str): Name of the semaphore
+            limit (int): Number of actions the semaphore lets run at once
+
+        Returns:
+            Semaphore: Semaphore bounding the concurrent actions
+        """
+        loop: AbstractEventLoop = get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphores = {}
+            self._semaphore_loop = loop
+        if key not in self._semaphores:
+            self._semaphores[key] = Semaphore(limit)
+        return self._semaphores[key]
@@ -0,0 +1,264 @@
+"""
+Module for exposing metrics of the watch loop in the Prometheus text format
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from subprocess import CompletedProcess
+from threading import Lock, Thread
+from time import monotonic
+
+from src.enums.vpn_operation import VpnOperation
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+
+_Labels = tuple[tuple[str, str], ...]
+
+_METRICS_PATH: str = "/metrics"
+_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# pylint: disable-next=too-few-public-methods
+class _Histogram:
+    """
+    Cumulative histogram of observed durations, like a Prometheus histogram.
+
+    Attributes:
+        bucket_counts (list[int]): Number of observations up to each bucket bound
+        total (float): Sum of the observations
+        count (int): Number of observations
+    """
+
+    __slots__ = ("bucket_counts", "total", "count")
+
+    def __init__(self, bucket_count: int) -> None:
+        self.bucket_counts: list[int] = [0] * bucket_count
+        self.total: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float, bounds: tuple[float, ...]) -> None:
+        """
+        Add an observation to the histogram.
+
+        Args:
+            value (float): Observed value
+            bounds (tuple[float, ...]): Upper bounds of the buckets
+        """
+        for index, bound in enumerate(bounds):
+            if value <= bound:
+                self.bucket_counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+# pylint: disable-next=R0902
+class VpnMetricsService:
+    """
+    Service collecting counters and histograms of the VPN actions and checks of the watch loop,
+    labelled with the global ID of each VPN, and serving them to Prometheus over a local HTTP
+    endpoint.
+
+    Observations are recorded by the event loop and read by the HTTP server thread, so every
+    access goes through a lock.
+
+    Attributes:
+        duration_buckets (tuple[float, ...]): Upper bounds, in seconds, of the buckets of the
+            duration histograms
+    """
+
+    _default_duration_buckets: tuple[float, ...] = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, duration_buckets: tuple[float, ...] = _default_duration_buckets) -> None:
+        self.duration_buckets: tuple[float, ...] = tuple(sorted(duration_buckets))
+        self._lock: Lock = Lock()
+        self._action_durations: dict[_Labels, _Histogram] = {}
+        self._return_codes: dict[_Labels, int] = {}
+        self._reconnects: dict[_Labels, int] = {}
+        self._check_durations: dict[_Labels, _Histogram] = {}
+        self._last_healthy_checks: dict[_Labels, float] = {}
+        self._server: ThreadingHTTPServer | None = None
+
+    def observe_action(
+        self,
+        vpn: AbstractVpnModel,
+        operation: VpnOperation,
+        seconds: float,
+        result: CompletedProcess
+    ) -> None:
+        """
+        Record the latency and return code of a connection or disconnection.
+
+        Args:
+            vpn (AbstractVpnModel): VPN the action belongs to
+            operation (VpnOperation): Connection or disconnection
+            seconds (float): Duration of the action
+            result (CompletedProcess): Result of the action
+        """
+        labels: _Labels = (("vpn", vpn.get_global_vpn_id()), ("operation", operation.value))
+        with self._lock:
+            self._observe_duration(self._action_durations, labels, seconds)
+            code_labels: _Labels = (*labels, ("return_code", str(result.returncode)))
+            self._return_codes[code_labels] = self._return_codes.get(code_labels, 0) + 1
+
+    def observe_check(
+        self, vpn: AbstractVpnModel, seconds: float, result: CompletedProcess | None
+    ) -> None:
+        """
+        Record a watch loop check of a VPN. A check that reconnected the VPN also counts as a
+        reconnection and a connection, and a check is healthy unless its reconnection failed.
+
+        Args:
+            vpn (AbstractVpnModel): VPN that was checked
+            seconds (float): Duration of the check, including the reconnection if there was one
+            result (CompletedProcess | None): Result of the reconnection, or None if the VPN was
+                not reconnected
+        """
+        labels: _Labels = (("vpn", vpn.get_global_vpn_id()),)
+        if result is not None:
+            self.observe_action(vpn, VpnOperation.CONNECT, seconds, result)
+        with self._lock:
+            self._observe_duration(self._check_durations, labels, seconds)
+            if result is not None:
+                self._reconnects[labels] = self._reconnects.get(labels, 0) + 1
+            if result is None or result.returncode == 0:
+                self._last_healthy_checks[labels] = monotonic()
+
+    def render(self) -> str:
+        """
+        Render all the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics, one sample per line
+        """
+        lines: list[str] = []
+        with self._lock:
+            self._render_histograms(
+                lines,
+                "auto_vpn_action_duration_seconds",
+                "Latency of VPN connections and disconnections",
+                self._action_durations
+            )
+            self._render_samples(
+                lines,
+                "auto_vpn_action_return_codes_total",
+                "counter",
+                "Return codes of VPN connections and disconnections",
+                self._return_codes
+            )
+            self._render_samples(
+                lines,
+                "auto_vpn_reconnects_total",
+                "counter",
+                "Reconnections of VPNs found down by the watch loop",
+                self._reconnects
+            )
+            self._render_histograms(
+                lines,
+                "auto_vpn_check_duration_seconds",
+                "Duration of watch loop checks, including reconnections",
+                self._check_durations
+            )
+            now: float = monotonic()
+            self._render_samples(
+                lines,
+                "auto_vpn_seconds_since_healthy_check",
+                "gauge",
+                "Seconds since the latest check that found the VPN up or reconnected it",
+                {labels: now - time for labels, time in self._last_healthy_checks.items()}
+            )
+        return "\n".join(lines) + "\n"
+
+    def start_server(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serve the metrics on http://host:port/metrics from a background thread.
+
+        Args:
+            port (int): Port to listen on, or 0 for any free port
+            host (str): Address to listen on. Only local by default
+
+        Returns:
+            ThreadingHTTPServer: Running server
+        """
+        metrics_service: VpnMetricsService = self
+
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            """Answers scrapes of the metrics endpoint."""
+
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                """Serve the metrics."""
+                if self.path.split("?", 1)[0] != _METRICS_PATH:
+                    self.send_error(404)
+                    return
+                content: bytes = metrics_service.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", _CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *_) -> None:
+                """Keep scrapes out of the output."""
+
+        self._server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self._server.daemon_threads = True
+        Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def stop_server(self) -> None:
+        """
+        Stop serving the metrics, if they are served.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        self._server = None
+
+    def _observe_duration(
+        self, histograms: dict[_Labels, _Histogram], labels: _Labels, seconds: float
+    ) -> None:
+        """Add a duration to the histogram of some labels. Call with the lock held."""
+        if labels not in histograms:
+            histograms[labels] = _Histogram(len(self.duration_buckets))
+        histograms[labels].observe(seconds, self.duration_buckets)
+
+    def _render_histograms(
+        self,
+        lines: list[str],
+        name: str,
+        description: str,
+        histograms: dict[_Labels, _Histogram]
+    ) -> None:
+        """Render the histograms of a metric. Call with the lock held."""
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in histograms.items():
+            for bound, bucket_count in zip(self.duration_buckets, histogram.bucket_counts):
+                bucket_labels: _Labels = (*labels, ("le", f"{bound:g}"))
+                lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {bucket_count}")
+            lines.append(
+                f"{name}_bucket{_format_labels((*labels, ('le', '+Inf')))} {histogram.count}"
+            )
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    @staticmethod
+    # pylint: disable-next=R0913,R0917
+    def _render_samples(
+        lines: list[str],
+        name: str,
+        metric_type: str,
+        description: str,
+        samples: dict[_Labels, float]
+    ) -> None:
+        """Render the samples of a counter or gauge. Call with the lock held."""
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples.items():
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+
+
+def _format_labels(labels: _Labels) -> str:
+    """Format labels like {name="value",...}, escaping the values."""
+    formatted: list[str] = []
+    for name, value in labels:
+        escaped: str = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        formatted.append(f'{name}="{escaped}"')
+    return "{" + ",".join(formatted) + "}"
@@ -3,50 +3,17 @@ Module for parsing VPN data from JSON
 """
 
 from json import loads
+from typing import Iterator, TextIO
 
+from src.models.runner_config import RunnerConfig
+from src.models.vpn_dependency_graph import VpnDependencyGraph
 from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
-from src.models.vpn_model.global_protect_vpn_model import GlobalProtectVpnModel
-from src.models.vpn_model.pritunl_vpn_model import PritunlVpnModel
 from src.models.vpn_config.abstract_vpn_config import AbstractVpnConfig
-from src.models.vpn_config.global_protect_vpn_config import GlobalProtectVpnConfig
-from src.models.vpn_config.pritunl_vpn_config import PritunlVpnConfig
-from src.enums.vpn_type import VpnTypeVisitor, VpnType
-
-
-class _VpnParsingVisitor(VpnTypeVisitor):
-    """
-    Visitor for parsing VPN data from JSON
-
-    Attributes:
-        json (dict): JSON data to parse
-    """
-
-    def __init__(self, data_json: dict, config_json: dict):
-        super().__init__()
-        self.data_json: dict = data_json
-        self.config_json: dict = config_json if config_json else {}
-
-    def visit_none(self) -> AbstractVpnModel:
-        """Visit VPN type not specified"""
-        raise ValueError("Invalid VPN type")
-
-    def visit_pritunl(self) -> AbstractVpnModel:
-        """Visit Pritunl VPN type"""
-        config: AbstractVpnConfig = PritunlVpnConfig.from_json(self.config_json)
-        return PritunlVpnModel.from_json_with_config(self.data_json, config)
-
-    def visit_wireguard(self) -> AbstractVpnModel:
-        """Visit Wireguard VPN type"""
-        raise NotImplementedError
-
-    def visit_open_vpn(self) -> AbstractVpnModel:
-        """Visit OpenVPN VPN type"""
-        raise NotImplementedError
-
-    def visit_global_protect(self) -> AbstractVpnModel:
-        """Visit Global Protect VPN type"""
-        config: AbstractVpnConfig = GlobalProtectVpnConfig.from_json(self.config_json)
-        return GlobalProtectVpnModel.from_json_with_config(self.data_json, config)
+from src.enums.vpn_type import VpnType
+from src.services.vpn_backend_registry import VpnBackend, VpnBackendRegistry
+from src.services.vpn_data_snapshot_service import VpnDataSnapshotService
+from src.utils.json_stream_utils import JsonStreamReader
+from src.utils.tracing_utils import trace_span
 
 
 class VpnDataParserService:
@@ -54,36 +21,164 @@ class VpnDataParserService:
     Service for parsing VPN data from JSON
 
     Attributes:
-        vpn_data (str): VPN data to parse
+        snapshot_service (VpnDataSnapshotService | None): Caches the VPNs parsed from VPN data
+            JSON files between runs, or None to always parse them
+        backend_registry (VpnBackendRegistry): Backends of the VPN types that can be parsed
     """
 
     _vpn_list_key: str = "vpn_list"
     _config_key: str = "config"
+    _runner_key: str = "runner"
+
+    def __init__(
+        self,
+        snapshot_service: VpnDataSnapshotService | None = None,
+        backend_registry: VpnBackendRegistry | None = None
+    ) -> None:
+        self.snapshot_service: VpnDataSnapshotService | None = snapshot_service
+        self.backend_registry: VpnBackendRegistry = (
+            backend_registry if backend_registry else VpnBackendRegistry.create_default()
+        )
+
+    def parse_vpn_data_file(
+        self, vpn_data_json_path: str, verbose: bool = False
+    ) -> list[AbstractVpnModel]:
+        """
+        Parse VPN data from a JSON file, loading it from its snapshot instead if the file did not
+        change since it was last parsed.
+
+        Args:
+            vpn_data_json_path (str): Path to the VPN data JSON file
+            verbose (bool): Whether to print whether the snapshot was used
+
+        Returns:
+            list[AbstractVpnModel]: List of VPN data objects
+        """
+        if self.snapshot_service:
+            return self.snapshot_service.load_or_parse(
+                vpn_data_json_path, self.parse_vpn_data, verbose
+            )
+        with open(vpn_data_json_path, "r", encoding="utf-8") as file:
+            return self.parse_vpn_data(file.read())
 
     def parse_vpn_data(self, vpn_data: str) -> list[AbstractVpnModel]:
         """
         Parse VPN data from JSON.
 
-        Also injects any global configs into the VPN data classes.
+        Also injects any global configs into the VPN data classes. The config of each VPN type is
+        only parsed once, and shared by all the VPNs of that type.
 
         Args:
             vpn_data (str): VPN data to parse
 
+        Raises:
+            ValueError: If a VPN depends on an unknown VPN, or the dependencies form a cycle
+
         Returns:
             list[AbstractVpnData]: List of VPN data objects
         """
-        vpn_data_dict: dict = loads(vpn_data)
-        vpn_config_json: dict = vpn_data_dict.get(VpnDataParserService._config_key, {})
-        vpn_list: list[AbstractVpnModel] = []
-        for vpn_json in vpn_data_dict[VpnDataParserService._vpn_list_key]:
-            vpn: _VpnParsingVisitor = self.generate_vpn_from_config_and_data(
-                vpn_config_json, vpn_json
-            )
-            vpn_list.append(vpn)
-        return vpn_list
+        with trace_span("parse_vpn_data", size=len(vpn_data)) as span:
+            vpn_data_dict: dict = loads(vpn_data)
+            vpn_config_json: dict = vpn_data_dict.get(VpnDataParserService._config_key, {})
+            configs: dict[VpnType, AbstractVpnConfig] = {}
+            vpns: list[AbstractVpnModel] = [
+                self.generate_vpn_from_config_and_data(vpn_config_json, vpn_json, configs)
+                for vpn_json in vpn_data_dict[VpnDataParserService._vpn_list_key]
+            ]
+            span["vpn_count"] = len(vpns)
+            VpnDependencyGraph(vpns).validate()
+            return vpns
+
+    def parse_runner_config_file(self, vpn_data_json_path: str) -> RunnerConfig:
+        """
+        Parse the runner config from the "config" of a VPN data JSON file.
+
+        Args:
+            vpn_data_json_path (str): Path to the VPN data JSON file
+
+        Returns:
+            RunnerConfig: Runner config of the file, or the default one if it has none
+        """
+        with open(vpn_data_json_path, "r", encoding="utf-8") as file:
+            return self.parse_runner_config(file)
+
+    def parse_runner_config(self, vpn_data: TextIO) -> RunnerConfig:
+        """
+        Parse the runner config from the "config" of VPN data JSON. The VPN list is skipped without
+        decoding it or holding it in memory, and nothing after the config is read.
+
+        Args:
+            vpn_data (TextIO): VPN data to parse
+
+        Returns:
+            RunnerConfig: Runner config of the VPN data, or the default one if it has none
+        """
+        reader: JsonStreamReader = JsonStreamReader(vpn_data)
+        for key in reader.iter_object_keys():
+            if key == VpnDataParserService._config_key:
+                vpn_config_json: dict = reader.read_value()
+                return RunnerConfig.from_json(
+                    vpn_config_json.get(VpnDataParserService._runner_key)
+                )
+            reader.skip_value()
+        return RunnerConfig()
+
+    def stream_vpn_data_file(self, vpn_data_json_path: str) -> Iterator[AbstractVpnModel]:
+        """
+        Parse VPN data from a JSON file incrementally, yielding every VPN as soon as it is parsed.
+        The snapshot is not used, as it only pays off once the whole file is parsed.
+
+        Args:
+            vpn_data_json_path (str): Path to the VPN data JSON file
+
+        Yields:
+            AbstractVpnModel: Next VPN data object of the file
+        """
+        with open(vpn_data_json_path, "r", encoding="utf-8") as file:
+            yield from self.stream_vpn_data(file)
+
+    def stream_vpn_data(self, vpn_data: TextIO) -> Iterator[AbstractVpnModel]:
+        """
+        Parse VPN data from JSON incrementally, yielding every VPN as soon as it is parsed, so that
+        memory stays flat however long the VPN list is.
+
+        The configs have to be known before any VPN can be built. If the config object comes
+        after the VPN list in the document, the VPN list is held back until the config is read.
+
+        Args:
+            vpn_data (TextIO): VPN data to parse
+
+        Yields:
+            AbstractVpnModel: Next VPN data object
+        """
+        reader: JsonStreamReader = JsonStreamReader(vpn_data)
+        vpn_config_json: dict | None = None
+        pending_vpn_jsons: list[dict] | None = None
+        configs: dict[VpnType, AbstractVpnConfig] = {}
+        for key in reader.iter_object_keys():
+            if key == VpnDataParserService._config_key:
+                vpn_config_json = reader.read_value()
+            elif key == VpnDataParserService._vpn_list_key:
+                pending_vpn_jsons = []
+                for vpn_json in reader.iter_array():
+                    if vpn_config_json is None:
+                        pending_vpn_jsons.append(vpn_json)
+                    else:
+                        yield self.generate_vpn_from_config_and_data(
+                            vpn_config_json, vpn_json, configs
+                        )
+            else:
+                reader.read_value()
+        if pending_vpn_jsons is None:
+            raise KeyError(VpnDataParserService._vpn_list_key)
+        for vpn_json in pending_vpn_jsons:
+            yield self.generate_vpn_from_config_and_data(vpn_config_json or {}, vpn_json, configs)
 
     def generate_vpn_from_config_and_data(
-        self, vpn_config_json: dict, vpn_json: dict
+        self,
+        vpn_config_json: dict,
+        vpn_json: dict,
+        configs: dict[VpnType, AbstractVpnConfig] | None = None
     ) -> AbstractVpnModel:
         """
         Generate a VPN data object from a config and data JSON.
@@ -91,11 +186,17 @@ class VpnDataParserService:
         Args:
             vpn_config_json (dict): JSON of the VPN config
             vpn_json (dict): JSON of the VPN data
+            configs (dict[VpnType, AbstractVpnConfig] | None): Configs already parsed from the
+                same config JSON, which the parsed config is added to. None to always parse it
 
         Returns:
             AbstractVpnData: VPN data object
         """
         vpn_type: VpnType = VpnType(vpn_json.get(AbstractVpnModel.vpn_type_key))
-        config: dict = vpn_config_json.get(vpn_type.value)
-        parsing_visitor: _VpnParsingVisitor = _VpnParsingVisitor(vpn_json, config)
-        return vpn_type.visit(parsing_visitor)
+        backend: VpnBackend = self.backend_registry.get_backend(vpn_type)
+        config: AbstractVpnConfig | None = configs.get(vpn_type) if configs is not None else None
+        if config is None:
+            config = backend.parse_config(vpn_config_json.get(vpn_type.value))
+            if configs is not None:
+                configs[vpn_type] = config
+        return backend.parse_vpn(vpn_json, config)
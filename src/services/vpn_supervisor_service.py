@@ -0,0 +1,305 @@
+"""
+Module for keeping VPNs connected in watch mode
+"""
+
+from asyncio import Event, Task, create_task, current_task, sleep, wait
+from heapq import heappop, heappush
+from itertools import count
+from subprocess import CompletedProcess
+from time import monotonic
+from typing import Callable, Iterable, Iterator
+
+from src.models.circuit_breaker import CircuitBreaker
+from src.models.vpn_dependency_graph import VpnDependencyGraph
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.services.vpn_fleet_service import VpnFleetService
+
+
+# pylint: disable-next=R0902
+class VpnSupervisorService:
+    """
+    Service for keeping VPNs connected.
+
+    Checks are kept in a priority queue ordered by when each VPN is next due, and the supervisor
+    sleeps exactly until the earliest one. Every due check runs as its own task, so a slow or hung
+    backend only delays the reconnection of its own VPN, and every VPN can have its own interval.
+
+    A VPN that keeps failing to connect is backed off by its own circuit breaker, so broken VPNs
+    stop consuming resources while healthy ones keep the fast cadence.
+
+    A VPN that is down is only reconnected once the VPNs it depends on are connected, reconnecting
+    them first if they are down too, instead of failing until their own checks bring them up.
+
+    Attributes:
+        fleet_service (VpnFleetService): Fleet service bounding the concurrent CLI invocations
+        check_interval (float): Seconds between two checks of a VPN without its own interval
+        circuit_breaker_factory (Callable[[], CircuitBreaker]): Creates the circuit breaker of
+            each supervised VPN
+    """
+
+    _default_check_interval: float = 5.0
+
+    def __init__(
+        self,
+        fleet_service: VpnFleetService,
+        check_interval: float = _default_check_interval,
+        circuit_breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker
+    ) -> None:
+        self.fleet_service: VpnFleetService = fleet_service
+        self.check_interval: float = check_interval
+        self.circuit_breaker_factory: Callable[[], CircuitBreaker] = circuit_breaker_factory
+        self._circuit_breakers: dict[str, CircuitBreaker] = {}
+        self._vpns: dict[str, AbstractVpnModel] = {}
+        self._schedule: list[tuple[float, int, str]] = []
+        self._sequence: Iterator[int] = count()
+        self._latest_sequences: dict[str, int] = {}
+        self._in_flight: dict[str, Task] = {}
+        self._wake_up: Event | None = None
+        self._dependency_graph: VpnDependencyGraph | None = None
+
+    async def supervise_all(self, vpns: Iterable[AbstractVpnModel], verbose: bool) -> None:
+        """
+        Keep all the VPNs connected, until cancelled.
+
+        Args:
+            vpns (Iterable[AbstractVpnModel]): VPNs to keep connected. The first VPNs of a
+                streamed VPN list are checked while the rest of it is being parsed, except for
+                the VPNs that depend on other VPNs
+            verbose (bool): Whether to print the output of the probes and connection processes
+        """
+        self._wake_up = Event()
+        try:
+            # The VPNs a VPN depends on are only known once the VPN list is exhausted
+            dependents: list[AbstractVpnModel] = []
+            for vpn in vpns:
+                if vpn.get_dependencies():
+                    dependents.append(vpn)
+                    continue
+                self.add_vpn(vpn)
+                self._start_due_checks(verbose)
+                await sleep(0)
+            for vpn in dependents:
+                self.add_vpn(vpn)
+            while True:
+                self._start_due_checks(verbose)
+                self._wake_up.clear()
+                # asyncio.wait, unlike wait_for, never swallows a cancellation of the supervisor
+                # that arrives just as the wake-up event is set
+                wake_up: Task = create_task(self._wake_up.wait())
+                try:
+                    await wait({wake_up}, timeout=self._get_time_until_next_check())
+                finally:
+                    wake_up.cancel()
+        finally:
+            for task in self._in_flight.values():
+                task.cancel()
+
+    def add_vpn(self, vpn: AbstractVpnModel) -> None:
+        """
+        Start supervising a VPN, checking it straight away.
+
+        Args:
+            vpn (AbstractVpnModel): VPN to keep connected
+        """
+        global_vpn_id: str = vpn.get_global_vpn_id()
+        self._vpns[global_vpn_id] = vpn
+        self._dependency_graph = None
+        self._circuit_breakers.pop(global_vpn_id, None)
+        self._schedule_check(global_vpn_id, 0)
+
+    def replace_vpn(self, vpn: AbstractVpnModel) -> None:
+        """
+        Replace a supervised VPN with a new version of it whose connection is unchanged, keeping
+        its circuit breaker, its queued check and any check already running. The new version's
+        check interval applies from its next check on.
+
+        Args:
+            vpn (AbstractVpnModel): New version of the VPN
+        """
+        global_vpn_id: str = vpn.get_global_vpn_id()
+        if global_vpn_id not in self._vpns:
+            raise ValueError(f"{global_vpn_id} is not supervised")
+        self._vpns[global_vpn_id] = vpn
+        self._dependency_graph = None
+
+    def remove_vpn(self, global_vpn_id: str) -> AbstractVpnModel | None:
+        """
+        Stop supervising a VPN, cancelling its check if one is running.
+
+        Args:
+            global_vpn_id (str): Global ID of the VPN to stop supervising
+
+        Returns:
+            AbstractVpnModel | None: VPN that was supervised, or None if there was none
+        """
+        in_flight: Task | None = self._in_flight.pop(global_vpn_id, None)
+        if in_flight:
+            in_flight.cancel()
+        self._latest_sequences.pop(global_vpn_id, None)
+        self._circuit_breakers.pop(global_vpn_id, None)
+        self._dependency_graph = None
+        return self._vpns.pop(global_vpn_id, None)
+
+    def get_vpns(self) -> list[AbstractVpnModel]:
+        """
+        Get the VPNs being supervised.
+
+        Returns:
+            list[AbstractVpnModel]: VPNs being supervised
+        """
+        return list(self._vpns.values())
+
+    def get_check_interval(self, vpn: AbstractVpnModel) -> float:
+        """
+        Get the seconds between two checks of a VPN.
+
+        Args:
+            vpn (AbstractVpnModel): VPN to get the check interval of
+
+        Returns:
+            float: Interval of the VPN, or the default interval if it has none of its own
+        """
+        check_interval: float | None = vpn.get_check_interval()
+        return check_interval if check_interval is not None else self.check_interval
+
+    def get_circuit_breaker(self, vpn: AbstractVpnModel) -> CircuitBreaker:
+        """
+        Get the circuit breaker tracking the connection failures of a VPN.
+
+        Args:
+            vpn (AbstractVpnModel): VPN to get the circuit breaker of
+
+        Returns:
+            CircuitBreaker: Circuit breaker of the VPN
+        """
+        global_vpn_id: str = vpn.get_global_vpn_id()
+        if global_vpn_id not in self._circuit_breakers:
+            self._circuit_breakers[global_vpn_id] = self.circuit_breaker_factory()
+        return self._circuit_breakers[global_vpn_id]
+
+    def get_dependencies(self, vpn: AbstractVpnModel) -> list[AbstractVpnModel]:
+        """
+        Get the supervised VPNs that a VPN directly or indirectly depends on.
+
+        Args:
+            vpn (AbstractVpnModel): VPN to get the dependencies of
+
+        Returns:
+            list[AbstractVpnModel]: Dependencies of the VPN, every VPN after its own dependencies
+        """
+        if not vpn.get_dependencies():
+            return []
+        if self._dependency_graph is None:
+            self._dependency_graph = VpnDependencyGraph(self._vpns.values())
+        return self._dependency_graph.get_all_dependencies(vpn)
+
+    def _schedule_check(self, global_vpn_id: str, delay: float) -> None:
+        """
+        Queue the next check of a VPN and wake the supervisor up to account for it.
+
+        Args:
+            global_vpn_id (str): Global ID of the VPN to check
+            delay (float): Seconds from now until the check is due
+        """
+        sequence: int = next(self._sequence)
+        self._latest_sequences[global_vpn_id] = sequence
+        heappush(self._schedule, (monotonic() + delay, sequence, global_vpn_id))
+        if self._wake_up:
+            self._wake_up.set()
+
+    def _start_due_checks(self, verbose: bool) -> None:
+        """
+        Start a check task for every VPN whose check is due.
+
+        Args:
+            verbose (bool): Whether to print the output of the probes and connection processes
+        """
+        now: float = monotonic()
+        while self._schedule and self._schedule[0][0] <= now:
+            _, sequence, global_vpn_id = heappop(self._schedule)
+            if self._latest_sequences.get(global_vpn_id) != sequence:
+                # Superseded by a later check of the same VPN, or the VPN was removed
+                continue
+            self._in_flight[global_vpn_id] = create_task(
+                self._check(self._vpns[global_vpn_id], sequence, verbose)
+            )
+
+    def _get_time_until_next_check(self) -> float | None:
+        """
+        Get the seconds until the earliest queued check is due.
+
+        Returns:
+            float | None: Seconds until the next check, or None if no check is queued
+        """
+        if not self._schedule:
+            return None
+        return max(0.0, self._schedule[0][0] - monotonic())
+
+    async def _check(self, vpn: AbstractVpnModel, sequence: int, verbose: bool) -> None:
+        """
+        Check a VPN, reconnect it if it is down, and queue its next check.
+
+        Args:
+            vpn (AbstractVpnModel): VPN to check
+            sequence (int): Sequence number of the queued check that started this one
+            verbose (bool): Whether to print the output of the probe and connection process
+        """
+        global_vpn_id: str = vpn.get_global_vpn_id()
+        circuit_breaker: CircuitBreaker = self.get_circuit_breaker(vpn)
+        started_at: float = monotonic()
+        try:
+            connected, result = await self.fleet_service.check_connected(
+                vpn, verbose, self.get_dependencies(vpn)
+            )
+            self._record_result(vpn, circuit_breaker, connected, result)
+            if self.fleet_service.metrics_service:
+                self.fleet_service.metrics_service.observe_check(
+                    vpn, monotonic() - started_at, result
+                )
+        finally:
+            if self._in_flight.get(global_vpn_id) is current_task():
+                del self._in_flight[global_vpn_id]
+        if self._latest_sequences.get(global_vpn_id) != sequence:
+            # The VPN was removed or added again while it was being checked
+            return
+        self._schedule_check(
+            global_vpn_id,
+            max(
+                self.get_check_interval(self._vpns[global_vpn_id]),
+                circuit_breaker.get_remaining_delay()
+            )
+        )
+
+    @staticmethod
+    def _record_result(
+        vpn: AbstractVpnModel,
+        circuit_breaker: CircuitBreaker,
+        connected: bool | None,
+        result: CompletedProcess | None
+    ) -> None:
+        """
+        Record the outcome of a check in the circuit breaker of the VPN. The circuit only closes
+        once the VPN is found connected or connects, a check that could not tell whether the VPN
+        is connected leaves it as it is.
+
+        Args:
+            vpn (AbstractVpnModel): VPN that was checked
+            circuit_breaker (CircuitBreaker): Circuit breaker of the VPN
+            connected (bool | None): Whether the probe found the VPN connected, or None if its
+                status is unknown
+            result (CompletedProcess | None): Result of the connection, or None if there was none
+        """
+        if result is None:
+            if connected:
+                circuit_breaker.record_success()
+            return
+        if result.returncode == 0:
+            circuit_breaker.record_success()
+            return
+        delay: float = circuit_breaker.record_failure()
+        if delay > 0:
+            print(
+                f"{vpn.get_global_vpn_id()} failed to connect "
+                f"{circuit_breaker.get_consecutive_failures()} times in a row, "
+                f"backing off for {delay:.1f} seconds"
+            )
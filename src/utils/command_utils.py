@@ -0,0 +1,204 @@
+'''
+Module for running backend CLI commands.
+
+Every command runs in its own process group, so that a timed out or cancelled command is
+terminated together with any processes it spawned.
+'''
+
+from asyncio import CancelledError, TimeoutError as AsyncTimeoutError
+from asyncio import create_subprocess_exec, wait_for
+from asyncio.subprocess import PIPE as ASYNC_PIPE, Process
+from os import killpg
+from os.path import basename
+from signal import SIGKILL, SIGTERM, Signals
+from subprocess import PIPE, CompletedProcess, Popen, TimeoutExpired
+
+from src.utils.single_flight_utils import SingleFlight
+from src.utils.tracing_utils import set_exit_code, trace_span
+
+COMMAND_NOT_RUNNABLE_RETURN_CODE: int = 127
+DEFAULT_KILL_GRACE_PERIOD: float = 2.0
+_RUNNING_COMMANDS: SingleFlight[CompletedProcess] = SingleFlight()
+
+
+# pylint: disable-next=too-few-public-methods
+class TimedOutProcess(CompletedProcess):
+    '''
+    Result of a command that was terminated because it exceeded its deadline.
+
+    Attributes:
+        timeout (float): Deadline the command exceeded, in seconds
+    '''
+
+    def __init__(self, args: list[str], returncode: int, timeout: float) -> None:
+        super().__init__(args, returncode, '', '')
+        self.timeout: float = timeout
+
+
+def run_command(
+    args: list[str],
+    timeout: float | None = None,
+    kill_grace_period: float = DEFAULT_KILL_GRACE_PERIOD,
+    capture_output: bool = False
+) -> CompletedProcess:
+    '''
+    Run a command as a subprocess, terminating it once it exceeds its deadline.
+
+    A timed out command is sent SIGTERM, and whatever is left of its process group is sent SIGKILL
+    once the grace period is over.
+
+    Args:
+        args (list[str]): Command and its arguments
+        timeout (float | None): Deadline of the command in seconds, or None to wait indefinitely
+        kill_grace_period (float): Seconds to wait after SIGTERM before sending SIGKILL
+        capture_output (bool): Whether to capture the output as text instead of inheriting it
+
+    Returns:
+        CompletedProcess: Result of the command, or a TimedOutProcess if it exceeded its deadline.
+            A command that could not be spawned at all is reported with return code 127.
+    '''
+    with trace_span('command', command=_get_command_name(args)) as span:
+        process: CompletedProcess = _run_command(args, timeout, kill_grace_period, capture_output)
+        set_exit_code(span, process)
+        return process
+
+
+def _run_command(
+    args: list[str], timeout: float | None, kill_grace_period: float, capture_output: bool
+) -> CompletedProcess:
+    '''
+    Run a command as a subprocess, terminating it once it exceeds its deadline.
+    '''
+    try:
+        # pylint: disable-next=consider-using-with
+        process: Popen = Popen(
+            args,
+            stdout=PIPE if capture_output else None,
+            stderr=PIPE if capture_output else None,
+            text=True,
+            start_new_session=True
+        )
+    except OSError as error:
+        return CompletedProcess(args, COMMAND_NOT_RUNNABLE_RETURN_CODE, '', str(error))
+    with process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except TimeoutExpired:
+            _signal_process_group(process.pid, SIGTERM)
+            try:
+                process.wait(kill_grace_period)
+            except TimeoutExpired:
+                pass
+            _signal_process_group(process.pid, SIGKILL)
+            process.wait()
+            return TimedOutProcess(args, process.returncode, timeout)
+        except BaseException:
+            _signal_process_group(process.pid, SIGKILL)
+            raise
+    return CompletedProcess(args, process.returncode, stdout, stderr)
+
+
+async def run_command_async(
+    args: list[str],
+    timeout: float | None = None,
+    kill_grace_period: float = DEFAULT_KILL_GRACE_PERIOD
+) -> CompletedProcess:
+    '''
+    Run a command as a subprocess without blocking the event loop, terminating it once it exceeds
+    its deadline.
+
+    A timed out command is sent SIGTERM, and whatever is left of its process group is sent SIGKILL
+    once the grace period is over. A cancelled command is killed straight away.
+
+    A command with the same arguments as one that is still running is not run again: the caller
+    waits for the running command and gets its result, like every VPN sharing one service load
+    command does. The shared command is only killed once all of its callers are cancelled.
+
+    Args:
+        args (list[str]): Command and its arguments
+        timeout (float | None): Deadline of the command in seconds, or None to wait indefinitely
+        kill_grace_period (float): Seconds to wait after SIGTERM before sending SIGKILL
+
+    Returns:
+        CompletedProcess: Result of the command with its output decoded as text, or a
+            TimedOutProcess if it exceeded its deadline. A command that could not be spawned at all
+            is reported with return code 127, like a shell would.
+    '''
+    return await _RUNNING_COMMANDS.run(
+        tuple(args), lambda: _run_traced_command_async(args, timeout, kill_grace_period)
+    )
+
+
+async def _run_traced_command_async(
+    args: list[str], timeout: float | None, kill_grace_period: float
+) -> CompletedProcess:
+    '''
+    Run a command as a subprocess without blocking the event loop, in a span.
+    '''
+    with trace_span('command', command=_get_command_name(args)) as span:
+        process: CompletedProcess = await _run_command_async(args, timeout, kill_grace_period)
+        set_exit_code(span, process)
+        return process
+
+
+async def _run_command_async(
+    args: list[str], timeout: float | None, kill_grace_period: float
+) -> CompletedProcess:
+    '''
+    Run a command as a subprocess without blocking the event loop, terminating it once it exceeds
+    its deadline.
+    '''
+    try:
+        process: Process = await create_subprocess_exec(
+            *args, stdout=ASYNC_PIPE, stderr=ASYNC_PIPE, start_new_session=True
+        )
+    except OSError as error:
+        return CompletedProcess(args, COMMAND_NOT_RUNNABLE_RETURN_CODE, '', str(error))
+    try:
+        stdout, stderr = await wait_for(process.communicate(), timeout)
+    except AsyncTimeoutError:
+        _signal_process_group(process.pid, SIGTERM)
+        try:
+            await wait_for(process.wait(), kill_grace_period)
+        except AsyncTimeoutError:
+            pass
+        _signal_process_group(process.pid, SIGKILL)
+        await process.wait()
+        return TimedOutProcess(args, process.returncode, timeout)
+    except CancelledError:
+        _signal_process_group(process.pid, SIGKILL)
+        raise
+    return CompletedProcess(
+        args,
+        process.returncode,
+        stdout.decode(errors='replace'),
+        stderr.decode(errors='replace')
+    )
+
+
+def _get_command_name(args: list[str]) -> str:
+    '''
+    Get the name of the program a command runs, to trace it without its arguments, as these can
+    hold credentials.
+
+    Args:
+        args (list[str]): Command and its arguments
+
+    Returns:
+        str: File name of the program
+    '''
+    return basename(args[0]) if args else ''
+
+
+def _signal_process_group(pid: int, signal: Signals) -> None:
+    '''
+    Send a signal to the process group led by a command, ignoring groups that already exited.
+
+    Args:
+        pid (int): Process ID of the command leading the process group
+        signal (Signals): Signal to send
+    '''
+    try:
+        killpg(pid, signal)
+    except (ProcessLookupError, PermissionError):
+        pass
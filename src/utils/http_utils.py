@@ -0,0 +1,176 @@
+'''
+Module for sending HTTP requests to local services over persistent connections.
+
+Every service address gets one keep-alive connection, shared by all requests to that service, so
+that a request costs a round-trip on an open socket instead of a new connection or a process spawn.
+'''
+
+from http.client import HTTPConnection, HTTPException, HTTPResponse
+from json import dumps, loads
+from socket import AF_UNIX, SOCK_STREAM, socket
+from threading import Lock
+from typing import Any
+
+
+class UnixHttpConnection(HTTPConnection):
+    '''
+    HTTP connection to a service listening on a Unix socket.
+
+    Attributes:
+        socket_path (str): Path to the Unix socket of the service
+    '''
+
+    def __init__(self, socket_path: str, timeout: float | None = None) -> None:
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path: str = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket(AF_UNIX, SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class HttpServiceError(Exception):
+    '''
+    Raised when a service answers a request with a status code that is not a success.
+
+    Attributes:
+        status (int): HTTP status code of the response
+    '''
+
+    def __init__(self, status: int, reason: str) -> None:
+        super().__init__(f'{status} {reason}')
+        self.status: int = status
+
+
+class PersistentHttpClient:
+    '''
+    Keep-alive connection to a local HTTP service, opened lazily and reopened whenever the service
+    closed it. Requests are serialized, as a connection carries one request at a time.
+
+    Attributes:
+        address (str): Path to the Unix socket of the service, or its TCP host:port
+    '''
+
+    _clients: dict[str, 'PersistentHttpClient'] = {}
+    _clients_lock: Lock = Lock()
+
+    def __init__(self, address: str) -> None:
+        self.address: str = address
+        self._lock: Lock = Lock()
+        self._connection: HTTPConnection | None = None
+
+    @staticmethod
+    def get_pooled(address: str) -> 'PersistentHttpClient':
+        '''
+        Get the connection shared by all users of a service.
+
+        Args:
+            address (str): Path to the Unix socket of the service, or its TCP host:port
+
+        Returns:
+            PersistentHttpClient: Shared connection to the service
+        '''
+        with PersistentHttpClient._clients_lock:
+            client: PersistentHttpClient | None = PersistentHttpClient._clients.get(address)
+            if client is None:
+                client = PersistentHttpClient(address)
+                PersistentHttpClient._clients[address] = client
+            return client
+
+    # pylint: disable=R0913,R0917
+    def request_json(
+        self,
+        method: str,
+        path: str,
+        body: Any = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None
+    ) -> Any:
+        '''
+        Send a request with a JSON body and decode the JSON body of the response. A connection the
+        service closed since it was last used is reopened once.
+
+        Args:
+            method (str): HTTP method of the request
+            path (str): Path of the request
+            body (Any): Body of the request, encoded as JSON, or None for no body
+            headers (dict[str, str] | None): Additional headers of the request
+            timeout (float | None): Deadline of every socket operation, in seconds
+
+        Returns:
+            Any: Decoded body of the response, or None if it is empty
+
+        Raises:
+            HttpServiceError: If the response does not have a success status code
+            OSError: If the service cannot be reached or does not answer in time
+            HTTPException: If the response is not valid HTTP
+            ValueError: If the body of the response is not valid JSON
+        '''
+        encoded_body: bytes | None = dumps(body).encode('utf-8') if body is not None else None
+        all_headers: dict[str, str] = {
+            **({'Content-Type': 'application/json'} if encoded_body is not None else {}),
+            **(headers or {}),
+        }
+        with self._lock:
+            try:
+                status, reason, content = self._send(
+                    method, path, encoded_body, all_headers, timeout
+                )
+            except ConnectionError:
+                status, reason, content = self._send(
+                    method, path, encoded_body, all_headers, timeout
+                )
+        if not 200 <= status < 300:
+            raise HttpServiceError(status, reason)
+        return loads(content) if content.strip() else None
+
+    def close(self) -> None:
+        '''
+        Close the connection, if it is open. The next request opens a new one.
+        '''
+        if self._connection is not None:
+            self._connection.close()
+        self._connection = None
+
+    # pylint: disable=R0913,R0917
+    def _send(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        timeout: float | None
+    ) -> tuple[int, str, bytes]:
+        '''
+        Send a request over the connection, opening it first if needed. The connection is closed
+        if the request fails, as its state is unknown.
+
+        Returns:
+            tuple[int, str, bytes]: Status code, reason and body of the response
+        '''
+        if self._connection is None:
+            self._connection = self._create_connection(timeout)
+        elif self._connection.sock is not None:
+            self._connection.sock.settimeout(timeout)
+        self._connection.timeout = timeout
+        try:
+            self._connection.request(method, path, body, headers)
+            response: HTTPResponse = self._connection.getresponse()
+            content: bytes = response.read()
+        except (OSError, HTTPException):
+            self.close()
+            raise
+        if response.will_close:
+            self.close()
+        return response.status, response.reason, content
+
+    def _create_connection(self, timeout: float | None) -> HTTPConnection:
+        '''
+        Create a connection to the service, over TCP for a host:port address and over a Unix
+        socket otherwise.
+        '''
+        if ':' in self.address and not self.address.startswith('/'):
+            host, port = self.address.rsplit(':', 1)
+            return HTTPConnection(host, int(port), timeout=timeout)
+        return UnixHttpConnection(self.address, timeout)
@@ -0,0 +1,287 @@
+"""
+Module for reading large JSON documents incrementally, one value at a time
+"""
+
+from json import JSONDecodeError, JSONDecoder
+from re import Pattern, compile as compile_pattern
+from typing import Any, Iterator, TextIO
+
+DEFAULT_CHUNK_SIZE: int = 1 << 16
+_WHITESPACE: str = " \t\n\r"
+_STRING_PATTERN: Pattern = compile_pattern(r'["\\]')
+# A whole string, or a bracket, or the opening quote of a string that goes on in the next piece
+_STRUCTURE_PATTERN: Pattern = compile_pattern(r'"[^"\\]*(?:\\.[^"\\]*)*"|["\[\]{}]')
+_SCALAR_END_PATTERN: Pattern = compile_pattern(r"[\s,\]}]")
+
+
+# pylint: disable-next=too-few-public-methods
+class _ValueScanner:
+    """
+    Finds where a JSON value ends without decoding it, tracking the nesting of its arrays and
+    objects and the strings it contains. The value is fed one piece of text at a time, so that it
+    can be scanned across chunks without going over any character twice.
+
+    The value is not validated, decoding it reports any error.
+    """
+
+    __slots__ = ("_depth", "_is_started", "_is_scalar", "_is_in_string", "_is_escaped")
+
+    def __init__(self) -> None:
+        self._depth: int = 0
+        self._is_started: bool = False
+        self._is_scalar: bool = False
+        self._is_in_string: bool = False
+        self._is_escaped: bool = False
+
+    # Kept in one loop, as it runs for every quote and bracket of the skipped values
+    # pylint: disable-next=too-many-branches
+    def feed(self, text: str, index: int) -> int | None:
+        """
+        Scan the next piece of the value.
+
+        Args:
+            text (str): Text holding the next piece of the value
+            index (int): Position of the next piece in the text
+
+        Returns:
+            int | None: Position in the text right after the value, or None if the value goes on
+                in the next piece
+        """
+        if self._is_escaped:
+            # The escaped character is the first one of this piece
+            index += 1
+            self._is_escaped = False
+        if not self._is_started and index < len(text):
+            self._is_started = True
+            if text[index] == '"':
+                self._is_in_string = True
+                index += 1
+            elif text[index] in "[{":
+                self._depth = 1
+                index += 1
+            else:
+                self._is_scalar = True
+        while index < len(text):
+            if self._is_scalar:
+                match = _SCALAR_END_PATTERN.search(text, index)
+                return match.start() if match else None
+            match = (_STRING_PATTERN if self._is_in_string else _STRUCTURE_PATTERN).search(
+                text, index
+            )
+            if match is None:
+                return None
+            index = match.end()
+            character: str = match.group()
+            if character == "\\":
+                index += 1
+                self._is_escaped = index > len(text)
+            elif self._is_in_string:
+                self._is_in_string = False
+                if self._depth == 0:
+                    return index
+            elif len(character) > 1:
+                # A whole string, which cannot hold any of the brackets that count
+                continue
+            elif character == '"':
+                self._is_in_string = True
+            elif character in "[{":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth <= 0:
+                    return index
+        return None
+
+
+class JsonStreamReader:
+    """
+    Reads a JSON document from a text file in chunks, so that the members of its top-level object
+    and the elements of its arrays can be decoded one at a time, without ever holding the whole
+    document or its whole decoded tree in memory.
+
+    Attributes:
+        file (TextIO): File to read the document from
+        chunk_size (int): Number of characters read from the file at once
+    """
+
+    _decoder: JSONDecoder = JSONDecoder()
+
+    def __init__(self, file: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.file: TextIO = file
+        self.chunk_size: int = chunk_size
+        self._buffer: str = ""
+        self._position: int = 0
+        self._is_exhausted: bool = False
+
+    def iter_object_keys(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the object at the current position. After every key, the caller
+        has to consume its value with read_value or iter_array before resuming the iteration.
+
+        Yields:
+            str: Key of the next member of the object
+
+        Raises:
+            JSONDecodeError: If the document is not a valid JSON object
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._position += 1
+            return
+        while True:
+            key: Any = self.read_value()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name enclosed in double quotes")
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def iter_array(self) -> Iterator[Any]:
+        """
+        Iterate over the elements of the array at the current position, decoding one at a time.
+
+        Yields:
+            Any: Next decoded element of the array
+
+        Raises:
+            JSONDecodeError: If the value at the current position is not a valid JSON array
+        """
+        self._expect("[")
+        if self._peek() == "]":
+            self._position += 1
+            return
+        while True:
+            yield self.read_value()
+            if self._expect(",]") == "]":
+                return
+
+    def read_value(self) -> Any:
+        """
+        Decode the complete value at the current position. The chunks holding the value are
+        scanned once to find its end, and the value is only decoded once it is complete.
+
+        Returns:
+            Any: Decoded value
+
+        Raises:
+            JSONDecodeError: If the value at the current position is not valid JSON
+        """
+        self._scan_value(True)
+        value, self._position = JsonStreamReader._decoder.raw_decode(self._buffer, self._position)
+        return value
+
+    def skip_value(self) -> None:
+        """
+        Skip the value at the current position without decoding it or holding it in memory, like
+        a long VPN list that is not needed.
+
+        Raises:
+            JSONDecodeError: If there is no value at the current position
+        """
+        self._position = self._scan_value(False)
+
+    def _scan_value(self, keep: bool) -> int:
+        """
+        Find where the value at the current position ends, reading chunks until it is complete.
+
+        Args:
+            keep (bool): Whether to keep the whole value in the buffer, from the current position,
+                or only what follows it
+
+        Returns:
+            int: Position in the buffer right after the value
+
+        Raises:
+            JSONDecodeError: If there is no value at the current position
+        """
+        if not self._peek():
+            raise self._error("Expecting value")
+        scanner: _ValueScanner = _ValueScanner()
+        end: int | None = scanner.feed(self._buffer, self._position)
+        if end is not None:
+            return end
+        # Chunks are only joined once the value is complete, so that no part is copied twice
+        pieces: list[str] = [self._buffer[self._position:]] if keep else []
+        while end is None:
+            chunk: str = self._read_file_chunk()
+            if not chunk:
+                break
+            if not keep:
+                pieces.clear()
+            pieces.append(chunk)
+            end = scanner.feed(chunk, 0)
+        last_length: int = len(pieces[-1]) if pieces else 0
+        self._buffer = "".join(pieces)
+        self._position = 0
+        return len(self._buffer) - last_length + (last_length if end is None else end)
+
+    def _peek(self) -> str:
+        """
+        Skip whitespace and get the next character without consuming it.
+
+        Returns:
+            str: Next character, or an empty string at the end of the document
+        """
+        while True:
+            buffer: str = self._buffer
+            while self._position < len(buffer) and buffer[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer) or not self._read_chunk():
+                return self._buffer[self._position:self._position + 1]
+
+    def _expect(self, characters: str) -> str:
+        """
+        Consume the next non-whitespace character, which has to be one of the given ones.
+
+        Args:
+            characters (str): Characters that are valid at the current position
+
+        Returns:
+            str: Consumed character
+        """
+        character: str = self._peek()
+        if not character or character not in characters:
+            raise self._error(f"Expecting one of {characters!r}")
+        self._position += 1
+        return character
+
+    def _read_chunk(self) -> bool:
+        """
+        Append the next chunk of the file to the buffer, dropping the part already consumed.
+
+        Returns:
+            bool: Whether anything was read, False at the end of the file
+        """
+        chunk: str = self._read_file_chunk()
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
+
+    def _read_file_chunk(self) -> str:
+        """
+        Read the next chunk of the file, without adding it to the buffer.
+
+        Returns:
+            str: Next chunk, or an empty string at the end of the file
+        """
+        if self._is_exhausted:
+            return ""
+        chunk: str = self.file.read(self.chunk_size)
+        if not chunk:
+            self._is_exhausted = True
+        return chunk
+
+    def _error(self, message: str) -> JSONDecodeError:
+        """
+        Create a decoding error at the current position of the buffer.
+
+        Args:
+            message (str): Description of the error
+
+        Returns:
+            JSONDecodeError: Error to raise
+        """
+        return JSONDecodeError(message, self._buffer, self._position)
@@ -0,0 +1,219 @@
+'''
+Module for talking to the management interface of OpenVPN daemons.
+
+Every management address gets one long-lived connection, shared by all the operations on that
+daemon, so that status checks and restarts cost a socket round-trip instead of a process spawn.
+'''
+
+from socket import AF_UNIX, SOCK_STREAM, create_connection, socket
+from threading import Lock
+from typing import Callable, TextIO
+
+_NOTIFICATION_PREFIX: str = '>'
+_PASSWORD_PROMPT: str = 'ENTER PASSWORD:'
+_MULTILINE_END: str = 'END'
+_SUCCESS_PREFIX: str = 'SUCCESS:'
+_ERROR_PREFIX: str = 'ERROR:'
+
+
+class OpenVpnManagementError(Exception):
+    '''
+    Raised when the management interface rejects a command with an ERROR response.
+    '''
+
+
+class OpenVpnManagementClient:
+    '''
+    Connection to the management interface of one OpenVPN daemon, opened lazily and reopened
+    whenever it breaks. Commands are serialized, as the interface answers them in order.
+
+    Real-time notifications, the lines starting with '>', are skipped while reading responses.
+
+    Attributes:
+        address (str): Path to the Unix socket of the interface, or its TCP host:port
+        password (str): Password of the interface, empty if there is none
+    '''
+
+    _clients: dict[tuple[str, str], 'OpenVpnManagementClient'] = {}
+    _clients_lock: Lock = Lock()
+
+    def __init__(self, address: str, password: str = '') -> None:
+        self.address: str = address
+        self.password: str = password
+        self._lock: Lock = Lock()
+        self._socket: socket | None = None
+        self._file: TextIO | None = None
+
+    @staticmethod
+    def get_pooled(address: str, password: str = '') -> 'OpenVpnManagementClient':
+        '''
+        Get the connection shared by all users of a management interface.
+
+        Args:
+            address (str): Path to the Unix socket of the interface, or its TCP host:port
+            password (str): Password of the interface, empty if there is none
+
+        Returns:
+            OpenVpnManagementClient: Shared connection to the interface
+        '''
+        key: tuple[str, str] = (address, password)
+        with OpenVpnManagementClient._clients_lock:
+            client: OpenVpnManagementClient | None = OpenVpnManagementClient._clients.get(key)
+            if client is None:
+                client = OpenVpnManagementClient(address, password)
+                OpenVpnManagementClient._clients[key] = client
+            return client
+
+    def run(self, command: str, timeout: float, multiline: bool = False) -> list[str]:
+        '''
+        Send a command and read its response. A connection that turns out to be broken is
+        reopened once, as the daemon may have been restarted since it was last used.
+
+        Args:
+            command (str): Management command, like "state" or "signal SIGUSR1"
+            timeout (float): Deadline of every socket operation, in seconds
+            multiline (bool): Whether the response spans several lines terminated by "END"
+
+        Returns:
+            list[str]: Lines of the response, without the terminating "END"
+
+        Raises:
+            OpenVpnManagementError: If the interface answers with an ERROR
+            OSError: If the interface cannot be reached or does not answer in time
+        '''
+        with self._lock:
+            try:
+                return self._run_connected(command, timeout, multiline)
+            except ConnectionError:
+                pass
+            return self._run_connected(command, timeout, multiline)
+
+    def close(self) -> None:
+        '''
+        Close the connection, if it is open. The next command opens a new one.
+        '''
+        if self._file is not None:
+            self._file.close()
+        if self._socket is not None:
+            self._socket.close()
+        self._file = None
+        self._socket = None
+
+    def _run_connected(self, command: str, timeout: float, multiline: bool) -> list[str]:
+        '''
+        Send a command, opening the connection first if needed. The connection is closed if the
+        command fails for any reason other than an ERROR response, as its state is unknown.
+
+        Args:
+            command (str): Management command
+            timeout (float): Deadline of every socket operation, in seconds
+            multiline (bool): Whether the response spans several lines terminated by "END"
+
+        Returns:
+            list[str]: Lines of the response, without the terminating "END"
+        '''
+        try:
+            self._ensure_connected(timeout)
+            return self._send(command, timeout, multiline)
+        except OSError:
+            self.close()
+            raise
+
+    def _ensure_connected(self, timeout: float) -> None:
+        '''
+        Open the connection and log in, unless it is already open.
+
+        Args:
+            timeout (float): Deadline of every socket operation, in seconds
+        '''
+        if self._socket is not None:
+            self._socket.settimeout(timeout)
+            return
+        if ':' in self.address and not self.address.startswith('/'):
+            host, port = self.address.rsplit(':', 1)
+            self._socket = create_connection((host, int(port)), timeout)
+        else:
+            self._socket = socket(AF_UNIX, SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(self.address)
+        self._file = self._socket.makefile('r', encoding='utf-8', newline='\n')
+        if self.password:
+            self._read_until(lambda line: line.startswith(_PASSWORD_PROMPT), partial=True)
+            self._write(self.password)
+            line: str = self._read_until(
+                lambda line: line.startswith((_SUCCESS_PREFIX, _ERROR_PREFIX))
+            )
+            if line.startswith(_ERROR_PREFIX):
+                self.close()
+                raise OpenVpnManagementError(line[len(_ERROR_PREFIX):].strip())
+
+    def _send(self, command: str, timeout: float, multiline: bool) -> list[str]:
+        '''
+        Send a command over the open connection and read its response.
+
+        Args:
+            command (str): Management command
+            timeout (float): Deadline of every socket operation, in seconds
+            multiline (bool): Whether the response spans several lines terminated by "END"
+
+        Returns:
+            list[str]: Lines of the response, without the terminating "END"
+        '''
+        self._socket.settimeout(timeout)
+        self._write(command)
+        if not multiline:
+            line: str = self._read_until(
+                lambda line: line.startswith((_SUCCESS_PREFIX, _ERROR_PREFIX))
+            )
+            if line.startswith(_ERROR_PREFIX):
+                raise OpenVpnManagementError(line[len(_ERROR_PREFIX):].strip())
+            return [line[len(_SUCCESS_PREFIX):].strip()]
+        lines: list[str] = []
+        while True:
+            line = self._read_line()
+            if line == _MULTILINE_END:
+                return lines
+            if line.startswith(_ERROR_PREFIX):
+                raise OpenVpnManagementError(line[len(_ERROR_PREFIX):].strip())
+            lines.append(line)
+
+    def _write(self, line: str) -> None:
+        '''
+        Send one line to the interface.
+        '''
+        self._socket.sendall(f'{line}\n'.encode('utf-8'))
+
+    def _read_line(self) -> str:
+        '''
+        Read the next line of a response, skipping real-time notifications.
+
+        Raises:
+            ConnectionError: If the daemon closed the connection
+        '''
+        while True:
+            line: str = self._file.readline()
+            if not line:
+                raise ConnectionError(f'{self.address} closed the connection')
+            line = line.rstrip('\r\n')
+            if not line.startswith(_NOTIFICATION_PREFIX):
+                return line
+
+    def _read_until(self, is_last: Callable[[str], bool], partial: bool = False) -> str:
+        '''
+        Read lines until one matches, returning it.
+
+        Args:
+            is_last (Callable[[str], bool]): Whether a line is the one waited for
+            partial (bool): Whether the line waited for is a prompt without a line break
+        '''
+        if not partial:
+            while not is_last(line := self._read_line()):
+                pass
+            return line
+        buffer: str = ''
+        while not is_last(buffer):
+            character: str = self._file.read(1)
+            if not character:
+                raise ConnectionError(f'{self.address} closed the connection')
+            buffer = '' if character == '\n' else buffer + character
+        return buffer
@@ -0,0 +1,96 @@
+'''
+Module for sharing one run of an identical asynchronous operation between concurrent callers.
+'''
+
+from asyncio import Task, create_task, get_running_loop, shield
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+# pylint: disable-next=too-few-public-methods
+class _Flight:
+    '''
+    Operation in flight for a key, with the number of callers waiting for it.
+    '''
+
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: Task) -> None:
+        self.task: Task = task
+        self.waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    '''
+    Runs at most one operation per key at a time. A caller asking for a key whose operation is
+    already in flight waits for that operation and gets its result, instead of starting another.
+
+    The operation runs in its own task, shielded from its callers. A cancelled caller stops
+    waiting without stopping the operation, which is only cancelled once none of its callers are
+    left waiting.
+    '''
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight] = {}
+
+    async def run(self, key: Hashable, start: Callable[[], Awaitable[T]]) -> T:
+        '''
+        Run an operation, or join the operation in flight for the same key.
+
+        Args:
+            key (Hashable): Key identifying identical operations
+            start (Callable[[], Awaitable[T]]): Starts the operation, only called if none is in
+                flight for the key
+
+        Returns:
+            T: Result of the operation
+        '''
+        flight: _Flight | None = self._flights.get(key)
+        if flight is None or flight.task.done() or flight.task.get_loop() is not get_running_loop():
+            flight = self._start(key, start)
+        flight.waiters += 1
+        try:
+            return await shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        '''
+        Get whether an operation is in flight for a key.
+
+        Args:
+            key (Hashable): Key identifying identical operations
+
+        Returns:
+            bool: Whether an operation is running for the key
+        '''
+        flight: _Flight | None = self._flights.get(key)
+        return flight is not None and not flight.task.done()
+
+    def _start(self, key: Hashable, start: Callable[[], Awaitable[T]]) -> _Flight:
+        '''
+        Start an operation in its own task, forgetting it once it is done.
+
+        Args:
+            key (Hashable): Key identifying identical operations
+            start (Callable[[], Awaitable[T]]): Starts the operation
+
+        Returns:
+            _Flight: Operation in flight
+        '''
+
+        async def run_operation() -> T:
+            return await start()
+
+        flight: _Flight = _Flight(create_task(run_operation()))
+        self._flights[key] = flight
+
+        def forget(_: Task) -> None:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+        flight.task.add_done_callback(forget)
+        return flight
@@ -0,0 +1,128 @@
+'''
+Module for timing VPN operations as structured spans.
+
+Tracing is off until a sink is set, in which case every span is a single check of a global, so the
+instrumented code paths cost nothing measurable when nobody is listening.
+'''
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from json import dumps
+from subprocess import CompletedProcess
+from threading import Lock
+from time import monotonic, time
+from typing import Any, Iterator, TextIO
+
+
+class TraceSink(ABC):
+    '''
+    Destination of finished spans. Spans may be emitted from several threads at once.
+    '''
+
+    @abstractmethod
+    def emit(self, span: dict[str, Any]) -> None:
+        '''
+        Record a finished span.
+
+        Args:
+            span (dict[str, Any]): Name, start time, duration and attributes of the span
+        '''
+        raise NotImplementedError
+
+    def close(self) -> None:
+        '''
+        Release the resources of the sink. No span is emitted afterwards.
+        '''
+
+
+class JsonLinesTraceSink(TraceSink):
+    '''
+    Appends every span to a file as one JSON object per line.
+
+    Attributes:
+        path (str): Path to the JSON Lines file
+    '''
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self._lock: Lock = Lock()
+        # pylint: disable-next=consider-using-with
+        self._file: TextIO = open(path, 'a', encoding='utf-8', buffering=1)
+
+    def emit(self, span: dict[str, Any]) -> None:
+        line: str = dumps(span, default=str)
+        with self._lock:
+            self._file.write(f'{line}\n')
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_sink: TraceSink | None = None  # pylint: disable=invalid-name
+
+
+def set_trace_sink(sink: TraceSink | None) -> TraceSink | None:
+    '''
+    Send all spans to a sink from now on, or stop tracing.
+
+    Args:
+        sink (TraceSink | None): Sink to send the spans to, or None to stop tracing
+
+    Returns:
+        TraceSink | None: Sink that was used until now, which is not closed
+    '''
+    global _sink  # pylint: disable=global-statement
+    previous_sink: TraceSink | None = _sink
+    _sink = sink
+    return previous_sink
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+    '''
+    Time the code of a with block as a span. Attributes known only at the end of the block, like
+    an exit code, can be added to the yielded dictionary. An exception escaping the block is
+    recorded in the "error" attribute.
+
+    Args:
+        name (str): Name of the span, like "connect"
+        **attributes (Any): Attributes of the span, like the ID of the VPN
+
+    Yields:
+        dict[str, Any]: Attributes of the span
+    '''
+    sink: TraceSink | None = _sink
+    if sink is None:
+        yield attributes
+        return
+    start: float = time()
+    started_at: float = monotonic()
+    try:
+        yield attributes
+    except BaseException as error:
+        attributes['error'] = repr(error)
+        raise
+    finally:
+        sink.emit({
+            'name': name,
+            'start': start,
+            'duration': monotonic() - started_at,
+            **attributes,
+        })
+
+
+def set_exit_code(attributes: dict[str, Any], process: CompletedProcess | None) -> None:
+    '''
+    Record the outcome of a command or VPN action in the attributes of its span.
+
+    Args:
+        attributes (dict[str, Any]): Attributes of the span
+        process (CompletedProcess | None): Result of the command, or None if nothing was run
+    '''
+    if process is None:
+        return
+    attributes['exit_code'] = process.returncode
+    timeout: float | None = getattr(process, 'timeout', None)
+    if timeout is not None:
+        attributes['timed_out_after'] = timeout
@@ -0,0 +1,53 @@
+'''
+Module for waiting on conditions with a deadline.
+'''
+
+from asyncio import sleep as async_sleep
+from time import monotonic, sleep
+from typing import Awaitable, Callable
+
+
+def wait_until(condition: Callable[[], bool], timeout: float, poll_interval: float) -> bool:
+    '''
+    Poll a condition until it holds or the deadline passes.
+
+    Args:
+        condition (Callable[[], bool]): Condition to poll
+        timeout (float): Seconds to keep polling for
+        poll_interval (float): Seconds to wait between two polls
+
+    Returns:
+        bool: Whether the condition held before the deadline
+    '''
+    deadline: float = monotonic() + timeout
+    while not condition():
+        remaining: float = deadline - monotonic()
+        if remaining <= 0:
+            return False
+        sleep(min(poll_interval, remaining))
+    return True
+
+
+async def wait_until_async(
+    condition: Callable[[], Awaitable[bool]],
+    timeout: float,
+    poll_interval: float
+) -> bool:
+    '''
+    Poll a condition until it holds or the deadline passes, without blocking the event loop.
+
+    Args:
+        condition (Callable[[], Awaitable[bool]]): Condition to poll
+        timeout (float): Seconds to keep polling for
+        poll_interval (float): Seconds to wait between two polls
+
+    Returns:
+        bool: Whether the condition held before the deadline
+    '''
+    deadline: float = monotonic() + timeout
+    while not await condition():
+        remaining: float = deadline - monotonic()
+        if remaining <= 0:
+            return False
+        await async_sleep(min(poll_interval, remaining))
+    return True
@@ -0,0 +1,95 @@
+"""
+Fake VPNs and backend CLIs shared by the tests
+"""
+
+from asyncio import sleep
+from pathlib import Path
+from subprocess import CompletedProcess
+
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.models.vpn_config.abstract_vpn_config import AbstractVpnConfig
+
+
+def write_fake_cli(directory: Path, name: str, script: str) -> Path:
+    """
+    Write an executable shell script standing in for a backend CLI.
+
+    Args:
+        directory (Path): Directory to write the script to
+        name (str): File name of the script
+        script (str): Body of the script, without the shebang line
+
+    Returns:
+        Path: Path to the script
+    """
+    cli_path: Path = directory / name
+    cli_path.write_text(f"#!/bin/sh\n{script}", encoding="utf-8")
+    cli_path.chmod(0o755)
+    return cli_path
+
+
+class FakeVpnModel(AbstractVpnModel):
+    """
+    VPN whose actions take a fixed time and are recorded, counting how many of them run at once
+    and logging the order they complete in across VPNs
+    """
+
+    running: int = 0
+    max_running: int = 0
+    log: list[str] = []
+
+    # pylint: disable=R0913
+    def __init__(
+        self,
+        vpn_id: str,
+        connected: bool | None = False,
+        *,
+        action_seconds: float = 0.0,
+        returncode: int = 0,
+        error: Exception | None = None
+    ) -> None:
+        super().__init__(vpn_id=vpn_id, config=AbstractVpnConfig())
+        self.connected: bool | None = connected
+        self.action_seconds: float = action_seconds
+        self.returncode: int = returncode
+        self.error: Exception | None = error
+        self.actions: list[str] = []
+        self.checks: int = 0
+
+    def get_connects(self) -> int:
+        """
+        Get the number of completed connections.
+        """
+        return self.actions.count("connect")
+
+    def connect(self, verbose: bool) -> CompletedProcess:
+        raise NotImplementedError
+
+    def disconnect(self, verbose: bool) -> CompletedProcess:
+        raise NotImplementedError
+
+    def is_connected(self, verbose: bool) -> bool | None:
+        return self.connected
+
+    async def connect_async(self, verbose: bool) -> CompletedProcess:
+        return await self._act("connect")
+
+    async def disconnect_async(self, verbose: bool) -> CompletedProcess:
+        return await self._act("disconnect")
+
+    async def is_connected_async(self, verbose: bool) -> bool | None:
+        self.checks += 1
+        return self.connected
+
+    async def _act(self, action: str) -> CompletedProcess:
+        if self.error:
+            raise self.error
+        FakeVpnModel.running += 1
+        FakeVpnModel.max_running = max(FakeVpnModel.max_running, FakeVpnModel.running)
+        try:
+            await sleep(self.action_seconds)
+        finally:
+            FakeVpnModel.running -= 1
+        self.actions.append(action)
+        FakeVpnModel.log.append(f"{action} {self.vpn_id}")
+        return CompletedProcess([action, self.vpn_id], self.returncode)
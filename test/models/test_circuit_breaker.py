@@ -0,0 +1,95 @@
+'''
+Test Circuit Breaker Model module
+'''
+
+from random import Random
+
+from pytest import raises
+
+from src.enums.circuit_state import CircuitState
+from src.models.circuit_breaker import CircuitBreaker
+
+
+class _FakeClock:
+    '''
+    Clock that only moves when told to
+    '''
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance_to(self, now: float) -> None:
+        '''Move the clock to the given time'''
+        self.now = now
+
+
+class TestCircuitBreaker:
+    '''
+    Test CircuitBreaker class
+    '''
+
+    def test_opens_after_threshold(self):
+        '''
+        Test that the circuit only opens once the failure threshold is reached
+        '''
+        # Arrange
+        clock: _FakeClock = _FakeClock()
+        sut: CircuitBreaker = CircuitBreaker(3, base_delay=10, jitter=0, clock=clock)
+
+        # Act
+        delays: list[float] = [sut.record_failure() for _ in range(3)]
+
+        # Assert
+        assert [0, 0, 10] == delays
+        assert CircuitState.OPEN == sut.get_state()
+        assert 10 == sut.get_remaining_delay()
+
+    def test_half_open_trial(self):
+        '''
+        Test that a failed trial reopens the circuit for twice as long, and a successful one
+        closes it
+        '''
+        # Arrange
+        clock: _FakeClock = _FakeClock()
+        sut: CircuitBreaker = CircuitBreaker(1, base_delay=10, jitter=0, clock=clock)
+        sut.record_failure()
+
+        # Act and Assert
+        clock.advance_to(10)
+        assert CircuitState.HALF_OPEN == sut.get_state()
+        assert 0 == sut.get_remaining_delay()
+        assert 20 == sut.record_failure()
+        assert CircuitState.OPEN == sut.get_state()
+        clock.advance_to(30)
+        sut.record_success()
+        assert CircuitState.CLOSED == sut.get_state()
+        assert 0 == sut.get_consecutive_failures()
+
+    def test_backoff_is_capped_and_jittered(self):
+        '''
+        Test that the open delay is jittered but never exceeds its upper bound
+        '''
+        # Arrange
+        sut: CircuitBreaker = CircuitBreaker(
+            1, base_delay=10, max_delay=60, jitter=0.5, rng=Random(0)
+        )
+
+        # Act
+        delays: list[float] = [sut.record_failure() for _ in range(2000)]
+
+        # Assert
+        assert all(0 < delay <= 60 for delay in delays)
+        assert 60 == delays[-1]
+        assert all(5 <= delay <= 15 for delay in delays[:1])
+        assert 3 == len(set(delays[:3]))
+
+    def test_invalid_threshold(self):
+        '''
+        Test that a circuit needs at least one failure to open
+        '''
+        # Act and Assert
+        with raises(ValueError):
+            CircuitBreaker(0)
@@ -0,0 +1,69 @@
+'''
+Test Token Bucket Model module
+'''
+
+from pytest import raises
+
+from src.models.token_bucket import TokenBucket
+
+
+class _FakeClock:
+    '''
+    Clock that only moves when told to
+    '''
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance_to(self, now: float) -> None:
+        '''Move the clock to the given time'''
+        self.now = now
+
+
+class TestTokenBucket:
+    '''
+    Test TokenBucket class
+    '''
+
+    def test_burst_then_rate(self):
+        '''
+        Test that a full bucket allows a burst, after which reservations are spread at the rate
+        '''
+        # Arrange
+        sut: TokenBucket = TokenBucket(2, 3, clock=_FakeClock())
+
+        # Act
+        waits: list[float] = [sut.reserve() for _ in range(6)]
+
+        # Assert
+        assert [0, 0, 0, 0.5, 1, 1.5] == waits
+
+    def test_refill_is_capped(self):
+        '''
+        Test that an idle bucket refills, but never beyond its capacity
+        '''
+        # Arrange
+        clock: _FakeClock = _FakeClock()
+        sut: TokenBucket = TokenBucket(1, 2, clock=clock)
+        for _ in range(3):
+            sut.reserve()
+
+        # Act
+        clock.advance_to(100)
+        waits: list[float] = [sut.reserve() for _ in range(3)]
+
+        # Assert
+        assert [0, 0, 1] == waits
+
+    def test_invalid_bucket(self):
+        '''
+        Test that a bucket needs a positive rate and capacity
+        '''
+        # Act and Assert
+        with raises(ValueError):
+            TokenBucket(0)
+        with raises(ValueError):
+            TokenBucket(1, 0)
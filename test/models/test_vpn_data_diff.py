@@ -0,0 +1,60 @@
+'''
+Test VPN Data Diff Model module
+'''
+
+from src.models.vpn_data_diff import VpnDataDiff
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.models.vpn_model.pritunl_vpn_model import PritunlVpnModel
+from src.models.vpn_config.pritunl_vpn_config import PritunlVpnConfig
+
+
+class TestVpnDataDiff:
+    '''
+    Test VpnDataDiff class
+    '''
+    config: PritunlVpnConfig = PritunlVpnConfig()
+
+    def test_from_vpn_lists(self):
+        '''
+        Test computing the difference between two lists of VPNs
+        '''
+        # Arrange
+        old_vpns: list[AbstractVpnModel] = [
+            PritunlVpnModel('kept', TestVpnDataDiff.config, pin='1'),
+            PritunlVpnModel('changed', TestVpnDataDiff.config, pin='1'),
+            PritunlVpnModel('reconfigured', TestVpnDataDiff.config),
+            PritunlVpnModel('rescheduled', TestVpnDataDiff.config),
+            PritunlVpnModel('retimed', TestVpnDataDiff.config),
+            PritunlVpnModel('removed', TestVpnDataDiff.config),
+        ]
+        new_vpns: list[AbstractVpnModel] = [
+            PritunlVpnModel('kept', TestVpnDataDiff.config, pin='1'),
+            PritunlVpnModel('changed', TestVpnDataDiff.config, pin='2'),
+            PritunlVpnModel('reconfigured', PritunlVpnConfig('other_cli_path')),
+            PritunlVpnModel('rescheduled', TestVpnDataDiff.config),
+            PritunlVpnModel('retimed', PritunlVpnConfig(kill_grace_period=5)),
+            PritunlVpnModel('added', TestVpnDataDiff.config),
+        ]
+        new_vpns[3].check_interval = 30
+        new_vpns[3].priority = 2
+
+        # Act
+        actual_diff: VpnDataDiff = VpnDataDiff.from_vpn_lists(old_vpns, new_vpns)
+
+        # Assert
+        assert ['added'] == [vpn.get_vpn_id() for vpn in actual_diff.added]
+        assert ['removed'] == [vpn.get_vpn_id() for vpn in actual_diff.removed]
+        assert [(old_vpns[1], new_vpns[1]), (old_vpns[2], new_vpns[2])] == actual_diff.changed
+        assert [(old_vpns[3], new_vpns[3]), (old_vpns[4], new_vpns[4])] == actual_diff.updated
+        assert '1 added, 1 removed, 2 changed, 2 updated' == str(actual_diff)
+
+    def test_is_empty(self):
+        '''
+        Test that equivalent lists of VPNs have an empty difference
+        '''
+        # Arrange
+        vpns: list[AbstractVpnModel] = [PritunlVpnModel('kept', TestVpnDataDiff.config)]
+
+        # Act and Assert
+        assert VpnDataDiff.from_vpn_lists(vpns, list(vpns)).is_empty()
+        assert not VpnDataDiff.from_vpn_lists(vpns, []).is_empty()
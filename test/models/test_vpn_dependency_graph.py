@@ -0,0 +1,76 @@
+'''
+Test VPN Dependency Graph Model module
+'''
+
+from pytest import raises
+
+from fakes import FakeVpnModel
+from src.models.vpn_dependency_graph import VpnDependencyGraph
+
+
+def _create_vpns(dependencies: dict[str, tuple[str, ...]]) -> list[FakeVpnModel]:
+    '''
+    Create a VPN for every ID, depending on the given IDs.
+    '''
+    vpns: list[FakeVpnModel] = []
+    for vpn_id, depends_on in dependencies.items():
+        vpn: FakeVpnModel = FakeVpnModel(vpn_id)
+        vpn.depends_on = depends_on
+        vpns.append(vpn)
+    return vpns
+
+
+class TestVpnDependencyGraph:
+    '''
+    Test VpnDependencyGraph class
+    '''
+
+    def test_waves(self):
+        '''
+        Test that every VPN is in the wave after the last of its dependencies
+        '''
+        # Arrange
+        sut: VpnDependencyGraph = VpnDependencyGraph(_create_vpns({
+            'app': ('office', 'NONE_lab'),
+            'office': ('gateway',),
+            'lab': ('gateway',),
+            'gateway': (),
+            'home': (),
+        }))
+
+        # Act
+        waves: list[list[str]] = [[vpn.get_vpn_id() for vpn in wave] for wave in sut.get_waves()]
+
+        # Assert
+        assert [['gateway', 'home'], ['office', 'lab'], ['app']] == waves
+        assert ['gateway', 'office', 'lab'] == [
+            vpn.get_vpn_id() for vpn in sut.get_all_dependencies(sut.vpns[0])
+        ]
+        sut.validate()
+
+    def test_unknown_dependencies(self):
+        '''
+        Test that dependencies on unknown VPNs are left out of the graph, but fail the validation
+        '''
+        # Arrange
+        sut: VpnDependencyGraph = VpnDependencyGraph(_create_vpns({'app': ('PRITUNL_app',)}))
+
+        # Act and Assert
+        assert {'PRITUNL_app'} == sut.get_unknown_dependencies()
+        assert [['app']] == [[vpn.get_vpn_id() for vpn in wave] for wave in sut.get_waves()]
+        with raises(ValueError, match='Unknown dependencies PRITUNL_app'):
+            sut.validate()
+
+    def test_cycles(self):
+        '''
+        Test that cycles fail the waves, but not the lookup of dependencies
+        '''
+        # Arrange
+        sut: VpnDependencyGraph = VpnDependencyGraph(_create_vpns({
+            'first': ('second',), 'second': ('first',), 'free': (),
+        }))
+
+        # Act and Assert
+        assert ['second'] == [vpn.get_vpn_id() for vpn in sut.get_all_dependencies(sut.vpns[0])]
+        with raises(ValueError, match='Dependency cycle among NONE_first, NONE_second'):
+            sut.validate()
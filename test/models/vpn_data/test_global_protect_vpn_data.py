@@ -0,0 +1,72 @@
+'''
+Test Global Protect VPN Data Model module
+'''
+
+from asyncio import run
+from pathlib import Path
+from subprocess import CompletedProcess
+
+from src.models.vpn_config.global_protect_vpn_config import GlobalProtectVpnConfig
+from src.models.vpn_model.global_protect_vpn_model import GlobalProtectVpnModel
+
+
+def _create_sut(directory: Path, unload_works: bool) -> GlobalProtectVpnModel:
+    '''
+    Create a Global Protect VPN whose agent is simulated by a flag file.
+    '''
+    agent_path: Path = directory / 'agent'
+    agent_path.touch()
+    config: GlobalProtectVpnConfig = GlobalProtectVpnConfig(
+        service_load_command=f'touch {agent_path}',
+        service_unload_command=f'rm {agent_path}' if unload_works else 'true',
+        process_kill_command=f'touch {directory / "killed"}',
+        status_command=f'test -f {agent_path}',
+        unload_wait_timeout=0.2,
+        unload_poll_interval=0.01
+    )
+    return GlobalProtectVpnModel('GP1', config)
+
+
+class TestGlobalProtectVpnModel:
+    '''
+    Test GlobalProtectVpnModel class
+    '''
+
+    def test_is_connected(self, tmp_path: Path):
+        '''
+        Test probing the agent with the status command
+        '''
+        # Arrange
+        sut: GlobalProtectVpnModel = _create_sut(tmp_path, unload_works=True)
+
+        # Act and Assert
+        assert sut.is_connected(False)
+        (tmp_path / 'agent').unlink()
+        assert not sut.is_connected(False)
+
+    def test_disconnect_skips_kill_when_unloaded(self, tmp_path: Path):
+        '''
+        Test that the agent is not killed once unloading it succeeded
+        '''
+        # Arrange
+        sut: GlobalProtectVpnModel = _create_sut(tmp_path, unload_works=True)
+
+        # Act
+        actual_process: CompletedProcess = sut.disconnect(False)
+
+        # Assert
+        assert 0 == actual_process.returncode
+        assert not (tmp_path / 'killed').exists()
+
+    def test_disconnect_kills_when_unload_hangs(self, tmp_path: Path):
+        '''
+        Test that the agent is killed if it is still running once the unload wait deadline passes
+        '''
+        # Arrange
+        sut: GlobalProtectVpnModel = _create_sut(tmp_path, unload_works=False)
+
+        # Act
+        run(sut.disconnect_async(False))
+
+        # Assert
+        assert (tmp_path / 'killed').exists()
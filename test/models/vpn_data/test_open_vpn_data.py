@@ -0,0 +1,283 @@
+'''
+Test OpenVPN VPN Data Model module
+'''
+
+from asyncio import run
+from pathlib import Path
+from socket import AF_UNIX, SHUT_RDWR, SOCK_STREAM, socket
+from subprocess import CompletedProcess
+from threading import Thread
+from typing import Iterator
+
+from pytest import fixture, raises
+
+from src.models.vpn_config.open_vpn_config import OpenVpnConfig
+from src.models.vpn_model.open_vpn_model import OpenVpnModel
+
+
+class _FakeManagementServer:
+    '''
+    Management interface of a fake OpenVPN daemon listening on a Unix socket, which starts on hold
+    and connects as soon as it is released.
+    '''
+
+    def __init__(self, socket_path: Path, password: str = '') -> None:
+        self.password: str = password
+        self.state: str = 'WAIT'
+        self.hold: bool = True
+        self.commands: list[str] = []
+        self.connections: list[socket] = []
+        self._server: socket = socket(AF_UNIX, SOCK_STREAM)
+        self._server.bind(str(socket_path))
+        self._server.listen()
+        Thread(target=self._accept, daemon=True).start()
+
+    def drop_connections(self) -> None:
+        '''
+        Close every open connection, like a restarted daemon would.
+        '''
+        for connection in self.connections:
+            try:
+                connection.shutdown(SHUT_RDWR)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        '''
+        Stop accepting connections.
+        '''
+        self.drop_connections()
+        self._server.close()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            self.connections.append(connection)
+            Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection: socket) -> None:
+        with connection, connection.makefile('rw', encoding='utf-8', newline='\n') as file:
+            if self.password:
+                file.write('ENTER PASSWORD:')
+                file.flush()
+                if file.readline().strip() != self.password:
+                    file.write('ERROR: bad password\n')
+                    file.flush()
+                    return
+                file.write('SUCCESS: password is correct\n')
+            file.write('>INFO:OpenVPN Management Interface Version 5\n')
+            file.flush()
+            for line in file:
+                self.commands.append(line.strip())
+                file.write(f'>STATE:1700000000,{self.state},,,,,,\n')
+                file.write(self._respond(line.strip()))
+                file.flush()
+
+    def _respond(self, command: str) -> str:
+        if command == 'state':
+            return f'1700000000,{self.state},SUCCESS,10.8.0.2,1.2.3.4,,,\nEND\n'
+        if command == 'hold':
+            return f'SUCCESS: hold={int(self.hold)}\n'
+        if command in ('hold on', 'hold off'):
+            self.hold = command == 'hold on'
+            return 'SUCCESS: hold flag set\n'
+        if command == 'hold release':
+            if self.state == 'WAIT':
+                self.state = 'CONNECTED'
+            return 'SUCCESS: hold release succeeded\n'
+        if command == 'signal SIGUSR1':
+            self.state = 'WAIT' if self.hold else 'CONNECTED'
+            return 'SUCCESS: signal SIGUSR1 thrown\n'
+        return 'ERROR: unknown command\n'
+
+
+@fixture(name='server_path')
+def _server_path(tmp_path: Path) -> Path:
+    '''
+    Path of the Unix socket of a fake management interface.
+    '''
+    return tmp_path / 'management.sock'
+
+
+@fixture(name='server')
+def _server(server_path: Path) -> Iterator[_FakeManagementServer]:
+    '''
+    Fake management interface of an OpenVPN daemon, stopped after the test.
+    '''
+    server: _FakeManagementServer = _FakeManagementServer(server_path)
+    yield server
+    server.close()
+
+
+class TestOpenVpnModel:
+    '''
+    Test OpenVpnModel class
+    '''
+
+    def test_operations_share_one_connection(
+        self, server: _FakeManagementServer, server_path: Path
+    ):
+        '''
+        Test that connecting, probing and disconnecting all go over one pooled connection
+        '''
+        # Arrange
+        sut: OpenVpnModel = OpenVpnModel(
+            'office', OpenVpnConfig(), management_address=str(server_path)
+        )
+
+        # Act
+        was_connected: bool | None = sut.is_connected(False)
+        connect_process: CompletedProcess | None = run(sut.ensure_connected_async(False))
+        is_connected: bool | None = run(sut.is_connected_async(False))
+        disconnect_process: CompletedProcess = sut.disconnect(False)
+        is_disconnected: bool | None = sut.is_connected(False)
+
+        # Assert
+        assert [False, True, False] == [was_connected, is_connected, is_disconnected]
+        assert [0, 0] == [connect_process.returncode, disconnect_process.returncode]
+        assert 1 == len(server.connections)
+        assert [
+            'state',
+            'state',
+            'state',
+            'hold',
+            'hold off',
+            'hold release',
+            'state',
+            'hold on',
+            'signal SIGUSR1',
+            'state',
+        ] == server.commands
+
+    def test_connect_leaves_connected_tunnel_alone(
+        self, server: _FakeManagementServer, server_path: Path
+    ):
+        '''
+        Test that connecting a tunnel that is already connected sends no command that would drop it
+        '''
+        # Arrange
+        server.state = 'CONNECTED'
+        server.hold = False
+        sut: OpenVpnModel = OpenVpnModel(
+            'office', OpenVpnConfig(), management_address=str(server_path)
+        )
+
+        # Act
+        actual_process: CompletedProcess = sut.connect(False)
+
+        # Assert
+        assert 0 == actual_process.returncode
+        assert ['state'] == server.commands
+
+    def test_connect_restarts_tunnel_not_on_hold(
+        self, server: _FakeManagementServer, server_path: Path
+    ):
+        '''
+        Test that a tunnel that is down without being on hold is restarted
+        '''
+        # Arrange
+        server.state = 'RECONNECTING'
+        server.hold = False
+        sut: OpenVpnModel = OpenVpnModel(
+            'office', OpenVpnConfig(), management_address=str(server_path)
+        )
+
+        # Act
+        actual_process: CompletedProcess = sut.connect(False)
+
+        # Assert
+        assert 0 == actual_process.returncode
+        assert ['state', 'hold', 'signal SIGUSR1'] == server.commands
+        assert 'CONNECTED' == server.state
+
+    def test_dropped_connection_is_reopened(
+        self, server: _FakeManagementServer, server_path: Path
+    ):
+        '''
+        Test that a connection closed by a restarted daemon is transparently reopened
+        '''
+        # Arrange
+        sut: OpenVpnModel = OpenVpnModel(
+            'office', OpenVpnConfig(), management_address=str(server_path)
+        )
+        sut.connect(False)
+
+        # Act
+        server.drop_connections()
+        actual_connected: bool | None = sut.is_connected(False)
+
+        # Assert
+        assert actual_connected
+        assert 2 == len(server.connections)
+
+    def test_password(self, tmp_path: Path):
+        '''
+        Test logging in to a management interface protected by a password
+        '''
+        # Arrange
+        server: _FakeManagementServer = _FakeManagementServer(tmp_path / 'sock', 'secret')
+        sut: OpenVpnModel = OpenVpnModel(
+            'office',
+            OpenVpnConfig(),
+            management_address=str(tmp_path / 'sock'),
+            management_password='secret'
+        )
+        wrong_password_sut: OpenVpnModel = OpenVpnModel(
+            'office',
+            OpenVpnConfig(),
+            management_address=str(tmp_path / 'sock'),
+            management_password='wrong'
+        )
+
+        # Act
+        actual_connected: bool | None = sut.is_connected(False)
+        wrong_password_connected: bool | None = wrong_password_sut.is_connected(False)
+        server.close()
+
+        # Assert
+        assert actual_connected is False
+        assert wrong_password_connected is None
+
+    def test_unreachable_interface(self, tmp_path: Path):
+        '''
+        Test that a daemon whose management interface cannot be reached has an unknown status
+        '''
+        # Arrange
+        sut: OpenVpnModel = OpenVpnModel(
+            'office', OpenVpnConfig(), management_address=str(tmp_path / 'missing.sock')
+        )
+
+        # Act
+        actual_result: CompletedProcess | None = sut.ensure_connected(False)
+        actual_process: CompletedProcess = sut.connect(False)
+
+        # Assert
+        assert actual_result is None
+        assert 127 == actual_process.returncode
+
+    def test_json(self):
+        '''
+        Test converting OpenVPN VPNs from and to JSON
+        '''
+        # Arrange
+        vpn_json: dict = {
+            'vpn_id': 'office',
+            'vpn_type': 'OPEN_VPN',
+            'management_address': '127.0.0.1:7505',
+            'management_password': 'secret',
+        }
+
+        # Act
+        actual_vpn: OpenVpnModel = OpenVpnModel.from_json_with_config(
+            vpn_json, OpenVpnConfig.from_json({})
+        )
+
+        # Assert
+        assert vpn_json == actual_vpn.to_json()
+        with raises(ValueError):
+            OpenVpnModel.from_json_with_config(
+                {'vpn_id': 'office', 'vpn_type': 'OPEN_VPN'}, OpenVpnConfig()
+            )
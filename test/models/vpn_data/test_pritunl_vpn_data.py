@@ -2,9 +2,28 @@
 Test Pritunl VPN Data Model module
 '''
 
+from asyncio import run
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps as json_dumps, loads as json_loads
+from pickle import dumps, loads
+from pathlib import Path
+from subprocess import CompletedProcess
+from threading import Thread
+from time import time
+from typing import Iterator
 
+from pyotp import parse_uri
+from pytest import CaptureFixture, MonkeyPatch, fixture, raises
+
+from fakes import write_fake_cli
+from src.enums.vpn_operation import VpnOperation
 from src.enums.vpn_type import VpnType, VpnTypeVisitor
-from src.models.vpn_model.pritunl_vpn_model import PritunlVpnModel
+from src.models.vpn_model import pritunl_vpn_model
+from src.models.vpn_model.pritunl_vpn_model import (
+    PritunlServiceTransport,
+    PritunlStatusCache,
+    PritunlVpnModel,
+)
 from src.models.vpn_config.pritunl_vpn_config import PritunlVpnConfig
 
 class _TestVpnTypeVisitor(VpnTypeVisitor):
@@ -33,6 +52,114 @@ class _TestVpnTypeVisitor(VpnTypeVisitor):
         return VpnType.GLOBAL_PROTECT
 
 
+_MOCK_LIST_OUTPUT: str = '''
++----------------------------------+-------------+-----------------+----------------+
+|                ID                |    NAME     |   ONLINE FOR    | SERVER ADDRESS |
++----------------------------------+-------------+-----------------+----------------+
+| online_id                        | org (a)     | 1 hour 4 mins   | 10.0.0.1       |
+| offline_id                       | org (b)     | Disconnected    | -              |
+| connecting_id                    | org (c)     | Connecting      | -              |
++----------------------------------+-------------+-----------------+----------------+
+'''
+
+_MOCK_TOTP_URL: str = 'otpauth://totp/test.package@tester?secret=JBSWY3DPEHPK3PXP&issuer=test'
+
+
+def _write_fake_cli(directory: Path) -> Path:
+    '''
+    Write a fake Pritunl CLI that prints the mock listing and counts its invocations.
+    '''
+    calls_path: Path = directory / 'calls'
+    list_path: Path = directory / 'list_output'
+    list_path.write_text(_MOCK_LIST_OUTPUT, encoding='utf-8')
+    return write_fake_cli(
+        directory,
+        'pritunl-client',
+        f'echo "$1" >> "{calls_path}"\nif [ "$1" = "list" ]; then cat "{list_path}"; fi\n'
+    )
+
+
+class _FakeServiceHandler(BaseHTTPRequestHandler):
+    '''
+    Request handler of a fake Pritunl client service, which records every request and keeps the
+    connection open between them.
+    '''
+
+    protocol_version: str = 'HTTP/1.1'
+    server: '_FakeService'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        '''Answer a list request'''
+        self._respond(self.server.profiles)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        '''Answer a start request'''
+        body: dict = self._read_body()
+        self.server.profiles[body['id']] = {'status': 'connected'}
+        self._respond(None)
+
+    def do_DELETE(self):  # pylint: disable=invalid-name
+        '''Answer a stop request'''
+        body: dict = self._read_body()
+        self.server.profiles[body['id']] = {'status': 'disconnected'}
+        self._respond(None)
+
+    def log_message(self, *_) -> None:
+        '''Keep the test output quiet'''
+
+    def _read_body(self) -> dict:
+        content: bytes = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body: dict = json_loads(content)
+        self.server.requests.append(
+            (self.command, self.path, self.headers.get('Auth-Key'), body)
+        )
+        return body
+
+    def _respond(self, body) -> None:
+        if self.command == 'GET':
+            self.server.requests.append(
+                (self.command, self.path, self.headers.get('Auth-Key'), None)
+            )
+        self.server.ports.add(self.client_address[1])
+        content: bytes = json_dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class _FakeService(ThreadingHTTPServer):
+    '''
+    Fake Pritunl client service listening on a local TCP port.
+    '''
+
+    daemon_threads: bool = True
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), _FakeServiceHandler)
+        self.profiles: dict[str, dict] = {'offline_id': {'status': 'disconnected'}}
+        self.requests: list[tuple] = []
+        self.ports: set[int] = set()
+        Thread(target=self.serve_forever, daemon=True).start()
+
+    def get_address(self) -> str:
+        '''
+        Get the host:port the service listens on.
+        '''
+        return f'127.0.0.1:{self.server_address[1]}'
+
+
+@fixture(name='service')
+def _service() -> Iterator[_FakeService]:
+    '''
+    Fake Pritunl client service, stopped after the test.
+    '''
+    service: _FakeService = _FakeService()
+    yield service
+    service.shutdown()
+    service.server_close()
+
+
 class TestPritunlVpnModel:
     '''
     Test PritunlVpnData class
@@ -140,3 +267,311 @@ class TestPritunlVpnModel:
         assert TestPritunlVpnModel.mock_vpn_type == actual_vpn_data.get_vpn_type().value
         assert TestPritunlVpnModel.mock_pin == actual_vpn_data.get_pin()
         assert TestPritunlVpnModel.mock_token == actual_vpn_data.get_token()
+
+    def test_parse_list_output(self):
+        '''
+        Test parsing the table printed by the Pritunl CLI list command
+        '''
+        # Act
+        actual_statuses: dict[str, bool] = PritunlStatusCache.parse_list_output(
+            _MOCK_LIST_OUTPUT
+        )
+
+        # Assert
+        assert {
+            'online_id': True,
+            'offline_id': False,
+            'connecting_id': True
+        } == actual_statuses
+        assert {} == PritunlStatusCache.parse_list_output('')
+
+    def test_is_connected_shares_one_listing(self, tmp_path: Path):
+        '''
+        Test that status probes of many VPNs share a single Pritunl CLI listing
+        '''
+        # Arrange
+        config: PritunlVpnConfig = PritunlVpnConfig(str(_write_fake_cli(tmp_path)))
+        online_vpn: PritunlVpnModel = PritunlVpnModel('online_id', config)
+        offline_vpn: PritunlVpnModel = PritunlVpnModel('offline_id', config)
+        unknown_vpn: PritunlVpnModel = PritunlVpnModel('unknown_id', config)
+
+        # Act
+        actual_statuses: list[bool] = [
+            vpn.is_connected(False) for vpn in (online_vpn, offline_vpn, unknown_vpn)
+        ]
+
+        # Assert
+        assert [True, False, False] == actual_statuses
+        assert ['list'] == (tmp_path / 'calls').read_text(encoding='utf-8').split()
+
+    def test_ensure_connected(self, tmp_path: Path):
+        '''
+        Test that only VPNs reported as down are started
+        '''
+        # Arrange
+        config: PritunlVpnConfig = PritunlVpnConfig(str(_write_fake_cli(tmp_path)))
+        online_vpn: PritunlVpnModel = PritunlVpnModel('online_id', config)
+        offline_vpn: PritunlVpnModel = PritunlVpnModel('offline_id', config)
+
+        # Act
+        online_result = online_vpn.ensure_connected(False)
+        offline_result = offline_vpn.ensure_connected(False)
+
+        # Assert
+        assert online_result is None
+        assert offline_result.returncode == 0
+        assert ['list', 'start'] == (tmp_path / 'calls').read_text(encoding='utf-8').split()
+
+    def test_ensure_connected_skips_unknown_status(self, tmp_path: Path):
+        '''
+        Test that no VPN is started when the listing fails or times out
+        '''
+        # Arrange
+        calls_path: Path = tmp_path / 'calls'
+        failing_config: PritunlVpnConfig = PritunlVpnConfig(str(write_fake_cli(
+            tmp_path, 'failing-client', f'echo "$1" >> "{calls_path}"\nexit 1\n'
+        )))
+        hanging_config: PritunlVpnConfig = PritunlVpnConfig(
+            str(write_fake_cli(
+                tmp_path,
+                'hanging-client',
+                f'echo "$1" >> "{calls_path}"\nif [ "$1" = "list" ]; then exec sleep 5; fi\n'
+            )),
+            timeouts={VpnOperation.STATUS: 0.2},
+            kill_grace_period=0.1
+        )
+        failing_vpn: PritunlVpnModel = PritunlVpnModel('offline_id', failing_config)
+        hanging_vpn: PritunlVpnModel = PritunlVpnModel('offline_id', hanging_config)
+
+        # Act
+        actual_results: list = [
+            failing_vpn.ensure_connected(False),
+            run(hanging_vpn.ensure_connected_async(False)),
+        ]
+
+        # Assert
+        assert [None, None] == actual_results
+        assert failing_vpn.is_connected(False) is None
+        assert ['list', 'list'] == calls_path.read_text(encoding='utf-8').split()
+
+    def test_check_interval_json(self):
+        '''
+        Test reading and writing the check interval of a VPN
+        '''
+        # Arrange
+        mock_json: dict = {**TestPritunlVpnModel.mock_json, 'check_interval': 2}
+
+        # Act
+        actual_vpn_data: PritunlVpnModel = PritunlVpnModel.from_json_with_config(
+            mock_json,
+            PritunlVpnConfig()
+        )
+
+        # Assert
+        assert 2 == actual_vpn_data.get_check_interval()
+        assert mock_json == actual_vpn_data.to_json()
+        assert TestPritunlVpnModel.sut.get_check_interval() is None
+
+    def test_invalid_check_interval_json(self):
+        '''
+        Test that check intervals that are not positive numbers are rejected
+        '''
+        # Act and Assert
+        for check_interval in (0, -1, '5', True):
+            with raises(ValueError):
+                PritunlVpnModel.from_json_with_config(
+                    {**TestPritunlVpnModel.mock_json, 'check_interval': check_interval},
+                    PritunlVpnConfig()
+                )
+
+    def test_config_is_immutable(self):
+        '''
+        Test that a config shared by many VPNs cannot be modified, and survives pickling
+        '''
+        # Arrange
+        config: PritunlVpnConfig = PritunlVpnConfig(
+            'cli_path', timeouts={VpnOperation.CONNECT: 5}
+        )
+
+        # Act and Assert
+        with raises(AttributeError):
+            config.cli_path = 'other_cli_path'
+        with raises(TypeError):
+            config.timeouts[VpnOperation.CONNECT] = 10
+        assert config.to_json() == loads(dumps(config)).to_json()
+
+    def test_service_transport(self, tmp_path: Path, service: _FakeService):
+        '''
+        Test that status probes, connections and disconnections go to the Pritunl client service
+        over one connection instead of spawning the CLI
+        '''
+        # Arrange
+        (tmp_path / 'auth_key').write_text('secret_key\n', encoding='utf-8')
+        config: PritunlVpnConfig = PritunlVpnConfig(
+            str(_write_fake_cli(tmp_path)),
+            service_address=service.get_address(),
+            service_auth_key_path=str(tmp_path / 'auth_key'),
+            service_endpoints={'stop': 'DELETE /profile/{vpn_id}'}
+        )
+        sut: PritunlVpnModel = PritunlVpnModel('offline_id', config, pin='1234')
+
+        # Act
+        connect_result = sut.ensure_connected(False)
+        is_connected: bool | None = run(sut.is_connected_async(False))
+        disconnect_result = run(sut.disconnect_async(False))
+        is_disconnected: bool | None = sut.is_connected(False)
+
+        # Assert
+        assert [0, 0] == [connect_result.returncode, disconnect_result.returncode]
+        assert [True, False] == [is_connected, is_disconnected]
+        assert [
+            ('GET', '/profile', 'secret_key', None),
+            ('POST', '/profile', 'secret_key', {'id': 'offline_id', 'password': '1234'}),
+            ('GET', '/profile', 'secret_key', None),
+            ('DELETE', '/profile/offline_id', 'secret_key', {'id': 'offline_id'}),
+            ('GET', '/profile', 'secret_key', None),
+        ] == service.requests
+        assert 1 == len(service.ports)
+        assert not (tmp_path / 'calls').exists()
+
+    def test_service_falls_back_to_cli(self, tmp_path: Path):
+        '''
+        Test that the CLI is used when the Pritunl client service cannot be reached
+        '''
+        # Arrange
+        config: PritunlVpnConfig = PritunlVpnConfig(
+            str(_write_fake_cli(tmp_path)),
+            service_address=str(tmp_path / 'missing.sock')
+        )
+        sut: PritunlVpnModel = PritunlVpnModel('offline_id', config)
+
+        # Act
+        actual_result = sut.ensure_connected(False)
+
+        # Assert
+        assert 0 == actual_result.returncode
+        assert ['list', 'start'] == (tmp_path / 'calls').read_text(encoding='utf-8').split()
+
+    def test_parse_service_profiles(self):
+        '''
+        Test parsing the profiles listed by the Pritunl client service
+        '''
+        # Act
+        actual_statuses: dict[str, bool] = PritunlServiceTransport.parse_profiles(json_dumps({
+            'online_id': {'status': 'connected'},
+            'connecting_id': {'state': 'connecting'},
+            'offline_id': {'status': 'disconnected'},
+            'flag_id': {'connected': False},
+        }))
+
+        # Assert
+        assert {
+            'online_id': True,
+            'connecting_id': True,
+            'offline_id': False,
+            'flag_id': False,
+        } == actual_statuses
+        assert {'listed_id': True} == PritunlServiceTransport.parse_profiles(
+            json_dumps([{'id': 'listed_id', 'status': 'connected'}])
+        )
+        assert not PritunlServiceTransport.parse_profiles('')
+
+    def test_service_config_json(self):
+        '''
+        Test reading the Pritunl client service options of a config, and rejecting invalid
+        endpoints
+        '''
+        # Arrange
+        config_json: dict = {
+            'vpn_type': 'PRITUNL',
+            'cli_path': 'pritunl-client',
+            'service_address': '/var/run/pritunl.sock',
+            'service_endpoints': {'start': 'POST /profile/{vpn_id}'},
+        }
+
+        # Act
+        actual_config: PritunlVpnConfig = PritunlVpnConfig.from_json(config_json)
+
+        # Assert
+        assert ('POST', '/profile/vpn') == actual_config.get_service_endpoint('start', 'vpn')
+        assert ('GET', '/profile') == actual_config.get_service_endpoint('list')
+        assert actual_config.get_connection_json() == PritunlVpnConfig.from_json(
+            {'vpn_type': 'PRITUNL', 'cli_path': 'pritunl-client'}
+        ).get_connection_json()
+        for endpoints in ({'restart': 'POST /profile'}, {'start': 'POST'}, ['GET /profile']):
+            with raises(ValueError):
+                PritunlVpnConfig.from_json({**config_json, 'service_endpoints': endpoints})
+
+    def test_connect_waits_for_next_totp_window(self, tmp_path: Path, monkeypatch: MonkeyPatch):
+        '''
+        Test that a TOTP about to expire is not sent, and the connection waits for the next TOTP
+        window instead
+        '''
+        # Arrange
+        passwords_path: Path = tmp_path / 'passwords'
+        config: PritunlVpnConfig = PritunlVpnConfig(str(write_fake_cli(
+            tmp_path, 'pritunl-client', f'echo "$4" >> "{passwords_path}"\n'
+        )))
+        sut: PritunlVpnModel = PritunlVpnModel(
+            'test_id', config, pin='1234', totp_url=_MOCK_TOTP_URL
+        )
+        sleeps: list[float] = []
+        monkeypatch.setattr(pritunl_vpn_model, 'time', lambda: 30029.0)
+        monkeypatch.setattr(pritunl_vpn_model, 'sleep', sleeps.append)
+
+        # Act
+        actual_process = sut.connect(False)
+
+        # Assert
+        assert 0 == actual_process.returncode
+        assert [1.0] == sleeps
+        assert [f'1234{sut.get_totp(30030.0)}'] == passwords_path.read_text(
+            encoding='utf-8'
+        ).split()
+
+    def test_connect_retries_with_next_totp(self, tmp_path: Path, capsys: CaptureFixture):
+        '''
+        Test that a connection rejected for its credentials is retried once with the TOTP of the
+        next window, and that connections without a TOTP or failing for another reason are not
+        retried
+        '''
+        # Arrange
+        passwords_path: Path = tmp_path / 'passwords'
+        config: PritunlVpnConfig = PritunlVpnConfig(
+            str(write_fake_cli(
+                tmp_path,
+                'pritunl-client',
+                f'echo "$4" >> "{passwords_path}"\n'
+                'if [ "$3" = missing_id ]; then echo "Profile not found" >&2\n'
+                'else echo "Authentication failed" >&2; fi\n'
+                'exit 1\n'
+            )),
+            totp_min_validity=0
+        )
+        totp_vpn: PritunlVpnModel = PritunlVpnModel(
+            'test_id', config, totp_url=_MOCK_TOTP_URL
+        )
+        other_vpns: list[PritunlVpnModel] = [
+            PritunlVpnModel('test_id', config, pin='1234'),
+            PritunlVpnModel('missing_id', config, pin='5678', totp_url=_MOCK_TOTP_URL),
+        ]
+
+        # Act
+        processes: list[CompletedProcess] = [run(totp_vpn.connect_async(False))] + [
+            vpn.connect(False) for vpn in other_vpns
+        ]
+
+        # Assert
+        assert [1, 1, 1] == [process.returncode for process in processes]
+        first_password, retry_password, plain_password, missing_password = (
+            passwords_path.read_text(encoding='utf-8').split()
+        )
+        now: float = time()
+        totp = parse_uri(_MOCK_TOTP_URL)
+        first_offset: int = next(
+            offset for offset in (0, -1) if totp.at(now, offset) == first_password
+        )
+        assert totp.at(now, first_offset + 1) == retry_password
+        assert '1234' == plain_password
+        assert missing_password.startswith('5678')
+        assert '' == capsys.readouterr().out
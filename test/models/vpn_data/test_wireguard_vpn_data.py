@@ -0,0 +1,188 @@
+'''
+Test WireGuard VPN Data Model module
+'''
+
+from asyncio import run
+from os import environ, pathsep
+from pathlib import Path
+from time import time
+
+from pytest import MonkeyPatch, raises
+
+from fakes import write_fake_cli
+from src.models.vpn_config.wireguard_vpn_config import WireguardVpnConfig
+from src.models.vpn_model.wireguard_vpn_model import WireguardStatusCache, WireguardVpnModel
+
+_MOCK_DUMP_OUTPUT: str = (
+    'wg0\tprivate\tpublic\t51820\toff\n'
+    'wg0\tpeer_a\t(none)\t10.0.0.1:51820\t10.1.0.0/16\t100\t1\t2\toff\n'
+    'wg0\tpeer_b\t(none)\t10.0.0.2:51820\t10.2.0.0/16\t200\t1\t2\t25\n'
+    'wg1\tprivate\tpublic\t51821\toff\n'
+    'wg1\tpeer_c\t(none)\t(none)\t10.3.0.0/16\t0\t0\t0\toff\n'
+    'wg2\tprivate\tpublic\t51822\toff\n'
+)
+
+
+def _install_fake_wireguard(directory: Path, monkeypatch: MonkeyPatch) -> Path:
+    '''
+    Put fake wg and wg-quick CLIs on the PATH, which keep every interface that is up as a file
+    holding the latest handshake of its only peer, and log their invocations.
+
+    Returns:
+        Path: Directory holding the interfaces that are up
+    '''
+    interfaces_path: Path = directory / 'interfaces'
+    interfaces_path.mkdir()
+    calls_path: Path = directory / 'calls'
+    write_fake_cli(directory, 'wg', (
+        f'echo "wg $*" >> "{calls_path}"\n'
+        f'for interface in "{interfaces_path}"/*; do\n'
+        '  [ -f "$interface" ] || continue\n'
+        '  name=$(basename "$interface")\n'
+        '  printf "%s\\tprivate\\tpublic\\t51820\\toff\\n" "$name"\n'
+        '  printf "%s\\tpeer\\t(none)\\t(none)\\t10.0.0.0/8\\t%s\\t0\\t0\\toff\\n" '
+        '"$name" "$(cat "$interface")"\n'
+        'done\n'
+    ))
+    write_fake_cli(directory, 'wg-quick', (
+        f'echo "wg-quick $*" >> "{calls_path}"\n'
+        f'interface="{interfaces_path}/$(basename "$2" .conf)"\n'
+        'if [ "$1" = "up" ]; then\n'
+        '  [ -f "$interface" ] && exit 1\n'
+        '  date +%s > "$interface"\n'
+        'else\n'
+        '  rm "$interface" || exit 1\n'
+        'fi\n'
+    ))
+    monkeypatch.setenv('PATH', f'{directory}{pathsep}{environ["PATH"]}')
+    WireguardStatusCache.invalidate(WireguardVpnConfig().wg_path)
+    return interfaces_path
+
+
+def _read_calls(directory: Path) -> list[str]:
+    '''
+    Read the logged invocations of the fake WireGuard CLIs.
+    '''
+    return (directory / 'calls').read_text(encoding='utf-8').splitlines()
+
+
+class TestWireguardVpnModel:
+    '''
+    Test WireguardVpnModel class
+    '''
+
+    def test_parse_dump_output(self):
+        '''
+        Test parsing the lines printed by the wg CLI dump command
+        '''
+        # Act
+        actual_handshakes: dict[str, int] = WireguardStatusCache.parse_dump_output(
+            _MOCK_DUMP_OUTPUT
+        )
+
+        # Assert
+        assert {'wg0': 200, 'wg1': 0, 'wg2': 0} == actual_handshakes
+        assert not WireguardStatusCache.parse_dump_output('')
+
+    def test_get_interface(self):
+        '''
+        Test deriving the interface name from an interface name or a wg-quick config path
+        '''
+        # Arrange
+        config: WireguardVpnConfig = WireguardVpnConfig()
+
+        # Act and Assert
+        assert 'wg0' == WireguardVpnModel('wg0', config).get_interface()
+        assert 'office' == WireguardVpnModel('/etc/wireguard/office.conf', config).get_interface()
+
+    def test_is_connected_shares_one_dump(self, tmp_path: Path, monkeypatch: MonkeyPatch):
+        '''
+        Test that status probes of many interfaces share a single dump, and that interfaces
+        without a recent handshake are reported as down
+        '''
+        # Arrange
+        interfaces_path: Path = _install_fake_wireguard(tmp_path, monkeypatch)
+        (interfaces_path / 'fresh').write_text('0', encoding='utf-8')
+        (interfaces_path / 'dead').write_text('1000', encoding='utf-8')
+        config: WireguardVpnConfig = WireguardVpnConfig()
+        vpns: list[WireguardVpnModel] = [
+            WireguardVpnModel(interface, config) for interface in ('fresh', 'dead', 'down')
+        ]
+
+        # Act
+        actual_statuses: list[bool | None] = [vpn.is_connected(False) for vpn in vpns]
+
+        # Assert
+        assert [True, False, False] == actual_statuses
+        assert ['wg show all dump'] == _read_calls(tmp_path)
+
+    def test_ensure_connected_restarts_dead_tunnel(
+        self, tmp_path: Path, monkeypatch: MonkeyPatch
+    ):
+        '''
+        Test that an interface that is down is brought up, and one with a dead tunnel is brought
+        down before being brought up again
+        '''
+        # Arrange
+        interfaces_path: Path = _install_fake_wireguard(tmp_path, monkeypatch)
+        (interfaces_path / 'dead').write_text('1000', encoding='utf-8')
+        config: WireguardVpnConfig = WireguardVpnConfig()
+        dead_vpn: WireguardVpnModel = WireguardVpnModel('dead', config)
+        down_vpn: WireguardVpnModel = WireguardVpnModel('/etc/wireguard/down.conf', config)
+
+        # Act
+        dead_process = run(dead_vpn.ensure_connected_async(False))
+        down_process = down_vpn.ensure_connected(False)
+
+        # Assert
+        assert [0, 0] == [dead_process.returncode, down_process.returncode]
+        assert [True, True] == [dead_vpn.is_connected(False), down_vpn.is_connected(False)]
+        assert [
+            'wg show all dump',
+            'wg-quick down dead',
+            'wg-quick up dead',
+            'wg show all dump',
+            'wg-quick up /etc/wireguard/down.conf',
+            'wg show all dump',
+        ] == _read_calls(tmp_path)
+
+    def test_connect_leaves_live_tunnel_alone(self, tmp_path: Path, monkeypatch: MonkeyPatch):
+        '''
+        Test that connecting an interface that is up with a fresh handshake does not bounce it
+        '''
+        # Arrange
+        interfaces_path: Path = _install_fake_wireguard(tmp_path, monkeypatch)
+        (interfaces_path / 'live').write_text(str(int(time())), encoding='utf-8')
+        vpn: WireguardVpnModel = WireguardVpnModel('live', WireguardVpnConfig())
+
+        # Act
+        sync_process = vpn.connect(False)
+        async_process = run(vpn.connect_async(False))
+
+        # Assert
+        assert [0, 0] == [sync_process.returncode, async_process.returncode]
+        assert ['wg show all dump'] == _read_calls(tmp_path)
+        assert vpn.is_connected(False)
+
+    def test_json(self):
+        '''
+        Test converting WireGuard VPNs and their config from and to JSON
+        '''
+        # Arrange
+        vpn_json: dict = {'vpn_id': 'wg0', 'vpn_type': 'WIREGUARD', 'check_interval': 2}
+        config_json: dict = {'wg_path': '/usr/bin/wg', 'handshake_timeout': 60}
+
+        # Act
+        actual_config: WireguardVpnConfig = WireguardVpnConfig.from_json(config_json)
+        actual_vpn: WireguardVpnModel = WireguardVpnModel.from_json_with_config(
+            vpn_json, actual_config
+        )
+
+        # Assert
+        assert vpn_json == actual_vpn.to_json()
+        assert 'wg-quick' == actual_config.wg_quick_path
+        assert '/usr/bin/wg' == actual_config.wg_path
+        assert 60 == actual_config.handshake_timeout
+        for handshake_timeout in (0, -1, '60', True):
+            with raises(ValueError):
+                WireguardVpnConfig.from_json({'handshake_timeout': handshake_timeout})
@@ -0,0 +1,110 @@
+"""
+Test VPN Backend Registry module
+"""
+
+from pathlib import Path
+from subprocess import CompletedProcess, run
+from sys import executable
+
+from pytest import raises
+
+from src.enums.vpn_type import VpnType
+from src.models.vpn_config.abstract_vpn_config import AbstractVpnConfig
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.services.vpn_backend_registry import VpnBackend, VpnBackendRegistry
+
+_IMPORTED_MODULES_SCRIPT: str = """
+import sys
+from src.services.vpn_parser_service import VpnDataParserService
+VpnDataParserService().parse_vpn_data(sys.argv[1])
+print(" ".join(sorted(
+    module for module in sys.modules if module == "pyotp" or module.startswith("src.models.vpn_")
+)))
+"""
+
+
+def _get_imported_modules(vpn_data: str) -> list[str]:
+    """
+    Parse VPN data in a fresh interpreter and get the backend modules it imported.
+    """
+    process: CompletedProcess = run(
+        [executable, "-c", _IMPORTED_MODULES_SCRIPT, vpn_data],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).parents[2],
+        text=True,
+    )
+    return process.stdout.split()
+
+
+class TestVpnBackendRegistry:
+    """
+    Test VPN Backend Registry
+    """
+
+    def test_backends_are_loaded_on_first_use(self) -> None:
+        """
+        Test that a backend is only loaded once, when a VPN of its type is first looked up
+        """
+        # Arrange
+        loads: list[str] = []
+        sut: VpnBackendRegistry = VpnBackendRegistry()
+
+        def load() -> VpnBackend:
+            loads.append("loaded")
+            return VpnBackend(AbstractVpnModel, AbstractVpnConfig)
+
+        sut.register(VpnType.PRITUNL, load)
+
+        # Act
+        was_loaded: bool = sut.is_loaded(VpnType.PRITUNL)
+        first_backend: VpnBackend = sut.get_backend(VpnType.PRITUNL)
+        second_backend: VpnBackend = sut.get_backend(VpnType.PRITUNL)
+
+        # Assert
+        assert not was_loaded
+        assert sut.is_loaded(VpnType.PRITUNL)
+        assert first_backend is second_backend
+        assert 1 == len(loads)
+
+    def test_unsupported_vpn_types(self) -> None:
+        """
+        Test that VPN types without a backend are rejected
+        """
+        # Arrange
+        sut: VpnBackendRegistry = VpnBackendRegistry()
+
+        # Act and Assert
+        with raises(ValueError):
+            VpnBackendRegistry.create_default().get_backend(VpnType.NONE)
+        with raises(NotImplementedError):
+            sut.get_backend(VpnType.OPEN_VPN)
+
+    def test_only_used_backends_are_imported(self) -> None:
+        """
+        Test that parsing only imports the backends of the VPN types in the data, and only imports
+        pyotp once a TOTP URL is seen
+        """
+        # Arrange
+        global_protect_data: str = (
+            '{"vpn_list": [{"vpn_id": "gp", "vpn_type": "GLOBAL_PROTECT"}]}'
+        )
+        pritunl_data: str = '{"vpn_list": [{"vpn_id": "p", "vpn_type": "PRITUNL"}]}'
+        totp_data: str = (
+            '{"vpn_list": [{"vpn_id": "p", "vpn_type": "PRITUNL", '
+            '"totp_url": "otpauth://totp/p?secret=JBSWY3DPEHPK3PXP"}]}'
+        )
+
+        # Act
+        global_protect_modules: list[str] = _get_imported_modules(global_protect_data)
+        pritunl_modules: list[str] = _get_imported_modules(pritunl_data)
+        totp_modules: list[str] = _get_imported_modules(totp_data)
+
+        # Assert
+        assert "src.models.vpn_model.global_protect_vpn_model" in global_protect_modules
+        assert not [module for module in global_protect_modules if "pritunl" in module]
+        assert "pyotp" not in global_protect_modules
+        assert "src.models.vpn_model.pritunl_vpn_model" in pritunl_modules
+        assert not [module for module in pritunl_modules if "global_protect" in module]
+        assert "pyotp" not in pritunl_modules
+        assert "pyotp" in totp_modules
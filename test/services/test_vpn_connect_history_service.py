@@ -0,0 +1,86 @@
+"""
+Test VPN Connect History Service module
+"""
+
+from asyncio import run
+from pathlib import Path
+from subprocess import CompletedProcess
+
+from fakes import FakeVpnModel
+from src.models.vpn_config.pritunl_vpn_config import PritunlVpnConfig
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.models.vpn_model.pritunl_vpn_model import PritunlVpnModel
+from src.services.vpn_connect_history_service import VpnConnectHistoryService
+from src.services.vpn_fleet_service import VpnFleetService
+
+
+class TestVpnConnectHistoryService:
+    """
+    Test VPN Connect History Service
+    """
+
+    def test_order_for_connect(self, tmp_path: Path) -> None:
+        """
+        Test that VPNs are ordered by priority, then longest expected latency first, with VPNs
+        that never connected expected to take as long as the average VPN of their type
+        """
+        # Arrange
+        sut: VpnConnectHistoryService = VpnConnectHistoryService(str(tmp_path / "history.json"))
+        config: PritunlVpnConfig = PritunlVpnConfig()
+        vpns: list[AbstractVpnModel] = [
+            FakeVpnModel("fast"),
+            PritunlVpnModel("new_pritunl", config),
+            FakeVpnModel("new_fake"),
+            FakeVpnModel("slow"),
+            PritunlVpnModel("pritunl", config),
+            FakeVpnModel("urgent"),
+        ]
+        vpns[5].priority = 1
+        for vpn, duration in zip((vpns[0], vpns[3], vpns[4]), (1, 9, 4)):
+            sut.observe_connect(vpn, duration, CompletedProcess([], 0))
+
+        # Act
+        actual_vpns: list[AbstractVpnModel] = sut.order_for_connect(vpns)
+
+        # Assert
+        assert ["urgent", "slow", "new_fake", "new_pritunl", "pritunl", "fast"] == [
+            vpn.get_vpn_id() for vpn in actual_vpns
+        ]
+
+    def test_latencies_are_remembered(self, tmp_path: Path) -> None:
+        """
+        Test that the latencies of successful connections are averaged and saved for later runs
+        """
+        # Arrange
+        history_path: str = str(tmp_path / "cache" / "history.json")
+        sut: VpnConnectHistoryService = VpnConnectHistoryService(history_path, smoothing=0.5)
+        vpns: list[FakeVpnModel] = [
+            FakeVpnModel("working", action_seconds=0.02), FakeVpnModel("broken", returncode=1)
+        ]
+
+        # Act
+        for _ in range(2):
+            run(VpnFleetService(history_service=sut).connect_all(vpns, False))
+        sut.observe_connect(vpns[0], 10, CompletedProcess([], 0))
+        sut.save()
+        reloaded: VpnConnectHistoryService = VpnConnectHistoryService(history_path)
+
+        # Assert
+        assert 5 < reloaded.get_latency(vpns[0]) < 6
+        assert reloaded.get_latency(vpns[1]) is None
+        assert 0o600 == Path(history_path).stat().st_mode & 0o777
+
+    def test_unusable_history_is_ignored(self, tmp_path: Path) -> None:
+        """
+        Test that a corrupt or outdated history is ignored
+        """
+        # Arrange
+        history_path: Path = tmp_path / "history.json"
+        vpn: FakeVpnModel = FakeVpnModel("vpn")
+
+        # Act and Assert
+        for content in ("{", '{"version": 0, "latencies": {"NONE_vpn": 1}}', "[]"):
+            history_path.write_text(content, encoding="utf-8")
+            assert VpnConnectHistoryService(str(history_path)).get_latency(vpn) is None
+        history_path.write_text('{"version": 1, "latencies": {"NONE_vpn": 2}}', encoding="utf-8")
+        assert 2 == VpnConnectHistoryService(str(history_path)).get_latency(vpn)
@@ -0,0 +1,177 @@
+"""
+Test VPN Daemon Service module
+"""
+
+from asyncio import Task, create_task, gather, run, sleep, to_thread
+from json import dumps
+from pathlib import Path
+from typing import Callable
+
+from pytest import raises
+
+from fakes import FakeVpnModel, write_fake_cli
+from src.services.vpn_daemon_client_service import VpnDaemonClientService
+from src.services.vpn_daemon_service import VpnDaemonService
+from src.services.vpn_fleet_service import VpnFleetService
+from src.services.vpn_parser_service import VpnDataParserService
+
+
+def _create_sut(tmp_path: Path) -> VpnDaemonService:
+    """
+    Create a daemon listening on a socket of the test.
+    """
+    return VpnDaemonService(
+        str(tmp_path / "vpn_data.json"),
+        VpnDataParserService(),
+        VpnFleetService(),
+        str(tmp_path / "daemon.sock")
+    )
+
+
+def _run_with_daemon(sut: VpnDaemonService, send: Callable[[], object]) -> object:
+    """
+    Serve the daemon while a blocking client talks to it.
+    """
+    async def run_client() -> object:
+        server: Task = create_task(sut.serve(False))
+        while not VpnDaemonClientService(sut.socket_path).is_daemon_running():
+            await sleep(0.01)
+        try:
+            return await to_thread(send)
+        finally:
+            server.cancel()
+            await gather(server, return_exceptions=True)
+
+    return run(run_client())
+
+
+def _pritunl_data(cli_path: Path, vpn_ids: list[str], runner_json: dict | None = None) -> str:
+    """
+    Build a VPN data document of Pritunl VPNs, with an optional runner config.
+    """
+    return dumps({
+        "config": {"PRITUNL": {"cli_path": str(cli_path)}, "runner": runner_json or {}},
+        "vpn_list": [{"vpn_type": "PRITUNL", "vpn_id": vpn_id, "pin": "1"} for vpn_id in vpn_ids],
+    })
+
+
+class TestVpnDaemonService:
+    """
+    Test VPN Daemon Service
+    """
+
+    def test_commands_run_on_selected_vpns(self, tmp_path: Path) -> None:
+        """
+        Test that the commands of a client run on the VPNs it selects, or on every VPN
+        """
+        # Arrange
+        sut: VpnDaemonService = _create_sut(tmp_path)
+        vpns: list[FakeVpnModel] = [FakeVpnModel("first"), FakeVpnModel("second", returncode=2)]
+        sut.load(vpns)
+        client: VpnDaemonClientService = VpnDaemonClientService(sut.socket_path)
+
+        # Act
+        results: list[dict] = _run_with_daemon(sut, lambda: [
+            client.send(VpnDaemonService.connect_command, ["first"], sut.vpn_data_json_path),
+            client.send(VpnDaemonService.status_command),
+            client.send(VpnDaemonService.disconnect_command, ["NONE_second"]),
+        ])
+
+        # Assert
+        assert [
+            {"NONE_first": 0},
+            {"NONE_first": False, "NONE_second": False},
+            {"NONE_second": 2},
+        ] == results
+        assert [["connect"], ["disconnect"]] == [vpn.actions for vpn in vpns]
+        assert not Path(sut.socket_path).exists()
+
+    def test_invalid_requests_are_rejected(self, tmp_path: Path) -> None:
+        """
+        Test that unknown commands and VPNs are rejected without running anything
+        """
+        # Arrange
+        sut: VpnDaemonService = _create_sut(tmp_path)
+        vpn: FakeVpnModel = FakeVpnModel("known")
+        sut.load([vpn])
+        client: VpnDaemonClientService = VpnDaemonClientService(sut.socket_path)
+
+        other_path: str = str(tmp_path / "other" / "vpn_data.json")
+
+        def send_invalid_requests() -> list[str]:
+            errors: list[str] = []
+            for command, vpn_ids, vpn_data_path in (
+                ("restart", None, None),
+                ("connect", ["known", "unknown"], None),
+                ("connect", None, other_path),
+            ):
+                with raises(ValueError) as error:
+                    client.send(command, vpn_ids, vpn_data_path)
+                errors.append(str(error.value))
+            return errors
+
+        # Act
+        errors: list[str] = _run_with_daemon(sut, send_invalid_requests)
+
+        # Assert
+        assert [
+            "Unknown command 'restart'",
+            "Unknown VPNs unknown",
+            f"The daemon serves {tmp_path / 'vpn_data.json'}, not {other_path!r}",
+        ] == errors
+        assert not vpn.actions
+
+    def test_reload(self, tmp_path: Path) -> None:
+        """
+        Test that a reload replaces the VPNs and the connection limits of the daemon, and that a
+        broken file keeps them
+        """
+        # Arrange
+        cli_path: Path = write_fake_cli(tmp_path, "pritunl-client", "exit 0\n")
+        sut: VpnDaemonService = _create_sut(tmp_path)
+        data_path: Path = Path(sut.vpn_data_json_path)
+        data_path.write_text(_pritunl_data(cli_path, ["kept"]), encoding="utf-8")
+        sut.load(sut.parser_service.parse_vpn_data_file(str(data_path), False))
+        client: VpnDaemonClientService = VpnDaemonClientService(sut.socket_path)
+
+        def reload_twice() -> dict:
+            data_path.write_text(
+                _pritunl_data(cli_path, ["kept", "added"], {"max_concurrent_connects": 1}),
+                encoding="utf-8"
+            )
+            results: dict = client.send(VpnDaemonService.reload_command)
+            data_path.write_text("{", encoding="utf-8")
+            with raises(ValueError):
+                client.send(VpnDaemonService.reload_command)
+            return results
+
+        # Act
+        results: dict = _run_with_daemon(sut, reload_twice)
+
+        # Assert
+        assert {"diff": "1 added, 0 removed, 0 changed, 0 updated", "vpn_count": 2} == results
+        assert ["kept", "added"] == [vpn.get_vpn_id() for vpn in sut.get_vpns()]
+        assert 1 == sut.fleet_service.runner_config.max_concurrent_connects
+
+    def test_only_one_daemon_per_socket(self, tmp_path: Path) -> None:
+        """
+        Test that a stale socket is replaced, but a socket in use is not
+        """
+        # Arrange
+        sut: VpnDaemonService = _create_sut(tmp_path)
+        Path(sut.socket_path).touch()
+        client: VpnDaemonClientService = VpnDaemonClientService(sut.socket_path)
+
+        def start_second_daemon() -> bool:
+            with raises(OSError):
+                run(_create_sut(tmp_path).serve(False))
+            return client.is_daemon_running()
+
+        # Act
+        stale_socket_running: bool = client.is_daemon_running()
+        running: bool = _run_with_daemon(sut, start_second_daemon)
+
+        # Assert
+        assert not stale_socket_running
+        assert running
+        assert not client.is_daemon_running()
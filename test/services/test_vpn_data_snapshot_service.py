@@ -0,0 +1,90 @@
+"""
+Test VPN Data Snapshot Service module
+"""
+
+from json import dumps
+from os import chmod, utime
+from pathlib import Path
+
+from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
+from src.services.vpn_data_snapshot_service import VpnDataSnapshotService
+from src.services.vpn_parser_service import VpnDataParserService
+
+
+class _CountingParserService(VpnDataParserService):
+    """
+    Parser that counts how many times it parsed VPN data
+    """
+
+    def __init__(self, snapshot_service: VpnDataSnapshotService) -> None:
+        super().__init__(snapshot_service)
+        self.parses: int = 0
+
+    def parse_vpn_data(self, vpn_data: str) -> list[AbstractVpnModel]:
+        self.parses += 1
+        return super().parse_vpn_data(vpn_data)
+
+
+def _write_vpn_data(data_path: Path, pin: str, mtime: int) -> None:
+    """
+    Write a VPN data JSON file with one Pritunl VPN and a distinct modification time.
+    """
+    data_path.write_text(
+        dumps({"vpn_list": [{"vpn_id": "vpn", "vpn_type": "PRITUNL", "pin": pin}]}),
+        encoding="utf-8",
+    )
+    utime(data_path, (mtime, mtime))
+
+
+class TestVpnDataSnapshotService:
+    """
+    Test VPN Data Snapshot Service
+    """
+
+    def test_unchanged_file_is_loaded_from_snapshot(self, tmp_path: Path) -> None:
+        """
+        Test that a file is only parsed again once its content changes
+        """
+        # Arrange
+        data_path: Path = tmp_path / "vpn_data.json"
+        _write_vpn_data(data_path, "1", 1)
+        sut: _CountingParserService = _CountingParserService(
+            VpnDataSnapshotService(str(tmp_path / "cache"))
+        )
+
+        # Act
+        first_vpns: list[AbstractVpnModel] = sut.parse_vpn_data_file(str(data_path))
+        cached_vpns: list[AbstractVpnModel] = sut.parse_vpn_data_file(str(data_path))
+        utime(data_path, (2, 2))
+        touched_vpns: list[AbstractVpnModel] = sut.parse_vpn_data_file(str(data_path))
+        _write_vpn_data(data_path, "2", 3)
+        changed_vpns: list[AbstractVpnModel] = sut.parse_vpn_data_file(str(data_path))
+
+        # Assert
+        assert 2 == sut.parses
+        assert [vpn.to_json() for vpn in first_vpns] == [vpn.to_json() for vpn in cached_vpns]
+        assert [vpn.to_json() for vpn in first_vpns] == [vpn.to_json() for vpn in touched_vpns]
+        assert "2" == changed_vpns[0].to_json()["pin"]
+
+    def test_unusable_snapshot_is_ignored(self, tmp_path: Path) -> None:
+        """
+        Test that a corrupt or foreign-writable snapshot falls back to parsing the file
+        """
+        # Arrange
+        data_path: Path = tmp_path / "vpn_data.json"
+        _write_vpn_data(data_path, "1", 1)
+        snapshot_service: VpnDataSnapshotService = VpnDataSnapshotService(str(tmp_path / "cache"))
+        sut: _CountingParserService = _CountingParserService(snapshot_service)
+        snapshot_path: Path = Path(snapshot_service.get_snapshot_path(str(data_path)))
+
+        # Act
+        sut.parse_vpn_data_file(str(data_path))
+        chmod(snapshot_path, 0o666)
+        sut.parse_vpn_data_file(str(data_path))
+        snapshot_path.write_bytes(b"corrupt")
+        actual_vpns: list[AbstractVpnModel] = sut.parse_vpn_data_file(str(data_path))
+
+        # Assert
+        assert 3 == sut.parses
+        assert ["vpn"] == [vpn.get_vpn_id() for vpn in actual_vpns]
+        assert 0o600 == snapshot_path.stat().st_mode & 0o777
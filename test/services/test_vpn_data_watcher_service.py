@@ -0,0 +1,148 @@
+"""
+Test VPN Data Watcher Service module
+"""
+
+from asyncio import run
+from json import dumps
+from os import utime
+from pathlib import Path
+
+from fakes import write_fake_cli
+from src.models.vpn_data_diff import VpnDataDiff
+from src.services.vpn_data_watcher_service import VpnDataWatcherService
+from src.services.vpn_fleet_service import VpnFleetService
+from src.services.vpn_parser_service import VpnDataParserService
+from src.services.vpn_supervisor_service import VpnSupervisorService
+
+
+def _write_vpn_data(path: Path, document: dict | list | str, mtime: int) -> None:
+    """
+    Write a VPN data JSON file with a distinct modification time.
+    """
+    path.write_text(
+        document if isinstance(document, str) else dumps(document), encoding="utf-8"
+    )
+    utime(path, (mtime, mtime))
+
+
+def _create_sut(tmp_path: Path, document: dict) -> VpnDataWatcherService:
+    """
+    Create a watcher of a VPN data JSON file whose VPNs are already being supervised.
+    """
+    data_path: Path = tmp_path / "vpn_data.json"
+    _write_vpn_data(data_path, document, 1)
+    parser_service: VpnDataParserService = VpnDataParserService()
+    supervisor_service: VpnSupervisorService = VpnSupervisorService(VpnFleetService())
+    for vpn in parser_service.parse_vpn_data(data_path.read_text(encoding="utf-8")):
+        supervisor_service.add_vpn(vpn)
+    return VpnDataWatcherService(str(data_path), supervisor_service, parser_service)
+
+
+def _pritunl_data(cli_path: Path, vpn_list: list[dict], config: dict | None = None) -> dict:
+    """
+    Build a VPN data document of Pritunl VPNs.
+    """
+    return {
+        "config": {"PRITUNL": {"cli_path": str(cli_path), **(config or {})}},
+        "vpn_list": [{"vpn_type": "PRITUNL", **vpn} for vpn in vpn_list],
+    }
+
+
+class TestVpnDataWatcherService:
+    """
+    Test VPN Data Watcher Service
+    """
+
+    def test_reload_if_changed(self, tmp_path: Path) -> None:
+        """
+        Test that only the added, removed and changed VPNs are touched on reload
+        """
+        # Arrange
+        calls_path: Path = tmp_path / "calls"
+        cli_path: Path = write_fake_cli(
+            tmp_path, "pritunl-client", f'echo "$1 $2" >> "{calls_path}"\n'
+        )
+        sut: VpnDataWatcherService = _create_sut(tmp_path, _pritunl_data(cli_path, [
+            {"vpn_id": "kept", "pin": "1"},
+            {"vpn_id": "changed", "pin": "1"},
+            {"vpn_id": "removed", "pin": "1"},
+        ]))
+
+        # Act
+        unchanged_diff: VpnDataDiff | None = run(sut.reload_if_changed(False))
+        _write_vpn_data(Path(sut.vpn_data_json_path), _pritunl_data(cli_path, [
+            {"vpn_id": "kept", "pin": "1"},
+            {"vpn_id": "changed", "pin": "2"},
+            {"vpn_id": "added", "pin": "1"},
+        ]), 2)
+        actual_diff: VpnDataDiff | None = run(sut.reload_if_changed(False))
+
+        # Assert
+        assert unchanged_diff is None
+        assert "1 added, 1 removed, 1 changed, 0 updated" == str(actual_diff)
+        actual_vpns: dict = {
+            vpn.get_vpn_id(): vpn for vpn in sut.supervisor_service.get_vpns()
+        }
+        assert ["added", "changed", "kept"] == sorted(actual_vpns)
+        assert "2" == actual_vpns["changed"].to_json()["pin"]
+        assert ["stop changed", "stop removed"] == sorted(
+            calls_path.read_text(encoding="utf-8").splitlines()
+        )
+
+    def test_runtime_options_are_updated_in_place(self, tmp_path: Path) -> None:
+        """
+        Test that changing only check intervals or timeouts does not reconnect any VPN
+        """
+        # Arrange
+        calls_path: Path = tmp_path / "calls"
+        cli_path: Path = write_fake_cli(
+            tmp_path, "pritunl-client", f'echo "$1 $2" >> "{calls_path}"\n'
+        )
+        sut: VpnDataWatcherService = _create_sut(tmp_path, _pritunl_data(cli_path, [
+            {"vpn_id": "critical", "pin": "1"},
+            {"vpn_id": "lab", "pin": "1"},
+        ]))
+
+        # Act
+        _write_vpn_data(Path(sut.vpn_data_json_path), _pritunl_data(
+            cli_path,
+            [
+                {"vpn_id": "critical", "pin": "1", "check_interval": 1},
+                {"vpn_id": "lab", "pin": "1"},
+            ],
+            {"timeouts": {"connect": 5}}
+        ), 2)
+        actual_diff: VpnDataDiff | None = run(sut.reload_if_changed(False))
+
+        # Assert
+        assert "0 added, 0 removed, 0 changed, 2 updated" == str(actual_diff)
+        assert [1, None] == [
+            vpn.get_check_interval() for vpn in sut.supervisor_service.get_vpns()
+        ]
+        assert not calls_path.exists()
+
+    def test_invalid_change_is_ignored(self, tmp_path: Path) -> None:
+        """
+        Test that a change that cannot be parsed leaves the supervised VPNs untouched
+        """
+        # Arrange
+        sut: VpnDataWatcherService = _create_sut(
+            tmp_path, _pritunl_data(tmp_path / "cli", [{"vpn_id": "kept", "pin": "1"}])
+        )
+        invalid_documents: list[dict | list | str] = [
+            '{"vpn_list": [',
+            [],
+            {"vpn_list": [1]},
+            {"vpn_list": None},
+            {"config": [], "vpn_list": [{"vpn_id": "kept", "vpn_type": "PRITUNL"}]},
+        ]
+
+        # Act
+        actual_diffs: list[VpnDataDiff | None] = []
+        for mtime, document in enumerate(invalid_documents, start=2):
+            _write_vpn_data(Path(sut.vpn_data_json_path), document, mtime)
+            actual_diffs.append(run(sut.reload_if_changed(False)))
+
+        # Assert
+        assert [None] * len(invalid_documents) == actual_diffs
+        assert ["kept"] == [vpn.get_vpn_id() for vpn in sut.supervisor_service.get_vpns()]
@@ -0,0 +1,232 @@
+"""
+Test VPN Fleet Service module
+"""
+
+from asyncio import gather, run
+from subprocess import CompletedProcess
+from time import monotonic
+from typing import Iterator
+
+from fakes import FakeVpnModel
+from src.enums.vpn_type import VpnType
+from src.models.runner_config import RunnerConfig
+from src.services.vpn_fleet_service import VpnFleetService
+
+
+class TestVpnFleetService:
+    """
+    Test VPN Fleet Service
+    """
+
+    def test_connect_all_respects_concurrency_limit(self) -> None:
+        """
+        Test that no more actions than the concurrency limit run at once
+        """
+        # Arrange
+        sut: VpnFleetService = VpnFleetService(concurrency_limit=3)
+        vpns: list[FakeVpnModel] = [
+            FakeVpnModel(f"vpn_{i}", action_seconds=0.01) for i in range(10)
+        ]
+        FakeVpnModel.max_running = 0
+
+        # Act
+        results: list[CompletedProcess | None] = run(sut.connect_all(vpns, False))
+
+        # Assert
+        assert [["connect", vpn.vpn_id] for vpn in vpns] == [result.args for result in results]
+        assert 3 == FakeVpnModel.max_running
+
+    def test_ensure_all_connected_skips_connected(self) -> None:
+        """
+        Test that only VPNs reported as down are connected
+        """
+        # Arrange
+        sut: VpnFleetService = VpnFleetService()
+        vpns: list[FakeVpnModel] = [FakeVpnModel("up", True), FakeVpnModel("down")]
+
+        # Act
+        results: list[CompletedProcess | None] = run(sut.ensure_all_connected(vpns, False))
+
+        # Assert
+        assert results[0] is None
+        assert 0 == results[1].returncode
+        assert [[], ["connect"]] == [vpn.actions for vpn in vpns]
+
+    def test_failed_action_does_not_affect_others(self) -> None:
+        """
+        Test that an error raised by one VPN is reported without affecting the others
+        """
+        # Arrange
+        sut: VpnFleetService = VpnFleetService()
+        vpns: list[FakeVpnModel] = [
+            FakeVpnModel("broken", error=OSError("CLI not found")), FakeVpnModel("working")
+        ]
+
+        # Act
+        results: list[CompletedProcess | None] = run(sut.disconnect_all(vpns, False))
+
+        # Assert
+        assert 1 == results[0].returncode
+        assert ["disconnect"] == vpns[1].actions
+
+    def test_connect_all_starts_before_vpns_are_exhausted(self) -> None:
+        """
+        Test that the first VPNs of a streamed list are connected while the rest are produced
+        """
+        # Arrange
+        sut: VpnFleetService = VpnFleetService()
+        vpns: list[FakeVpnModel] = [FakeVpnModel(f"vpn_{i}") for i in range(3)]
+        started_when_produced: list[int] = []
+
+        def produce_vpns() -> Iterator[FakeVpnModel]:
+            for vpn in vpns:
+                started_when_produced.append(FakeVpnModel.running + len(vpns[0].actions))
+                yield vpn
+
+        # Act
+        run(sut.connect_all(produce_vpns(), False))
+
+        # Assert
+        assert 0 == started_when_produced[0]
+        assert all(started > 0 for started in started_when_produced[1:])
+
+    def test_overlapping_actions_of_a_vpn_are_joined(self) -> None:
+        """
+        Test that an action already running for a VPN is joined rather than run again
+        """
+        # Arrange
+        sut: VpnFleetService = VpnFleetService()
+        vpn: FakeVpnModel = FakeVpnModel("shared", action_seconds=0.05)
+
+        async def act_concurrently() -> list[list[CompletedProcess | None]]:
+            return await gather(
+                sut.connect_all([vpn], False),
+                sut.connect_all([vpn], False),
+                sut.disconnect_all([vpn], False),
+            )
+
+        # Act
+        results: list[list[CompletedProcess | None]] = run(act_concurrently())
+
+        # Assert
+        assert results[0][0] is results[1][0]
+        assert ["connect", "disconnect"] == vpn.actions
+
+    def test_connects_respect_runner_limits(self) -> None:
+        """
+        Test that connections respect the limits of the runner config, and disconnections only
+        the concurrency limit
+        """
+        # Arrange
+        sut: VpnFleetService = VpnFleetService(
+            concurrency_limit=8,
+            runner_config=RunnerConfig(
+                max_concurrent_connects=4, max_concurrent_connects_per_type={VpnType.NONE: 2}
+            )
+        )
+        vpns: list[FakeVpnModel] = [
+            FakeVpnModel(f"vpn_{i}", action_seconds=0.01) for i in range(10)
+        ]
+
+        # Act
+        FakeVpnModel.max_running = 0
+        run(sut.connect_all(vpns, False))
+        max_connects: int = FakeVpnModel.max_running
+        FakeVpnModel.max_running = 0
+        run(sut.disconnect_all(vpns, False))
+
+        # Assert
+        assert 2 == max_connects
+        assert 8 == FakeVpnModel.max_running
+
+    def test_runner_limits_can_be_replaced(self) -> None:
+        """
+        Test that replaced runner limits apply to the later connections of the same event loop
+        """
+        # Arrange
+        sut: VpnFleetService = VpnFleetService(
+            runner_config=RunnerConfig(max_concurrent_connects=2)
+        )
+        vpns: list[FakeVpnModel] = [
+            FakeVpnModel(f"vpn_{i}", action_seconds=0.01) for i in range(6)
+        ]
+
+        async def connect_twice() -> list[int]:
+            FakeVpnModel.max_running = 0
+            await sut.connect_all(vpns, False)
+            max_connects: list[int] = [FakeVpnModel.max_running]
+            sut.set_runner_config(RunnerConfig(max_concurrent_connects=3))
+            FakeVpnModel.max_running = 0
+            await sut.connect_all(vpns, False)
+            return max_connects + [FakeVpnModel.max_running]
+
+        # Act
+        actual_max_connects: list[int] = run(connect_twice())
+
+        # Assert
+        assert [2, 3] == actual_max_connects
+
+    def test_connects_respect_runner_rate(self) -> None:
+        """
+        Test that connections beyond the burst of the runner config start at its rate
+        """
+        # Arrange
+        sut: VpnFleetService = VpnFleetService(
+            runner_config=RunnerConfig(connects_per_second=50, connect_burst=2)
+        )
+        vpns: list[FakeVpnModel] = [FakeVpnModel(f"vpn_{i}") for i in range(6)]
+
+        # Act
+        started_at: float = monotonic()
+        run(sut.connect_all(vpns, False))
+        elapsed: float = monotonic() - started_at
+
+        # Assert
+        assert 0.08 <= elapsed < 1
+        assert all(["connect"] == vpn.actions for vpn in vpns)
+
+    def test_actions_run_in_dependency_waves(self) -> None:
+        """
+        Test that VPNs connect after the VPNs they depend on, and disconnect before them
+        """
+        # Arrange
+        sut: VpnFleetService = VpnFleetService()
+        vpns: list[FakeVpnModel] = [
+            FakeVpnModel(vpn_id, action_seconds=0.01) for vpn_id in ("c", "b", "a", "d")
+        ]
+        vpns[0].depends_on = ("b", "NONE_a")
+        vpns[1].depends_on = ("a", "not_selected")
+        FakeVpnModel.log = []
+
+        # Act
+        connect_results: list[CompletedProcess | None] = run(sut.connect_all(vpns, False))
+        connect_log: list[str] = FakeVpnModel.log
+        FakeVpnModel.log = []
+        run(sut.disconnect_all(vpns, False))
+
+        # Assert
+        assert [["connect", vpn.vpn_id] for vpn in vpns] == [
+            result.args for result in connect_results
+        ]
+        assert ["connect a", "connect d", "connect b", "connect c"] == connect_log
+        assert ["disconnect c", "disconnect b", "disconnect a", "disconnect d"] == FakeVpnModel.log
+
+    def test_dependents_of_failed_vpn_are_skipped(self) -> None:
+        """
+        Test that the VPNs depending on a VPN that failed to connect are not connected
+        """
+        # Arrange
+        sut: VpnFleetService = VpnFleetService()
+        vpns: list[FakeVpnModel] = [
+            FakeVpnModel("broken", returncode=1), FakeVpnModel("inner"), FakeVpnModel("innermost")
+        ]
+        vpns[1].depends_on = ("broken",)
+        vpns[2].depends_on = ("inner",)
+
+        # Act
+        results: list[CompletedProcess | None] = run(sut.connect_all(vpns, False))
+
+        # Assert
+        assert [1, 1, 1] == [result.returncode for result in results]
+        assert "NONE_inner skipped, as NONE_broken failed" == results[1].stderr
+        assert [["connect"], [], []] == [vpn.actions for vpn in vpns]
@@ -0,0 +1,112 @@
+"""
+Test VPN Metrics Service module
+"""
+
+from asyncio import TimeoutError as AsyncTimeoutError, run, wait_for
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from pytest import raises
+
+from fakes import FakeVpnModel
+from src.models.circuit_breaker import CircuitBreaker
+from src.services.vpn_fleet_service import VpnFleetService
+from src.services.vpn_metrics_service import VpnMetricsService
+from src.services.vpn_supervisor_service import VpnSupervisorService
+
+
+class TestVpnMetricsService:
+    """
+    Test VPN Metrics Service
+    """
+
+    def test_fleet_actions_are_recorded(self) -> None:
+        """
+        Test that the latency and return code of every connection and disconnection are recorded,
+        including the reconnections of VPNs found down
+        """
+        # Arrange
+        sut: VpnMetricsService = VpnMetricsService(duration_buckets=(0.5, 1))
+        fleet_service: VpnFleetService = VpnFleetService(metrics_service=sut)
+        vpns: list[FakeVpnModel] = [FakeVpnModel("up"), FakeVpnModel("broken", returncode=2)]
+
+        # Act
+        run(fleet_service.connect_all(vpns, False))
+        run(fleet_service.disconnect_all(vpns[:1], False))
+        run(fleet_service.ensure_all_connected(vpns, False))
+        actual_metrics: list[str] = sut.render().splitlines()
+
+        # Assert
+        assert (
+            'auto_vpn_action_duration_seconds_bucket{vpn="NONE_up",operation="connect",le="0.5"} 2'
+        ) in actual_metrics
+        assert (
+            'auto_vpn_action_duration_seconds_count{vpn="NONE_up",operation="disconnect"} 1'
+        ) in actual_metrics
+        assert (
+            'auto_vpn_action_return_codes_total'
+            '{vpn="NONE_broken",operation="connect",return_code="2"} 2'
+        ) in actual_metrics
+        assert 3 == sum(
+            line.startswith("auto_vpn_action_return_codes_total{") for line in actual_metrics
+        )
+
+    def test_watch_loop_checks_are_recorded(self) -> None:
+        """
+        Test that reconnections, check durations and healthy checks of the watch loop are recorded
+        """
+        # Arrange
+        sut: VpnMetricsService = VpnMetricsService()
+        supervisor_service: VpnSupervisorService = VpnSupervisorService(
+            VpnFleetService(metrics_service=sut),
+            check_interval=10,
+            circuit_breaker_factory=lambda: CircuitBreaker(1, base_delay=10, jitter=0)
+        )
+        vpns: list[FakeVpnModel] = [
+            FakeVpnModel("up", connected=True),
+            FakeVpnModel("down"),
+            FakeVpnModel("broken", returncode=1),
+        ]
+
+        # Act
+        with raises(AsyncTimeoutError):
+            run(wait_for(supervisor_service.supervise_all(vpns, False), timeout=0.1))
+        actual_metrics: list[str] = sut.render().splitlines()
+
+        # Assert
+        assert 'auto_vpn_reconnects_total{vpn="NONE_down"} 1' in actual_metrics
+        assert 'auto_vpn_reconnects_total{vpn="NONE_broken"} 1' in actual_metrics
+        assert 'auto_vpn_check_duration_seconds_count{vpn="NONE_up"} 1' in actual_metrics
+        assert [
+            'auto_vpn_seconds_since_healthy_check{vpn="NONE_up"}',
+            'auto_vpn_seconds_since_healthy_check{vpn="NONE_down"}',
+        ] == [
+            line.rsplit(" ", 1)[0]
+            for line in actual_metrics
+            if line.startswith("auto_vpn_seconds_since_healthy_check{")
+        ]
+
+    def test_metrics_endpoint(self) -> None:
+        """
+        Test scraping the metrics over HTTP
+        """
+        # Arrange
+        sut: VpnMetricsService = VpnMetricsService()
+        run(VpnFleetService(metrics_service=sut).connect_all([FakeVpnModel('vpn"1')], False))
+        server: ThreadingHTTPServer = sut.start_server(0)
+        address: str = f"http://127.0.0.1:{server.server_address[1]}"
+
+        # Act
+        with urlopen(f"{address}/metrics", timeout=5) as response:
+            actual_content_type: str = response.headers["Content-Type"]
+            actual_metrics: str = response.read().decode("utf-8")
+        with raises(HTTPError):
+            with urlopen(f"{address}/other", timeout=5):
+                pass
+        sut.stop_server()
+
+        # Assert
+        assert actual_content_type.startswith("text/plain; version=0.0.4")
+        assert actual_metrics == sut.render()
+        assert 'vpn="NONE_vpn\\"1"' in actual_metrics
@@ -2,8 +2,14 @@
 Test VPN Parser Service module
 """
 
+from io import StringIO
 from json import dumps
 
+from pytest import raises
+
+from src.enums.vpn_operation import VpnOperation
+from src.enums.vpn_type import VpnType
+from src.models.runner_config import RunnerConfig
 from src.services.vpn_parser_service import VpnDataParserService
 from src.models.vpn_model.abstract_vpn_model import AbstractVpnModel
 from src.models.vpn_model.pritunl_vpn_model import PritunlVpnModel
@@ -105,3 +111,215 @@ class TestVpnParserService:
 
         # Assert
         assert vpn.cli_path == mock_cli_path
+
+    def test_inject_timeouts(self) -> None:
+        """
+        Test injecting per-operation deadlines from the global configs
+        """
+        # Arrange
+        mock_vpn_config_json: dict = {
+            "PRITUNL": {
+                "cli_path": "test_cli_path",
+                "timeouts": {"connect": 12, "status": 1.5},
+                "kill_grace_period": 0.5,
+            }
+        }
+        mock_vpn_data_json: dict = {"vpn_id": "<vpn_id_1>", "vpn_type": "PRITUNL"}
+
+        # Act
+        vpn: PritunlVpnModel = (
+            TestVpnParserService.sut.generate_vpn_from_config_and_data(
+                mock_vpn_config_json,
+                mock_vpn_data_json,
+            )
+        )
+
+        # Assert
+        assert 12 == vpn.config.get_timeout(VpnOperation.CONNECT)
+        assert 1.5 == vpn.config.get_timeout(VpnOperation.STATUS)
+        assert 30 == vpn.config.get_timeout(VpnOperation.DISCONNECT)
+        assert 0.5 == vpn.config.kill_grace_period
+
+    def test_inject_invalid_timeouts(self) -> None:
+        """
+        Test that invalid per-operation deadlines are rejected
+        """
+        # Arrange
+        mock_vpn_data_json: dict = {"vpn_id": "<vpn_id_1>", "vpn_type": "PRITUNL"}
+
+        # Act and Assert
+        for timeouts in ({"connect": 0}, {"connect": "10"}, {"connect": True}, {"reboot": 10}):
+            with raises(ValueError):
+                TestVpnParserService.sut.generate_vpn_from_config_and_data(
+                    {"PRITUNL": {"timeouts": timeouts}},
+                    mock_vpn_data_json,
+                )
+
+    def test_inject_invalid_unload_wait(self) -> None:
+        """
+        Test that invalid Global Protect unload wait durations are rejected
+        """
+        # Arrange
+        mock_vpn_data_json: dict = {"vpn_id": "<vpn_id_1>", "vpn_type": "GLOBAL_PROTECT"}
+        invalid_configs: list[dict] = [
+            {"unload_wait_timeout": "x"},
+            {"unload_wait_timeout": -1},
+            {"unload_poll_interval": 0},
+            {"unload_poll_interval": -0.1},
+            {"unload_poll_interval": None},
+            {"unload_poll_interval": True},
+        ]
+
+        # Act and Assert
+        for config in invalid_configs:
+            with raises(ValueError):
+                TestVpnParserService.sut.generate_vpn_from_config_and_data(
+                    {"GLOBAL_PROTECT": config},
+                    mock_vpn_data_json,
+                )
+        assert 0 == TestVpnParserService.sut.generate_vpn_from_config_and_data(
+            {"GLOBAL_PROTECT": {"unload_wait_timeout": 0}},
+            mock_vpn_data_json,
+        ).config.unload_wait_timeout
+
+    def test_inject_priority(self) -> None:
+        """
+        Test that the connection priority of a VPN is parsed, and that invalid ones are rejected
+        """
+        # Arrange
+        mock_vpn_data_json: dict = {"vpn_id": "<vpn_id_1>", "vpn_type": "PRITUNL"}
+
+        # Act
+        actual_vpn: AbstractVpnModel = TestVpnParserService.sut.generate_vpn_from_config_and_data(
+            {"PRITUNL": {}}, {**mock_vpn_data_json, "priority": -2}
+        )
+
+        # Assert
+        assert -2 == actual_vpn.get_priority()
+        assert -2 == actual_vpn.to_json()["priority"]
+        for priority in ("1", 1.5, True):
+            with raises(ValueError):
+                TestVpnParserService.sut.generate_vpn_from_config_and_data(
+                    {"PRITUNL": {}}, {**mock_vpn_data_json, "priority": priority}
+                )
+
+    def test_invalid_dependencies(self) -> None:
+        """
+        Test that dependencies on unknown VPNs and dependency cycles are rejected
+        """
+        # Arrange
+        documents: list[dict] = [
+            {"config": {}, "vpn_list": [
+                {"vpn_id": "<vpn_id_1>", "vpn_type": "PRITUNL", "depends_on": ["<vpn_id_2>"]},
+            ]},
+            {"config": {}, "vpn_list": [
+                {"vpn_id": "<vpn_id_1>", "vpn_type": "PRITUNL", "depends_on": ["<vpn_id_2>"]},
+                {"vpn_id": "<vpn_id_2>", "vpn_type": "PRITUNL", "depends_on": ["<vpn_id_1>"]},
+            ]},
+            {"config": {}, "vpn_list": [
+                {"vpn_id": "<vpn_id_1>", "vpn_type": "PRITUNL", "depends_on": "<vpn_id_2>"},
+            ]},
+        ]
+
+        # Act and Assert
+        for document in documents:
+            with raises(ValueError):
+                TestVpnParserService.sut.parse_vpn_data(dumps(document))
+
+    def test_configs_are_shared(self) -> None:
+        """
+        Test that the config of each VPN type is parsed once and shared by all its VPNs
+        """
+        # Arrange
+        mock_vpn_data: dict = {
+            "config": {"PRITUNL": {"cli_path": "<cli_path>"}},
+            "vpn_list": [
+                {"vpn_id": "<vpn_id_1>", "vpn_type": "PRITUNL"},
+                {"vpn_id": "<vpn_id_2>", "vpn_type": "GLOBAL_PROTECT"},
+                {"vpn_id": "<vpn_id_3>", "vpn_type": "PRITUNL"},
+                {"vpn_id": "<vpn_id_4>", "vpn_type": "GLOBAL_PROTECT"},
+            ],
+        }
+
+        # Act
+        actual_vpn_data: list[AbstractVpnModel] = TestVpnParserService.sut.parse_vpn_data(
+            dumps(mock_vpn_data)
+        )
+
+        # Assert
+        assert actual_vpn_data[0].config is actual_vpn_data[2].config
+        assert actual_vpn_data[1].config is actual_vpn_data[3].config
+        assert "<cli_path>" == actual_vpn_data[2].cli_path
+        assert not any(hasattr(vpn, "__dict__") for vpn in actual_vpn_data)
+
+    def test_stream_vpn_data(self) -> None:
+        """
+        Test that streaming VPN data yields the same VPNs as parsing it whole, wherever the config
+        is in the document
+        """
+        # Arrange
+        vpn_list: list[dict] = [
+            {"vpn_id": f"<vpn_id_{i}>", "vpn_type": "PRITUNL", "pin": str(i)} for i in range(5)
+        ]
+        config: dict = {"PRITUNL": {"cli_path": "<cli_path>"}}
+        documents: list[str] = [
+            dumps({"config": config, "vpn_list": vpn_list}),
+            dumps({"vpn_list": vpn_list, "unknown": [1, {"a": 2}], "config": config}),
+        ]
+
+        # Act
+        actual_vpn_data: list[list[AbstractVpnModel]] = [
+            list(TestVpnParserService.sut.stream_vpn_data(StringIO(document)))
+            for document in documents
+        ]
+
+        # Assert
+        expected_vpn_data: list[AbstractVpnModel] = TestVpnParserService.sut.parse_vpn_data(
+            documents[0]
+        )
+        for vpns in actual_vpn_data:
+            assert [vpn.to_json() for vpn in expected_vpn_data] == [vpn.to_json() for vpn in vpns]
+            assert ["<cli_path>"] * 5 == [vpn.cli_path for vpn in vpns]
+        with raises(KeyError):
+            list(TestVpnParserService.sut.stream_vpn_data(StringIO('{"config": {}}')))
+
+    def test_parse_runner_config(self) -> None:
+        """
+        Test that the runner config is read from the config, and that invalid options are rejected
+        """
+        # Arrange
+        runner_json: dict = {
+            "max_concurrent_connects": 4,
+            "max_concurrent_connects_per_type": {"PRITUNL": 2},
+            "connects_per_second": 5,
+            "connect_burst": 3,
+        }
+        document: str = dumps({
+            "config": {"PRITUNL": {}, "runner": runner_json},
+            "vpn_list": [{"vpn_id": "<vpn_id>", "vpn_type": "PRITUNL"}],
+        })
+
+        # Act
+        actual: RunnerConfig = TestVpnParserService.sut.parse_runner_config(StringIO(document))
+        default: RunnerConfig = TestVpnParserService.sut.parse_runner_config(
+            StringIO('{"vpn_list": [], "config": {}}')
+        )
+
+        # Assert
+        assert 4 == actual.max_concurrent_connects
+        assert 2 == actual.get_connect_limit(VpnType.PRITUNL)
+        assert actual.get_connect_limit(VpnType.GLOBAL_PROTECT) is None
+        assert 5.0 == actual.connects_per_second
+        assert 3 == actual.connect_burst
+        assert runner_json == actual.to_json()
+        assert default.max_concurrent_connects is None
+        assert default.connects_per_second is None
+        for invalid_json in (
+            {"max_concurrent_connects": 0},
+            {"max_concurrent_connects_per_type": {"PRITUNL": "2"}},
+            {"max_concurrent_connects_per_type": {"OPENVPN": 2}},
+            {"connects_per_second": -1},
+            {"connect_burst": True},
+        ):
+            with raises(ValueError):
+                RunnerConfig.from_json(invalid_json)
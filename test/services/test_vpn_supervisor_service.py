@@ -0,0 +1,145 @@
+"""
+Test VPN Supervisor Service module
+"""
+
+from asyncio import TimeoutError as AsyncTimeoutError, run, wait_for
+
+from pytest import raises
+
+from fakes import FakeVpnModel
+from src.models.circuit_breaker import CircuitBreaker
+from src.services.vpn_fleet_service import VpnFleetService
+from src.services.vpn_supervisor_service import VpnSupervisorService
+
+
+class TestVpnSupervisorService:
+    """
+    Test VPN Supervisor Service
+    """
+
+    def test_slow_vpn_does_not_delay_others(self) -> None:
+        """
+        Test that a hung VPN does not delay the reconnection of the other VPNs
+        """
+        # Arrange
+        sut: VpnSupervisorService = VpnSupervisorService(VpnFleetService(), check_interval=0.01)
+        hung_vpn: FakeVpnModel = FakeVpnModel("hung", action_seconds=10)
+        healthy_vpn: FakeVpnModel = FakeVpnModel("healthy")
+
+        # Act
+        with raises(AsyncTimeoutError):
+            run(wait_for(sut.supervise_all([hung_vpn, healthy_vpn], False), timeout=0.3))
+
+        # Assert
+        assert 0 == hung_vpn.get_connects()
+        assert healthy_vpn.get_connects() >= 5
+
+    def test_connected_vpn_is_only_checked(self) -> None:
+        """
+        Test that a connected VPN is checked on every interval but never reconnected
+        """
+        # Arrange
+        sut: VpnSupervisorService = VpnSupervisorService(VpnFleetService(), check_interval=0.01)
+        connected_vpn: FakeVpnModel = FakeVpnModel("up", connected=True)
+
+        # Act
+        with raises(AsyncTimeoutError):
+            run(wait_for(sut.supervise_all([connected_vpn], False), timeout=0.1))
+
+        # Assert
+        assert 0 == connected_vpn.get_connects()
+        assert connected_vpn.checks >= 3
+
+    def test_failing_vpn_is_backed_off(self) -> None:
+        """
+        Test that a VPN that keeps failing stops being retried at the fast cadence
+        """
+        # Arrange
+        sut: VpnSupervisorService = VpnSupervisorService(
+            VpnFleetService(),
+            check_interval=0.01,
+            circuit_breaker_factory=lambda: CircuitBreaker(2, base_delay=10, jitter=0)
+        )
+        failing_vpn: FakeVpnModel = FakeVpnModel("broken", returncode=1)
+        healthy_vpn: FakeVpnModel = FakeVpnModel("healthy")
+
+        # Act
+        with raises(AsyncTimeoutError):
+            run(wait_for(sut.supervise_all([failing_vpn, healthy_vpn], False), timeout=0.2))
+
+        # Assert
+        assert 2 == failing_vpn.get_connects()
+        assert healthy_vpn.get_connects() >= 5
+        assert 2 == sut.get_circuit_breaker(failing_vpn).get_consecutive_failures()
+
+    def test_unknown_status_leaves_circuit_open(self) -> None:
+        """
+        Test that a check that cannot tell whether a VPN is connected leaves its circuit breaker
+        as it is, and that a check finding it connected closes it
+        """
+        # Arrange
+        def create_open_circuit_breaker() -> CircuitBreaker:
+            circuit_breaker: CircuitBreaker = CircuitBreaker(1, base_delay=0.01, jitter=0)
+            circuit_breaker.record_failure()
+            return circuit_breaker
+
+        sut: VpnSupervisorService = VpnSupervisorService(
+            VpnFleetService(),
+            check_interval=0.01,
+            circuit_breaker_factory=create_open_circuit_breaker
+        )
+        unknown_vpn: FakeVpnModel = FakeVpnModel("unknown", connected=None)
+        connected_vpn: FakeVpnModel = FakeVpnModel("up", connected=True)
+
+        # Act
+        with raises(AsyncTimeoutError):
+            run(wait_for(sut.supervise_all([unknown_vpn, connected_vpn], False), timeout=0.1))
+
+        # Assert
+        assert unknown_vpn.checks >= 2
+        assert 0 == unknown_vpn.get_connects()
+        assert 1 == sut.get_circuit_breaker(unknown_vpn).get_consecutive_failures()
+        assert 0 == sut.get_circuit_breaker(connected_vpn).get_consecutive_failures()
+
+    def test_dependencies_are_connected_first(self) -> None:
+        """
+        Test that a VPN is reconnected after the VPNs it depends on, and not while they fail
+        """
+        # Arrange
+        sut: VpnSupervisorService = VpnSupervisorService(VpnFleetService(), check_interval=0.01)
+        vpns: list[FakeVpnModel] = [
+            FakeVpnModel("inner"),
+            FakeVpnModel("outer", action_seconds=0.01),
+            FakeVpnModel("blocked"),
+            FakeVpnModel("broken", returncode=1),
+        ]
+        vpns[0].depends_on = ("outer",)
+        vpns[2].depends_on = ("broken",)
+        FakeVpnModel.log = []
+
+        # Act
+        with raises(AsyncTimeoutError):
+            run(wait_for(sut.supervise_all(vpns, False), timeout=0.1))
+
+        # Assert
+        assert FakeVpnModel.log.index("connect outer") < FakeVpnModel.log.index("connect inner")
+        assert 0 == vpns[2].get_connects()
+        assert vpns[3].get_connects() > 0
+
+    def test_per_vpn_check_intervals(self) -> None:
+        """
+        Test that every VPN is checked at its own interval
+        """
+        # Arrange
+        sut: VpnSupervisorService = VpnSupervisorService(VpnFleetService(), check_interval=0.02)
+        critical_vpn: FakeVpnModel = FakeVpnModel("critical", connected=True)
+        lab_vpn: FakeVpnModel = FakeVpnModel("lab", connected=True)
+        lab_vpn.check_interval = 10
+
+        # Act
+        with raises(AsyncTimeoutError):
+            run(wait_for(sut.supervise_all([critical_vpn, lab_vpn], False), timeout=0.3))
+
+        # Assert
+        assert critical_vpn.checks >= 5
+        assert 1 == lab_vpn.checks
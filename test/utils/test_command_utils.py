@@ -0,0 +1,151 @@
+'''
+Test command utilities module
+'''
+
+from asyncio import create_task, gather, run, sleep
+from pathlib import Path
+from signal import SIGKILL, SIGTERM
+from subprocess import CompletedProcess
+from sys import executable
+from time import monotonic
+
+from src.utils.command_utils import COMMAND_NOT_RUNNABLE_RETURN_CODE, TimedOutProcess
+from src.utils.command_utils import run_command, run_command_async
+
+
+class TestCommandUtils:
+    '''
+    Test command utilities
+    '''
+
+    def test_run_command_async(self):
+        '''
+        Test running a command and capturing its output
+        '''
+        # Arrange
+        args: list[str] = [executable, '-c', 'import sys; print("out"); sys.exit(3)']
+
+        # Act
+        actual_process: CompletedProcess = run(run_command_async(args))
+
+        # Assert
+        assert args == actual_process.args
+        assert 3 == actual_process.returncode
+        assert 'out' == actual_process.stdout.strip()
+
+    def test_run_command_async_missing_executable(self):
+        '''
+        Test running a command whose executable does not exist
+        '''
+        # Act
+        actual_process: CompletedProcess = run(run_command_async(['/nonexistent/cli', 'start']))
+
+        # Assert
+        assert COMMAND_NOT_RUNNABLE_RETURN_CODE == actual_process.returncode
+
+    def test_run_command_timeout_escalates_to_sigkill(self):
+        '''
+        Test that a command ignoring SIGTERM is killed once its grace period is over
+        '''
+        # Arrange
+        args: list[str] = [
+            executable,
+            '-c',
+            'import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); time.sleep(30)'
+        ]
+
+        # Act
+        start: float = monotonic()
+        actual_process: CompletedProcess = run_command(
+            args, timeout=0.5, kill_grace_period=0.2, capture_output=True
+        )
+        elapsed: float = monotonic() - start
+
+        # Assert
+        assert isinstance(actual_process, TimedOutProcess)
+        assert 0.5 == actual_process.timeout
+        assert -SIGKILL == actual_process.returncode
+        assert elapsed < 5
+
+    def test_run_command_async_timeout(self):
+        '''
+        Test that a command exceeding its deadline is terminated and reported as timed out
+        '''
+        # Arrange
+        args: list[str] = [executable, '-c', 'import time; time.sleep(30)']
+
+        # Act
+        actual_process: CompletedProcess = run(run_command_async(args, timeout=0.5))
+
+        # Assert
+        assert isinstance(actual_process, TimedOutProcess)
+        assert -SIGTERM == actual_process.returncode
+
+    def test_run_command_within_deadline(self):
+        '''
+        Test that a command finishing within its deadline is not reported as timed out
+        '''
+        # Act
+        actual_process: CompletedProcess = run_command(
+            [executable, '-c', 'print("done")'], timeout=30, capture_output=True
+        )
+
+        # Assert
+        assert not isinstance(actual_process, TimedOutProcess)
+        assert 'done' == actual_process.stdout.strip()
+
+    def test_identical_commands_are_coalesced(self, tmp_path: Path):
+        '''
+        Test that identical commands running at once share one process, unlike different ones
+        '''
+        # Arrange
+        runs_path: Path = tmp_path / 'runs'
+        script: str = (
+            f'import sys, time; open({str(runs_path)!r}, "a").write(sys.argv[1]); '
+            'time.sleep(0.2); print(sys.argv[1])'
+        )
+
+        async def run_commands() -> list[CompletedProcess]:
+            return await gather(*(
+                run_command_async([executable, '-c', script, name])
+                for name in ('a', 'a', 'a', 'b')
+            ))
+
+        # Act
+        actual_processes: list[CompletedProcess] = run(run_commands())
+        run(run_command_async([executable, '-c', script, 'a']))
+
+        # Assert
+        assert ['a', 'a', 'a', 'b'] == [process.stdout.strip() for process in actual_processes]
+        assert actual_processes[0] is actual_processes[2]
+        assert ['a', 'a', 'b'] == sorted(runs_path.read_text(encoding='utf-8'))
+
+    def test_cancelled_caller_leaves_shared_command_running(self, tmp_path: Path):
+        '''
+        Test that a shared command keeps running for its other caller once its first caller is
+        cancelled, rather than being killed and run again
+        '''
+        # Arrange
+        runs_path: Path = tmp_path / 'runs'
+        script: str = (
+            f'import time; open({str(runs_path)!r}, "a").write("a"); time.sleep(0.2); print("a")'
+        )
+        args: list[str] = [executable, '-c', script]
+
+        async def run_commands() -> CompletedProcess:
+            leader = create_task(run_command_async(args))
+            while not runs_path.exists():
+                await sleep(0.01)
+            waiter = create_task(run_command_async(args))
+            await sleep(0)
+            leader.cancel()
+            await gather(leader, return_exceptions=True)
+            return await waiter
+
+        # Act
+        actual_process: CompletedProcess = run(run_commands())
+
+        # Assert
+        assert 0 == actual_process.returncode
+        assert 'a' == actual_process.stdout.strip()
+        assert 'a' == runs_path.read_text(encoding='utf-8')
@@ -0,0 +1,90 @@
+'''
+Test JSON stream utilities module
+'''
+
+from io import StringIO
+from json import JSONDecodeError, dumps
+from typing import Any
+
+from pytest import raises
+
+from src.utils.json_stream_utils import JsonStreamReader
+
+
+def _read_all(reader: JsonStreamReader) -> dict[str, Any]:
+    '''
+    Read a whole object with the stream reader, iterating over the arrays it contains.
+    '''
+    document: dict[str, Any] = {}
+    for key in reader.iter_object_keys():
+        document[key] = list(reader.iter_array()) if key.endswith('list') else reader.read_value()
+    return document
+
+
+class TestJsonStreamReader:
+    '''
+    Test JsonStreamReader class
+    '''
+
+    def test_read_in_tiny_chunks(self):
+        '''
+        Test that values split across chunk boundaries are decoded whole
+        '''
+        # Arrange
+        expected_document: dict[str, Any] = {
+            'config': {'PRITUNL': {'cli_path': 'pritunl-client', 'timeouts': {'connect': 12345}}},
+            'count': 1234567,
+            'empty_list': [],
+            'vpn_list': [{'vpn_id': f'vpn_{i}', 'pin': 'ü' * i} for i in range(20)] + [6789],
+            'last': None,
+        }
+        text: str = dumps(expected_document, indent=2, ensure_ascii=False)
+
+        # Act and Assert
+        for chunk_size in (1, 3, 7, 64):
+            assert expected_document == _read_all(JsonStreamReader(StringIO(text), chunk_size))
+        assert not _read_all(JsonStreamReader(StringIO(' { } ')))
+
+    def test_invalid_documents(self):
+        '''
+        Test that invalid documents are rejected
+        '''
+        # Act and Assert
+        for text in ('', '[]', '{"vpn_list": [1, }', '{"vpn_list": [1]', '{1: 2}', '{"a" 1}'):
+            with raises(JSONDecodeError):
+                _read_all(JsonStreamReader(StringIO(text), 2))
+
+    def test_skip_value(self):
+        '''
+        Test that skipped values of every kind end where they should, whatever the chunk size,
+        even with brackets and escaped quotes inside their strings
+        '''
+        # Arrange
+        skipped: list[Any] = [
+            [{'a': '}]"\\', 'b': [1, [2, {}]]}, 'x\\"y', ['[', '{']],
+            '"escaped" \\ string ]',
+            -12.5e3,
+            True,
+            None,
+            {},
+        ]
+        text: str = dumps(
+            {f'skipped_{i}': value for i, value in enumerate(skipped)} | {'kept': {'a': 1}}
+        )
+
+        # Act
+        documents: list[dict[str, Any]] = []
+        for chunk_size in (1, 2, 5, 64):
+            reader: JsonStreamReader = JsonStreamReader(StringIO(text), chunk_size)
+            document: dict[str, Any] = {}
+            for key in reader.iter_object_keys():
+                if key == 'kept':
+                    document[key] = reader.read_value()
+                else:
+                    reader.skip_value()
+            documents.append(document)
+
+        # Assert
+        assert [{'kept': {'a': 1}}] * 4 == documents
+        with raises(JSONDecodeError):
+            JsonStreamReader(StringIO('  ')).skip_value()
@@ -0,0 +1,131 @@
+'''
+Test single flight utilities module
+'''
+
+from asyncio import CancelledError, Event, create_task, gather, run, sleep
+
+from pytest import raises
+
+from src.utils.single_flight_utils import SingleFlight
+
+
+class TestSingleFlightUtils:
+    '''
+    Test single flight utilities
+    '''
+
+    def test_callers_share_the_operation_in_flight(self):
+        '''
+        Test that callers of the same key share one run, and that a later call runs again
+        '''
+        # Arrange
+        sut: SingleFlight[str] = SingleFlight()
+        starts: list[str] = []
+
+        async def operation(key: str) -> str:
+            starts.append(key)
+            await sleep(0.01)
+            return f'{key} {len(starts)}'
+
+        async def run_operations() -> list[str]:
+            results: list[str] = await gather(
+                *(sut.run(key, lambda key=key: operation(key)) for key in ('a', 'b', 'a'))
+            )
+            return results + [await sut.run('a', lambda: operation('a'))]
+
+        # Act
+        actual_results: list[str] = run(run_operations())
+
+        # Assert
+        assert ['a 2', 'b 2', 'a 2', 'a 3'] == actual_results
+        assert ['a', 'b', 'a'] == starts
+        assert not sut.is_in_flight('a')
+
+    def test_errors_are_shared(self):
+        '''
+        Test that every caller of an operation gets its error
+        '''
+        # Arrange
+        sut: SingleFlight[None] = SingleFlight()
+
+        async def operation() -> None:
+            await sleep(0.01)
+            raise OSError('CLI not found')
+
+        async def run_operations() -> list[BaseException]:
+            return await gather(
+                sut.run('key', operation), sut.run('key', operation), return_exceptions=True
+            )
+
+        # Act
+        actual_errors: list[BaseException] = run(run_operations())
+
+        # Assert
+        assert actual_errors[0] is actual_errors[1]
+        assert isinstance(actual_errors[0], OSError)
+
+    def test_cancelled_leader_does_not_cancel_callers(self):
+        '''
+        Test that the operation keeps running for the callers still waiting once its first caller
+        is cancelled
+        '''
+        # Arrange
+        sut: SingleFlight[str] = SingleFlight()
+        started: Event = Event()
+        starts: list[int] = []
+
+        async def operation() -> str:
+            starts.append(1)
+            started.set()
+            await sleep(0.01)
+            return 'done'
+
+        async def run_operations() -> str:
+            leader = create_task(sut.run('key', operation))
+            await started.wait()
+            follower = create_task(sut.run('key', operation))
+            await sleep(0)
+            leader.cancel()
+            with raises(CancelledError):
+                await leader
+            return await follower
+
+        # Act
+        actual_result: str = run(run_operations())
+
+        # Assert
+        assert 'done' == actual_result
+        assert 1 == len(starts)
+
+    def test_operation_is_cancelled_with_its_last_caller(self):
+        '''
+        Test that the operation is cancelled once none of its callers are left waiting
+        '''
+        # Arrange
+        sut: SingleFlight[str] = SingleFlight()
+        started: Event = Event()
+        cancelled: list[int] = []
+
+        async def operation() -> str:
+            started.set()
+            try:
+                await sleep(10)
+            except CancelledError:
+                cancelled.append(1)
+                raise
+            return 'done'
+
+        async def run_operations() -> None:
+            callers = [create_task(sut.run('key', operation)) for _ in range(2)]
+            await started.wait()
+            for caller in callers:
+                caller.cancel()
+                await gather(caller, return_exceptions=True)
+            await sleep(0)
+
+        # Act
+        run(run_operations())
+
+        # Assert
+        assert [1] == cancelled
+        assert not sut.is_in_flight('key')
@@ -0,0 +1,144 @@
+'''
+Test tracing utilities module
+'''
+
+from asyncio import run, to_thread
+from json import loads
+from pathlib import Path
+from subprocess import CompletedProcess
+from sys import executable
+from typing import Any, Iterator
+
+from pytest import fixture, raises
+
+from fakes import FakeVpnModel
+from src.services.vpn_parser_service import VpnDataParserService
+from src.utils.command_utils import run_command, run_command_async
+from src.utils.tracing_utils import JsonLinesTraceSink, TraceSink, set_trace_sink, trace_span
+
+
+class _ListTraceSink(TraceSink):
+    '''
+    Sink keeping the spans in a list
+    '''
+
+    def __init__(self) -> None:
+        self.spans: list[dict[str, Any]] = []
+
+    def emit(self, span: dict[str, Any]) -> None:
+        self.spans.append(span)
+
+
+class _ThreadedVpnModel(FakeVpnModel):
+    '''
+    VPN whose async connection runs its sync connection in a thread
+    '''
+
+    def connect(self, verbose: bool) -> CompletedProcess:
+        return CompletedProcess(['connect', self.vpn_id], 0)
+
+    def disconnect(self, verbose: bool) -> CompletedProcess:
+        return CompletedProcess(['disconnect', self.vpn_id], 0)
+
+    async def connect_async(self, verbose: bool) -> CompletedProcess:
+        return await to_thread(self.connect, verbose)
+
+
+@fixture(name='sink')
+def _sink() -> Iterator[_ListTraceSink]:
+    '''
+    Sink receiving the spans of a test, removed after the test.
+    '''
+    sink: _ListTraceSink = _ListTraceSink()
+    set_trace_sink(sink)
+    yield sink
+    set_trace_sink(None)
+
+
+class TestTracingUtils:
+    '''
+    Test tracing utilities
+    '''
+
+    def test_commands_are_traced_without_arguments(self, sink: _ListTraceSink):
+        '''
+        Test that every command is traced with its exit code, but without its arguments
+        '''
+        # Arrange
+        args: list[str] = [executable, '-c', 'import sys; sys.exit(3)', 'secret']
+
+        # Act
+        run_command(args)
+        run(run_command_async(args))
+
+        # Assert
+        assert [('command', 3), ('command', 3)] == [
+            (span['name'], span['exit_code']) for span in sink.spans
+        ]
+        assert all(Path(executable).name == span['command'] for span in sink.spans)
+        assert all('secret' not in str(span) for span in sink.spans)
+        assert all(span['duration'] >= 0 for span in sink.spans)
+
+    def test_vpn_actions_are_traced(self, sink: _ListTraceSink):
+        '''
+        Test that connections and disconnections of every VPN type are traced once each
+        '''
+        # Arrange
+        fake_vpn: FakeVpnModel = FakeVpnModel('fake', returncode=2)
+        threaded_vpn: _ThreadedVpnModel = _ThreadedVpnModel('threaded')
+
+        # Act
+        run(fake_vpn.connect_async(False))
+        run(fake_vpn.disconnect_async(False))
+        run(threaded_vpn.connect_async(False))
+
+        # Assert
+        assert [
+            ('connect', 'NONE_fake', 'NONE', 2),
+            ('disconnect', 'NONE_fake', 'NONE', 2),
+            ('connect', 'NONE_threaded', 'NONE', 0),
+        ] == [
+            (span['name'], span['vpn'], span['vpn_type'], span['exit_code'])
+            for span in sink.spans
+        ]
+
+    def test_errors_are_traced(self, sink: _ListTraceSink):
+        '''
+        Test that an error escaping a span is recorded and raised again
+        '''
+        # Act
+        with raises(OSError):
+            run(FakeVpnModel('broken', error=OSError('CLI not found')).connect_async(False))
+
+        # Assert
+        assert "OSError('CLI not found')" == sink.spans[0]['error']
+
+    def test_json_lines_sink(self, tmp_path: Path):
+        '''
+        Test writing the spans of a VPN data parse to a JSON Lines file
+        '''
+        # Arrange
+        trace_path: Path = tmp_path / 'trace.jsonl'
+        sut: JsonLinesTraceSink = JsonLinesTraceSink(str(trace_path))
+        set_trace_sink(sut)
+
+        # Act
+        VpnDataParserService().parse_vpn_data('{"vpn_list": [], "config": {}}')
+        with trace_span('custom', attribute='value') as span:
+            span['result'] = 1
+        previous_sink: TraceSink | None = set_trace_sink(None)
+        sut.close()
+        with trace_span('untraced'):
+            pass
+
+        # Assert
+        assert previous_sink is sut
+        spans: list[dict] = [
+            loads(line) for line in trace_path.read_text(encoding='utf-8').splitlines()
+        ]
+        assert [('parse_vpn_data', 0), ('custom', None)] == [
+            (span['name'], span.get('vpn_count')) for span in spans
+        ]
+        assert {'attribute': 'value', 'result': 1} == {
+            key: spans[1][key] for key in ('attribute', 'result')
+        }
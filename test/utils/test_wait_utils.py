@@ -0,0 +1,59 @@
+'''
+Test wait utilities module
+'''
+
+from asyncio import run
+from time import monotonic
+
+from src.utils.wait_utils import wait_until, wait_until_async
+
+
+class TestWaitUtils:
+    '''
+    Test wait utilities
+    '''
+
+    def test_wait_until_returns_once_condition_holds(self):
+        '''
+        Test that waiting stops as soon as the condition holds
+        '''
+        # Arrange
+        polls: list[int] = []
+
+        def condition() -> bool:
+            polls.append(1)
+            return len(polls) == 3
+
+        # Act
+        actual_result: bool = wait_until(condition, timeout=10, poll_interval=0.01)
+
+        # Assert
+        assert actual_result
+        assert 3 == len(polls)
+
+    def test_wait_until_deadline(self):
+        '''
+        Test that waiting gives up once the deadline passes
+        '''
+        # Act
+        start: float = monotonic()
+        actual_result: bool = wait_until(lambda: False, timeout=0.1, poll_interval=0.01)
+
+        # Assert
+        assert not actual_result
+        assert monotonic() - start < 1
+
+    def test_wait_until_async(self):
+        '''
+        Test waiting on an asynchronous condition
+        '''
+        # Arrange
+        async def holds() -> bool:
+            return True
+
+        async def never_holds() -> bool:
+            return False
+
+        # Act and Assert
+        assert run(wait_until_async(holds, timeout=0, poll_interval=0.01))
+        assert not run(wait_until_async(never_holds, timeout=0.05, poll_interval=0.01))